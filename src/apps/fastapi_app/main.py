@@ -1,3 +1,8 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
@@ -21,17 +26,80 @@ from apps.fastapi_app.routes import (
 )
 from personal_assistant.config.monitoring import monitoring_router
 from personal_assistant.config.settings import settings
+from personal_assistant.core import get_agent_core
 from personal_assistant.middleware import CorrelationIDMiddleware
 from personal_assistant.monitoring import get_metrics_service
+from personal_assistant.rag import warm_embedding_cache
+from personal_assistant.sms_router.services.inbound_queue import get_inbound_sms_queue
+from personal_assistant.tools.ai_scheduler.core import (
+    AITaskTimer,
+    get_ai_task_timer_index,
+)
+from personal_assistant.tools.execution import LoopStallDetector
+
+logger = logging.getLogger(__name__)
 
 # Create security scheme
 security = HTTPBearer()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm shared components at startup and drain queued work on shutdown."""
+    start_time = time.perf_counter()
+    agent_core = None
+    stall_detector = None
+    if settings.LOOP_STALL_DETECTION:
+        stall_detector = LoopStallDetector()
+        stall_detector.start()
+    try:
+        agent_core = get_agent_core()
+        logger.info(
+            f"AgentCore warmed up in {(time.perf_counter() - start_time) * 1000:.0f}ms"
+        )
+        await agent_core.background_service.start()
+    except Exception as e:
+        # Requests will retry initialization lazily
+        logger.error(f"Failed to warm up AgentCore: {e}")
+    inbound_sms_queue = None
+    try:
+        inbound_sms_queue = get_inbound_sms_queue()
+        await inbound_sms_queue.start()
+    except Exception as e:
+        # The webhook starts the queue on first use
+        logger.error(f"Failed to start inbound SMS queue: {e}")
+    ai_task_timer = None
+    try:
+        timer_index = get_ai_task_timer_index()
+        if timer_index is not None:
+            ai_task_timer = AITaskTimer(timer_index)
+            ai_task_timer.start()
+    except Exception as e:
+        # The Celery beat poll still dispatches due tasks
+        logger.error(f"Failed to start AI task timer: {e}")
+    embedding_warmup = None
+    if settings.RAG_EMBEDDING_CACHE_WARMUP_ROWS > 0:
+        # Runs alongside request handling; cache misses fall through to the API
+        embedding_warmup = asyncio.create_task(warm_embedding_cache())
+    yield
+    if embedding_warmup is not None and not embedding_warmup.done():
+        embedding_warmup.cancel()
+    if ai_task_timer is not None:
+        await ai_task_timer.stop()
+    if inbound_sms_queue is not None:
+        await inbound_sms_queue.stop()
+    if agent_core is not None:
+        await agent_core.background_service.stop()
+    if stall_detector is not None:
+        await stall_detector.stop()
+
+
 app = FastAPI(
     title="Personal Assistant API",
     description="AI-powered personal assistant API",
     version="0.1.0",
     debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
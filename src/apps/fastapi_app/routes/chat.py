@@ -21,7 +21,7 @@ from apps.fastapi_app.models.chat import (
     SendMessageResponse,
 )
 from apps.fastapi_app.services.chat_service import ChatService
-from personal_assistant.core import AgentCore
+from personal_assistant.core import get_agent_core
 from personal_assistant.database.models.users import User
 from personal_assistant.database.session import AsyncSessionLocal
 
@@ -42,11 +42,8 @@ async def get_db():
 
 
 async def get_chat_service() -> ChatService:
-    """Get chat service instance."""
-    from personal_assistant.tools import create_tool_registry
-    tool_registry = create_tool_registry()
-    agent_core = AgentCore(tools=tool_registry)
-    return ChatService(agent_core)
+    """Get chat service instance backed by the shared AgentCore."""
+    return ChatService(get_agent_core())
 
 
 @router.post("/messages", response_model=SendMessageResponse)
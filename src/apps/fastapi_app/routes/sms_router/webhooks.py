@@ -2,7 +2,6 @@
 Webhook routes for SMS Router Service.
 """
 
-import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Request
@@ -12,9 +11,9 @@ from twilio.twiml.messaging_response import MessagingResponse
 from personal_assistant.sms_router.middleware.webhook_validation import (
     validate_twilio_webhook,
 )
+from personal_assistant.sms_router.services.inbound_queue import get_inbound_sms_queue
 from personal_assistant.sms_router.services.routing_engine import SMSRoutingEngine
 from personal_assistant.sms_router.services.simple_retry_service import SimpleSMSRetryService
-from personal_assistant.communication.twilio_integration.twilio_client import TwilioService
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -27,17 +26,18 @@ async def twilio_sms_webhook(
     From: str = Form(...),
     To: str = Form(...),
     MessageSid: str = Form(...),
-    routing_engine: SMSRoutingEngine = Depends(),
 ):
     """
     Handle incoming SMS webhook from Twilio.
 
+    The message is handed to the inbound SMS queue and acknowledged right away;
+    the reply is sent by the queue once the agent has processed it.
+
     Args:
         Body: SMS message content
         From: Sender's phone number
         To: Recipient's phone number (our Twilio number)
         MessageSid: Twilio message SID
-        routing_engine: SMS routing engine instance
     """
     logger.info(f"🚨 SMS WEBHOOK CALLED! From: {From}, To: {To}, Body: {Body}, MessageSid: {MessageSid}")
     logger.info(f"🚨 Request headers: {dict(request.headers)}")
@@ -50,15 +50,13 @@ async def twilio_sms_webhook(
             logger.warning(f"Invalid webhook request from {client_host}")
             raise HTTPException(status_code=400, detail="Invalid webhook")
 
-        logger.info(f"Processing SMS from {From}: {Body[:50]}...")
-
-        # Route the SMS through the routing engine
-        response = MessagingResponse()
-        
-        asyncio.create_task(process_sms_continue_background(From, Body, MessageSid))
+        logger.info(f"Queueing SMS from {From}: {Body[:50]}...")
 
+        # Duplicates (Twilio retries of an accepted MessageSid) are acknowledged too
+        await get_inbound_sms_queue().submit(From, Body, MessageSid)
 
         # Return TwiML response
+        response = MessagingResponse()
         return Response(content=str(response), media_type="application/xml")
 
     except HTTPException:
@@ -68,45 +66,6 @@ async def twilio_sms_webhook(
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-async def process_sms_continue_background(from_phone: str, message_body: str, message_sid: str):
-    """Continue SMS processing in background after webhook acknowledgment."""
-    logger.info(f"🚀 STARTING SMS BACKGROUND TASK: {from_phone}, message: {message_body[:30]}...")
-    
-    try:
-        # Import here to avoid circular imports
-        
-        # Initialize services
-        routing_engine = SMSRoutingEngine()
-        twilio_service = TwilioService()
-        
-        logger.info(f"Continuing SMS processing from {from_phone}: {message_body[:50]}...")
-        
-        # Process the message through the routing engine
-        # This will handle user identification, spam detection, agent processing, etc.
-        logger.info(f"🔍 DEBUG: Calling routing_engine.route_sms for {from_phone}")
-        response = await routing_engine.route_sms(from_phone, message_body, message_sid)
-        logger.info(f"🔍 DEBUG: routing_engine.route_sms completed for {from_phone}")
-        
-        # Extract message content using Twilio's built-in API
-        if hasattr(response, 'verbs') and response.verbs:
-            response_text = response.verbs[0].value
-        else:
-            response_text = "Sorry, I couldn't process your request."
-        
-        # Send the response via SMS using Twilio REST API
-        logger.info(f"🔍 DEBUG: Sending SMS response to {from_phone}: {response_text[:50]}...")
-        message_sid = await twilio_service.send_sms(from_phone, response_text)
-        
-        logger.info(f"✅ SMS BACKGROUND TASK COMPLETED: {from_phone}, SID: {message_sid}")
-        
-    except Exception as e:
-        logger.error(f"❌ SMS BACKGROUND TASK FAILED: {from_phone}, error: {e}")
-        # Send error message
-        try:
-            await twilio_service.send_sms(from_phone, "Sorry, there was an error processing your request.")
-        except Exception as send_error:
-            logger.error(f"Failed to send error message: {send_error}")
-
 @router.post("/delivery-status")
 async def twilio_delivery_status_webhook(
     request: Request,
@@ -157,6 +116,7 @@ async def webhook_stats(routing_engine: SMSRoutingEngine = Depends()):
     """Get routing engine statistics."""
     try:
         stats = await routing_engine.get_routing_stats()
+        stats["inbound_queue"] = get_inbound_sms_queue().get_metrics()
         return stats
     except Exception as e:
         logger.error(f"Failed to get stats: {e}")
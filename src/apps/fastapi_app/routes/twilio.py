@@ -10,12 +10,9 @@ from personal_assistant.auth.decorators import require_permission
 from personal_assistant.communication.twilio_integration.twilio_client import (
     TwilioService,
 )
-from personal_assistant.config.settings import settings
-from personal_assistant.core import AgentCore
+from personal_assistant.core import get_agent_core
 from personal_assistant.database.models.users import User
 from personal_assistant.database.session import AsyncSessionLocal
-from personal_assistant.llm.gemini import GeminiLLM
-from personal_assistant.tools import create_tool_registry
 
 router = APIRouter(prefix="/twilio", tags=["twilio"])
 
@@ -56,12 +53,7 @@ async def get_current_user(
 
 
 async def get_twilio_service():
-    tool_registry = create_tool_registry()
-    agent_core = AgentCore(
-        tools=tool_registry,
-        llm=GeminiLLM(api_key=settings.GOOGLE_API_KEY, model=settings.GEMINI_MODEL),
-    )
-    return TwilioService(agent_core)
+    return TwilioService(get_agent_core())
 
 
 class SMSRequest(BaseModel):
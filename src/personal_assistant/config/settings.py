@@ -46,6 +46,7 @@ class Settings(BaseSettings):
     # Google settings (including Gemini LLM)
     GOOGLE_API_KEY: Optional[str] = None
     GEMINI_MODEL: str = "gemini-2.5-flash"  # Default Gemini model
+    LLM_MAX_CONCURRENCY: int = 8  # Worker threads for async LLM completions
     YOUTUBE_API_KEY: Optional[str] = None  # YouTube Data API v3 key
 
     # Twilio settings
@@ -105,6 +106,13 @@ class Settings(BaseSettings):
     STRUCTURED_LOGGING: bool = False
     LOG_TO_LOKI: bool = False
     LOKI_URL: str = "http://loki:3100/loki/api/v1/push"
+    LOKI_BATCH_SIZE: int = 500  # Records per push
+    LOKI_FLUSH_INTERVAL_SECONDS: float = 1.0  # Longest a partial batch waits
+    LOKI_MAX_BUFFERED_RECORDS: int = 10000  # Oldest records are dropped beyond this
+    LOKI_MAX_RETRIES: int = 3
+    LOKI_RETRY_BACKOFF_SECONDS: float = 0.5  # Doubles after each failed attempt
+    LOKI_PUSH_TIMEOUT_SECONDS: float = 5.0
+    LOKI_SHUTDOWN_TIMEOUT_SECONDS: float = 5.0  # Time allowed to flush at exit
     CORRELATION_ID_HEADER: str = "X-Correlation-ID"
 
     # Module-specific log levels
@@ -176,14 +184,81 @@ class Settings(BaseSettings):
     DEFAULT_MAX_CONVERSATION_HISTORY_SIZE: int = 20
     DEFAULT_MAX_HISTORY_SIZE: int = 20  # Maximum items in history
     DEFAULT_CONTEXT_WINDOW_SIZE: int = 10  # Recent items to keep in context
+    STATE_INCREMENTAL_SAVE: bool = True  # Write only new/pruned rows on save
+    # Hot per-user AgentState cache; unset enables it only with
+    # STATE_CACHE_REDIS_URL. True without Redis keeps an in-process cache,
+    # which is only safe when a single process serves each user
+    STATE_CACHE_ENABLED: Optional[bool] = None
+    STATE_CACHE_MAX_USERS: int = 1000
+    STATE_CACHE_LOCAL_TTL_SECONDS: int = 60
+    STATE_CACHE_REDIS_URL: Optional[str] = None  # Shared tier, e.g. redis://localhost:6379/2
+    STATE_CACHE_REDIS_TTL_SECONDS: int = 1800
+
+    # Write-behind queue for post-response work (state saves, LTM learning)
+    BACKGROUND_QUEUE_MAX_PENDING: int = 1000  # Conversations waiting before backpressure
+    BACKGROUND_QUEUE_WORKERS: int = 2
+    BACKGROUND_QUEUE_BATCH_SIZE: int = 16  # Conversations written per worker cycle
+    BACKGROUND_QUEUE_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+
+    # Off-loop execution for blocking tools and SDK calls (Notion, YouTube, ...)
+    TOOL_EXECUTOR_MAX_WORKERS: int = 4  # Threads per tool category
+    TOOL_BLOCKING_TIMEOUT_SECONDS: float = 30.0  # 0 disables the timeout
+    TOOL_MAX_PARALLEL_CALLS_PER_USER: int = 4  # Concurrent calls from one multi-tool step
+    TOOL_RESULT_CACHE_ENABLED: bool = True  # Cache tools that declare a cache_ttl
+    TOOL_RESULT_CACHE_MAX_ENTRIES: int = 2048  # In-process LRU bound
+    TOOL_RESULT_CACHE_REDIS_URL: Optional[str] = None  # Shared backend, e.g. redis://localhost:6379/4
+    LOOP_STALL_DETECTION: bool = False  # Debug aid: warn when the event loop blocks
+    LOOP_STALL_THRESHOLD_MS: int = 100
+
+    # Due AI task dispatcher (Celery beat -> claim -> run)
+    AI_TASK_DISPATCH_BATCH_SIZE: int = 50  # Tasks claimed per dispatcher run
+    AI_TASK_MAX_CONCURRENCY: int = 8  # Claimed tasks executed at once
+    AI_TASK_LEASE_SECONDS: int = 900  # Claim expiry; a dead worker's tasks are re-run after it
+    # Due-time index (Redis sorted set) that lets the API dispatch tasks exactly
+    # when due; the Celery beat poll drops to every 5 minutes when it is set
+    AI_TASK_TIMER_REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/6
+    AI_TASK_TIMER_MAX_SLEEP_SECONDS: float = 5.0  # Bounds delay for tasks scheduled by other processes
+    AI_TASK_TIMER_RECONCILE_SECONDS: int = 300  # Reload upcoming tasks from the DB
+
+    # Inbound SMS queue (Twilio webhook -> agent -> reply)
+    SMS_INBOUND_WORKERS: int = 4  # Senders processed concurrently
+    SMS_INBOUND_REDIS_URL: Optional[str] = None  # Durable journal, e.g. redis://localhost:6379/3
+    SMS_INBOUND_DEDUPE_TTL_SECONDS: int = 86400  # How long a MessageSid is remembered
+    SMS_INBOUND_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0
+    # SMS usage rollups (hourly/daily aggregates behind the SMS analytics)
+    SMS_ROLLUP_LOOKBACK_HOURS: int = 6  # Recent hours rebuilt each refresh (late-arriving logs)
+    SMS_ROLLUP_BACKFILL_CHUNK_DAYS: int = 7  # Days aggregated per transaction on first build
+    SMS_PRICING_CACHE_TTL_SECONDS: int = 86400  # Process-wide SMS pricing cache
 
     # RAG Configuration
     RAG_MAX_CONTEXT_LENGTH: int = 2000
     RAG_NOTION_INDEXING_ENABLED: bool = True
     RAG_BATCH_INDEX_SIZE: int = 10
-    RAG_EMBEDDING_CACHE_SIZE: int = 1000
+    RAG_EMBEDDING_CACHE_SIZE: int = 1000  # In-process LRU (float32, ~12KB per embedding)
     RAG_EMBEDDING_CACHE_TTL: int = 3600  # 1 hour in seconds
+    RAG_EMBEDDING_CACHE_REDIS_URL: Optional[str] = None  # Shared tier, e.g. redis://localhost:6379/5
+    RAG_EMBEDDING_CACHE_REDIS_TTL_SECONDS: int = 2592000  # 30 days; entries are content-addressed
+    RAG_EMBEDDING_CACHE_WARMUP_ROWS: int = 0  # Stored embeddings loaded at startup (0 = off)
+    RAG_EMBEDDING_BATCH_SIZE: int = 100  # Texts per request (Gemini batch limit)
+    RAG_EMBEDDING_MAX_CONCURRENT_BATCHES: int = 4
+    RAG_EMBEDDING_MAX_RETRIES: int = 3  # Attempts per batch, then per text
+    RAG_EMBEDDING_RETRY_BACKOFF_SECONDS: float = 0.5  # Doubles on each retry
+    RAG_BACKFILL_PAGE_SIZE: int = 500  # Rows fetched and written per backfill page
+    RAG_BACKFILL_WORKERS: int = 2  # Backfill pages embedded concurrently
+    RAG_BACKFILL_CHECKPOINT_DIR: str = "data/backfill"  # Resumable backfill progress
     RAG_MAX_RESULTS: int = 5  # Maximum results to return from RAG queries
+    RAG_VECTOR_INDEX_BACKEND: str = "auto"  # auto, pgvector or numpy
+    RAG_VECTOR_INDEX_DIR: str = "data/vector_index"  # NumPy index persistence
+    RAG_EMBEDDING_DIMENSION: int = 3072  # gemini-embedding-001 output size
+
+    # Context retrieval deadlines (LTM and RAG run concurrently per turn)
+    CONTEXT_LTM_TIMEOUT_SECONDS: float = 3.0
+    CONTEXT_RAG_TIMEOUT_SECONDS: float = 3.0
+
+    # Per-turn stage tracing (Prometheus histograms, optional log waterfall)
+    AGENT_TRACING_ENABLED: bool = True
+    AGENT_TRACE_LOG_WATERFALL: bool = False  # Log each turn's spans with its correlation ID
+    AGENT_TRACE_WATERFALL_MIN_MS: float = 0.0  # Only log turns at least this slow
 
     class Config:
         env_file = config_file
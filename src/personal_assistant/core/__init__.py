@@ -1,8 +1,8 @@
 # Configure module logger
 from personal_assistant.config.logging_config import get_logger
 
-from .agent import AgentCore
+from .agent import AgentCore, get_agent_core, set_agent_core
 
 logger = get_logger("core")
 
-__all__ = ["AgentCore", "logger"]
+__all__ = ["AgentCore", "get_agent_core", "set_agent_core", "logger"]
@@ -2,9 +2,10 @@
 Main AgentCore class that orchestrates memory, tools, LLM, and AgentRunner functionality.
 """
 
-import asyncio
 import os
+import threading
 import time
+from typing import Optional
 
 from personal_assistant.prompts.enhanced_prompt_builder import EnhancedPromptBuilder
 
@@ -19,8 +20,10 @@ from ..memory.ltm_optimization import (
     LTMLearningManager,
     SmartLTMRetriever,
 )
+from ..memory.state_cache import get_state_cache
 from ..memory.storage_integration import StorageIntegrationManager
-from ..tools import ToolRegistry
+from ..monitoring.tracing import span, start_turn
+from ..tools import ToolRegistry, create_tool_registry
 from .error_handler import AgentErrorHandler
 from .logging_utils import log_agent_operation
 from .services import ContextService, ConversationService, BackgroundService, ContextInjectionService, ToolExecutionService, AgentLoopService
@@ -29,6 +32,15 @@ logger = get_logger("core")
 
 
 class AgentCore:
+    """
+    Orchestrates memory, tools, LLM and the agent loop.
+
+    An AgentCore holds only long-lived components (tool registry, LLM client,
+    LTM managers, prompt builder) and keeps per-request state local to run(),
+    so one instance can be shared across concurrent requests; see
+    get_agent_core().
+    """
+
     def __init__(self, tools=None, llm=None):
         """
         Initialize the core agent components.
@@ -70,9 +82,6 @@ class AgentCore:
             context_manager=self.context_manager
         )
         
-        # Initialize conversation service
-        self.conversation_service = ConversationService(self.storage_manager)
-        
         # Initialize background service
         self.background_service = BackgroundService(
             storage_manager=self.storage_manager,
@@ -80,14 +89,18 @@ class AgentCore:
             lifecycle_manager=self.lifecycle_manager
         )
         
+        # Initialize conversation service (reads unsaved state from the background queue)
+        self.conversation_service = ConversationService(
+            self.storage_manager,
+            background_service=self.background_service,
+            state_cache=get_state_cache(),
+        )
+        
         # Initialize runner services (merged from AgentRunner)
         self.context_injection_service = ContextInjectionService()
         self.tool_execution_service = ToolExecutionService(self.tools)
         self.agent_loop_service = AgentLoopService(self.planner, self.tool_execution_service)
         
-        # Current state for agent loop execution
-        self.current_state = None
-        
         logger.info("All services initialized successfully")
 
     async def run(self, user_input: str, user_id: int, enable_background_processing: bool = True) -> str:
@@ -111,49 +124,55 @@ class AgentCore:
             logger, user_id, "agent_run_start", {"input_length": len(user_input)}
         )
 
-        try:
-            # 1. Get conversation context and agent state
-            conversation_id, agent_state = await self.conversation_service.get_conversation_context(
-                user_id, user_input
-            )
-
-            # 2. Get enhanced context (LTM + RAG)
-            context_data = await self.context_service.get_enhanced_context(
-                user_id, user_input, agent_state
-            )
-
-            # 3. Set context for agent execution
-            await self._set_context(
-                agent_state, 
-                context_data["rag_context"], 
-                context_data["ltm_context"]
-            )
-
-            # 4. Execute agent loop
-            response, updated_state = await self._execute_agent_loop(user_input, user_id)
-
-            # 5. Save state (synchronously if background processing disabled)
-            if not enable_background_processing:
-                # Save state immediately to ensure messages are persisted
-                logger.info(f"🔍 DEBUG: Saving state synchronously for conversation: {conversation_id}")
-                logger.info(f"🔍 DEBUG: Response length: {len(response) if response else 0}")
-                logger.info(f"🔍 DEBUG: Conversation history items: {len(updated_state.conversation_history) if updated_state else 0}")
-                await self.storage_manager.save_state(conversation_id, updated_state, user_id)
-                logger.info(f"✅ State saved synchronously for conversation: {conversation_id}")
-            else:
-                # This is very low performance and blocks followup messages, we need to rethink how to save memories
-                # Start background processing (non-blocking)
-                asyncio.create_task(self.background_service.process_async(
-                    user_id, user_input, response, updated_state, conversation_id, start_time
-                ))
-
-            return response
-
-        except Exception as e:
-            error_response = await self.error_handler.handle_error(
-                e, user_id, start_time
-            )
-            return error_response
+        with start_turn(user_id=user_id):
+            try:
+                # 1. Get conversation context and agent state
+                with span("conversation"):
+                    conversation_id, agent_state = await self.conversation_service.get_conversation_context(
+                        user_id, user_input
+                    )
+
+                # 2. Get enhanced context (LTM + RAG)
+                context_data = await self.context_service.get_enhanced_context(
+                    user_id, user_input, agent_state
+                )
+
+                # 3. Set context for agent execution
+                with span("context_injection"):
+                    await self._set_context(
+                        agent_state, 
+                        context_data["rag_context"], 
+                        context_data["ltm_context"]
+                    )
+
+                # 4. Execute agent loop
+                response, updated_state = await self._execute_agent_loop(
+                    user_input, user_id, agent_state
+                )
+
+                # 5. Save state (synchronously if background processing disabled)
+                if not enable_background_processing:
+                    # Save state immediately to ensure messages are persisted
+                    logger.info(f"🔍 DEBUG: Saving state synchronously for conversation: {conversation_id}")
+                    logger.info(f"🔍 DEBUG: Response length: {len(response) if response else 0}")
+                    logger.info(f"🔍 DEBUG: Conversation history items: {len(updated_state.conversation_history) if updated_state else 0}")
+                    with span("state_save"):
+                        await self.storage_manager.save_state(conversation_id, updated_state, user_id)
+                    logger.info(f"✅ State saved synchronously for conversation: {conversation_id}")
+                else:
+                    # Hand off to the write-behind queue (waits only under backpressure)
+                    with span("state_submit"):
+                        await self.background_service.submit(
+                            user_id, user_input, response, updated_state, conversation_id, start_time
+                        )
+
+                return response
+
+            except Exception as e:
+                error_response = await self.error_handler.handle_error(
+                    e, user_id, start_time
+                )
+                return error_response
 
     async def _set_context(
         self,
@@ -169,29 +188,25 @@ class AgentCore:
             rag_context: List of semantic documents from RAG
             ltm_context: Long-term memory context string
         """
-        # Store the current state for use in _execute_agent_loop()
-        self.current_state = agent_state
-        
         # Delegate to context injection service
         await self.context_injection_service.inject_context(
             agent_state, rag_context, ltm_context
         )
 
-    async def _execute_agent_loop(self, user_input: str, user_id: int):
+    async def _execute_agent_loop(self, user_input: str, user_id: int, state):
         """
         Execute the main agent loop processing user input with optimized context.
 
         Args:
             user_input: String containing the user's message or query
             user_id: User identifier for tool execution
+            state: The request's AgentState, prepared by _set_context()
 
         Returns:
             Tuple[str, AgentState]: Final response to user and the final AgentState
         """
-        # Use the state that was set up by _set_context()
-        state = self.current_state
         if state is None:
-            raise ValueError("No current state available. Call _set_context() first.")
+            raise ValueError("No agent state available. Call _set_context() first.")
 
         # Delegate to agent loop service with user_id
         return await self.agent_loop_service.execute_loop(state, user_input, user_id)
@@ -213,3 +228,45 @@ class AgentCore:
             self.context_manager = None
             self.lifecycle_manager = None
 
+
+
+# Process-wide AgentCore shared by API requests and worker tasks
+_agent_core: Optional[AgentCore] = None
+_agent_core_lock = threading.Lock()
+
+
+def get_agent_core() -> AgentCore:
+    """
+    Get the shared AgentCore, building it on first use.
+
+    Building an AgentCore initializes the tool registry and metadata, the
+    Gemini client, the LTM managers and the prompt builder, so it is done
+    once per process (at app startup or worker init) rather than per request.
+
+    Returns:
+        AgentCore: The process-wide agent instance
+    """
+    global _agent_core
+    if _agent_core is None:
+        with _agent_core_lock:
+            if _agent_core is None:
+                start_time = time.perf_counter()
+                # The SMS and Twilio paths configure the key as GOOGLE_API_KEY
+                _agent_core = AgentCore(
+                    tools=create_tool_registry(),
+                    llm=GeminiLLM(
+                        api_key=settings.GOOGLE_API_KEY, model=settings.GEMINI_MODEL
+                    ),
+                )
+                logger.info(
+                    f"Shared AgentCore initialized in "
+                    f"{(time.perf_counter() - start_time) * 1000:.0f}ms"
+                )
+    return _agent_core
+
+
+def set_agent_core(agent_core: Optional[AgentCore]) -> None:
+    """Override the shared AgentCore (e.g. for tests); None resets it."""
+    global _agent_core
+    with _agent_core_lock:
+        _agent_core = agent_core
@@ -2,12 +2,13 @@
 AgentLoopService handles the main agent conversation loop execution.
 """
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 from personal_assistant.config.logging_config import get_logger
 from personal_assistant.config.settings import settings
 from personal_assistant.llm.planner import LLMPlanner
-from personal_assistant.types.messages import FinalAnswer, ToolCall
+from personal_assistant.monitoring.tracing import span
+from personal_assistant.types.messages import FinalAnswer, ToolCall, ToolCallBatch
 from personal_assistant.types.state import AgentState
 
 logger = get_logger("agent_loop_service")
@@ -66,20 +67,27 @@ class AgentLoopService:
                 if not success:
                     # Tool execution failed, return error response
                     return action.name, state
+            elif isinstance(action, ToolCallBatch):
+                failed_call = await self._handle_tool_calls(action, state, user_id)
+                if failed_call is not None:
+                    # Tool execution failed, return error response
+                    return failed_call.name, state
             else:
                 logger.warning(f"Unknown action type: {type(action)} - {action}")
                 logger.warning("This action will be ignored and the loop will continue")
 
         # Loop limit reached
         logger.warning("Loop limit reached, forcing finish.")
-        forced_response = self.planner.force_finish(state)
+        with span("plan"):
+            forced_response = await self.planner.aforce_finish(state)
         state._apply_size_limits()
         return forced_response, state
     
     async def _get_next_action(self, state: AgentState):
         """Get the next action from the planner."""
-        logger.debug("=== CALLING PLANNER.CHOOSE_ACTION ===")
-        action = self.planner.choose_action(state)
+        logger.debug("=== CALLING PLANNER.ACHOOSE_ACTION ===")
+        with span("plan"):
+            action = await self.planner.achoose_action(state)
         logger.debug(f"=== PLANNER RETURNED ACTION: {type(action).__name__} ===")
         logger.debug(f"Chosen action: {action}")
         logger.debug(f"Action type: {type(action)}")
@@ -103,3 +111,16 @@ class AgentLoopService:
             return False
         
         return True
+
+    async def _handle_tool_calls(self, action: ToolCallBatch, state: AgentState, user_id: int) -> Optional[ToolCall]:
+        """Handle several tool calls from one step; returns the first failed call, if any."""
+        results = await self.tool_execution_service.execute_batch_and_update(
+            action.calls, state, user_id
+        )
+
+        for call, (result, success) in zip(action.calls, results):
+            if not success:
+                logger.error(f"Tool execution failed: {result}")
+                return call
+
+        return None
@@ -1,10 +1,20 @@
 """
 BackgroundService handles all background processing after response is returned.
+
+Work is handed to a bounded write-behind queue keyed by conversation: pending
+saves of the same conversation coalesce into one write, workers drain several
+conversations per cycle, and the latest unsaved state of a conversation can be
+read back before it reaches the database.
 """
 
+import asyncio
+import copy
 import time
-from typing import Optional
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
 from personal_assistant.config.logging_config import get_logger
+from personal_assistant.config.settings import settings
 from personal_assistant.memory.ltm_optimization import (
     LTMLearningManager,
     EnhancedMemoryLifecycleManager,
@@ -15,13 +25,38 @@ from ..logging_utils import log_performance_metrics
 
 logger = get_logger("background_service")
 
+# Every live service, so process shutdown can flush their work
+_services: "weakref.WeakSet[BackgroundService]" = weakref.WeakSet()
+
+
+@dataclass
+class _Turn:
+    """One completed agent turn awaiting per-turn background work."""
+
+    user_input: str
+    response: str
+    state: AgentState
+    start_time: float
+
+
+@dataclass
+class _PendingConversation:
+    """Coalesced background work for one conversation."""
+
+    user_id: int
+    state: AgentState
+    turns: List[_Turn] = field(default_factory=list)
+
 
 class BackgroundService:
     """Service for handling background processing tasks."""
     
     def __init__(self, storage_manager: StorageIntegrationManager,
                  ltm_learning_manager: Optional[LTMLearningManager] = None,
-                 lifecycle_manager: Optional[EnhancedMemoryLifecycleManager] = None):
+                 lifecycle_manager: Optional[EnhancedMemoryLifecycleManager] = None,
+                 max_pending: Optional[int] = None,
+                 num_workers: Optional[int] = None,
+                 batch_size: Optional[int] = None):
         """
         Initialize the background service.
         
@@ -29,11 +64,239 @@ class BackgroundService:
             storage_manager: Storage integration manager
             ltm_learning_manager: LTM learning manager (optional)
             lifecycle_manager: Memory lifecycle manager (optional)
+            max_pending: Queued conversations before submit() applies backpressure
+            num_workers: Number of queue worker tasks
+            batch_size: Conversations a worker drains per cycle
         """
         self.storage_manager = storage_manager
         self.ltm_learning_manager = ltm_learning_manager
         self.lifecycle_manager = lifecycle_manager
-    
+
+        self.max_pending = max_pending or settings.BACKGROUND_QUEUE_MAX_PENDING
+        self.num_workers = num_workers or settings.BACKGROUND_QUEUE_WORKERS
+        self.batch_size = batch_size or settings.BACKGROUND_QUEUE_BATCH_SIZE
+
+        # Queue state, bound to the event loop that called start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._pending: Dict[str, _PendingConversation] = {}
+        self._in_flight: Dict[str, AgentState] = {}
+        # Fire-and-forget tasks used when the queue is not running
+        self._detached_tasks: Set[asyncio.Task] = set()
+        self._metrics = {
+            "submitted": 0,
+            "coalesced": 0,
+            "saves": 0,
+            "batches": 0,
+            "backpressure_waits": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+        }
+        _services.add(self)
+
+    # ------------------------
+    # Write-behind queue
+    # ------------------------
+    @property
+    def is_running(self) -> bool:
+        """Whether the write-behind queue is accepting work on its event loop."""
+        return self._loop is not None
+
+    async def start(self):
+        """Start the queue workers on the current event loop."""
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"background-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        logger.info(
+            f"Background write-behind queue started: {self.num_workers} workers, "
+            f"max {self.max_pending} pending, batch size {self.batch_size}"
+        )
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Flush queued work and detached tasks, then stop the workers.
+
+        Args:
+            timeout: Seconds to wait for the flush before dropping remaining work
+        """
+        if timeout is None:
+            timeout = settings.BACKGROUND_QUEUE_SHUTDOWN_TIMEOUT_SECONDS
+        deadline = time.monotonic() + timeout
+
+        if self.is_running:
+            try:
+                await asyncio.wait_for(self._ready.join(), timeout)
+                logger.info("Background write-behind queue flushed")
+            except asyncio.TimeoutError:
+                logger.error(
+                    f"Background queue flush timed out after {timeout}s; "
+                    f"dropping {len(self._pending)} pending conversations"
+                )
+
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+            self._ready = None
+            self._loop = None
+
+        await self._wait_for_detached(max(0.0, deadline - time.monotonic()))
+
+    async def _wait_for_detached(self, timeout: float):
+        """Wait for detached tasks running on this event loop."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._detached_tasks if task.get_loop() is loop]
+        if not tasks:
+            return
+        _, still_running = await asyncio.wait(tasks, timeout=timeout)
+        if still_running:
+            logger.error(
+                f"{len(still_running)} detached background tasks still running "
+                f"after {timeout:.1f}s"
+            )
+
+    async def submit(self, user_id: int, user_input: str, response: str,
+                     updated_state: AgentState, conversation_id: str, start_time: float):
+        """
+        Queue post-response work for a turn.
+
+        Pending work for the same conversation is coalesced into one state save.
+        Waits only when the queue is full (backpressure). When the queue is not
+        running on this event loop the work runs as a detached task instead.
+
+        Args:
+            user_id: User identifier
+            user_input: Original user input
+            response: Agent response
+            updated_state: Updated agent state
+            conversation_id: Conversation identifier
+            start_time: Request start time
+        """
+        if self._loop is not asyncio.get_running_loop():
+            task = asyncio.create_task(self.process_async(
+                user_id, user_input, response, updated_state, conversation_id, start_time
+            ))
+            self._detached_tasks.add(task)
+            task.add_done_callback(self._detached_tasks.discard)
+            return
+
+        self._metrics["submitted"] += 1
+        turn = _Turn(user_input, response, updated_state, start_time)
+
+        pending = self._pending.get(conversation_id)
+        if pending is not None:
+            pending.state = updated_state
+            pending.turns.append(turn)
+            self._metrics["coalesced"] += 1
+            return
+
+        entry = _PendingConversation(user_id=user_id, state=updated_state, turns=[turn])
+        self._pending[conversation_id] = entry
+        if conversation_id in self._in_flight:
+            # The worker saving this conversation picks the newer state up next
+            return
+
+        if self._ready.full():
+            self._metrics["backpressure_waits"] += 1
+            logger.warning(
+                f"Background queue full ({self.max_pending}); waiting to enqueue "
+                f"conversation {conversation_id}"
+            )
+        try:
+            await self._ready.put(conversation_id)
+        except asyncio.CancelledError:
+            # No queue item exists for the entry, so no worker would ever save it
+            if self._pending.get(conversation_id) is entry:
+                del self._pending[conversation_id]
+            raise
+        self._metrics["max_queue_depth"] = max(
+            self._metrics["max_queue_depth"], self._ready.qsize()
+        )
+
+    def get_pending_state(self, conversation_id: str) -> Optional[AgentState]:
+        """
+        Get a copy of the latest state of a conversation not yet saved.
+
+        Args:
+            conversation_id: Conversation identifier
+
+        Returns:
+            The queued or in-flight state, or None if nothing is pending
+        """
+        pending = self._pending.get(conversation_id)
+        state = pending.state if pending else self._in_flight.get(conversation_id)
+        return copy.deepcopy(state) if state is not None else None
+
+    def get_metrics(self) -> dict:
+        """Queue counters and current depth."""
+        return {
+            **self._metrics,
+            "running": self.is_running,
+            "queue_depth": self._ready.qsize() if self._ready else 0,
+            "pending_conversations": len(self._pending),
+            "in_flight_conversations": len(self._in_flight),
+            "detached_tasks": len(self._detached_tasks),
+        }
+
+    async def _worker(self, worker_id: int):
+        """Drain up to batch_size conversations per cycle until cancelled."""
+        while True:
+            batch = [await self._ready.get()]
+            while len(batch) < self.batch_size and not self._ready.empty():
+                batch.append(self._ready.get_nowait())
+            try:
+                await self._process_batch(batch)
+            except Exception as e:
+                self._metrics["failed"] += 1
+                logger.error(f"Background worker {worker_id} batch failed: {e}")
+            finally:
+                for _ in batch:
+                    self._ready.task_done()
+
+    async def _process_batch(self, conversation_ids: List[str]):
+        """Save and post-process a batch of conversations, oldest turns first."""
+        self._metrics["batches"] += 1
+        while conversation_ids:
+            jobs = {
+                cid: self._pending.pop(cid)
+                for cid in conversation_ids
+                if cid in self._pending
+            }
+            for cid, job in jobs.items():
+                self._in_flight[cid] = job.state
+
+            try:
+                await asyncio.gather(*(
+                    self._save_state(cid, job.state, job.user_id)
+                    for cid, job in jobs.items()
+                ))
+                self._metrics["saves"] += len(jobs)
+
+                for cid, job in jobs.items():
+                    for turn in job.turns:
+                        await self._process_ltm_learning(
+                            job.user_id, turn.user_input, turn.response, turn.state, cid
+                        )
+                        await self._log_interaction(job.user_id, turn.state, turn.response)
+                        self._log_performance_metrics(job.user_id, turn.response, turn.start_time)
+
+                # Lifecycle management runs once per user with their latest state
+                latest_by_user = {job.user_id: job.state for job in jobs.values()}
+                for user_id, state in latest_by_user.items():
+                    await self._process_memory_lifecycle(user_id, state)
+            finally:
+                for cid in jobs:
+                    self._in_flight.pop(cid, None)
+
+            # Newer turns submitted while these were in flight
+            conversation_ids = [cid for cid in jobs if cid in self._pending]
+
     async def process_async(self, user_id: int, user_input: str, response: str,
                           updated_state: AgentState, conversation_id: str, start_time: float):
         """
@@ -72,6 +335,7 @@ class BackgroundService:
             await self.storage_manager.save_state(conversation_id, updated_state, user_id)
             logger.debug(f"State saved for conversation: {conversation_id}")
         except Exception as e:
+            self._metrics["failed"] += 1
             logger.error(f"Failed to save state for user {user_id}: {e}")
     
     async def _process_ltm_learning(self, user_id: int, user_input: str, response: str,
@@ -142,3 +406,18 @@ class BackgroundService:
             logger.debug(f"Performance metrics logged for user {user_id}")
         except Exception as e:
             logger.warning(f"Failed to log performance metrics for user {user_id}: {e}")
+
+
+async def stop_background_services(timeout: Optional[float] = None):
+    """
+    Stop every BackgroundService in this process, flushing queued and detached
+    work (e.g. before a worker's event loop cancels its remaining tasks).
+
+    Args:
+        timeout: Seconds each service may spend flushing
+    """
+    for service in list(_services):
+        try:
+            await service.stop(timeout)
+        except Exception as e:
+            logger.warning(f"Failed to stop background service: {e}")
@@ -1,13 +1,21 @@
 """
 ContextService handles all context retrieval (LTM + RAG) for the agent.
+
+LTM and RAG are fetched concurrently, each under its own deadline, so a slow
+embedding call or memory query cannot stall the whole reply.
 """
 
-from typing import Optional, Dict, Any
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
 from personal_assistant.config.logging_config import get_logger
+from personal_assistant.config.settings import settings
 from personal_assistant.memory.ltm_optimization import (
     DynamicContextManager,
     SmartLTMRetriever,
 )
+from personal_assistant.monitoring.tracing import span
 from personal_assistant.rag.retriever import query_knowledge_base
 from personal_assistant.tools.ltm.ltm_manager import get_ltm_context_with_tags
 from personal_assistant.types.state import AgentState
@@ -19,44 +27,130 @@ class ContextService:
     """Service for retrieving and optimizing context from LTM and RAG systems."""
     
     def __init__(self, ltm_retriever: Optional[SmartLTMRetriever] = None,
-                 context_manager: Optional[DynamicContextManager] = None):
+                 context_manager: Optional[DynamicContextManager] = None,
+                 ltm_timeout: Optional[float] = None,
+                 rag_timeout: Optional[float] = None):
         """
         Initialize the context service.
         
         Args:
             ltm_retriever: Enhanced LTM retriever (optional)
             context_manager: Dynamic context manager (optional)
+            ltm_timeout: Deadline in seconds for LTM retrieval (defaults to settings)
+            rag_timeout: Deadline in seconds for RAG retrieval (defaults to settings)
         """
         self.ltm_retriever = ltm_retriever
         self.context_manager = context_manager
+        self.ltm_timeout = (
+            ltm_timeout if ltm_timeout is not None
+            else settings.CONTEXT_LTM_TIMEOUT_SECONDS
+        )
+        self.rag_timeout = (
+            rag_timeout if rag_timeout is not None
+            else settings.CONTEXT_RAG_TIMEOUT_SECONDS
+        )
         
     async def get_enhanced_context(self, user_id: int, user_input: str, 
                                  agent_state: AgentState) -> Dict[str, Any]:
         """
         Get enhanced context from both LTM and RAG systems.
         
+        Both sources run concurrently. A source that misses its deadline
+        contributes whatever partial result it had reached (or nothing).
+        
         Args:
             user_id: User identifier
             user_input: User's input message
             agent_state: Current agent state
             
         Returns:
-            Dict containing ltm_context and rag_context
+            Dict containing ltm_context, rag_context and per-source timings
         """
-        # Get LTM context
-        ltm_context = await self._get_ltm_context(user_id, user_input, agent_state)
-        
-        # Get RAG context
-        rag_context = await self._get_rag_context(user_id, user_input)
+        with span("context"):
+            (ltm_context, ltm_timing), (rag_context, rag_timing) = await asyncio.gather(
+                self._run_with_deadline(
+                    "ltm",
+                    lambda partial: self._get_ltm_context(
+                        user_id, user_input, agent_state, partial
+                    ),
+                    self.ltm_timeout,
+                    default=None,
+                ),
+                self._run_with_deadline(
+                    "rag",
+                    lambda partial: self._get_rag_context(user_id, user_input),
+                    self.rag_timeout,
+                    default=[],
+                ),
+            )
+
+        logger.info(
+            f"Context retrieved for user {user_id}: "
+            f"ltm {ltm_timing['status']} in {ltm_timing['duration_ms']}ms, "
+            f"rag {rag_timing['status']} in {rag_timing['duration_ms']}ms"
+        )
         
         return {
             "ltm_context": ltm_context,
-            "rag_context": rag_context
+            "rag_context": rag_context,
+            "timings": {"ltm": ltm_timing, "rag": rag_timing},
         }
+
+    async def _run_with_deadline(
+        self,
+        source: str,
+        fetch: Callable[[Dict[str, Any]], Awaitable[Any]],
+        timeout: float,
+        default: Any,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """
+        Run a context fetch under a deadline.
+        
+        Args:
+            source: Source name used in logs
+            fetch: Coroutine factory; it may store an intermediate result
+                under ``partial["result"]`` to be used if the deadline hits
+            timeout: Deadline in seconds
+            default: Result used when the fetch fails or times out empty-handed
+            
+        Returns:
+            Tuple of (result, timing) where timing has duration_ms and status
+            (ok, partial, timeout or error)
+        """
+        partial: Dict[str, Any] = {}
+        start = time.perf_counter()
+        with span(source) as stage:
+            try:
+                result = await asyncio.wait_for(fetch(partial), timeout=timeout)
+                status = "ok"
+            except asyncio.TimeoutError:
+                if "result" in partial:
+                    result, status = partial["result"], "partial"
+                else:
+                    result, status = default, "timeout"
+                logger.warning(
+                    f"{source.upper()} context exceeded {timeout}s deadline ({status})"
+                )
+            except Exception as e:
+                logger.warning(f"{source.upper()} context retrieval failed: {e}")
+                result, status = default, "error"
+            stage.set_status(status)
+
+        timing = {
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "status": status,
+        }
+        return result, timing
     
     async def _get_ltm_context(self, user_id: int, user_input: str, 
-                             agent_state: AgentState) -> Optional[str]:
-        """Get LTM context with enhanced fallback logic."""
+                             agent_state: AgentState,
+                             partial: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Get LTM context with enhanced fallback logic.
+        
+        Once memories are retrieved, a plainly formatted version is stored in
+        ``partial["result"]`` so it can be used if optimization runs out of time.
+        """
+        partial = partial if partial is not None else {}
         try:
             # Try enhanced LTM retriever first
             if self.ltm_retriever:
@@ -67,6 +161,14 @@ class ContextService:
                     query_complexity="medium",
                 )
                 
+                # Simple context formatting (also the partial result if the
+                # optimization step misses the deadline)
+                ltm_context = "\n".join(
+                    [mem.get("content", "") for mem in relevant_memories[:5]]
+                )
+                if relevant_memories:
+                    partial["result"] = ltm_context
+
                 if relevant_memories and self.context_manager:
                     # Use dynamic context manager for optimization
                     ltm_context = await self.context_manager.optimize_context_with_state(
@@ -76,11 +178,6 @@ class ContextService:
                         focus_areas=agent_state.focus if hasattr(agent_state, "focus") else None,
                         query_complexity="medium",
                     )
-                else:
-                    # Simple context formatting
-                    ltm_context = "\n".join(
-                        [mem.get("content", "") for mem in relevant_memories[:5]]
-                    )
                 
                 logger.debug(f"Enhanced LTM context retrieved: {len(ltm_context)} chars")
                 return ltm_context
@@ -9,6 +9,7 @@ from personal_assistant.memory.conversation_manager import (
     get_conversation_id,
     should_resume_conversation,
 )
+from personal_assistant.memory.state_cache import ConversationStateCache
 from personal_assistant.memory.storage_integration import StorageIntegrationManager
 from personal_assistant.types.state import AgentState
 
@@ -18,14 +19,25 @@ logger = get_logger("conversation_service")
 class ConversationService:
     """Service for managing conversations and loading agent state."""
     
-    def __init__(self, storage_manager: StorageIntegrationManager):
+    def __init__(
+        self,
+        storage_manager: StorageIntegrationManager,
+        background_service=None,
+        state_cache: Optional[ConversationStateCache] = None,
+    ):
         """
         Initialize the conversation service.
         
         Args:
             storage_manager: Storage integration manager
+            background_service: BackgroundService whose queued, not yet saved
+                state takes precedence over the database (optional)
+            state_cache: Hot per-user state cache consulted before the
+                database (optional)
         """
         self.storage_manager = storage_manager
+        self.background_service = background_service
+        self.state_cache = state_cache
     
     async def get_conversation_context(self, user_id: int, user_input: str) -> Tuple[str, AgentState]:
         """
@@ -38,7 +50,10 @@ class ConversationService:
         Returns:
             Tuple of (conversation_id, agent_state)
         """
-        conversation_id = await get_conversation_id(user_id)
+        cached = await self.state_cache.get(user_id) if self.state_cache else None
+        conversation_id = (
+            cached.conversation_id if cached else await get_conversation_id(user_id)
+        )
         
         if conversation_id is None:
             # Create new conversation
@@ -47,6 +62,25 @@ class ConversationService:
             logger.info(f"Created new conversation: {conversation_id}")
             return conversation_id, agent_state
         
+        # A state still queued for saving is the freshest copy of the conversation
+        pending_state = (
+            self.background_service.get_pending_state(conversation_id)
+            if self.background_service
+            else None
+        )
+        if pending_state is not None:
+            pending_state.user_input = user_input
+            pending_state.reset_for_new_message(user_input)
+            logger.info(f"Resumed conversation from pending write: {conversation_id}")
+            return conversation_id, pending_state
+        
+        # The cached copy is what the last save wrote, so it can stand in for a load
+        if cached is not None and should_resume_conversation(cached.updated_at):
+            agent_state = cached.state
+            agent_state.reset_for_new_message(user_input)
+            logger.info(f"Resumed conversation from state cache: {conversation_id}")
+            return conversation_id, agent_state
+        
         # Check if we should resume existing conversation
         last_timestamp = await self.storage_manager.get_conversation_timestamp(
             user_id, conversation_id
@@ -66,6 +100,10 @@ class ConversationService:
             else:
                 agent_state.user_input = user_input
                 logger.info(f"Resumed conversation: {conversation_id}")
+                if self.state_cache:
+                    await self.state_cache.put(
+                        user_id, conversation_id, agent_state, last_timestamp
+                    )
         else:
             # Create new conversation (previous one too old)
             conversation_id = await create_new_conversation(user_id)
@@ -2,9 +2,13 @@
 ToolExecutionService handles tool calling and result processing.
 """
 
-from typing import Any, Dict, Optional, Tuple
+import asyncio
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
 
 from personal_assistant.config.logging_config import get_logger
+from personal_assistant.config.settings import settings
+from personal_assistant.monitoring.tracing import span
 from personal_assistant.tools.base import ToolRegistry
 from personal_assistant.types.messages import ToolCall
 from personal_assistant.types.state import AgentState
@@ -23,6 +27,10 @@ class ToolExecutionService:
             tools: Registry containing all available tools
         """
         self.tools = tools
+        # Caps each user's concurrent calls; an entry lives while a batch uses it
+        self._user_semaphores: "weakref.WeakValueDictionary[int, asyncio.Semaphore]" = (
+            weakref.WeakValueDictionary()
+        )
     
     async def execute_tool(self, action: ToolCall, state: AgentState, user_id: int) -> Tuple[Any, bool]:
         """
@@ -36,25 +44,27 @@ class ToolExecutionService:
         Returns:
             Tuple of (result, success_flag)
         """
-        try:
-            logger.debug(f"=== EXECUTING TOOL: {action.name} ===")
-            logger.debug(f"Tool args: {action.args}")
+        with span("tool", tool=action.name) as stage:
+            try:
+                logger.debug(f"=== EXECUTING TOOL: {action.name} ===")
+                logger.debug(f"Tool args: {action.args}")
 
-            # Automatically inject user_id into tool arguments
-            tool_args = action.args.copy()
-            tool_args['user_id'] = user_id
-            logger.debug(f"Injected user_id {user_id} into tool call")
+                # Automatically inject user_id into tool arguments
+                tool_args = action.args.copy()
+                tool_args['user_id'] = user_id
+                logger.debug(f"Injected user_id {user_id} into tool call")
 
-            # Execute tool with injected user_id
-            result = await self.tools.run_tool(action.name, **tool_args)
-            logger.debug("=== TOOL EXECUTION COMPLETED ===")
-            logger.debug(f"Tool result: {result}")
+                # Execute tool with injected user_id
+                result = await self.tools.run_tool(action.name, **tool_args)
+                logger.debug("=== TOOL EXECUTION COMPLETED ===")
+                logger.debug(f"Tool result: {result}")
 
-            return result, True
+                return result, True
 
-        except Exception as e:
-            logger.error(f"Tool execution error: {str(e)}")
-            return f"Error executing tool {action.name}: {str(e)}", False
+            except Exception as e:
+                logger.error(f"Tool execution error: {str(e)}")
+                stage.set_status("error")
+                return f"Error executing tool {action.name}: {str(e)}", False
     
     def update_state_with_result(self, state: AgentState, action: ToolCall, result: Any) -> None:
         """
@@ -98,3 +108,74 @@ class ToolExecutionService:
             self.update_state_with_result(state, action, result)
         
         return result, success
+
+    async def execute_batch(self, actions: List[ToolCall], state: AgentState, user_id: int) -> List[Tuple[Any, bool]]:
+        """
+        Execute several tool calls from one planner step.
+
+        Calls in one LLM response cannot use each other's output, but calls to
+        tools of the same category may touch the same data (e.g. create then
+        list todos), so those run one after another in the order given. Other
+        calls run concurrently, at most TOOL_MAX_PARALLEL_CALLS_PER_USER at a
+        time per user.
+
+        Args:
+            actions: Tool calls in the order the LLM requested them
+            state: Current agent state
+            user_id: User identifier to inject into tool calls
+
+        Returns:
+            List of (result, success_flag), in the same order as actions
+        """
+        semaphore = self._get_user_semaphore(user_id)
+        results: List[Optional[Tuple[Any, bool]]] = [None] * len(actions)
+
+        chains: Dict[str, List[int]] = {}
+        for index, action in enumerate(actions):
+            chains.setdefault(self._dependency_key(action), []).append(index)
+
+        async def run_chain(indices: List[int]):
+            for index in indices:
+                async with semaphore:
+                    results[index] = await self.execute_tool(actions[index], state, user_id)
+
+        logger.debug(
+            f"=== EXECUTING {len(actions)} TOOL CALLS IN {len(chains)} CONCURRENT CHAINS ==="
+        )
+        await asyncio.gather(*(run_chain(indices) for indices in chains.values()))
+        return results  # type: ignore
+
+    async def execute_batch_and_update(self, actions: List[ToolCall], state: AgentState, user_id: int) -> List[Tuple[Any, bool]]:
+        """
+        Execute a step's tool calls and record the successful results.
+
+        Results are added to the state in request order, whatever order the
+        calls finished in, and the whole batch counts as one step.
+
+        Args:
+            actions: Tool calls in the order the LLM requested them
+            state: Current agent state
+            user_id: User identifier to inject into tool calls
+
+        Returns:
+            List of (result, success_flag), in the same order as actions
+        """
+        results = await self.execute_batch(actions, state, user_id)
+
+        state.add_tool_results(
+            [(action, result) for action, (result, success) in zip(actions, results) if success]
+        )
+        return results
+
+    def _dependency_key(self, action: ToolCall) -> str:
+        """Calls sharing a key may depend on each other and run sequentially."""
+        tool = self.tools.tools.get(action.name)
+        # Uncategorized tools share one key so they never race each other
+        return (tool.category if tool is not None else None) or "uncategorized"
+
+    def _get_user_semaphore(self, user_id: int) -> asyncio.Semaphore:
+        semaphore = self._user_semaphores.get(user_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, settings.TOOL_MAX_PARALLEL_CALLS_PER_USER))
+            self._user_semaphores[user_id] = semaphore
+        return semaphore
@@ -0,0 +1,37 @@
+-- Migration: 008_add_rag_vector_index
+-- Description: pgvector-backed ANN index for RAG document retrieval
+-- Dependencies: 000_complete_schema_migration
+-- Rollback: Available
+
+-- Requires the pgvector extension (>= 0.7 for halfvec HNSW indexes).
+-- When it is not installed the application falls back to the in-process
+-- NumPy index (RAG_VECTOR_INDEX_BACKEND=auto).
+CREATE EXTENSION IF NOT EXISTS vector;
+
+-- One row per embedded RAG document, scoped by owning user
+CREATE TABLE IF NOT EXISTS rag_document_embeddings (
+    message_id INTEGER PRIMARY KEY REFERENCES conversation_messages(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    embedding vector(3072) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE rag_document_embeddings IS 'Vector index for RAG documents stored in conversation_messages';
+
+CREATE INDEX IF NOT EXISTS idx_rag_document_embeddings_user_id
+    ON rag_document_embeddings(user_id);
+
+-- vector HNSW indexes are limited to 2000 dimensions, so index the halfvec cast
+CREATE INDEX IF NOT EXISTS idx_rag_document_embeddings_hnsw
+    ON rag_document_embeddings
+    USING hnsw ((embedding::halfvec(3072)) halfvec_cosine_ops);
+
+-- Backfill from embeddings already stored in conversation_messages.additional_data
+INSERT INTO rag_document_embeddings (message_id, user_id, embedding)
+SELECT m.id, s.user_id, (m.additional_data->>'embedding')::vector(3072)
+FROM conversation_messages m
+JOIN conversation_states s ON s.conversation_id = m.conversation_id
+WHERE m.message_type = 'rag_document'
+  AND json_typeof(m.additional_data->'embedding') = 'array'
+  AND json_array_length(m.additional_data->'embedding') = 3072
+ON CONFLICT (message_id) DO NOTHING;
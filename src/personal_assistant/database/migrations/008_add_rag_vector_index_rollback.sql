@@ -0,0 +1,7 @@
+-- Rollback Migration: 008_add_rag_vector_index
+-- Description: Drop the pgvector-backed RAG index (embeddings remain in conversation_messages)
+-- Dependencies: 008_add_rag_vector_index
+
+DROP INDEX IF EXISTS idx_rag_document_embeddings_hnsw;
+DROP INDEX IF EXISTS idx_rag_document_embeddings_user_id;
+DROP TABLE IF EXISTS rag_document_embeddings;
@@ -0,0 +1,15 @@
+-- Migration: 009_add_state_content_hash
+-- Description: Row fingerprints for incremental conversation state saves
+-- Dependencies: 000_complete_schema_migration
+-- Rollback: Available
+
+-- Existing rows keep a NULL hash; the first incremental save of each
+-- conversation rewrites them once, after which only changed rows are written.
+ALTER TABLE conversation_messages
+    ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+ALTER TABLE memory_context_items
+    ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+COMMENT ON COLUMN conversation_messages.content_hash IS 'SHA-256 of the persisted message fields, used by incremental state saves';
+COMMENT ON COLUMN memory_context_items.content_hash IS 'SHA-256 of the persisted context fields, used by incremental state saves';
@@ -0,0 +1,6 @@
+-- Rollback Migration: 009_add_state_content_hash
+-- Description: Drop row fingerprints used by incremental state saves
+-- Dependencies: 009_add_state_content_hash
+
+ALTER TABLE memory_context_items DROP COLUMN IF EXISTS content_hash;
+ALTER TABLE conversation_messages DROP COLUMN IF EXISTS content_hash;
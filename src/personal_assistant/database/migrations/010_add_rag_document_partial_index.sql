@@ -0,0 +1,11 @@
+-- Migration: 010_add_rag_document_partial_index
+-- Description: Partial index for keyset scans over RAG documents
+-- Dependencies: 000_complete_schema_migration
+-- Rollback: Available
+
+-- The embedding backfill pages through rag_document rows with
+-- "id > :last_id ORDER BY id LIMIT :page_size"; this index keeps each page an
+-- index range scan instead of a sequential scan of conversation_messages.
+CREATE INDEX IF NOT EXISTS idx_conversation_messages_rag_document_id
+    ON conversation_messages (id)
+    WHERE message_type = 'rag_document';
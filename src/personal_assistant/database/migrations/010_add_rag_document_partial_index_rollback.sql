@@ -0,0 +1,5 @@
+-- Rollback Migration: 010_add_rag_document_partial_index
+-- Description: Drop the partial index used by the embedding backfill
+-- Dependencies: 010_add_rag_document_partial_index
+
+DROP INDEX IF EXISTS idx_conversation_messages_rag_document_id;
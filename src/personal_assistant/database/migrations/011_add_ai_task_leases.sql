@@ -0,0 +1,23 @@
+-- Migration: 011_add_ai_task_leases
+-- Description: Lease columns for claiming due AI tasks with SKIP LOCKED
+-- Dependencies: 000_complete_schema_migration
+-- Rollback: Available
+
+-- A dispatcher claims due tasks with SELECT ... FOR UPDATE SKIP LOCKED and
+-- marks them 'processing' with a lease. Tasks whose lease expired (the
+-- worker died) become claimable again.
+ALTER TABLE ai_tasks
+    ADD COLUMN IF NOT EXISTS locked_by VARCHAR(255),
+    ADD COLUMN IF NOT EXISTS locked_until TIMESTAMP WITHOUT TIME ZONE;
+
+COMMENT ON COLUMN ai_tasks.locked_by IS 'Dispatcher run that holds the lease on a processing task';
+COMMENT ON COLUMN ai_tasks.locked_until IS 'When the lease on a processing task expires';
+
+-- The claim query reads active tasks by due time and processing tasks by lease
+CREATE INDEX IF NOT EXISTS idx_ai_tasks_due_active
+    ON ai_tasks (next_run_at)
+    WHERE status = 'active';
+
+CREATE INDEX IF NOT EXISTS idx_ai_tasks_lease_processing
+    ON ai_tasks (locked_until)
+    WHERE status = 'processing';
@@ -0,0 +1,8 @@
+-- Rollback Migration: 011_add_ai_task_leases
+-- Description: Drop AI task lease columns and claim indexes
+-- Dependencies: 011_add_ai_task_leases
+
+DROP INDEX IF EXISTS idx_ai_tasks_lease_processing;
+DROP INDEX IF EXISTS idx_ai_tasks_due_active;
+ALTER TABLE ai_tasks DROP COLUMN IF EXISTS locked_until;
+ALTER TABLE ai_tasks DROP COLUMN IF EXISTS locked_by;
@@ -0,0 +1,67 @@
+-- Migration: 012_add_sms_usage_rollups
+-- Description: Hourly and daily SMS usage rollups for the SMS analytics
+-- Dependencies: 000_complete_schema_migration
+-- Rollback: Available
+
+-- SMS analytics read pre-aggregated buckets instead of scanning
+-- sms_usage_logs. A Celery job rebuilds the recent hours every few minutes;
+-- sms_usage_rollup_state records how far the rollups are complete, and
+-- queries read raw logs only for the part of a window after that point.
+CREATE TABLE IF NOT EXISTS sms_usage_hourly_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    bucket_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    user_id INTEGER,
+    message_direction VARCHAR(10) NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    length_count INTEGER NOT NULL DEFAULT 0,
+    total_message_length BIGINT NOT NULL DEFAULT 0,
+    short_message_count INTEGER NOT NULL DEFAULT 0,
+    medium_message_count INTEGER NOT NULL DEFAULT 0,
+    long_message_count INTEGER NOT NULL DEFAULT 0,
+    processing_count INTEGER NOT NULL DEFAULT 0,
+    processing_total_ms BIGINT NOT NULL DEFAULT 0,
+    processing_min_ms INTEGER,
+    processing_max_ms INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS sms_usage_daily_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    bucket_start TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    user_id INTEGER,
+    message_direction VARCHAR(10) NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    success_count INTEGER NOT NULL DEFAULT 0,
+    length_count INTEGER NOT NULL DEFAULT 0,
+    total_message_length BIGINT NOT NULL DEFAULT 0,
+    short_message_count INTEGER NOT NULL DEFAULT 0,
+    medium_message_count INTEGER NOT NULL DEFAULT 0,
+    long_message_count INTEGER NOT NULL DEFAULT 0,
+    processing_count INTEGER NOT NULL DEFAULT 0,
+    processing_total_ms BIGINT NOT NULL DEFAULT 0,
+    processing_min_ms INTEGER,
+    processing_max_ms INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS sms_usage_rollup_state (
+    name VARCHAR(50) PRIMARY KEY,
+    refreshed_through TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+    updated_at TIMESTAMP WITHOUT TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE sms_usage_hourly_rollups IS 'SMS usage per hour, user and direction';
+COMMENT ON TABLE sms_usage_daily_rollups IS 'SMS usage per day, user and direction (built from the hourly rollups)';
+COMMENT ON COLUMN sms_usage_rollup_state.refreshed_through IS 'Rollups cover every log created before this time';
+
+CREATE INDEX IF NOT EXISTS idx_sms_usage_hourly_rollups_bucket
+    ON sms_usage_hourly_rollups (bucket_start);
+CREATE INDEX IF NOT EXISTS idx_sms_usage_hourly_rollups_user_bucket
+    ON sms_usage_hourly_rollups (user_id, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_sms_usage_daily_rollups_bucket
+    ON sms_usage_daily_rollups (bucket_start);
+CREATE INDEX IF NOT EXISTS idx_sms_usage_daily_rollups_user_bucket
+    ON sms_usage_daily_rollups (user_id, bucket_start);
+
+-- Per-user reads of the raw tail and error breakdowns
+CREATE INDEX IF NOT EXISTS idx_sms_usage_logs_user_created
+    ON sms_usage_logs (user_id, created_at);
@@ -0,0 +1,8 @@
+-- Rollback Migration: 012_add_sms_usage_rollups
+-- Description: Drop the SMS usage rollup tables
+-- Dependencies: 012_add_sms_usage_rollups
+
+DROP INDEX IF EXISTS idx_sms_usage_logs_user_created;
+DROP TABLE IF EXISTS sms_usage_rollup_state;
+DROP TABLE IF EXISTS sms_usage_daily_rollups;
+DROP TABLE IF EXISTS sms_usage_hourly_rollups;
@@ -0,0 +1,30 @@
+-- Migration: 013_add_sms_usage_international
+-- Description: Classify SMS usage logs as international at write time
+-- Dependencies: 012_add_sms_usage_rollups
+-- Rollback: Available
+
+-- Pricing needs to know whether a message went to an international number.
+-- The router now stores that on each log, and the rollups count it, so costs
+-- come from aggregates instead of parsing every phone number per request.
+ALTER TABLE sms_usage_logs
+    ADD COLUMN IF NOT EXISTS is_international BOOLEAN NOT NULL DEFAULT FALSE;
+
+COMMENT ON COLUMN sms_usage_logs.is_international IS 'Phone number is outside the US/Canada (international SMS rate)';
+
+-- Same rule as phone_validator.is_international_number: more than 10 digits,
+-- unless it is an 11-digit number with the North American country code
+UPDATE sms_usage_logs
+SET is_international = TRUE
+WHERE length(regexp_replace(phone_number, '\D', '', 'g')) > 10
+  AND NOT (
+      regexp_replace(phone_number, '\D', '', 'g') LIKE '1%'
+      AND length(regexp_replace(phone_number, '\D', '', 'g')) = 11
+  );
+
+ALTER TABLE sms_usage_hourly_rollups
+    ADD COLUMN IF NOT EXISTS international_count INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sms_usage_daily_rollups
+    ADD COLUMN IF NOT EXISTS international_count INTEGER NOT NULL DEFAULT 0;
+
+-- Existing rollups have no international counts; the next refresh rebuilds them
+DELETE FROM sms_usage_rollup_state WHERE name = 'sms_usage';
@@ -0,0 +1,7 @@
+-- Rollback Migration: 013_add_sms_usage_international
+-- Description: Drop the international classification of SMS usage
+-- Dependencies: 013_add_sms_usage_international
+
+ALTER TABLE sms_usage_daily_rollups DROP COLUMN IF EXISTS international_count;
+ALTER TABLE sms_usage_hourly_rollups DROP COLUMN IF EXISTS international_count;
+ALTER TABLE sms_usage_logs DROP COLUMN IF EXISTS is_international;
@@ -0,0 +1,25 @@
+-- Migration: 014_add_message_position
+-- Description: Explicit message order for incremental conversation state saves
+-- Dependencies: 009_add_state_content_hash
+-- Rollback: Available
+
+-- Incremental saves replace an edited message with a new row; ordering by
+-- timestamp would move it to the end of the conversation. Positions are
+-- spaced by 1024 so a replacement can keep its place between its neighbours.
+ALTER TABLE conversation_messages
+    ADD COLUMN IF NOT EXISTS position BIGINT;
+
+UPDATE conversation_messages AS m
+SET position = ordered.rn * 1024
+FROM (
+    SELECT id,
+           row_number() OVER (PARTITION BY conversation_id ORDER BY timestamp, id) AS rn
+    FROM conversation_messages
+) AS ordered
+WHERE m.id = ordered.id
+  AND m.position IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_message_position
+    ON conversation_messages (conversation_id, position);
+
+COMMENT ON COLUMN conversation_messages.position IS 'Order of the message within its conversation, spaced to leave room for edits';
@@ -0,0 +1,6 @@
+-- Rollback Migration: 014_add_message_position
+-- Description: Drop explicit message order used by incremental state saves
+-- Dependencies: 014_add_message_position
+
+DROP INDEX IF EXISTS idx_message_position;
+ALTER TABLE conversation_messages DROP COLUMN IF EXISTS position;
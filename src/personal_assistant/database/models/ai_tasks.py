@@ -37,6 +37,11 @@ class AITask(Base):
     # 'active', 'paused', 'completed', 'failed'
     status = Column(String(20), default="active")
 
+    # Dispatcher lease: the worker running a 'processing' task and when its
+    # claim expires; an expired lease makes the task claimable again
+    locked_by = Column(String(255))
+    locked_until = Column(DateTime)
+
     # AI processing
     ai_context = Column(Text)  # context for AI processing
     # ['sms', 'email', 'in_app']
@@ -62,6 +67,10 @@ class AITask(Base):
             "next_run_at": self.next_run_at.isoformat() if self.next_run_at else None,
             "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
             "status": self.status,
+            "locked_by": self.locked_by,
+            "locked_until": self.locked_until.isoformat()
+            if self.locked_until
+            else None,
             "ai_context": self.ai_context,
             "notification_channels": self.notification_channels or [],
             "created_at": self.created_at.isoformat() if self.created_at else None,
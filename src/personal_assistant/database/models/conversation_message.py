@@ -8,7 +8,17 @@ enabling efficient querying and analysis of conversation flow.
 
 from typing import Optional
 
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -42,6 +52,10 @@ class ConversationMessage(Base):
     tool_success = Column(String(10), index=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     additional_data = Column(JSON)  # Additional message data as JSON
+    # Fingerprint of the persisted fields, lets incremental saves skip unchanged rows
+    content_hash = Column(String(64))
+    # Order within the conversation; spaced out so edited rows keep their place
+    position = Column(BigInteger)
 
     # Relationship to conversation state
     conversation_state = relationship("ConversationState", back_populates="messages")
@@ -50,6 +64,7 @@ class ConversationMessage(Base):
     __table_args__ = (
         Index("idx_message_conversation_role", "conversation_id", "role"),
         Index("idx_message_timestamp", "conversation_id", "timestamp"),
+        Index("idx_message_position", "conversation_id", "position"),
         Index("idx_message_type", "message_type"),
         Index("idx_message_tool", "tool_name", "tool_success"),
     )
@@ -69,6 +84,8 @@ class ConversationMessage(Base):
             "tool_success": self.tool_success,
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
             "additional_data": self.additional_data,
+            "content_hash": self.content_hash,
+            "position": self.position,
         }
 
     @classmethod
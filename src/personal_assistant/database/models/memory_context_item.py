@@ -54,6 +54,8 @@ class MemoryContextItem(Base):
     preference_type = Column(String(100), index=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
     additional_data = Column(JSON)  # Additional data as JSON
+    # Fingerprint of the persisted fields, lets incremental saves skip unchanged rows
+    content_hash = Column(String(64))
 
     # Relationship to conversation state
     conversation_state = relationship(
@@ -86,6 +88,7 @@ class MemoryContextItem(Base):
             "preference_type": self.preference_type,
             "timestamp": self.timestamp.isoformat() if self.timestamp else None,
             "additional_data": self.additional_data,
+            "content_hash": self.content_hash,
         }
 
     @classmethod
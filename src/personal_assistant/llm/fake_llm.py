@@ -0,0 +1,75 @@
+"""
+Local stand-in LLM for tests and benchmarks.
+
+📁 llm/fake_llm.py
+Returns scripted responses after a configurable delay, with no network access.
+"""
+
+import itertools
+import threading
+import time
+from typing import Iterable, Optional
+
+from ..config.logging_config import get_logger
+from .llm_client import LLMClient
+
+# Configure module logger
+logger = get_logger("llm")
+
+
+class FakeLLM(LLMClient):
+    """
+    Offline LLM client with configurable latency.
+
+    complete() sleeps synchronously, the same way the real SDK blocks on a
+    network round trip, so it can be used to measure how much concurrency the
+    async path (acomplete) gains over calling the model on the event loop.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        responses: Optional[Iterable[dict]] = None,
+        default_response: Optional[dict] = None,
+    ):
+        """
+        Initialize the fake LLM.
+
+        Args:
+            latency (float): Seconds each completion takes
+            responses (Iterable[dict]): Responses to return in order, cycling when
+                exhausted (e.g. {'content': ...} or {'function_call': {...}})
+            default_response (dict): Response used when no script is given
+        """
+        super().__init__(model=None)
+        self.model_name = "fake"
+        self.latency = latency
+        self.default_response = default_response or {"content": "OK"}
+        self._responses = itertools.cycle(list(responses)) if responses else None
+        self._lock = threading.Lock()
+        self.call_count = 0
+        self.prompts: list = []
+
+    def complete(self, prompt: str, functions: list) -> dict:
+        """
+        Return the next scripted response after sleeping for ``latency`` seconds.
+
+        Args:
+            prompt (str): The prompt (recorded for inspection)
+            functions (list): Available function schemas (ignored)
+
+        Returns:
+            dict: The scripted response
+        """
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        with self._lock:
+            self.call_count += 1
+            self.prompts.append(prompt)
+            response = (
+                next(self._responses) if self._responses else self.default_response
+            )
+
+        logger.debug(f"FakeLLM returning response #{self.call_count}")
+        return dict(response)
@@ -1,11 +1,11 @@
-from typing import Union
+from typing import Optional, Tuple, Union
 
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
 
 from ..config.logging_config import get_logger
-from ..types.messages import FinalAnswer, ToolCall
+from ..types.messages import FinalAnswer, ToolCall, ToolCallBatch
 from ..utils.text_cleaner import clean_text_for_logging
 from .llm_client import LLMClient
 
@@ -37,6 +37,10 @@ class GeminiLLM(LLMClient):
         """
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel(model)
+        self.model_name = model
+        # Last function list and its Gemini declarations; reused while the
+        # tool registry hands out the same schema dicts
+        self._declarations_cache: Optional[Tuple[list, list]] = None
         # Note: Embeddings are now handled by creating a client in embed_text()
         print(f"Initialized GeminiLLM with model: {model}")
 
@@ -54,7 +58,9 @@ class GeminiLLM(LLMClient):
 
         Returns:
             dict: Either {'content': str} for text responses or
-                 {'function_call': {'name': str, 'arguments': dict}} for function calls
+                 {'function_call': {'name': str, 'arguments': dict}} for function calls.
+                 When several calls are requested, 'function_calls' lists all of
+                 them in order and 'function_call' is the first.
 
         Raises:
             Exception: If there's an error during the API call or response processing
@@ -68,26 +74,7 @@ class GeminiLLM(LLMClient):
             )
 
             # Convert functions to Gemini's function calling format
-            tools = None
-            if functions:
-                # Convert list of functions to list of tool objects
-                tools = []
-                for func_def in functions:
-                    tool = {
-                        "name": func_def["name"],
-                        "description": func_def.get("description", ""),
-                        "parameters": {
-                            "type": "OBJECT",
-                            "properties": func_def.get("parameters", {}).get(
-                                "properties", {}
-                            ),
-                            "required": func_def.get("parameters", {}).get(
-                                "required", []
-                            ),
-                        },
-                    }
-                    tools.append(tool)
-                print(f"Converted {len(tools)} functions to Gemini tool format")
+            tools = self._get_tool_declarations(functions)
 
             # Make the API call with tools as a direct parameter
             logger.debug("Calling Gemini API...")
@@ -105,14 +92,11 @@ class GeminiLLM(LLMClient):
             clean_content = clean_text_for_logging(str(content))
             print(f"Extracted candidate content: {clean_content}")
 
-            # Check all parts for function calls
-            function_call_found = False
+            # Collect every function call part; Gemini may request several
+            # independent calls in one response
+            function_calls = []
             for part in content.parts:
                 if hasattr(part, "function_call") and part.function_call is not None:
-                    if not function_call_found:
-                        logger.debug("Function call detected in response")
-                        function_call_found = True
-
                     function_call = part.function_call
                     name = getattr(function_call, "name", None)
 
@@ -138,7 +122,16 @@ class GeminiLLM(LLMClient):
                                     )
                                     args = {}
 
-                        return {"function_call": {"name": name, "arguments": args}}
+                        function_calls.append({"name": name, "arguments": args})
+
+            if function_calls:
+                logger.debug(
+                    f"{len(function_calls)} function call(s) detected in response"
+                )
+                response_dict = {"function_call": function_calls[0]}
+                if len(function_calls) > 1:
+                    response_dict["function_calls"] = function_calls
+                return response_dict
 
             # If no function call found in any part, return text content
             return {"content": content.parts[0].text if content.parts else ""}
@@ -156,20 +149,67 @@ class GeminiLLM(LLMClient):
                 logger.debug("Response is None or not available.")
             raise
 
+    def _get_tool_declarations(self, functions: list) -> Optional[list]:
+        """
+        Convert function definitions to Gemini function declarations.
+
+        The conversion is reused when called again with the same schema
+        objects, which ToolRegistry.get_schema() returns until a tool is
+        registered.
+
+        Args:
+            functions (list): Function definitions with 'name', 'description'
+                and 'parameters'
+
+        Returns:
+            Optional[list]: Gemini function declarations, or None if no functions
+        """
+        if not functions:
+            return None
+
+        cached = self._declarations_cache
+        if (
+            cached is not None
+            and len(cached[0]) == len(functions)
+            and all(a is b for a, b in zip(cached[0], functions))
+        ):
+            return cached[1]
+
+        # Convert list of functions to list of tool objects
+        tools = []
+        for func_def in functions:
+            tool = {
+                "name": func_def["name"],
+                "description": func_def.get("description", ""),
+                "parameters": {
+                    "type": "OBJECT",
+                    "properties": func_def.get("parameters", {}).get("properties", {}),
+                    "required": func_def.get("parameters", {}).get("required", []),
+                },
+            }
+            tools.append(tool)
+        logger.debug(f"Converted {len(tools)} functions to Gemini tool format")
+
+        self._declarations_cache = (list(functions), tools)
+        return tools
+
     # ------------------------
     # Response Processing
     # ------------------------
-    def parse_response(self, response: dict) -> Union[ToolCall, FinalAnswer]:
+    def parse_response(
+        self, response: dict
+    ) -> Union[ToolCall, ToolCallBatch, FinalAnswer]:
         """
-        Parse the completion response into either a ToolCall or FinalAnswer.
+        Parse the completion response into a ToolCall, ToolCallBatch or FinalAnswer.
 
         Args:
             response (dict): The response from complete() method, containing either
                            text content or function call details
 
         Returns:
-            Union[ToolCall, FinalAnswer]:
+            Union[ToolCall, ToolCallBatch, FinalAnswer]:
                 - ToolCall if the response contains a function call
+                - ToolCallBatch if the response contains several function calls
                 - FinalAnswer if the response contains text content
         """
         # Clean response before logging
@@ -178,6 +218,14 @@ class GeminiLLM(LLMClient):
         if "error" in response:
             return FinalAnswer(output=f"Error: {response['error']}")
 
+        if len(response.get("function_calls") or []) > 1:
+            return ToolCallBatch(
+                calls=[
+                    ToolCall(name=call["name"], args=call["arguments"])
+                    for call in response["function_calls"]
+                ]
+            )
+
         if "function_call" in response:
             return ToolCall(
                 name=response["function_call"]["name"],
@@ -200,28 +248,41 @@ class GeminiLLM(LLMClient):
                         Returns empty list if embedding fails.
         """
         try:
-            print(f"Creating embedding for text of length: {len(text)}")
-            # Use the correct Gemini embeddings API for version 0.8.4
-            # In this version, embed_content is a module-level function
-            import google.generativeai as genai
-
-            # Use the module-level embed_content function
-            result = genai.embed_content(
-                model="models/gemini-embedding-001", content=text
-            )
-
-            # Debug: print the result structure
-            print(f"API Response type: {type(result)}")
-            print(f"API Response dir: {dir(result)}")
-
-            # The API returns a dictionary with 'embedding' key
-            if isinstance(result, dict) and "embedding" in result:
-                embedding = result["embedding"]
-                print(f"Embedding created with length: {len(embedding)}")
-                return embedding
-            # This should not happen if API call succeeds
-            raise ValueError("No embedding returned from API")
+            logger.debug(f"Creating embedding for text of length: {len(text)}")
+            return self.embed_batch([text])[0]
 
         except Exception as e:
-            print(f"Error creating embedding: {str(e)}")
+            logger.error(f"Error creating embedding: {str(e)}")
             return []
+
+    def embed_batch(
+        self, texts: list[str], model: str = "models/gemini-embedding-001"
+    ) -> list[list[float]]:
+        """
+        Create embeddings for several texts in one API request.
+
+        Args:
+            texts (list[str]): Texts to embed (at most 100 per request)
+            model (str): Embedding model name
+
+        Returns:
+            list[list[float]]: One embedding per text, in order
+
+        Raises:
+            ValueError: If the API does not return one embedding per text
+        """
+        # Use the correct Gemini embeddings API for version 0.8.4
+        # In this version, embed_content is a module-level function
+        import google.generativeai as genai
+
+        # A list of texts is sent as a single batchEmbedContents request
+        result = genai.embed_content(model=model, content=list(texts))
+
+        embeddings = result.get("embedding") if isinstance(result, dict) else None
+        if not embeddings or len(embeddings) != len(texts):
+            raise ValueError(
+                f"Expected {len(texts)} embeddings from API, got "
+                f"{len(embeddings) if embeddings else 0}"
+            )
+        logger.debug(f"Created {len(embeddings)} embeddings in one request")
+        return embeddings
@@ -1,12 +1,40 @@
 # agent_core/llm/llm_client.py
 
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
 from ..config.logging_config import get_logger
-from ..types.messages import FinalAnswer, ToolCall
+from ..config.settings import settings
+from ..types.messages import FinalAnswer, ToolCall, ToolCallBatch
 from ..utils.text_cleaner import clean_text_for_logging
 
 # Configure module logger
 logger = get_logger("llm")
 
+# Shared pool for blocking LLM SDK calls so they never run on the event loop
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def get_llm_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool used for async LLM completions.
+
+    The pool size (LLM_MAX_CONCURRENCY) caps how many LLM calls are in
+    flight at once; further calls queue until a worker frees up.
+    """
+    global _llm_executor
+    with _llm_executor_lock:
+        if _llm_executor is None:
+            _llm_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.LLM_MAX_CONCURRENCY),
+                thread_name_prefix="llm",
+            )
+    return _llm_executor
+
 
 class LLMClient:
     """
@@ -14,6 +42,9 @@ class LLMClient:
     Handles prompt completion and response parsing with support for function calling.
     """
 
+    # Model label for metrics and traces; subclasses set the configured model
+    model_name: str = "unknown"
+
     # ------------------------
     # Initialization
     # ------------------------
@@ -71,6 +102,25 @@ class LLMClient:
                 "content": "I encountered an error processing your request.",
             }
 
+    async def acomplete(self, prompt: str, functions: list) -> dict:
+        """
+        Async variant of complete() that keeps the event loop free.
+
+        The blocking complete() call runs on the shared, bounded LLM executor,
+        so concurrent requests overlap instead of serializing on the loop.
+
+        Args:
+            prompt (str): The constructed prompt including user message and context
+            functions (list): List of available tools with their function schemas
+
+        Returns:
+            dict: Raw response from the LLM (could be function call or final response)
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_llm_executor(), functools.partial(self.complete, prompt, functions)
+        )
+
     # ------------------------
     # Response Processing
     # ------------------------
@@ -95,18 +145,29 @@ class LLMClient:
 
     def parse_response(self, response: dict):
         """
-        Parses the LLM's raw output and returns a ToolCall or FinalAnswer.
+        Parses the LLM's raw output and returns a ToolCall, ToolCallBatch or FinalAnswer.
 
         Args:
             response (dict): Raw response from the LLM
 
         Returns:
-            ToolCall or FinalAnswer: Parsed result from model output
+            ToolCall, ToolCallBatch or FinalAnswer: Parsed result from model output
         """
         # Clean response before logging
         clean_response = clean_text_for_logging(str(response))
         logger.debug(f"=== PARSING RESPONSE: {clean_response} ===")
 
+        # Several independent calls requested in one step
+        function_calls = response.get("function_calls") or []
+        if len(function_calls) > 1:
+            logger.debug(f"=== {len(function_calls)} FUNCTION CALLS DETECTED ===")
+            return ToolCallBatch(
+                calls=[
+                    ToolCall(name=call["name"], args=call["arguments"])
+                    for call in function_calls
+                ]
+            )
+
         # Check if response contains a function call
         if "function_call" in response:
             function_call = response["function_call"]
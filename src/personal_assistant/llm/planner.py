@@ -5,13 +5,14 @@ LLM-based planning and tool selection logic.
 LLM planner step. Decides whether to respond, call a tool, or reflect.
 """
 
-from typing import Any, Union
+from typing import Any, List, Tuple, Union
 
 from ..config.logging_config import get_logger
+from ..monitoring.tracing import span
 
 # from ..prompts.prompt_builder import PromptBuilder  # No longer needed - using custom prompt builders
 from ..tools.base import ToolRegistry
-from ..types.messages import FinalAnswer, ToolCall
+from ..types.messages import FinalAnswer, ToolCall, ToolCallBatch
 from ..types.state import AgentState
 from ..utils.text_cleaner import clean_text_for_logging
 from .llm_client import LLMClient
@@ -61,15 +62,59 @@ class LLMPlanner:
     # ------------------------
     # Core Planning Logic
     # ------------------------
-    def choose_action(self, state: "AgentState") -> Union[ToolCall, FinalAnswer]:
+    def choose_action(
+        self, state: "AgentState"
+    ) -> Union[ToolCall, ToolCallBatch, FinalAnswer]:
         """
         Choose next action based on current agent state.
 
+        Blocks on the LLM call; async callers should use achoose_action().
+
         Args:
             state (AgentState): Current state of the agent including conversation history
 
         Returns:
-            Union[ToolCall, FinalAnswer]: Either a tool call action or final response
+            Union[ToolCall, ToolCallBatch, FinalAnswer]: One or more tool calls, or the final response
+        """
+        with span("prompt_build"):
+            prompt, functions = self._build_action_request(state)
+
+        logger.info("=== REQUESTING COMPLETION FROM LLM ===")
+        with span("llm", model=self.llm_client.model_name):
+            response = self.llm_client.complete(prompt, functions)
+
+        return self._parse_action(response)
+
+    async def achoose_action(
+        self, state: "AgentState"
+    ) -> Union[ToolCall, ToolCallBatch, FinalAnswer]:
+        """
+        Async variant of choose_action() that does not block the event loop.
+
+        Args:
+            state (AgentState): Current state of the agent including conversation history
+
+        Returns:
+            Union[ToolCall, ToolCallBatch, FinalAnswer]: One or more tool calls, or the final response
+        """
+        with span("prompt_build"):
+            prompt, functions = self._build_action_request(state)
+
+        logger.info("=== REQUESTING ASYNC COMPLETION FROM LLM ===")
+        with span("llm", model=self.llm_client.model_name):
+            response = await self.llm_client.acomplete(prompt, functions)
+
+        return self._parse_action(response)
+
+    def _build_action_request(self, state: "AgentState") -> Tuple[str, List[dict]]:
+        """
+        Build the prompt and tool schemas for an action-selection call.
+
+        Args:
+            state (AgentState): Current state of the agent
+
+        Returns:
+            Tuple[str, List[dict]]: The prompt and the list of function schemas
         """
         logger.info("Starting action selection process")
 
@@ -103,10 +148,20 @@ class LLMPlanner:
         functions = self.tool_registry.get_schema()
         logger.debug(f"Available tools: {list(functions.keys())}")
 
-        # Get LLM response
-        logger.info("=== REQUESTING COMPLETION FROM LLM ===")
-        response = self.llm_client.complete(prompt, list(functions.values()))
+        return prompt, list(functions.values())
+
+    def _parse_action(
+        self, response: dict
+    ) -> Union[ToolCall, ToolCallBatch, FinalAnswer]:
+        """
+        Parse a raw LLM response into the next action.
+
+        Args:
+            response (dict): Raw response from the LLM client
 
+        Returns:
+            Union[ToolCall, ToolCallBatch, FinalAnswer]: One or more tool calls, or the final response
+        """
         # Clean response before logging
         clean_response = clean_text_for_logging(str(response))
         logger.debug(f"=== RECEIVED LLM RESPONSE: {clean_response} ===")
@@ -120,6 +175,10 @@ class LLMPlanner:
         if isinstance(action, ToolCall):
             logger.info(f"Selected action: ToolCall - {action.name}")
             logger.debug(f"ToolCall arguments: {action.args}")
+        elif isinstance(action, ToolCallBatch):
+            logger.info(
+                f"Selected action: ToolCallBatch - {[call.name for call in action.calls]}"
+            )
         else:
             logger.info("Selected action: FinalAnswer")
             # Clean content before logging
@@ -135,20 +194,47 @@ class LLMPlanner:
         """
         Forces the agent to finish after hitting loop limit.
 
+        Blocks on the LLM call; async callers should use aforce_finish().
+
         Args:
             state (AgentState): Current state of the agent
 
         Returns:
             str: Final response message
         """
+        with span("prompt_build"):
+            prompt = self._build_force_finish_prompt(state)
+        with span("llm", model=self.llm_client.model_name):
+            response = self.llm_client.complete(prompt, [])
+        return self._format_force_finish(response)
+
+    async def aforce_finish(self, state: "AgentState") -> str:
+        """
+        Async variant of force_finish() that does not block the event loop.
+
+        Args:
+            state (AgentState): Current state of the agent
+
+        Returns:
+            str: Final response message
+        """
+        with span("prompt_build"):
+            prompt = self._build_force_finish_prompt(state)
+        with span("llm", model=self.llm_client.model_name):
+            response = await self.llm_client.acomplete(prompt, [])
+        return self._format_force_finish(response)
+
+    def _build_force_finish_prompt(self, state: "AgentState") -> str:
+        """Build the prompt used to wrap up a conversation at the loop limit."""
         logger.warning("Forcing conversation to finish due to loop limit")
 
         # Pass the AgentState object directly to the prompt builder
         prompt = self.prompt_builder.build(state)
         logger.debug("Generated force finish prompt")
+        return prompt
 
-        response = self.llm_client.complete(prompt, [])
-
+    def _format_force_finish(self, response: dict) -> str:
+        """Turn the force-finish LLM response into the final user message."""
         # Clean response before logging
         clean_response = clean_text_for_logging(str(response))
         logger.debug(f"Received force finish response: {clean_response}")
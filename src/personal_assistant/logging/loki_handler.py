@@ -3,39 +3,342 @@ Loki logging handler for centralized log aggregation.
 
 📁 logging/loki_handler.py
 Provides Loki integration for shipping structured logs to centralized log storage.
+
+Logging never waits on Loki: LokiQueueHandler formats the record and appends
+it to a bounded in-memory buffer, and a background LokiShipper thread pushes
+the buffer to Loki in gzip-compressed batches (by size or after
+LOKI_FLUSH_INTERVAL_SECONDS). Once LOKI_MAX_BUFFERED_RECORDS are waiting, the
+oldest records are dropped and counted. Failed pushes are retried with
+exponential backoff, and buffered records are flushed at shutdown.
 """
 
+import atexit
+import gzip
+import json
 import logging
+import logging.handlers
 import os
-from typing import Dict, Optional
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
 
-try:
-    from python_logging_loki import LokiHandler
+from ..config.settings import settings
+from .structured_formatter import StructuredJSONFormatter
 
-    LOKI_AVAILABLE = True
-except ImportError:
-    LOKI_AVAILABLE = False
-    LokiHandler = None
+# (stream labels, timestamp in nanoseconds, log line)
+LokiEntry = Tuple[Tuple[Tuple[str, str], ...], str, str]
 
-from ..config.settings import settings
+
+class LokiBuffer:
+    """
+    Bounded buffer between LokiQueueHandler and LokiShipper.
+
+    Implements the ``put_nowait`` QueueHandler enqueues with. When full, the
+    oldest entry is dropped to make room.
+
+    Args:
+        max_records: Most entries held at once
+        batch_size: Entries per batch handed to the shipper
+    """
+
+    def __init__(self, max_records: int, batch_size: int):
+        self.max_records = max_records
+        self.batch_size = batch_size
+        self.enqueued = 0
+        self.dropped = 0
+        self._entries: Deque[LokiEntry] = deque()
+        self._ready = threading.Condition()
+        self._closed = False
+
+    def put_nowait(self, entry: LokiEntry) -> None:
+        """Add an entry without blocking, dropping the oldest if full."""
+        with self._ready:
+            if len(self._entries) >= self.max_records:
+                self._entries.popleft()
+                self.dropped += 1
+            self._entries.append(entry)
+            self.enqueued += 1
+            if len(self._entries) == self.batch_size:
+                self._ready.notify()
+
+    def get_batch(self, timeout: float) -> List[LokiEntry]:
+        """Wait up to ``timeout`` for a full batch, then return what is buffered."""
+        with self._ready:
+            if len(self._entries) < self.batch_size and not self._closed:
+                self._ready.wait(timeout)
+            count = min(len(self._entries), self.batch_size)
+            return [self._entries.popleft() for _ in range(count)]
+
+    def close(self) -> None:
+        """Stop waiting for full batches."""
+        with self._ready:
+            self._closed = True
+            self._ready.notify_all()
+
+    def reset(self) -> None:
+        """Start empty, with a fresh lock (used in a forked child)."""
+        self._entries = deque()
+        self._ready = threading.Condition()
+        self._closed = False
+        self.enqueued = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LokiShipper:
+    """
+    Background thread pushing buffered log records to Loki in batches.
+
+    Args:
+        url: Loki push URL
+        batch_size: Records per push (defaults to settings.LOKI_BATCH_SIZE)
+        flush_interval: Longest a partial batch waits, in seconds
+        max_buffered: Records buffered before the oldest are dropped
+        max_retries: Retries for a batch after a failed push
+        retry_backoff: Delay before the first retry, doubling after each one
+        timeout: HTTP timeout for a push, in seconds
+    """
+
+    def __init__(
+        self,
+        url: str,
+        batch_size: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+        max_buffered: Optional[int] = None,
+        max_retries: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.url = url
+        self.flush_interval = (
+            flush_interval
+            if flush_interval is not None
+            else settings.LOKI_FLUSH_INTERVAL_SECONDS
+        )
+        self.max_retries = (
+            max_retries if max_retries is not None else settings.LOKI_MAX_RETRIES
+        )
+        self.retry_backoff = (
+            retry_backoff
+            if retry_backoff is not None
+            else settings.LOKI_RETRY_BACKOFF_SECONDS
+        )
+        self.timeout = (
+            timeout if timeout is not None else settings.LOKI_PUSH_TIMEOUT_SECONDS
+        )
+        self.buffer = LokiBuffer(
+            max_buffered or settings.LOKI_MAX_BUFFERED_RECORDS,
+            batch_size or settings.LOKI_BATCH_SIZE,
+        )
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.batches = 0
+        self._failing = False
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the shipper thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="loki-shipper", daemon=True
+        )
+        self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush buffered records and stop the thread, waiting up to ``timeout``."""
+        self._stopping.set()
+        self.buffer.close()
+        if self._thread is not None:
+            self._thread.join(
+                timeout
+                if timeout is not None
+                else settings.LOKI_SHUTDOWN_TIMEOUT_SECONDS
+            )
+
+    def stats(self) -> Dict[str, int]:
+        """Record counters since the shipper started."""
+        return {
+            "enqueued": self.buffer.enqueued,
+            "sent": self.sent,
+            "dropped": self.buffer.dropped,
+            "failed": self.failed,
+            "retries": self.retries,
+            "batches": self.batches,
+            "buffered": len(self.buffer),
+        }
+
+    def push(self, entries: List[LokiEntry]) -> None:
+        """Push entries to Loki once, raising on failure."""
+        streams: Dict[Tuple[Tuple[str, str], ...], List[List[str]]] = {}
+        for labels, timestamp, line in entries:
+            streams.setdefault(labels, []).append([timestamp, line])
+        payload = {
+            "streams": [
+                {"stream": dict(labels), "values": values}
+                for labels, values in streams.items()
+            ]
+        }
+        request = urllib.request.Request(
+            self.url,
+            data=gzip.compress(json.dumps(payload).encode("utf-8"), compresslevel=6),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            batch = self.buffer.get_batch(self.flush_interval)
+            if batch:
+                self._ship(batch, self.max_retries)
+
+        # Flush on shutdown, without retries so exit is not held up
+        while True:
+            batch = self.buffer.get_batch(0)
+            if not batch:
+                break
+            self._ship(batch, 0)
+
+    def _ship(self, batch: List[LokiEntry], max_retries: int) -> None:
+        for attempt in range(max_retries + 1):
+            try:
+                self.push(batch)
+            except Exception as e:
+                if attempt == max_retries or not _is_retryable(e):
+                    self.failed += len(batch)
+                    if not self._failing:
+                        # Printed, not logged, so the failure is not shipped back here
+                        print(
+                            f"❌ Failed to push logs to Loki ({len(batch)} dropped): {e}"
+                        )
+                        self._failing = True
+                    return
+                self.retries += 1
+                self._stopping.wait(self.retry_backoff * 2**attempt)
+            else:
+                self.sent += len(batch)
+                self.batches += 1
+                if self._failing:
+                    print("🔧 Loki log shipping recovered")
+                    self._failing = False
+                return
+
+    def _after_fork(self) -> None:
+        # The parent's thread does not exist in a forked child, and the parent
+        # still ships the records buffered before the fork
+        running = self._thread is not None and not self._stopping.is_set()
+        self.buffer.reset()
+        self.sent = self.failed = self.retries = self.batches = 0
+        self._stopping = threading.Event()
+        self._thread = None
+        if running:
+            self.start()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Server errors, rate limiting and connection failures are retried."""
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, OSError)
+
+
+class LokiQueueHandler(logging.handlers.QueueHandler):
+    """
+    Logging handler that hands records to a LokiShipper without blocking.
+
+    Args:
+        shipper: Shipper whose buffer records are added to
+        tags: Loki stream labels for every record
+    """
+
+    def __init__(self, shipper: LokiShipper, tags: Dict[str, str]):
+        super().__init__(shipper.buffer)
+        self.shipper = shipper
+        self.tags = dict(tags)
+        self._labels = {
+            level: tuple(sorted({**self.tags, "level": level}.items()))
+            for level in ("debug", "info", "warning", "error", "critical")
+        }
+
+    def prepare(self, record: logging.LogRecord) -> LokiEntry:  # type: ignore[override]
+        """Format the record into a Loki entry."""
+        level = record.levelname.lower()
+        labels = self._labels.get(level)
+        if labels is None:
+            labels = tuple(sorted({**self.tags, "level": level}.items()))
+        return labels, str(int(record.created * 1e9)), self.format(record)
+
+
+_shippers: Dict[str, LokiShipper] = {}
+_shippers_lock = threading.Lock()
+
+
+def get_loki_shipper(url: Optional[str] = None) -> LokiShipper:
+    """Get the process-wide shipper for a Loki push URL, starting it if needed."""
+    loki_url = url or settings.LOKI_URL
+    with _shippers_lock:
+        shipper = _shippers.get(loki_url)
+        if shipper is None:
+            if not _shippers:
+                atexit.register(shutdown_loki_logging)
+            shipper = LokiShipper(loki_url)
+            shipper.start()
+            _shippers[loki_url] = shipper
+        return shipper
+
+
+def shutdown_loki_logging(timeout: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Flush and stop every shipper.
+
+    Returns:
+        Final counters per Loki URL
+    """
+    with _shippers_lock:
+        shippers = dict(_shippers)
+        _shippers.clear()
+    for shipper in shippers.values():
+        shipper.close(timeout)
+    return {url: shipper.stats() for url, shipper in shippers.items()}
+
+
+def _restart_shippers_after_fork() -> None:
+    global _shippers_lock
+    _shippers_lock = threading.Lock()
+    for shipper in _shippers.values():
+        shipper._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_shippers_after_fork)
 
 
 def create_loki_handler(
     url: Optional[str] = None, tags: Optional[Dict[str, str]] = None, version: str = "1"
-) -> Optional[LokiHandler]:
+) -> Optional[LokiQueueHandler]:
     """
     Create a Loki handler for shipping logs to Loki.
 
     Args:
         url: Loki push URL (defaults to settings.LOKI_URL)
         tags: Tags to include with all logs
-        version: Loki API version
+        version: Loki API version (only the v1 push API is supported)
 
     Returns:
-        LokiHandler instance or None if Loki is not available
+        LokiQueueHandler instance or None if the handler could not be created
     """
-    if not LOKI_AVAILABLE:
-        print("⚠️  Loki handler not available - python-logging-loki not installed")
+    if version != "1":
+        print(f"❌ Unsupported Loki API version: {version}")
         return None
 
     # Use provided URL or default from settings
@@ -58,7 +361,8 @@ def create_loki_handler(
         default_tags.update(tags)
 
     try:
-        handler = LokiHandler(url=loki_url, tags=default_tags, version=version)
+        handler = LokiQueueHandler(get_loki_shipper(loki_url), default_tags)
+        handler.setFormatter(StructuredJSONFormatter())
         print(f"🔧 Loki handler created successfully: {loki_url}")
         return handler
     except Exception as e:
@@ -123,10 +427,6 @@ def configure_loki_logging(
         print("🔧 Loki logging disabled")
         return False
 
-    if not LOKI_AVAILABLE:
-        print("❌ Loki logging requested but python-logging-loki not available")
-        return False
-
     # Module names to configure
     modules = ["core", "llm", "memory", "rag", "tools", "types"]
 
@@ -155,25 +455,14 @@ def test_loki_connection(url: Optional[str] = None) -> bool:
     Returns:
         True if connection successful, False otherwise
     """
-    if not LOKI_AVAILABLE:
-        print("❌ Cannot test Loki connection - python-logging-loki not available")
-        return False
-
     loki_url = url or settings.LOKI_URL
 
     try:
-        # Create a test handler
-        handler = create_loki_handler(loki_url)
-        if not handler:
-            return False
-
-        # Create a test logger
-        test_logger = logging.getLogger("loki_test")
-        test_logger.setLevel(logging.INFO)
-        test_logger.addHandler(handler)
-
-        # Send a test log
-        test_logger.info("Loki connection test", extra={"test": True})
+        # Push a test line directly, bypassing the buffer
+        labels = (("application", "personal_assistant"), ("test", "true"))
+        LokiShipper(loki_url).push(
+            [(labels, str(time.time_ns()), "Loki connection test")]
+        )
 
         print(f"✅ Loki connection test successful: {loki_url}")
         return True
@@ -6,6 +6,7 @@ Provides structured JSON logging with correlation IDs, user context,
 and metadata for enhanced observability and debugging.
 """
 
+import contextvars
 import json
 import logging
 import uuid
@@ -189,10 +190,16 @@ class StructuredJSONFormatter(logging.Formatter):
 class CorrelationContext:
     """
     Context manager for storing and retrieving correlation IDs across requests.
+
+    The ID is kept in a context variable, so concurrent requests handled on
+    the same event loop thread each see their own ID, and tasks spawned
+    during a request inherit it.
     """
 
     def __init__(self):
-        self._context: dict[int, str] = {}
+        self._context: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+            "correlation_id", default=None
+        )
 
     def set_correlation_id(self, correlation_id: str) -> None:
         """
@@ -201,10 +208,7 @@ class CorrelationContext:
         Args:
             correlation_id: Unique correlation ID
         """
-        import threading
-
-        thread_id = threading.get_ident()
-        self._context[thread_id] = correlation_id
+        self._context.set(correlation_id)
 
     def get_correlation_id(self) -> Optional[str]:
         """
@@ -213,19 +217,13 @@ class CorrelationContext:
         Returns:
             Correlation ID if set, None otherwise
         """
-        import threading
-
-        thread_id = threading.get_ident()
-        return self._context.get(thread_id)
+        return self._context.get()
 
     def clear_correlation_id(self) -> None:
         """
         Clear the correlation ID for the current context.
         """
-        import threading
-
-        thread_id = threading.get_ident()
-        self._context.pop(thread_id, None)
+        self._context.set(None)
 
 
 # Global correlation context instance
@@ -13,10 +13,13 @@ from sqlalchemy.exc import SQLAlchemyError
 from ..config.settings import settings
 from ..database.crud.utils import add_record_no_commit
 from ..database.session import AsyncSessionLocal
+from ..monitoring.tracing import traced
+from .state_cache import get_state_cache
 
 logger = logging.getLogger(__name__)
 
 
+@traced("storage.get_conversation_id")
 async def get_conversation_id(user_id: int | None) -> Optional[str]:
     """
     Retrieve the latest conversation_id for a user, or None if not found.
@@ -67,6 +70,7 @@ async def get_conversation_id(user_id: int | None) -> Optional[str]:
         return None
 
 
+@traced("storage.create_conversation")
 async def create_new_conversation(user_id: int | None) -> str:
     """
     Create a new conversation for a user and return the conversation ID.
@@ -122,12 +126,18 @@ async def create_new_conversation(user_id: int | None) -> str:
                     )
 
                     logger.info(f"Successfully created conversation {conversation_id}")
-                    return conversation_id
 
                 except SQLAlchemyError as e:
                     logger.error(f"Database error creating conversation: {e}")
                     raise  # This will trigger rollback
 
+        # The new conversation supersedes whatever is cached for this user
+        state_cache = get_state_cache()
+        if state_cache is not None:
+            await state_cache.invalidate_user(user_id)
+
+        return conversation_id
+
     except SQLAlchemyError as e:
         logger.error(f"Failed to create conversation for user {user_id}: {e}")
         raise  # Re-raise the exception instead of returning None
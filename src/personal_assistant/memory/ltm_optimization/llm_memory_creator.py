@@ -1061,8 +1061,11 @@ Analyze the interaction with state context and create high-quality memories:"""
             elif hasattr(self.llm, "aask"):
                 response = await self.llm.aask(prompt)
             elif hasattr(self.llm, "complete"):
-                # Handle GeminiLLM.complete method
-                response = self.llm.complete(prompt, functions={})
+                # Handle GeminiLLM.complete method, off the event loop when possible
+                if hasattr(self.llm, "acomplete"):
+                    response = await self.llm.acomplete(prompt, functions={})
+                else:
+                    response = self.llm.complete(prompt, functions={})
                 logger.info(f"GeminiLLM.complete response type: {type(response)}")
                 logger.info(f"GeminiLLM.complete response: {response}")
 
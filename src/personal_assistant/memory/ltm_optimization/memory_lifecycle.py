@@ -9,9 +9,12 @@ storage optimization coordinated with state management data.
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import numpy as np
+
 from ...config.logging_config import get_logger
 from ...tools.ltm.ltm_storage import add_ltm_memory
 from ...types.state import AgentState
+from ...utils.similarity import jaccard_matrix
 from .config import EnhancedLTMConfig, LTMConfig
 
 logger = get_logger("memory_lifecycle")
@@ -360,31 +363,51 @@ class EnhancedMemoryLifecycleManager:
     ) -> List[List[dict]]:
         """Group memories by state-aware similarity"""
 
+        if not memories:
+            return []
+
+        # Tag/content overlap for every pair in one pass instead of O(n²) set ops
+        base_similar = self._pairwise_base_similarity(memories)
+
         groups = []
-        processed = set()
+        processed = np.zeros(len(memories), dtype=bool)
 
         for i, memory in enumerate(memories):
-            if i in processed:
+            if processed[i]:
                 continue
 
             group = [memory]
-            processed.add(i)
+            processed[i] = True
 
-            # Find similar memories with state context consideration
-            for j, other_memory in enumerate(memories[i + 1 :], i + 1):
-                if j in processed:
-                    continue
+            # Later, unprocessed memories that pass the base similarity check
+            candidates = np.flatnonzero(
+                base_similar[i, i + 1 :] & ~processed[i + 1 :]
+            ) + (i + 1)
 
+            for j in candidates:
+                other_memory = memories[j]
                 if self._are_memories_similar_with_state(
-                    memory, other_memory, state_context
+                    memory, other_memory, state_context, base_similarity=True
                 ):
                     group.append(other_memory)
-                    processed.add(j)
+                    processed[j] = True
 
             groups.append(group)
 
         return groups
 
+    def _pairwise_base_similarity(self, memories: List[Dict[str, Any]]) -> np.ndarray:
+        """Boolean matrix of memory pairs passing the tag or content overlap check"""
+
+        tag_sets = [set(memory.get("tags") or []) for memory in memories]
+        word_sets = [
+            set((memory.get("content") or "").lower().split()) for memory in memories
+        ]
+
+        return (jaccard_matrix(tag_sets) > self.config.tag_similarity_threshold) | (
+            jaccard_matrix(word_sets) > self.config.content_similarity_threshold
+        )
+
     def _are_memories_similar(self, memory1: dict, memory2: dict) -> bool:
         """Check if two memories are similar enough to consolidate"""
 
@@ -416,11 +439,13 @@ class EnhancedMemoryLifecycleManager:
         memory1: Dict[str, Any],
         memory2: Dict[str, Any],
         state_context: Optional["AgentState"] = None,
+        base_similarity: Optional[bool] = None,
     ) -> bool:
         """Check if memories are similar with state context consideration"""
 
-        # Base similarity check
-        base_similarity = self._are_memories_similar(memory1, memory2)
+        # Base similarity check (callers may pass a precomputed result)
+        if base_similarity is None:
+            base_similarity = self._are_memories_similar(memory1, memory2)
 
         if not base_similarity or not state_context:
             return base_similarity
@@ -14,6 +14,7 @@ from typing import Any, Dict, List, Optional
 from ...config.logging_config import get_logger
 from ...tools.ltm.ltm_storage import get_relevant_ltm_memories
 from ...types.state import AgentState
+from ...utils.similarity import jaccard_matrix
 from .config import LTMConfig
 
 logger = get_logger("smart_retriever")
@@ -90,11 +91,22 @@ class SmartLTMRetriever:
             logger.info(f"No candidate memories found for user {user_id}")
             return []
 
+        # Word and phrase overlap against the context for all candidates at once
+        word_overlaps, phrase_overlaps = self._calculate_overlap_scores(
+            candidate_memories, context
+        )
+
         # Enhanced multi-dimensional relevance scoring
         scored_memories = []
-        for memory in candidate_memories:
+        for memory, word_overlap, phrase_overlap in zip(
+            candidate_memories, word_overlaps, phrase_overlaps
+        ):
             relevance_score = self._calculate_enhanced_relevance_score(
-                memory, context, state_context
+                memory,
+                context,
+                state_context,
+                word_overlap=float(word_overlap),
+                phrase_overlap=float(phrase_overlap),
             )
 
             # Quality threshold filtering
@@ -237,10 +249,32 @@ class SmartLTMRetriever:
         # Return focused memories first, then others
         return focused_memories + other_memories
 
+    def _calculate_overlap_scores(self, memories: List[dict], context: str):
+        """Jaccard word and phrase overlap of each memory's content with the context"""
+
+        contents = [(memory.get("content") or "").lower() for memory in memories]
+        word_overlaps = jaccard_matrix(
+            [context.lower().split()], [content.split() for content in contents]
+        )[0]
+        phrase_overlaps = jaccard_matrix(
+            [self._extract_phrases(context)],
+            [self._extract_phrases(content) for content in contents],
+        )[0]
+        return word_overlaps, phrase_overlaps
+
     def _calculate_enhanced_relevance_score(
-        self, memory: dict, context: str, state_context: Optional[AgentState] = None
+        self,
+        memory: dict,
+        context: str,
+        state_context: Optional[AgentState] = None,
+        word_overlap: Optional[float] = None,
+        phrase_overlap: Optional[float] = None,
     ) -> float:
-        """Calculate enhanced multi-dimensional relevance score"""
+        """Calculate enhanced multi-dimensional relevance score
+
+        ``word_overlap`` and ``phrase_overlap`` may be precomputed in batch by
+        ``_calculate_overlap_scores``; they are computed here when omitted.
+        """
 
         score = 0.0
 
@@ -266,17 +300,19 @@ class SmartLTMRetriever:
         content_words = set(memory_content.split())
 
         # Word overlap with stemming consideration
-        word_overlap = len(content_words & context_words) / max(
-            len(content_words | context_words), 1
-        )
+        if word_overlap is None:
+            word_overlap = len(content_words & context_words) / max(
+                len(content_words | context_words), 1
+            )
         score += word_overlap * self.config.content_scoring_weight
 
         # Phrase matching (check for multi-word phrases)
-        context_phrases = self._extract_phrases(context)
-        memory_phrases = self._extract_phrases(memory_content)
-        phrase_overlap = len(context_phrases & memory_phrases) / max(
-            len(context_phrases | memory_phrases), 1
-        )
+        if phrase_overlap is None:
+            context_phrases = self._extract_phrases(context)
+            memory_phrases = self._extract_phrases(memory_content)
+            phrase_overlap = len(context_phrases & memory_phrases) / max(
+                len(context_phrases | memory_phrases), 1
+            )
         score += phrase_overlap * getattr(self.config, "phrase_scoring_weight", 0.2)
 
         # Importance score boost (enhanced)
@@ -5,13 +5,16 @@ This module implements the new storage layer using normalized database tables
 instead of JSON blobs, providing better performance, queryability, and maintainability.
 """
 
+import hashlib
 import json
+from collections import defaultdict
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import and_, desc, select
+from sqlalchemy import and_, delete, desc, func, select, update
 
 from ..config.logging_config import get_logger
+from ..config.settings import settings
 from ..database.models.conversation_message import ConversationMessage
 
 # Import the new models
@@ -20,6 +23,7 @@ from ..database.models.memory_context_item import MemoryContextItem
 from ..database.session import AsyncSessionLocal
 from ..rag.retriever import embed_and_index
 from ..types.state import AgentState, StateConfig
+from .state_cache import get_state_cache
 from .state_optimization import StateOptimizationManager
 
 logger = get_logger("normalized_storage")
@@ -38,8 +42,362 @@ def _get_state_optimization_manager() -> StateOptimizationManager:
     return _state_optimization_manager
 
 
+# Row fields covered by the content hash (everything persisted from state)
+_MESSAGE_HASH_FIELDS = (
+    "role",
+    "content",
+    "message_type",
+    "tool_name",
+    "tool_success",
+    "additional_data",
+)
+_CONTEXT_HASH_FIELDS = (
+    "source",
+    "content",
+    "relevance_score",
+    "context_type",
+    "original_role",
+    "focus_area",
+    "preference_type",
+    "additional_data",
+)
+
+
+def _content_hash(row, fields: Sequence[str]) -> str:
+    """SHA-256 fingerprint of a row's persisted fields."""
+    values = {field: getattr(row, field) for field in fields}
+    additional_data = values.get("additional_data")
+    if isinstance(additional_data, dict):
+        # Loaded history items carry the DB timestamp back in; it is not content
+        values["additional_data"] = {
+            k: v for k, v in additional_data.items() if k != "timestamp"
+        }
+    payload = json.dumps(values, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Gap between consecutive message positions, leaving room to place a
+# replacement row between its neighbours without renumbering
+_POSITION_STEP = 1024
+
+
+def _build_message_rows(
+    conversation_id: str, history: List[Any], after_position: int = 0
+) -> List[ConversationMessage]:
+    """
+    Build fingerprinted, positioned ConversationMessage rows for history items,
+    placed after ``after_position``.
+    """
+    rows = []
+    for index, item in enumerate(history, start=1):
+        message = ConversationMessage.from_conversation_item(conversation_id, item)
+        message.content_hash = _content_hash(message, _MESSAGE_HASH_FIELDS)
+        message.position = after_position + index * _POSITION_STEP
+        rows.append(message)
+    return rows
+
+
+def _build_context_rows(
+    conversation_id: str, memory_context: List[dict], focus: Optional[List[str]]
+) -> List[MemoryContextItem]:
+    """Build fingerprinted MemoryContextItem rows for context items and focus areas."""
+    rows = [
+        MemoryContextItem.from_memory_context_item(conversation_id, item)
+        for item in memory_context
+    ]
+    rows.extend(
+        MemoryContextItem.from_focus_area(conversation_id, focus_area)
+        for focus_area in focus or []
+    )
+    for row in rows:
+        row.content_hash = _content_hash(row, _CONTEXT_HASH_FIELDS)
+    return rows
+
+
+def _match_rows(
+    persisted: Sequence[Tuple[int, Optional[str]]], rows: List[Any]
+) -> Tuple[List[Optional[int]], List[int]]:
+    """
+    Match wanted rows against persisted (id, content_hash) pairs.
+
+    Duplicates are matched one-for-one, in order, so repeated messages are
+    kept as many times as they appear.
+
+    Returns:
+        The matched persisted id (or None) for each wanted row, and ids of
+        persisted rows to delete
+    """
+    available: Dict[Optional[str], List[int]] = defaultdict(list)
+    for row_id, content_hash in persisted:
+        available[content_hash].append(row_id)
+
+    matched = []
+    for row in rows:
+        matches = available.get(row.content_hash)
+        matched.append(matches.pop(0) if matches else None)
+
+    to_delete = [row_id for row_ids in available.values() for row_id in row_ids]
+    return matched, to_delete
+
+
+def _diff_rows(
+    persisted: Sequence[Tuple[int, Optional[str]]], rows: List[Any]
+) -> Tuple[List[Any], List[int]]:
+    """
+    Match wanted rows against persisted (id, content_hash) pairs.
+
+    Returns:
+        Rows that still need inserting, and ids of persisted rows to delete
+    """
+    matched, to_delete = _match_rows(persisted, rows)
+    to_insert = [row for row, row_id in zip(rows, matched) if row_id is None]
+    return to_insert, to_delete
+
+
+def _diff_ordered_rows(
+    persisted: Sequence[Tuple[int, Optional[str], Optional[int]]], rows: List[Any]
+) -> Tuple[List[Any], List[int], Dict[int, int]]:
+    """
+    Like _diff_rows, for rows ordered by ``position``.
+
+    Kept rows keep their position. A new row takes a position between its
+    neighbours, reusing the position of a row it replaces (e.g. a message
+    edited in place) when one is free there. Rows are renumbered only when
+    kept rows are out of order or a gap is exhausted.
+
+    Returns:
+        Rows to insert (positions set), ids of persisted rows to delete, and
+        new positions for kept rows by id
+    """
+    matched, to_delete = _match_rows(
+        [(row_id, content_hash) for row_id, content_hash, _ in persisted], rows
+    )
+    stored = {row_id: position for row_id, _, position in persisted}
+    freed = sorted(stored[row_id] for row_id in to_delete if stored[row_id] is not None)
+    positions: List[Optional[int]] = [
+        stored[row_id] if row_id is not None else None for row_id in matched
+    ]
+
+    kept = [position for position in positions if position is not None]
+    in_order = all(b > a for a, b in zip(kept, kept[1:]))
+    if in_order:
+        index = 0
+        while index < len(positions):
+            if positions[index] is not None:
+                index += 1
+                continue
+            end = index
+            while end < len(positions) and positions[end] is None:
+                end += 1
+            count = end - index
+            upper = positions[end] if end < len(positions) else None
+            if index > 0:
+                lower = positions[index - 1]
+            elif upper is not None:
+                lower = upper - (count + 1) * _POSITION_STEP
+            else:
+                lower = 0
+            if upper is None:
+                upper = lower + (count + 1) * _POSITION_STEP
+
+            reusable = [p for p in freed if lower < p < upper]
+            if len(reusable) >= count:
+                run = reusable[:count]
+            else:
+                gap = (upper - lower) // (count + 1)
+                if gap == 0:
+                    in_order = False
+                    break
+                run = [lower + gap * offset for offset in range(1, count + 1)]
+            positions[index:end] = run
+            index = end
+
+    if not in_order:
+        positions = [offset * _POSITION_STEP for offset in range(1, len(rows) + 1)]
+
+    to_insert = []
+    updates: Dict[int, int] = {}
+    for row, row_id, position in zip(rows, matched, positions):
+        if row_id is None:
+            row.position = position
+            to_insert.append(row)
+        elif stored[row_id] != position:
+            updates[row_id] = position
+    return to_insert, to_delete, updates
+
+
+async def _sync_rows(
+    session, model, conversation_id: str, rows: List[Any]
+) -> Tuple[int, int]:
+    """
+    Bring a conversation's rows in ``model`` in line with ``rows``.
+
+    Unchanged rows are left alone; new rows are bulk inserted and pruned rows
+    are removed with a single DELETE. Models with a ``position`` column keep
+    the order of ``rows`` (see _diff_ordered_rows).
+
+    Returns:
+        Tuple of (inserted, deleted) row counts
+    """
+    ordered = hasattr(model, "position")
+    columns = [model.id, model.content_hash]
+    if ordered:
+        columns.append(model.position)
+    persisted = await session.execute(
+        select(*columns).where(model.conversation_id == conversation_id)
+    )
+    if ordered:
+        to_insert, to_delete, updates = _diff_ordered_rows(persisted.all(), rows)
+        if updates:
+            await session.execute(
+                update(model),
+                [
+                    {"id": row_id, "position": position}
+                    for row_id, position in updates.items()
+                ],
+            )
+    else:
+        to_insert, to_delete = _diff_rows(persisted.all(), rows)
+
+    if to_delete:
+        await session.execute(
+            delete(model)
+            .where(model.id.in_(to_delete))
+            .execution_options(synchronize_session=False)
+        )
+    if to_insert:
+        session.add_all(to_insert)
+
+    return len(to_insert), len(to_delete)
+
+
+# What load_state_normalized returns by default; the state cache holds the
+# same view of a saved state so a cache hit matches a fresh load
+_LOAD_MAX_MESSAGES = 50
+_LOAD_MAX_CONTEXT_ITEMS = 20
+_LOAD_MIN_RELEVANCE_SCORE = 0.3
+
+
+def _state_from_rows(
+    conversation_state: ConversationState,
+    messages: Sequence[ConversationMessage],
+    context_items: Sequence[MemoryContextItem],
+) -> AgentState:
+    """Rebuild an AgentState from its rows (messages newest first)."""
+    # Convert messages back to conversation history format
+    conversation_history = []
+    for msg in reversed(messages):  # Reverse to get chronological order
+        history_item = {
+            "role": msg.role,
+            "content": msg.content,
+            "timestamp": msg.timestamp.isoformat() if msg.timestamp else None,
+        }
+
+        # Add tool-specific information if available
+        if msg.tool_name:
+            history_item["tool_name"] = msg.tool_name
+        if msg.tool_success:
+            history_item["tool_success"] = msg.tool_success
+        if msg.additional_data:
+            # additional_data is already a dict from SQLAlchemy JSON column
+            if isinstance(msg.additional_data, dict):
+                history_item.update(msg.additional_data)
+            else:
+                # Fallback for string data (shouldn't happen with JSON column)
+                try:
+                    history_item.update(json.loads(msg.additional_data))
+                except (json.JSONDecodeError, TypeError) as e:
+                    logger.warning(
+                        f"⚠️ Failed to parse additional_data for message {msg.id}: {e}"
+                    )
+
+        conversation_history.append(history_item)
+
+    # Convert context items back to memory context format
+    memory_context = []
+    for ctx in context_items:
+        context_item = {
+            "content": ctx.content,
+            "source": ctx.source,
+            "relevance_score": ctx.relevance_score,
+            "context_type": ctx.context_type,
+        }
+
+        # Add optional fields if available
+        if ctx.original_role:
+            context_item["role"] = ctx.original_role
+        if ctx.focus_area:
+            context_item["focus_area"] = ctx.focus_area
+        if ctx.preference_type:
+            context_item["preference_type"] = ctx.preference_type
+        if ctx.additional_data:
+            try:
+                # additional_data is already a dict from SQLAlchemy JSON column
+                if isinstance(ctx.additional_data, dict):
+                    metadata = ctx.additional_data
+                else:
+                    # Fallback for string data (shouldn't happen with JSON column)
+                    metadata = json.loads(ctx.additional_data)
+                context_item.update(metadata)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.warning(
+                    f"⚠️ Failed to parse metadata for context item {ctx.id}: {e}"
+                )
+
+        memory_context.append(context_item)
+
+    # Extract focus areas from context items
+    focus_areas = []
+    for ctx in context_items:
+        if ctx.focus_area and ctx.focus_area not in focus_areas:
+            focus_areas.append(ctx.focus_area)
+
+    # If no focus areas found in context, use the stored ones
+    if not focus_areas and conversation_state.focus_areas:
+        focus_areas = conversation_state.focus_areas
+
+    return AgentState(
+        user_input=conversation_state.user_input or "",
+        memory_context=memory_context,
+        conversation_history=conversation_history,
+        focus=focus_areas,
+        step_count=conversation_state.step_count or 0,
+        last_tool_result=conversation_state.last_tool_result,
+    )
+
+
+def _loaded_view(
+    conversation_state: ConversationState,
+    message_rows: List[ConversationMessage],
+    context_rows: List[MemoryContextItem],
+) -> AgentState:
+    """
+    Build the state load_state_normalized returns for just-saved rows, applying
+    its message and context limits in memory. Rows not yet re-read from the
+    database have no server timestamp, so their history items carry none.
+    """
+
+    def relevance(row: MemoryContextItem) -> float:
+        # Column default for rows not yet inserted
+        return row.relevance_score if row.relevance_score is not None else 0.5
+
+    context_items = sorted(
+        (row for row in context_rows if relevance(row) >= _LOAD_MIN_RELEVANCE_SCORE),
+        key=relevance,
+        reverse=True,
+    )
+    return _state_from_rows(
+        conversation_state,
+        message_rows[::-1][:_LOAD_MAX_MESSAGES],
+        context_items[:_LOAD_MAX_CONTEXT_ITEMS],
+    )
+
+
 async def save_state_normalized(
-    conversation_id: str, state: AgentState, user_id: Optional[int] = None
+    conversation_id: str,
+    state: AgentState,
+    user_id: Optional[int] = None,
+    incremental: Optional[bool] = None,
 ) -> None:
     """
     Save conversation state using the new normalized database schema.
@@ -51,10 +409,16 @@ async def save_state_normalized(
     4. Maintains referential integrity with foreign keys
     5. Enables efficient querying and partial updates
 
+    In incremental mode (default, see STATE_INCREMENTAL_SAVE) messages and
+    context items are matched to stored rows by content hash: only new items
+    are inserted and only pruned ones deleted, so the write cost tracks what
+    changed this turn rather than the conversation length.
+
     Args:
         conversation_id: Unique identifier for the conversation
         state: The conversation state to save
         user_id: User ID for the conversation (required for normalized storage)
+        incremental: Override STATE_INCREMENTAL_SAVE; False rewrites all rows
 
     Raises:
         ValueError: If user_id is not provided
@@ -62,6 +426,8 @@ async def save_state_normalized(
     """
     if not user_id:
         raise ValueError("user_id is required for normalized storage")
+    if incremental is None:
+        incremental = settings.STATE_INCREMENTAL_SAVE
 
     logger.info(
         f"💾 Saving state using normalized schema for conversation: {conversation_id}"
@@ -132,63 +498,47 @@ async def save_state_normalized(
                 session.add(conversation_state)
                 await session.flush()  # Get the ID
 
-            # Step 3: Save conversation messages
-            logger.info(
-                f"💬 Saving {len(optimized_state.conversation_history)} conversation messages..."
+            message_rows = _build_message_rows(
+                conversation_id, optimized_state.conversation_history
+            )
+            context_rows = _build_context_rows(
+                conversation_id, optimized_state.memory_context, optimized_state.focus
             )
 
-            # Clear existing messages if updating
-            if existing_state:
-                await session.execute(
-                    select(ConversationMessage).where(
-                        ConversationMessage.conversation_id == conversation_id
-                    )
+            if existing_state and incremental:
+                # Step 3-5: Write only what changed since the last save
+                messages_added, messages_removed = await _sync_rows(
+                    session, ConversationMessage, conversation_id, message_rows
                 )
-                existing_messages = await session.execute(
-                    select(ConversationMessage).where(
-                        ConversationMessage.conversation_id == conversation_id
-                    )
+                context_added, context_removed = await _sync_rows(
+                    session, MemoryContextItem, conversation_id, context_rows
                 )
-                for msg in existing_messages.scalars():
-                    await session.delete(msg)
-
-            # Save new messages
-            for item in optimized_state.conversation_history:
-                message = ConversationMessage.from_conversation_item(
-                    conversation_id, item
+                logger.info(
+                    f"💬 Messages: +{messages_added} -{messages_removed} "
+                    f"(of {len(message_rows)}); "
+                    f"🧠 context items: +{context_added} -{context_removed} "
+                    f"(of {len(context_rows)})"
                 )
-                session.add(message)
-
-            # Step 4: Save memory context items
-            logger.info(
-                f"🧠 Saving {len(optimized_state.memory_context)} memory context items..."
-            )
+            else:
+                # Step 3: Save conversation messages
+                logger.info(f"💬 Saving {len(message_rows)} conversation messages...")
 
-            # Clear existing context items if updating
-            if existing_state:
-                existing_context = await session.execute(
-                    select(MemoryContextItem).where(
-                        MemoryContextItem.conversation_id == conversation_id
-                    )
+                # Step 4-5: Save memory context items and focus areas
+                logger.info(
+                    f"🧠 Saving {len(context_rows)} memory context items and focus areas..."
                 )
-                for ctx in existing_context.scalars():
-                    await session.delete(ctx)
 
-            # Save new context items
-            for item in optimized_state.memory_context:
-                context_item = MemoryContextItem.from_memory_context_item(
-                    conversation_id, item
-                )
-                session.add(context_item)
-
-            # Step 5: Save focus areas as context items
-            if optimized_state.focus:
-                logger.info(f"🎯 Saving {len(optimized_state.focus)} focus areas...")
-                for focus_area in optimized_state.focus:
-                    focus_item = MemoryContextItem.from_focus_area(
-                        conversation_id, focus_area
-                    )
-                    session.add(focus_item)
+                # Clear existing rows if updating
+                if existing_state:
+                    for model in (ConversationMessage, MemoryContextItem):
+                        await session.execute(
+                            delete(model)
+                            .where(model.conversation_id == conversation_id)
+                            .execution_options(synchronize_session=False)
+                        )
+
+                session.add_all(message_rows)
+                session.add_all(context_rows)
 
             # Commit all changes
             await session.commit()
@@ -196,6 +546,16 @@ async def save_state_normalized(
                 f"✅ Successfully saved state using normalized schema for conversation {conversation_id}"
             )
 
+            # Write through to the hot-state cache so the next message skips the load
+            state_cache = get_state_cache()
+            if state_cache is not None:
+                await state_cache.put(
+                    user_id,
+                    conversation_id,
+                    _loaded_view(conversation_state, message_rows, context_rows),
+                    datetime.now(timezone.utc),
+                )
+
             # Step 6: Generate RAG embeddings for the conversation state
             try:
                 logger.info(
@@ -232,9 +592,9 @@ async def save_state_normalized(
 async def load_state_normalized(
     conversation_id: str,
     user_id: Optional[int] = None,
-    max_messages: int = 50,
-    max_context_items: int = 20,
-    min_relevance_score: float = 0.3,
+    max_messages: int = _LOAD_MAX_MESSAGES,
+    max_context_items: int = _LOAD_MAX_CONTEXT_ITEMS,
+    min_relevance_score: float = _LOAD_MIN_RELEVANCE_SCORE,
 ) -> Optional[AgentState]:
     """
     Load conversation state using the new normalized database schema.
@@ -286,40 +646,16 @@ async def load_state_normalized(
             messages_result = await session.execute(
                 select(ConversationMessage)
                 .where(ConversationMessage.conversation_id == conversation_id)
-                .order_by(desc(ConversationMessage.timestamp))
+                .order_by(
+                    # Rows written outside state saves have no position yet
+                    desc(ConversationMessage.position).nulls_first(),
+                    desc(ConversationMessage.timestamp),
+                    desc(ConversationMessage.id),
+                )
                 .limit(max_messages)
             )
             messages = messages_result.scalars().all()
 
-            # Convert messages back to conversation history format
-            conversation_history = []
-            for msg in reversed(messages):  # Reverse to get chronological order
-                history_item = {
-                    "role": msg.role,
-                    "content": msg.content,
-                    "timestamp": msg.timestamp.isoformat() if msg.timestamp else None,
-                }
-
-                # Add tool-specific information if available
-                if msg.tool_name:
-                    history_item["tool_name"] = msg.tool_name
-                if msg.tool_success:
-                    history_item["tool_success"] = msg.tool_success
-                if msg.additional_data:
-                    # additional_data is already a dict from SQLAlchemy JSON column
-                    if isinstance(msg.additional_data, dict):
-                        history_item.update(msg.additional_data)
-                    else:
-                        # Fallback for string data (shouldn't happen with JSON column)
-                        try:
-                            history_item.update(json.loads(msg.additional_data))
-                        except (json.JSONDecodeError, TypeError) as e:
-                            logger.warning(
-                                f"⚠️ Failed to parse additional_data for message {msg.id}: {e}"
-                            )
-
-                conversation_history.append(history_item)
-
             # Step 3: Load memory context items (highest relevance first)
             logger.info(
                 f"🧠 Loading up to {max_context_items} context items with relevance >= {min_relevance_score}..."
@@ -337,66 +673,14 @@ async def load_state_normalized(
             )
             context_items = context_result.scalars().all()
 
-            # Convert context items back to memory context format
-            memory_context = []
-            for ctx in context_items:
-                context_item = {
-                    "content": ctx.content,
-                    "source": ctx.source,
-                    "relevance_score": ctx.relevance_score,
-                    "context_type": ctx.context_type,
-                }
-
-                # Add optional fields if available
-                if ctx.original_role:
-                    context_item["role"] = ctx.original_role
-                if ctx.focus_area:
-                    context_item["focus_area"] = ctx.focus_area
-                if ctx.preference_type:
-                    context_item["preference_type"] = ctx.preference_type
-                if ctx.additional_data:
-                    try:
-                        # additional_data is already a dict from SQLAlchemy JSON column
-                        if isinstance(ctx.additional_data, dict):
-                            metadata = ctx.additional_data
-                        else:
-                            # Fallback for string data (shouldn't happen with JSON column)
-                            metadata = json.loads(ctx.additional_data)
-                        context_item.update(metadata)
-                    except (json.JSONDecodeError, TypeError) as e:
-                        logger.warning(
-                            f"⚠️ Failed to parse metadata for context item {ctx.id}: {e}"
-                        )
-
-                memory_context.append(context_item)
-
             # Step 4: Reconstruct AgentState object
             logger.info("🔧 Reconstructing AgentState object...")
-
-            # Extract focus areas from context items
-            focus_areas = []
-            for ctx in context_items:
-                if ctx.focus_area and ctx.focus_area not in focus_areas:
-                    focus_areas.append(ctx.focus_area)
-
-            # If no focus areas found in context, use the stored ones
-            if not focus_areas and conversation_state.focus_areas:
-                focus_areas = conversation_state.focus_areas
-
-            # Create AgentState
-            agent_state = AgentState(
-                user_input=conversation_state.user_input or "",
-                memory_context=memory_context,
-                conversation_history=conversation_history,
-                focus=focus_areas,
-                step_count=conversation_state.step_count or 0,
-                last_tool_result=conversation_state.last_tool_result,
-            )
+            agent_state = _state_from_rows(conversation_state, messages, context_items)
 
             logger.info("✅ Successfully loaded state using normalized schema:")
-            logger.info(f"  Messages loaded: {len(conversation_history)}")
-            logger.info(f"  Context items loaded: {len(memory_context)}")
-            logger.info(f"  Focus areas: {focus_areas}")
+            logger.info(f"  Messages loaded: {len(agent_state.conversation_history)}")
+            logger.info(f"  Context items loaded: {len(agent_state.memory_context)}")
+            logger.info(f"  Focus areas: {agent_state.focus}")
 
             return agent_state
 
@@ -476,11 +760,17 @@ async def update_state_partial(
                 new_messages = updates["new_messages"]
                 logger.info(f"💬 Adding {len(new_messages)} new messages...")
 
-                for message_data in new_messages:
-                    message = ConversationMessage.from_conversation_item(
-                        conversation_id, message_data
+                # Append after the conversation's current last message
+                last_position = await session.scalar(
+                    select(func.max(ConversationMessage.position)).where(
+                        ConversationMessage.conversation_id == conversation_id
+                    )
+                )
+                session.add_all(
+                    _build_message_rows(
+                        conversation_id, new_messages, last_position or 0
                     )
-                    session.add(message)
+                )
 
                 logger.info(f"✅ Added {len(new_messages)} new messages")
 
@@ -489,11 +779,9 @@ async def update_state_partial(
                 new_context_items = updates["new_context_items"]
                 logger.info(f"🧠 Adding {len(new_context_items)} new context items...")
 
-                for context_data in new_context_items:
-                    context_item = MemoryContextItem.from_memory_context_item(
-                        conversation_id, context_data
-                    )
-                    session.add(context_item)
+                session.add_all(
+                    _build_context_rows(conversation_id, new_context_items, None)
+                )
 
                 logger.info(f"✅ Added {len(new_context_items)} new context items")
 
@@ -502,6 +790,10 @@ async def update_state_partial(
             logger.info(
                 f"✅ Successfully updated state partially for conversation {conversation_id}"
             )
+
+            state_cache = get_state_cache()
+            if state_cache is not None:
+                await state_cache.invalidate_user(conversation_state.user_id)
             return True
 
     except Exception as e:
@@ -554,6 +846,10 @@ async def delete_conversation_normalized(
             await session.delete(conversation_state)
             await session.commit()
 
+            state_cache = get_state_cache()
+            if state_cache is not None:
+                await state_cache.invalidate_user(conversation_state.user_id)
+
             logger.info(
                 f"✅ Successfully deleted conversation {conversation_id} and all related data"
             )
@@ -0,0 +1,214 @@
+"""
+Hot conversation-state cache.
+
+Keeps each user's latest conversation id, AgentState and last-update time so
+a follow-up message can resume without reading the database. Entries live in
+Redis, shared by the API and worker processes, or in an in-process LRU for
+single-process deployments: a process cannot see another process's writes to
+its local entries, so the two tiers are never combined. The storage layer
+refreshes entries when it saves a state and drops them on any other write.
+"""
+
+import copy
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from ..rag.embeddings.cache import LRUCache
+from ..types.state import AgentState
+
+logger = get_logger("state_cache")
+
+_REDIS_KEY_PREFIX = "pa:state:user:"
+
+
+@dataclass
+class CachedConversation:
+    """A user's latest conversation as last written by this service."""
+
+    conversation_id: str
+    state: AgentState
+    updated_at: datetime
+
+
+def _serialize(entry: CachedConversation) -> str:
+    state = entry.state
+    return json.dumps(
+        {
+            "conversation_id": entry.conversation_id,
+            "updated_at": entry.updated_at.isoformat(),
+            "state": {
+                "user_input": state.user_input,
+                "memory_context": state.memory_context,
+                "step_count": state.step_count,
+                "focus": state.focus,
+                "conversation_history": state.conversation_history,
+                "last_tool_result": state.last_tool_result,
+            },
+        },
+        default=str,
+    )
+
+
+def _deserialize(payload: str) -> CachedConversation:
+    data = json.loads(payload)
+    return CachedConversation(
+        conversation_id=data["conversation_id"],
+        state=AgentState.from_dict(data["state"]),
+        updated_at=datetime.fromisoformat(data["updated_at"]),
+    )
+
+
+class ConversationStateCache:
+    """
+    Per-user cache of the latest conversation state.
+
+    Entries are copied on the way in and out, so callers may mutate the
+    state they get back.
+
+    Args:
+        max_users: Users kept in the in-process LRU
+        local_ttl_seconds: Lifetime of in-process entries
+        redis_client: Optional ``redis.asyncio`` client; replaces the
+            in-process LRU with the shared tier
+        redis_ttl_seconds: Lifetime of Redis entries
+    """
+
+    def __init__(
+        self,
+        max_users: Optional[int] = None,
+        local_ttl_seconds: Optional[int] = None,
+        redis_client=None,
+        redis_ttl_seconds: Optional[int] = None,
+    ):
+        self._redis = redis_client
+        self._local = (
+            LRUCache(
+                max_size=max_users or settings.STATE_CACHE_MAX_USERS,
+                ttl_seconds=local_ttl_seconds or settings.STATE_CACHE_LOCAL_TTL_SECONDS,
+            )
+            if redis_client is None
+            else None
+        )
+        self._redis_ttl = redis_ttl_seconds or settings.STATE_CACHE_REDIS_TTL_SECONDS
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0}
+
+    async def get(self, user_id: int) -> Optional[CachedConversation]:
+        """Get a copy of the user's cached conversation, or None."""
+        entry = None
+        if self._local is not None:
+            entry = self._local.get(str(user_id))
+        else:
+            try:
+                payload = await self._redis.get(f"{_REDIS_KEY_PREFIX}{user_id}")
+                if payload:
+                    entry = _deserialize(payload)
+                    self.stats["redis_hits"] += 1
+            except Exception as e:
+                logger.warning(f"State cache Redis read failed for user {user_id}: {e}")
+
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return CachedConversation(
+            conversation_id=entry.conversation_id,
+            state=copy.deepcopy(entry.state),
+            updated_at=entry.updated_at,
+        )
+
+    async def put(
+        self,
+        user_id: int,
+        conversation_id: str,
+        state: AgentState,
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        """Store the user's latest conversation state."""
+        entry = CachedConversation(
+            conversation_id=conversation_id,
+            state=copy.deepcopy(state),
+            updated_at=updated_at or datetime.now(timezone.utc),
+        )
+        if self._local is not None:
+            self._local.put(str(user_id), entry)
+        else:
+            try:
+                await self._redis.set(
+                    f"{_REDIS_KEY_PREFIX}{user_id}",
+                    _serialize(entry),
+                    ex=self._redis_ttl,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"State cache Redis write failed for user {user_id}: {e}"
+                )
+
+    async def invalidate_user(self, user_id: int) -> None:
+        """Drop the user's cached conversation."""
+        self.stats["invalidations"] += 1
+        if self._local is not None:
+            self._local.delete(str(user_id))
+        else:
+            try:
+                await self._redis.delete(f"{_REDIS_KEY_PREFIX}{user_id}")
+            except Exception as e:
+                logger.warning(
+                    f"State cache Redis invalidation failed for user {user_id}: {e}"
+                )
+
+    def clear(self) -> None:
+        """Clear the in-process tier."""
+        if self._local is not None:
+            self._local.clear()
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters and in-process size."""
+        return {
+            **self.stats,
+            "local_size": self._local.size() if self._local is not None else 0,
+            "redis_enabled": self._redis is not None,
+        }
+
+
+# Global state cache instance
+_state_cache: Optional[ConversationStateCache] = None
+
+
+def get_state_cache() -> Optional[ConversationStateCache]:
+    """
+    Get the process-wide state cache, or None when it is disabled.
+    STATE_CACHE_ENABLED defaults to on only when STATE_CACHE_REDIS_URL is set.
+    """
+    global _state_cache
+    enabled = settings.STATE_CACHE_ENABLED
+    if enabled is None:
+        enabled = bool(settings.STATE_CACHE_REDIS_URL)
+    if not enabled:
+        return None
+    if _state_cache is None:
+        redis_client = None
+        if settings.STATE_CACHE_REDIS_URL:
+            import redis.asyncio as async_redis
+
+            redis_client = async_redis.Redis.from_url(
+                settings.STATE_CACHE_REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+        _state_cache = ConversationStateCache(redis_client=redis_client)
+        logger.info(
+            f"Conversation state cache initialized (redis: {redis_client is not None})"
+        )
+    return _state_cache
+
+
+def set_state_cache(cache: Optional[ConversationStateCache]) -> None:
+    """Override the process-wide state cache (e.g. for tests); None resets it."""
+    global _state_cache
+    _state_cache = cache
@@ -11,6 +11,7 @@ from typing import Any, Optional
 from ..config.feature_flags import normalized_storage_logging, use_normalized_storage
 from ..config.logging_config import get_logger
 from ..database.session import AsyncSessionLocal
+from ..monitoring.tracing import traced
 from ..types.state import AgentState
 from .normalized_storage import (
     delete_conversation_normalized,
@@ -43,6 +44,7 @@ class StorageIntegrationManager:
         logger.info(f"  Use normalized storage: {self.use_normalized}")
         logger.info(f"  Detailed logging: {self.logging_enabled}")
 
+    @traced("storage.save_state")
     async def save_state(
         self, conversation_id: str, state: AgentState, user_id: int
     ) -> bool:
@@ -81,6 +83,7 @@ class StorageIntegrationManager:
             logger.error(f"❌ Failed to save state for {conversation_id}: {e}")
             return False
 
+    @traced("storage.load_state")
     async def load_state(
         self,
         conversation_id: str,
@@ -231,6 +234,7 @@ class StorageIntegrationManager:
             logger.error(f"❌ Failed to delete conversation {conversation_id}: {e}")
             return False
 
+    @traced("storage.conversation_timestamp")
     async def get_conversation_timestamp(
         self, user_id: int, conversation_id: str
     ) -> Optional[datetime]:
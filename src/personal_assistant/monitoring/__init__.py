@@ -7,6 +7,7 @@ tracking.
 
 Key Components:
 - PrometheusMetricsService: Prometheus metrics collection and exposure
+- Agent turn tracing: per-stage spans exported as latency histograms
 - Health monitoring integration
 - Performance metrics collection
 - System resource monitoring
@@ -17,5 +18,15 @@ from .prometheus_metrics import (
     get_metrics_service,
     metrics_service,
 )
+from .tracing import TurnTrace, get_current_trace, span, start_turn, traced
 
-__all__ = ["PrometheusMetricsService", "metrics_service", "get_metrics_service"]
+__all__ = [
+    "PrometheusMetricsService",
+    "metrics_service",
+    "get_metrics_service",
+    "TurnTrace",
+    "start_turn",
+    "span",
+    "traced",
+    "get_current_trace",
+]
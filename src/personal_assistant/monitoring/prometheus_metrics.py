@@ -12,6 +12,7 @@ Key Features:
 - Database health metrics
 - System resource metrics
 - Business metrics
+- Agent turn stage, tool and LLM latency histograms
 - Real-time metrics collection
 """
 
@@ -252,6 +253,47 @@ class PrometheusMetricsService:
             registry=self.registry,
         )
 
+        # Agent Pipeline Metrics (fed by monitoring.tracing)
+        agent_latency_buckets = (
+            0.005,
+            0.01,
+            0.025,
+            0.05,
+            0.1,
+            0.25,
+            0.5,
+            1.0,
+            2.5,
+            5.0,
+            10.0,
+            30.0,
+            60.0,
+        )
+
+        self.agent_stage_duration_seconds = Histogram(
+            "agent_stage_duration_seconds",
+            "Agent turn stage duration in seconds",
+            ["stage", "status"],
+            buckets=agent_latency_buckets,
+            registry=self.registry,
+        )
+
+        self.agent_tool_duration_seconds = Histogram(
+            "agent_tool_duration_seconds",
+            "Agent tool call duration in seconds",
+            ["tool", "status"],
+            buckets=agent_latency_buckets,
+            registry=self.registry,
+        )
+
+        self.agent_llm_duration_seconds = Histogram(
+            "agent_llm_duration_seconds",
+            "Agent LLM call duration in seconds",
+            ["model", "status"],
+            buckets=agent_latency_buckets,
+            registry=self.registry,
+        )
+
     def update_system_metrics(self):
         """Update system resource metrics."""
         try:
@@ -344,6 +386,29 @@ class PrometheusMetricsService:
             duration
         )
 
+    def record_agent_span(
+        self,
+        stage: str,
+        duration: float,
+        tool: Optional[str] = None,
+        model: Optional[str] = None,
+        status: str = "ok",
+    ):
+        """Record an agent turn stage, plus its tool or model histogram."""
+        self.agent_stage_duration_seconds.labels(stage=stage, status=status).observe(
+            duration
+        )
+
+        if tool is not None:
+            self.agent_tool_duration_seconds.labels(tool=tool, status=status).observe(
+                duration
+            )
+
+        if model is not None:
+            self.agent_llm_duration_seconds.labels(model=model, status=status).observe(
+                duration
+            )
+
     def update_oauth_integrations(self, provider_counts: Dict[str, int]):
         """Update OAuth integration counts."""
         for provider, count in provider_counts.items():
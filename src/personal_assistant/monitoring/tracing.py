@@ -0,0 +1,252 @@
+"""
+Per-turn stage tracing for the agent pipeline.
+
+A turn (one AgentCore.run) opens a trace with ``start_turn()``; code along the
+pipeline wraps its stages in ``span()``. The trace lives in a context
+variable, so it follows the turn into the tasks it gathers (parallel tool
+calls, concurrent LTM/RAG retrieval) without being passed around.
+
+Each finished span is observed in the Prometheus stage histogram (and the
+per-tool or per-model one). When AGENT_TRACE_LOG_WATERFALL is on, the turn's
+spans are also logged as a waterfall tagged with the request's correlation
+ID. With tracing disabled, or outside a turn, ``span()`` returns a shared
+no-op and costs one context variable lookup.
+"""
+
+import contextvars
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from ..logging import get_correlation_id
+from .prometheus_metrics import get_metrics_service
+
+logger = get_logger("tracing")
+
+T = TypeVar("T")
+
+
+class Span:
+    """
+    A timed stage within a turn.
+
+    Args:
+        trace: Turn the span belongs to
+        stage: Pipeline stage, e.g. ``llm`` or ``storage.load_state``
+        tool: Tool name, for ``tool`` spans
+        model: LLM model name, for ``llm`` spans
+    """
+
+    __slots__ = ("trace", "stage", "tool", "model", "status", "start", "duration")
+
+    def __init__(
+        self,
+        trace: "TurnTrace",
+        stage: str,
+        tool: Optional[str] = None,
+        model: Optional[str] = None,
+    ):
+        self.trace = trace
+        self.stage = stage
+        self.tool = tool
+        self.model = model
+        self.status = "ok"
+        self.start = 0.0
+        self.duration = 0.0
+
+    def set_status(self, status: str) -> None:
+        """Record the stage outcome (``ok`` unless set, ``error`` on exceptions)."""
+        self.status = status
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self.start
+        if exc_type is not None and self.status == "ok":
+            self.status = "error"
+        self.trace.finish_span(self)
+
+
+class _NoopSpan:
+    """Stand-in returned by span() when no turn is being traced."""
+
+    __slots__ = ()
+
+    def set_status(self, status: str) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class TurnTrace:
+    """
+    The spans recorded for one agent turn.
+
+    Args:
+        channel: Entry point that started the turn (e.g. ``agent``, ``sms``)
+        user_id: User the turn runs for
+        correlation_id: Request correlation ID; defaults to the current one
+    """
+
+    def __init__(
+        self,
+        channel: str = "agent",
+        user_id: Optional[int] = None,
+        correlation_id: Optional[str] = None,
+    ):
+        self.channel = channel
+        self.user_id = user_id
+        self.correlation_id = correlation_id or get_correlation_id()
+        self.spans: List[Span] = []
+        self.start = 0.0
+        self.duration = 0.0
+        self._token: Optional[contextvars.Token[Optional[TurnTrace]]] = None
+
+    def finish_span(self, span: Span) -> None:
+        """Keep a finished span and export its duration."""
+        self.spans.append(span)
+        _record_span(span)
+
+    def __enter__(self) -> "TurnTrace":
+        self.start = time.perf_counter()
+        self._token = _current_trace.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration = time.perf_counter() - self.start
+        if self._token is not None:
+            _current_trace.reset(self._token)
+            self._token = None
+        turn = Span(self, "turn")
+        turn.start, turn.duration = self.start, self.duration
+        if exc_type is not None:
+            turn.status = "error"
+        _record_span(turn)
+        if (
+            settings.AGENT_TRACE_LOG_WATERFALL
+            and self.duration * 1000 >= settings.AGENT_TRACE_WATERFALL_MIN_MS
+        ):
+            self.log_waterfall()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Spans in start order, with offsets from the turn start in milliseconds."""
+        return [
+            {
+                "stage": span.stage,
+                "tool": span.tool,
+                "model": span.model,
+                "status": span.status,
+                "offset_ms": round((span.start - self.start) * 1000, 1),
+                "duration_ms": round(span.duration * 1000, 1),
+            }
+            for span in sorted(self.spans, key=lambda span: span.start)
+        ]
+
+    def log_waterfall(self) -> None:
+        """Log the turn's spans as an indented waterfall."""
+        spans = self.summary()
+        lines = [
+            f"Turn waterfall ({self.channel}) for user {self.user_id}: "
+            f"{self.duration * 1000:.1f}ms, {len(spans)} spans"
+        ]
+        for span in spans:
+            label = span["stage"]
+            if span["tool"] or span["model"]:
+                label += f" [{span['tool'] or span['model']}]"
+            if span["status"] != "ok":
+                label += f" ({span['status']})"
+            lines.append(
+                f"  +{span['offset_ms']:>8.1f}ms {span['duration_ms']:>8.1f}ms  {label}"
+            )
+        logger.info(
+            "\n".join(lines),
+            extra={
+                "correlation_id": self.correlation_id,
+                "user_id": self.user_id,
+                "operation": "agent_turn_trace",
+                "metadata": {
+                    "duration_ms": round(self.duration * 1000, 1),
+                    "spans": spans,
+                },
+            },
+        )
+
+
+_current_trace: contextvars.ContextVar[Optional[TurnTrace]] = contextvars.ContextVar(
+    "agent_turn_trace", default=None
+)
+
+
+def start_turn(
+    channel: str = "agent",
+    user_id: Optional[int] = None,
+    correlation_id: Optional[str] = None,
+):
+    """
+    Trace an agent turn; use as ``with start_turn(...):`` around the turn.
+
+    Returns a no-op context manager when AGENT_TRACING_ENABLED is off.
+    """
+    if not settings.AGENT_TRACING_ENABLED:
+        return _NOOP_SPAN
+    return TurnTrace(channel, user_id, correlation_id)
+
+
+def span(stage: str, tool: Optional[str] = None, model: Optional[str] = None):
+    """
+    Time a stage of the current turn; use as ``with span("stage") as s:``.
+
+    Outside a traced turn this returns a shared no-op.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP_SPAN
+    return Span(trace, stage, tool, model)
+
+
+def traced(
+    stage: str,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorator that runs an async function inside ``span(stage)``."""
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            trace = _current_trace.get()
+            if trace is None:
+                return await func(*args, **kwargs)
+            with Span(trace, stage):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def get_current_trace() -> Optional[TurnTrace]:
+    """Get the trace of the turn running in this context, if any."""
+    return _current_trace.get()
+
+
+def _record_span(span: Span) -> None:
+    try:
+        get_metrics_service().record_agent_span(
+            span.stage,
+            span.duration,
+            tool=span.tool,
+            model=span.model,
+            status=span.status,
+        )
+    except Exception as e:
+        logger.debug(f"Failed to record span {span.stage}: {e}")
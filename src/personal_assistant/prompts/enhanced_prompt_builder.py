@@ -5,7 +5,8 @@ Enhanced Prompt Builder with Metadata Integration.
 Builds agent prompts with intelligent metadata loading based on user context.
 """
 
-from typing import Any, List
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..config.logging_config import get_logger
 from ..tools.base import ToolRegistry
@@ -26,6 +27,7 @@ class EnhancedPromptBuilder:
     - Intelligent tool requirement analysis
     - Progressive metadata enhancement
     - Maintains existing prompt structure
+    - Static sections and the tool list compiled once per registry version
     """
 
     def __init__(self, tool_registry: "ToolRegistry"):
@@ -39,6 +41,15 @@ class EnhancedPromptBuilder:
         self.metadata_manager = ToolMetadataManager()
         self.enhancement_manager = AIEnhancementManager()
 
+        # Sections that do not change between steps, compiled once per tool
+        # registry version; only the dynamic parts are rendered per build
+        self._compiled_version: Optional[int] = None
+        self._static_sections: Dict[str, str] = {}
+        self._static_section_bytes: Dict[str, int] = {}
+        self._metadata_cache: Dict[Tuple[str, ...], str] = {}
+        self.last_build_stats: Dict[str, Any] = {}
+        self._metrics = {"builds": 0, "compiles": 0, "total_build_ms": 0.0}
+
         # Initialize metadata for available tools
         self._initialize_tool_metadata()
 
@@ -110,13 +121,24 @@ class EnhancedPromptBuilder:
         Returns:
             str: Enhanced prompt with relevant metadata
         """
+        start = time.perf_counter()
+        static = self._get_static_sections()
         current_time = get_current_time_for_prompts()
 
         # Analyze which tools are likely needed
         required_tools = self._analyze_tool_requirements(state.user_input)
 
-        # Get contextual metadata for relevant tools
-        contextual_metadata = self._get_contextual_metadata(required_tools)
+        # Get contextual metadata for relevant tools (static per tool set)
+        key = tuple(required_tools)
+        contextual_metadata = self._metadata_cache.get(key)
+        if contextual_metadata is None:
+            contextual_metadata = self._get_contextual_metadata(required_tools)
+            self._metadata_cache[key] = contextual_metadata
+
+        memory_context = PromptHelpers.format_memory_context(state.memory_context)
+        conversation_history = PromptHelpers.format_conversation_history(
+            state.conversation_history
+        )
 
         # Build enhanced prompt
         base_prompt = f"""
@@ -138,13 +160,7 @@ class EnhancedPromptBuilder:
 • For calendar events: "Just to confirm, you want me to create a meeting on [date] at [time] with [attendees] - is that correct?"
 • For reminders: Execute directly using default notification channel (SMS) - no confirmation needed
 
-{self._build_core_guidelines()}
-
-{self._build_tool_usage_guidelines()}
-
-{self._build_reasoning_framework()}
-
-{self._build_context_strategies()}
+{static["guidelines"]}
 
 {self._build_adhd_optimizations(state)}
 
@@ -156,19 +172,95 @@ class EnhancedPromptBuilder:
 {contextual_metadata}
 
 💾 MEMORY & KNOWLEDGE CONTEXT:
-{PromptHelpers.format_memory_context(state.memory_context)}
+{memory_context}
 
 📚 CONVERSATION HISTORY:
-{PromptHelpers.format_conversation_history(state.conversation_history)}
+{conversation_history}
 
 🛠 AVAILABLE TOOLS (Basic):
-{PromptHelpers.format_tools_professional(self.tool_registry)}
+{static["tools"]}
 
 🎯 ACTION GUIDANCE:
 {self._build_action_guidance(state)}
 """
+        self._record_build(
+            start,
+            base_prompt,
+            {
+                "metadata": contextual_metadata,
+                "memory": memory_context,
+                "history": conversation_history,
+            },
+        )
         return base_prompt
 
+    def _get_static_sections(self) -> Dict[str, str]:
+        """
+        Get the compiled static sections, recompiling if the registry changed.
+
+        Returns:
+            Dict[str, str]: 'guidelines' (core, tool usage, reasoning and context
+            blocks) and 'tools' (the formatted tool list)
+        """
+        version = getattr(self.tool_registry, "version", None)
+        if version is not None and version == self._compiled_version:
+            return self._static_sections
+
+        self._static_sections = {
+            "guidelines": "\n\n".join(
+                [
+                    self._build_core_guidelines(),
+                    self._build_tool_usage_guidelines(),
+                    self._build_reasoning_framework(),
+                    self._build_context_strategies(),
+                ]
+            ),
+            "tools": PromptHelpers.format_tools_professional(self.tool_registry),
+        }
+        self._static_section_bytes = {
+            name: len(section.encode("utf-8"))
+            for name, section in self._static_sections.items()
+        }
+        self._metadata_cache.clear()
+        self._compiled_version = version
+        self._metrics["compiles"] += 1
+        logger.debug(
+            f"Compiled static prompt sections for registry version {version}: "
+            f"{self._static_section_bytes}"
+        )
+        return self._static_sections
+
+    def _record_build(
+        self, start: float, prompt: str, dynamic_sections: Dict[str, str]
+    ):
+        """Record build time and per-section byte counts for a built prompt."""
+        build_ms = (time.perf_counter() - start) * 1000
+        section_bytes = dict(self._static_section_bytes)
+        section_bytes.update(
+            (name, len(section.encode("utf-8")))
+            for name, section in dynamic_sections.items()
+        )
+        self.last_build_stats = {
+            "build_ms": round(build_ms, 3),
+            "total_bytes": len(prompt.encode("utf-8")),
+            "section_bytes": section_bytes,
+        }
+        self._metrics["builds"] += 1
+        self._metrics["total_build_ms"] += build_ms
+        logger.debug(f"Prompt build stats: {self.last_build_stats}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Prompt build counters and the stats of the last build."""
+        builds = self._metrics["builds"]
+        return {
+            "builds": builds,
+            "compiles": self._metrics["compiles"],
+            "avg_build_ms": (
+                round(self._metrics["total_build_ms"] / builds, 3) if builds else 0.0
+            ),
+            "last_build": self.last_build_stats,
+        }
+
     def _analyze_tool_requirements(self, user_input: str | list[Any]) -> List[str]:
         """
         Analyze user input to determine which tools are likely needed.
@@ -432,6 +524,7 @@ class EnhancedPromptBuilder:
 • Use multiple tools when needed to gather comprehensive useful information
 • Prefer tools that provide the most relevant and up-to-date information
 • Consider tool dependencies and execution order
+• Request independent tool calls together in one step (e.g. calendar and inbox) - they run in parallel
 
 📋 TOOL USAGE RULES:
 1. ALWAYS follow tool schemas exactly - provide all required parameters
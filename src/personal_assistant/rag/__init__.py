@@ -1,11 +1,14 @@
 # Configure module logger
 from ..config.logging_config import get_logger
 
+# Import resumable embedding backfill
+from .backfill import BackfillCheckpoint, EmbeddingBackfill, run_embedding_backfill
+
 # Import document processor
 from .document_processor import DocumentProcessor
 
 # Import embedding models
-from .embeddings import EmbeddingCache, GeminiEmbeddings, LRUCache
+from .embeddings import EmbeddingCache, GeminiEmbeddings, LRUCache, get_embedding_cache
 
 # Import content extractor
 from .notion_extractor import NotionContentExtractor
@@ -14,28 +17,43 @@ from .notion_extractor import NotionContentExtractor
 from .retriever import (
     embed_and_index,
     embed_text,
+    embed_texts,
     generate_embeddings_for_content,
     generate_missing_embeddings,
     get_embedding_model,
     get_embedding_stats,
     get_query_performance_stats,
     query_knowledge_base,
+    warm_embedding_cache,
 )
 
+# Import vector index backends
+from .vector_index import NumpyVectorIndex, PgVectorIndex, VectorIndex, get_vector_index
+
 logger = get_logger("rag")
 
 __all__ = [
     "query_knowledge_base",
     "embed_text",
+    "embed_texts",
     "embed_and_index",
     "get_embedding_stats",
     "get_embedding_model",
     "generate_embeddings_for_content",
     "generate_missing_embeddings",
     "get_query_performance_stats",
+    "warm_embedding_cache",
+    "EmbeddingBackfill",
+    "BackfillCheckpoint",
+    "run_embedding_backfill",
     "GeminiEmbeddings",
     "LRUCache",
     "EmbeddingCache",
+    "get_embedding_cache",
     "NotionContentExtractor",
     "DocumentProcessor",
+    "VectorIndex",
+    "NumpyVectorIndex",
+    "PgVectorIndex",
+    "get_vector_index",
 ]
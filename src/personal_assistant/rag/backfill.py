@@ -0,0 +1,413 @@
+"""
+Resumable embedding backfill for stored RAG documents.
+
+📁 rag/backfill.py
+Streams rag_document rows that have no embedding in keyset-paginated pages
+(``id > last_id ORDER BY id``), so memory stays flat however large the table
+is. A producer fetches pages into a bounded queue; workers embed each page
+with batched API calls and write it back with one bulk UPDATE. After every
+page the highest id below which all pages are written is saved as a
+checkpoint, so an interrupted run resumes where it stopped.
+
+Run from the command line::
+
+    python -m personal_assistant.rag.backfill [--user-id N] [--restart]
+
+or as the ``rag_tasks.backfill_embeddings`` Celery task.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import Text, cast, func, or_, select, update
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from ..database.models.conversation_message import ConversationMessage
+from ..database.models.conversation_state import ConversationState
+from ..database.session import AsyncSessionLocal
+from .retriever import embed_texts
+from .vector_index import get_vector_index
+
+# Configure module logger
+logger = get_logger("rag")
+
+# (message id, content, additional_data, owning user id)
+BackfillRow = Tuple[int, Optional[str], Optional[dict], Optional[int]]
+
+
+class BackfillError(RuntimeError):
+    """Raised when a page cannot be embedded at all, e.g. the API is down."""
+
+
+class BackfillCheckpoint:
+    """
+    Backfill progress persisted as a small JSON file.
+
+    Writes go to a temporary file that is renamed over the checkpoint, so a
+    crash never leaves a truncated file behind.
+
+    Args:
+        path: Checkpoint file path
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    @classmethod
+    def for_scope(cls, user_id: Optional[int] = None) -> "BackfillCheckpoint":
+        """Checkpoint under RAG_BACKFILL_CHECKPOINT_DIR for one user, or for all users."""
+        name = f"user_{user_id}" if user_id else "all_users"
+        return cls(
+            os.path.join(
+                settings.RAG_BACKFILL_CHECKPOINT_DIR, f"embeddings_{name}.json"
+            )
+        )
+
+    def load(self) -> Dict[str, Any]:
+        """Saved progress, or an empty dict when there is none."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable backfill checkpoint {self.path}: {e}")
+            return {}
+
+    def save(self, state: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class EmbeddingBackfill:
+    """
+    Embed every stored RAG document that has no embedding yet.
+
+    Args:
+        user_id: Only backfill this user's documents (None for all users)
+        page_size: Rows fetched, embedded and written per page
+        workers: Pages embedded and written concurrently
+        checkpoint: Where progress is saved; None runs without resuming
+        session_factory: Async session factory
+        embed: Batched embedding function, one vector ([] on failure) per text
+        index_documents: Add new embeddings to the vector index
+    """
+
+    def __init__(
+        self,
+        user_id: Optional[int] = None,
+        page_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        checkpoint: Optional[BackfillCheckpoint] = None,
+        session_factory=AsyncSessionLocal,
+        embed: Callable[[List[str]], Awaitable[List[List[float]]]] = embed_texts,
+        index_documents: bool = True,
+    ):
+        self.user_id = user_id
+        self.page_size = max(1, page_size or settings.RAG_BACKFILL_PAGE_SIZE)
+        self.workers = max(1, workers or settings.RAG_BACKFILL_WORKERS)
+        self.checkpoint = checkpoint
+        self._session_factory = session_factory
+        self._embed = embed
+        self.index_documents = index_documents
+
+        self.last_id = 0
+        self.stats = {"processed": 0, "successful": 0, "failed": 0, "skipped": 0}
+        self.total = 0
+        self._started_at = 0.0
+        self._run_processed = 0
+        # Pages are numbered as fetched; the checkpoint only moves past a page
+        # once it and every page before it have been written
+        self._next_page = 0
+        self._done_pages: Dict[int, int] = {}
+
+    # ============================================================================
+    # Database access
+    # ============================================================================
+
+    def _filter(self, stmt):
+        """Restrict a statement to rag_document rows that still need an embedding."""
+        embedding = ConversationMessage.additional_data["embedding"]
+        stmt = stmt.where(ConversationMessage.message_type == "rag_document").where(
+            or_(
+                ConversationMessage.additional_data.is_(None),
+                func.json_typeof(embedding).is_distinct_from("array"),
+                cast(embedding, Text) == "[]",
+            )
+        )
+        if self.user_id:
+            stmt = stmt.join(
+                ConversationState,
+                ConversationState.conversation_id
+                == ConversationMessage.conversation_id,
+            ).where(ConversationState.user_id == self.user_id)
+        return stmt
+
+    async def count_remaining(self, after_id: int = 0) -> int:
+        """Number of documents after ``after_id`` that need an embedding."""
+        async with self._session_factory() as session:
+            stmt = self._filter(select(func.count(ConversationMessage.id))).where(
+                ConversationMessage.id > after_id
+            )
+            return int((await session.execute(stmt)).scalar() or 0)
+
+    async def fetch_page(self, after_id: int) -> List[BackfillRow]:
+        """The next page of documents needing an embedding, by ascending id."""
+        stmt = select(
+            ConversationMessage.id,
+            ConversationMessage.content,
+            ConversationMessage.additional_data,
+            ConversationState.user_id,
+        )
+        if not self.user_id:
+            stmt = stmt.outerjoin(
+                ConversationState,
+                ConversationState.conversation_id
+                == ConversationMessage.conversation_id,
+            )
+        stmt = (
+            self._filter(stmt)
+            .where(ConversationMessage.id > after_id)
+            .order_by(ConversationMessage.id)
+            .limit(self.page_size)
+        )
+        async with self._session_factory() as session:
+            result = await session.execute(stmt)
+            return [tuple(row) for row in result.all()]
+
+    async def write_page(self, rows: List[BackfillRow], embeddings: List[List[float]]):
+        """Store a page of embeddings with one executemany UPDATE, then index them."""
+        async with self._session_factory() as session:
+            await session.execute(
+                update(ConversationMessage),
+                [
+                    {
+                        "id": message_id,
+                        "additional_data": {
+                            **(additional_data or {}),
+                            "embedding": embedding,
+                        },
+                    }
+                    for (message_id, _, additional_data, _), embedding in zip(
+                        rows, embeddings
+                    )
+                ],
+            )
+            await session.commit()
+
+        if self.index_documents:
+            index = await get_vector_index()
+            for (message_id, _, _, user_id), embedding in zip(rows, embeddings):
+                if user_id:
+                    await index.add(user_id, message_id, embedding)
+
+    # ============================================================================
+    # Pipeline
+    # ============================================================================
+
+    async def _produce(self, queue: asyncio.Queue, after_id: int) -> None:
+        page_number = 0
+        try:
+            while True:
+                rows = await self.fetch_page(after_id)
+                if not rows:
+                    break
+                await queue.put((page_number, rows))
+                page_number += 1
+                after_id = rows[-1][0]
+                if len(rows) < self.page_size:
+                    break
+        finally:
+            for _ in range(self.workers):
+                await queue.put(None)
+
+    async def _consume(self, queue: asyncio.Queue) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            page_number, rows = item
+            await self._process_page(rows)
+            self._complete_page(page_number, rows[-1][0])
+
+    async def _process_page(self, rows: List[BackfillRow]) -> None:
+        with_content = [row for row in rows if row[1]]
+        self.stats["skipped"] += len(rows) - len(with_content)
+
+        embeddings = (
+            await self._embed([row[1] for row in with_content]) if with_content else []
+        )
+        embedded = [
+            (row, embedding)
+            for row, embedding in zip(with_content, embeddings)
+            if embedding
+        ]
+        if with_content and not embedded:
+            raise BackfillError(
+                f"No embeddings returned for documents {with_content[0][0]}-{with_content[-1][0]}"
+            )
+
+        if embedded:
+            await self.write_page(
+                [row for row, _ in embedded], [e for _, e in embedded]
+            )
+
+        self.stats["processed"] += len(rows)
+        self.stats["successful"] += len(embedded)
+        self.stats["failed"] += len(with_content) - len(embedded)
+        self._run_processed += len(rows)
+
+    def _complete_page(self, page_number: int, last_id: int) -> None:
+        self._done_pages[page_number] = last_id
+        advanced = False
+        while self._next_page in self._done_pages:
+            self.last_id = self._done_pages.pop(self._next_page)
+            self._next_page += 1
+            advanced = True
+        if advanced:
+            self._save_checkpoint()
+            progress = self.get_progress()
+            logger.info(
+                f"Embedding backfill: {progress['processed_this_run']}/{self.total} documents "
+                f"({progress['rows_per_second']} rows/s), checkpoint at id {self.last_id}"
+            )
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint is None:
+            return
+        try:
+            self.checkpoint.save(
+                {
+                    "last_id": self.last_id,
+                    **self.stats,
+                    "updated_at": datetime.utcnow().isoformat(),
+                }
+            )
+        except OSError as e:
+            logger.warning(f"Could not save backfill checkpoint: {e}")
+
+    def get_progress(self) -> Dict[str, Any]:
+        """Counters for this run and, when resumed, the runs before it."""
+        elapsed = time.perf_counter() - self._started_at if self._started_at else 0.0
+        return {
+            **self.stats,
+            "last_id": self.last_id,
+            "processed_this_run": self._run_processed,
+            "remaining_at_start": self.total,
+            "elapsed_seconds": round(elapsed, 2),
+            "rows_per_second": round(self._run_processed / elapsed, 1)
+            if elapsed
+            else 0.0,
+        }
+
+    async def run(self, restart: bool = False) -> Dict[str, Any]:
+        """
+        Run the backfill to completion, resuming from the checkpoint.
+
+        Documents whose embedding failed are passed over and picked up again
+        by a run with ``restart=True``. If a whole page fails the run stops,
+        with the checkpoint still before that page.
+
+        Args:
+            restart: Ignore the saved checkpoint and scan from the first document
+
+        Returns:
+            Progress counters, plus "error" if the run stopped early
+        """
+        if self.checkpoint is not None:
+            if restart:
+                self.checkpoint.clear()
+            saved = self.checkpoint.load()
+            self.last_id = int(saved.get("last_id", 0))
+            for key in self.stats:
+                self.stats[key] = int(saved.get(key, 0))
+        resumed_from = self.last_id
+
+        self._started_at = time.perf_counter()
+        self.total = await self.count_remaining(self.last_id)
+        logger.info(
+            f"Embedding backfill starting: {self.total} documents to embed"
+            + (f", resuming after id {resumed_from}" if resumed_from else "")
+        )
+
+        # At most workers pages waiting plus workers pages in flight
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers)
+        tasks = [asyncio.create_task(self._produce(queue, self.last_id))] + [
+            asyncio.create_task(self._consume(queue)) for _ in range(self.workers)
+        ]
+        error = None
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Embedding backfill stopped at id {self.last_id}: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        result = {**self.get_progress(), "resumed_from": resumed_from}
+        if error:
+            result["error"] = error
+        else:
+            logger.info(f"Embedding backfill complete: {result}")
+        return result
+
+
+async def run_embedding_backfill(
+    user_id: Optional[int] = None,
+    restart: bool = False,
+    page_size: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run a checkpointed backfill for one user or for all users."""
+    backfill = EmbeddingBackfill(
+        user_id=user_id,
+        page_size=page_size,
+        workers=workers,
+        checkpoint=BackfillCheckpoint.for_scope(user_id),
+    )
+    return await backfill.run(restart=restart)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Embed stored RAG documents that have no embedding yet."
+    )
+    parser.add_argument(
+        "--user-id", type=int, help="Only backfill this user's documents"
+    )
+    parser.add_argument("--page-size", type=int, help="Rows per page")
+    parser.add_argument("--workers", type=int, help="Pages processed concurrently")
+    parser.add_argument(
+        "--restart", action="store_true", help="Ignore the checkpoint and rescan"
+    )
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(
+        run_embedding_backfill(
+            user_id=args.user_id,
+            restart=args.restart,
+            page_size=args.page_size,
+            workers=args.workers,
+        )
+    )
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
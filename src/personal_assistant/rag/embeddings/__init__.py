@@ -2,7 +2,7 @@
 Embedding models for RAG system.
 """
 
-from .cache import EmbeddingCache, LRUCache
+from .cache import EmbeddingCache, LRUCache, get_embedding_cache
 from .gemini_embeddings import GeminiEmbeddings
 
-__all__ = ["GeminiEmbeddings", "LRUCache", "EmbeddingCache"]
+__all__ = ["GeminiEmbeddings", "LRUCache", "EmbeddingCache", "get_embedding_cache"]
@@ -2,13 +2,21 @@
 Caching utilities for embeddings and RAG operations.
 """
 
+import hashlib
 import logging
+import sys
 import time
+import unicodedata
+from array import array
 from collections import OrderedDict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence
+
+from ...config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+_REDIS_KEY_PREFIX = "pa:embedding:"
+
 
 class LRUCache:
     """
@@ -81,57 +89,159 @@ class LRUCache:
         return list(self.cache.keys())
 
 
-class EmbeddingCache:
-    """
-    Specialized cache for embeddings with metadata.
-    """
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: NFC, trimmed, whitespace runs collapsed."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600):
-        """
-        Initialize embedding cache.
 
-        Args:
-            max_size: Maximum number of embeddings to cache
-            ttl_seconds: Time to live for embeddings (1 hour default)
-        """
-        self.cache = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
-        self.stats = {"hits": 0, "misses": 0, "total_requests": 0}
+def embedding_cache_key(model: str, text: str) -> str:
+    """Content address of an embedding: SHA-256 of the model and normalized text."""
+    payload = f"{model}\0{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def pack_embedding(embedding: Sequence[float]) -> bytes:
+    """Encode an embedding as little-endian float32 (4 bytes per dimension)."""
+    values = array("f", embedding)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tobytes()
 
-    def get_embedding(self, text: str) -> Optional[list]:
-        """Get cached embedding for text."""
-        self.stats["total_requests"] += 1
 
-        cache_key = self._get_cache_key(text)
-        embedding = self.cache.get(cache_key)
+def unpack_embedding(payload: bytes) -> List[float]:
+    """Decode an embedding packed by pack_embedding."""
+    values = array("f")
+    values.frombytes(payload)
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values.tolist()
 
-        if embedding is not None:
-            self.stats["hits"] += 1
-            logger.debug(f"Embedding cache hit for text of length {len(text)}")
-        else:
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache shared by every process.
+
+    Keys are embedding_cache_key(model, text), so identical texts map to the
+    same entry in every API and Celery worker and across restarts. Values are
+    stored as packed float32. Lookups go to a bounded in-process LRU, then to
+    the optional Redis tier; Redis failures are logged and treated as misses.
+
+    Args:
+        max_size: Embeddings kept in the in-process LRU
+        ttl_seconds: Lifetime of in-process entries (None = no expiry)
+        redis_client: Optional ``redis.asyncio`` client (decode_responses=False)
+        redis_ttl_seconds: Lifetime of Redis entries
+    """
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        redis_client=None,
+        redis_ttl_seconds: Optional[int] = None,
+    ):
+        self.cache = LRUCache(
+            max_size=max_size or settings.RAG_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=ttl_seconds,
+        )
+        self._redis = redis_client
+        self._redis_ttl = (
+            redis_ttl_seconds or settings.RAG_EMBEDDING_CACHE_REDIS_TTL_SECONDS
+        )
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "total_requests": 0}
+
+    async def get_embedding(self, model: str, text: str) -> Optional[List[float]]:
+        """Get the cached embedding of text under model, or None."""
+        self.stats["total_requests"] += 1
+        key = embedding_cache_key(model, text)
+        payload = self.cache.get(key)
+
+        if payload is None and self._redis is not None:
+            try:
+                payload = await self._redis.get(f"{_REDIS_KEY_PREFIX}{key}")
+                if payload:
+                    self.cache.put(key, payload)
+                    self.stats["redis_hits"] += 1
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis read failed: {e}")
+                payload = None
+
+        if not payload:
             self.stats["misses"] += 1
             logger.debug(f"Embedding cache miss for text of length {len(text)}")
+            return None
 
-        return embedding
-
-    def put_embedding(self, text: str, embedding: list):
-        """Cache embedding for text."""
-        cache_key = self._get_cache_key(text)
-        self.cache.put(cache_key, embedding)
+        self.stats["hits"] += 1
+        logger.debug(f"Embedding cache hit for text of length {len(text)}")
+        return unpack_embedding(payload)
+
+    async def put_embedding(self, model: str, text: str, embedding: Sequence[float]):
+        """Cache the embedding of text under model in every tier."""
+        if not embedding:
+            return
+        key = embedding_cache_key(model, text)
+        payload = pack_embedding(embedding)
+        self.cache.put(key, payload)
+
+        if self._redis is not None:
+            try:
+                await self._redis.set(
+                    f"{_REDIS_KEY_PREFIX}{key}", payload, ex=self._redis_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Embedding cache Redis write failed: {e}")
         logger.debug(f"Cached embedding for text of length {len(text)}")
 
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text."""
-        return str(hash(text))
-
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         total = self.stats["total_requests"]
         hit_rate = self.stats["hits"] / total if total > 0 else 0
 
-        return {**self.stats, "hit_rate": hit_rate, "cache_size": self.cache.size()}
+        return {
+            **self.stats,
+            "hit_rate": hit_rate,
+            "cache_size": self.cache.size(),
+            "cache_bytes": sum(len(payload) for payload in self.cache.cache.values()),
+            "redis_enabled": self._redis is not None,
+        }
 
     def clear(self):
-        """Clear the cache."""
+        """Clear the in-process tier (shared entries are left in place)."""
         self.cache.clear()
-        self.stats = {"hits": 0, "misses": 0, "total_requests": 0}
+        self.stats = {"hits": 0, "redis_hits": 0, "misses": 0, "total_requests": 0}
         logger.info("Embedding cache cleared")
+
+
+# Global embedding cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache, creating it on first use."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        redis_client = None
+        if settings.RAG_EMBEDDING_CACHE_REDIS_URL:
+            import redis.asyncio as async_redis
+
+            # Values are raw float32 bytes, so responses are not decoded
+            redis_client = async_redis.Redis.from_url(
+                settings.RAG_EMBEDDING_CACHE_REDIS_URL,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+        _embedding_cache = EmbeddingCache(
+            ttl_seconds=settings.RAG_EMBEDDING_CACHE_TTL or None,
+            redis_client=redis_client,
+        )
+        logger.info(
+            f"Embedding cache initialized (redis tier: {redis_client is not None})"
+        )
+    return _embedding_cache
+
+
+def set_embedding_cache(cache: Optional[EmbeddingCache]) -> None:
+    """Override the process-wide embedding cache (e.g. for tests); None resets it."""
+    global _embedding_cache
+    _embedding_cache = cache
@@ -3,11 +3,14 @@ Gemini embeddings for RAG system.
 Integrates with existing GeminiLLM class for text embedding generation.
 """
 
+import asyncio
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from ...config.settings import settings
 from ...llm.gemini import GeminiLLM
+from ...tools.execution import run_blocking
+from .cache import EmbeddingCache, embedding_cache_key, get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -19,7 +22,10 @@ class GeminiEmbeddings:
     """
 
     def __init__(
-        self, api_key: Optional[str] = None, model: str = "gemini-embedding-001"
+        self,
+        api_key: Optional[str] = None,
+        model: str = "gemini-embedding-001",
+        cache: Optional[EmbeddingCache] = None,
     ):
         """
         Initialize Gemini embeddings.
@@ -27,13 +33,13 @@ class GeminiEmbeddings:
         Args:
             api_key: Gemini API key (uses settings if not provided)
             model: Embedding model name (default: gemini-embedding-001)
+            cache: Embedding cache (defaults to the process-wide shared cache)
         """
         self.api_key = api_key or settings.GOOGLE_API_KEY
         self.model = model
         self._llm_client: GeminiLLM | None = None
-        self._embedding_cache: dict[str, list[float]] = {}
-        self._cache_hits = 0
-        self._cache_misses = 0
+        self._cache = cache or get_embedding_cache()
+        self.api_stats = {"requests": 0, "texts": 0, "retries": 0, "failures": 0}
 
         if not self.api_key:
             logger.warning("No Gemini API key provided. Embeddings will fail.")
@@ -62,85 +68,148 @@ class GeminiEmbeddings:
             logger.warning("Empty text provided for embedding")
             return []
 
-        # Check cache first
-        cache_key = self._get_cache_key(text)
-        if cache_key in self._embedding_cache:
-            self._cache_hits += 1
-            logger.debug(f"Cache hit for text of length {len(text)}")
-            return self._embedding_cache[cache_key]
-
-        try:
-            # Generate embedding using existing GeminiLLM
-            llm_client = self._get_llm_client()
-
-            # Use the existing embed_text method from GeminiLLM
-            if llm_client is None:
-                raise ValueError("LLM client not initialized")
-            embedding = llm_client.embed_text(text)
-
-            if embedding:
-                # Cache the result
-                self._embedding_cache[cache_key] = embedding
-                self._cache_misses += 1
-
-                logger.debug(
-                    f"Generated embedding of length {len(embedding)} for text of length {len(text)}"
-                )
-                return embedding
-            else:
-                logger.error("No embedding returned from Gemini API")
-                return []
-
-        except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
-            return []
+        return (await self.embed_batch([text]))[0]
 
     async def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts.
 
+        Texts with the same cache key are embedded once, cached texts are not
+        sent at all, and the rest go out in chunks of RAG_EMBEDDING_BATCH_SIZE
+        with at most RAG_EMBEDDING_MAX_CONCURRENT_BATCHES requests in flight.
+        The blocking SDK call runs off the event loop.
+
         Args:
             texts: List of texts to embed
 
         Returns:
-            List of embedding vectors
+            List of embedding vectors, in input order; [] for empty texts and
+            texts that failed after retries
         """
         if not texts:
             return []
 
-        embeddings = []
+        # Dedupe on the content address, keeping the first spelling of each text
+        unique: Dict[str, str] = {}
+        keys: List[Optional[str]] = []
         for text in texts:
-            embedding = await self.embed_text(text)
-            embeddings.append(embedding)
+            if not text or not text.strip():
+                keys.append(None)
+                continue
+            key = embedding_cache_key(self.model, text)
+            unique.setdefault(key, text)
+            keys.append(key)
+
+        cached = await asyncio.gather(
+            *(self._cache.get_embedding(self.model, text) for text in unique.values())
+        )
+        embeddings: Dict[str, List[float]] = {
+            key: embedding
+            for key, embedding in zip(unique, cached)
+            if embedding is not None
+        }
+
+        missing = [(key, text) for key, text in unique.items() if key not in embeddings]
+        if missing:
+            batch_size = max(1, settings.RAG_EMBEDDING_BATCH_SIZE)
+            # Created per call, so the instance is not tied to one event loop
+            semaphore = asyncio.Semaphore(
+                max(1, settings.RAG_EMBEDDING_MAX_CONCURRENT_BATCHES)
+            )
+            chunks = [
+                missing[i : i + batch_size] for i in range(0, len(missing), batch_size)
+            ]
+            for chunk_result in await asyncio.gather(
+                *(self._embed_chunk(chunk, semaphore) for chunk in chunks)
+            ):
+                embeddings.update(chunk_result)
+
+            logger.debug(
+                f"Embedded {len(missing)} of {len(unique)} unique texts "
+                f"({len(texts)} requested) in {len(chunks)} batches"
+            )
+
+        return [embeddings.get(key, []) if key else [] for key in keys]
+
+    async def _embed_chunk(
+        self, chunk: List[tuple], semaphore: asyncio.Semaphore
+    ) -> Dict[str, List[float]]:
+        """
+        Embed one chunk of (key, text) pairs and cache the results.
 
-        return embeddings
+        The chunk is sent as one request; if that keeps failing, each text is
+        retried on its own so one bad text does not fail its neighbours.
+        """
+        texts = [text for _, text in chunk]
+        vectors = await self._call_with_retries(texts, semaphore)
+        if vectors is None and len(chunk) > 1:
+            vectors = [
+                (result or [None])[0]
+                for result in await asyncio.gather(
+                    *(self._call_with_retries([text], semaphore) for text in texts)
+                )
+            ]
 
-    def _get_cache_key(self, text: str) -> str:
-        """Generate cache key for text."""
-        # Simple hash-based cache key
-        return str(hash(text))
+        results: Dict[str, List[float]] = {}
+        for (key, text), vector in zip(chunk, vectors or [None] * len(chunk)):
+            if vector:
+                results[key] = vector
+                await self._cache.put_embedding(self.model, text, vector)
+            else:
+                self.api_stats["failures"] += 1
+                logger.error(f"Failed to embed text of length {len(text)}")
+        return results
+
+    async def _call_with_retries(
+        self, texts: List[str], semaphore: asyncio.Semaphore
+    ) -> Optional[List[List[float]]]:
+        """Call the batch API with exponential backoff; None if every attempt fails."""
+        try:
+            llm_client = self._get_llm_client()
+        except Exception as e:
+            logger.error(f"Error generating embedding: {e}")
+            return None
+
+        attempts = max(1, settings.RAG_EMBEDDING_MAX_RETRIES)
+        for attempt in range(attempts):
+            try:
+                async with semaphore:
+                    self.api_stats["requests"] += 1
+                    self.api_stats["texts"] += len(texts)
+                    return await run_blocking("Embeddings", llm_client.embed_batch, texts)
+            except Exception as e:
+                if attempt + 1 == attempts:
+                    logger.error(
+                        f"Embedding request for {len(texts)} texts failed after "
+                        f"{attempts} attempts: {e}"
+                    )
+                    return None
+                self.api_stats["retries"] += 1
+                delay = settings.RAG_EMBEDDING_RETRY_BACKOFF_SECONDS * (2**attempt)
+                logger.warning(
+                    f"Embedding request for {len(texts)} texts failed ({e}); "
+                    f"retrying in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+        return None
 
     def get_cache_stats(self) -> dict:
         """Get cache performance statistics."""
-        total_requests = self._cache_hits + self._cache_misses
-        hit_rate = self._cache_hits / total_requests if total_requests > 0 else 0
-
+        stats = self._cache.get_stats()
         return {
-            "cache_hits": self._cache_hits,
-            "cache_misses": self._cache_misses,
-            "total_requests": total_requests,
-            "hit_rate": hit_rate,
-            "cache_size": len(self._embedding_cache),
+            "cache_hits": stats["hits"],
+            "cache_misses": stats["misses"],
+            "total_requests": stats["total_requests"],
+            "hit_rate": stats["hit_rate"],
+            "cache_size": stats["cache_size"],
+            "cache_bytes": stats["cache_bytes"],
+            "redis_enabled": stats["redis_enabled"],
+            "api_requests": self.api_stats["requests"],
+            "api_texts": self.api_stats["texts"],
+            "api_retries": self.api_stats["retries"],
+            "api_failures": self.api_stats["failures"],
         }
 
     def clear_cache(self):
-        """Clear the embedding cache."""
-        self._embedding_cache.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
-        logger.info("Embedding cache cleared")
-
-    def __del__(self):
-        """Cleanup when object is destroyed."""
-        if hasattr(self, "_embedding_cache"):
-            self.clear_cache()
+        """Clear the in-process tier of the embedding cache."""
+        self._cache.clear()
@@ -3,6 +3,7 @@ Notion content extractor for RAG indexing.
 Extracts and normalizes content from Notion notes for vector embedding.
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional
@@ -289,24 +290,31 @@ class NotionContentExtractor:
         return False
 
     async def extract_multiple_notes(
-        self, note_ids: List[str], user_id: int
+        self, note_ids: List[str], user_id: int, max_concurrency: int = 4
     ) -> Dict[str, Dict[str, Any]]:
         """
-        Extract content from multiple notes.
+        Extract content from multiple notes concurrently.
 
         Args:
             note_ids: List of note IDs to extract
             user_id: User ID for the notes
+            max_concurrency: Maximum number of notes fetched at once
 
         Returns:
-            Dictionary mapping note IDs to structured content
+            Dictionary mapping note IDs to structured content, in input order
         """
-        results = {}
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
 
-        for note_id in note_ids:
-            content = await self.extract_note_content(note_id, user_id)
-            if content:
-                results[note_id] = content
+        async def extract(note_id: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.extract_note_content(note_id, user_id)
+
+        contents = await asyncio.gather(*(extract(note_id) for note_id in note_ids))
+        results = {
+            note_id: content
+            for note_id, content in zip(note_ids, contents)
+            if content
+        }
 
         logger.info(
             f"Extracted content from {len(results)} out of {len(note_ids)} notes"
@@ -3,15 +3,21 @@ Handles semantic search and retrieval from embedded knowledge sources.
 Enhanced with real Gemini embeddings and prepared for Notion integration.
 """
 
-from typing import Any, Dict, List
+import time
+from typing import Any, Dict, List, Optional
 
-import numpy as np
 from sqlalchemy import func, select
 
 from ..config.logging_config import get_logger
+from ..config.settings import settings
 from ..database.models.conversation_message import ConversationMessage
+from ..database.models.conversation_state import ConversationState
 from ..database.session import AsyncSessionLocal
+from ..monitoring.tracing import span
+from ..utils.similarity import cosine_similarity as _cosine_similarity
+from .embeddings.cache import get_embedding_cache
 from .embeddings.gemini_embeddings import GeminiEmbeddings
+from .vector_index import VectorIndex, get_vector_index
 
 # Configure module logger
 logger = get_logger("rag")
@@ -57,13 +63,32 @@ async def embed_text(text: str) -> List[float]:
         return []
 
 
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Generate embeddings for several texts with batched Gemini requests.
+
+    Args:
+        texts: Texts to embed
+
+    Returns:
+        One embedding per text, in order; [] for texts that could not be embedded
+    """
+    try:
+        return await get_embedding_model().embed_batch(texts)
+    except Exception as e:
+        logger.error(f"Error generating embeddings for {len(texts)} texts: {e}")
+        return [[] for _ in texts]
+
+
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """
     Calculate cosine similarity between two vectors.
+
+    Kept for single-pair callers; ranking many vectors should go through
+    ``utils.similarity.EmbeddingMatrix`` or the vector index instead.
     """
     try:
-        v1, v2 = np.array(vec1), np.array(vec2)
-        return float(np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+        return _cosine_similarity(vec1, vec2)
     except Exception as e:
         logger.error(f"Error calculating cosine similarity: {e}")
         return 0.0
@@ -165,6 +190,11 @@ async def embed_and_index(document: str, metadata: Dict) -> None:
             session.add(message)
             await session.commit()
 
+            # Keep the vector index in step with the stored document
+            if user_id > 0:
+                index = await get_vector_index()
+                await index.add(user_id, message.id, embedding)
+
             logger.info(
                 f"Successfully indexed document for user {user_id} in conversation {conversation_id}"
             )
@@ -173,10 +203,45 @@ async def embed_and_index(document: str, metadata: Dict) -> None:
         logger.error(f"Error in embed_and_index: {e}")
 
 
+async def _bootstrap_user_index(session, index: VectorIndex, user_id: int) -> int:
+    """
+    Build a user's vector index partition from stored RAG documents.
+
+    Runs once per user for backends that are not maintained on write (the
+    NumPy fallback on a fresh node); rows are streamed rather than loaded at once.
+    """
+    stmt = (
+        select(ConversationMessage.id, ConversationMessage.additional_data)
+        .join(
+            ConversationState,
+            ConversationState.conversation_id == ConversationMessage.conversation_id,
+        )
+        .where(ConversationState.user_id == user_id)
+        .where(ConversationMessage.message_type == "rag_document")
+        .where(ConversationMessage.additional_data.isnot(None))
+        .execution_options(yield_per=500)
+    )
+
+    items: list[tuple[int, list[float]]] = []
+    result = await session.stream(stmt)
+    async for message_id, additional_data in result:
+        embedding = (
+            additional_data.get("embedding")
+            if isinstance(additional_data, dict)
+            else None
+        )
+        if isinstance(embedding, list) and embedding:
+            items.append((message_id, embedding))
+
+    return await index.bulk_load(user_id, items)
+
+
 async def query_knowledge_base(user_id: int, input_text: str) -> List[Dict]:
     """
     Retrieve relevant documents based on semantic similarity.
-    Enhanced to use real embeddings and prepared for Notion integration.
+
+    Candidates come from the user's partition of the vector index, so the cost
+    of a query no longer grows with the size of the whole knowledge base.
     """
     try:
         async with AsyncSessionLocal() as session:
@@ -186,81 +251,52 @@ async def query_knowledge_base(user_id: int, input_text: str) -> List[Dict]:
                 return []
 
             # Get query embedding using real Gemini embeddings
-            query_vector = await embed_text(input_text)
+            with span("rag.embed"):
+                query_vector = await embed_text(input_text)
 
             if not query_vector:
                 logger.error("Failed to generate query embedding, cannot proceed")
                 return []
 
-            # Query conversation messages with embeddings
-            stmt = (
-                select(ConversationMessage)
-                .where(ConversationMessage.message_type == "rag_document")
-                .where(ConversationMessage.additional_data.isnot(None))
-            )
+            index = await get_vector_index()
+            if not await index.is_ready(user_id):
+                loaded = await _bootstrap_user_index(session, index, user_id)
+                logger.info(
+                    f"Bootstrapped {index.name} vector index for user {user_id} with {loaded} documents"
+                )
 
-            result = await session.execute(stmt)
-            messages = result.scalars().all()
+            with span("rag.search"):
+                hits = await index.search(
+                    user_id, query_vector, top_k=settings.RAG_MAX_RESULTS
+                )
 
-            if not messages:
+            if not hits:
                 logger.debug(f"No RAG documents found for user {user_id}")
                 return []
 
-            # Calculate similarities
-            scored: list[tuple[ConversationMessage, float]] = []
-            for message in messages:
-                # Check if message has embedding in additional_data
-                if message.additional_data and "embedding" in message.additional_data:
-                    try:
-                        chunk_embedding = message.additional_data["embedding"]
-
-                        # Validate embedding format
-                        if not isinstance(chunk_embedding, list) or not chunk_embedding:
-                            logger.warning(
-                                f"Invalid embedding format for message {message.id}: not a list or empty"
-                            )
-                            continue
-
-                        # Ensure all elements are numeric (skip validation for ColumnElement)
-                        # chunk_embedding is a ColumnElement[Any] from SQLAlchemy
-
-                    except Exception as e:
-                        logger.warning(
-                            f"Error processing message {message.id} embedding: {e}"
-                        )
-                        continue
-
-                    similarity = cosine_similarity(query_vector, chunk_embedding)
-
-                    # Create metadata dict from additional_data
-                    metadata_dict = message.additional_data.copy()
-                    metadata_dict.update(
-                        {
-                            "source": "normalized_storage",
-                            "message_id": message.id,
-                            "conversation_id": message.conversation_id,
-                            "similarity_score": similarity,
-                        }
-                    )
-
-                    scored.append(
-                        (
-                            message,
-                            similarity,
-                        )
-                    )
-
-            # Sort by similarity and return top results
-            scored.sort(key=lambda x: x[1], reverse=True)
+            # Fetch only the content of the top-k documents, not their embeddings
+            with span("rag.fetch"):
+                result = await session.execute(
+                    select(
+                        ConversationMessage.id,
+                        ConversationMessage.content,
+                        ConversationMessage.conversation_id,
+                    ).where(ConversationMessage.id.in_([doc_id for doc_id, _ in hits]))
+                )
+            rows = {row.id: row for row in result.all()}
 
-            # Return top 5 results instead of 3 for better coverage
             results: list[dict[str, Any]] = []
-            for message, similarity in scored[:5]:
+            for doc_id, similarity in hits:
+                row = rows.get(doc_id)
+                if row is None:
+                    # Document deleted since it was indexed
+                    await index.remove(user_id, doc_id)
+                    continue
                 results.append(
                     {
-                        "content": message.content,
+                        "content": row.content,
                         "metadata": {
-                            "conversation_id": message.conversation_id,
+                            "conversation_id": row.conversation_id,
                             "similarity_score": similarity,
                         },
                     }
@@ -276,6 +312,60 @@ async def query_knowledge_base(user_id: int, input_text: str) -> List[Dict]:
         return []
 
 
+async def warm_embedding_cache(limit: Optional[int] = None) -> int:
+    """
+    Pre-populate the embedding cache from stored RAG documents.
+
+    Loads the most recent documents' stored embeddings, so re-embedding their
+    text (re-indexing, backfills, repeated queries) never calls the API. With
+    the Redis tier enabled one warm-up serves every process.
+
+    Args:
+        limit: Documents to load (defaults to RAG_EMBEDDING_CACHE_WARMUP_ROWS)
+
+    Returns:
+        Number of embeddings loaded
+    """
+    limit = limit if limit is not None else settings.RAG_EMBEDDING_CACHE_WARMUP_ROWS
+    if limit <= 0:
+        return 0
+
+    model = get_embedding_model().model
+    cache = get_embedding_cache()
+    stmt = (
+        select(ConversationMessage.content, ConversationMessage.additional_data)
+        .where(ConversationMessage.message_type == "rag_document")
+        .where(ConversationMessage.additional_data.isnot(None))
+        .order_by(ConversationMessage.id.desc())
+        .limit(limit)
+        .execution_options(yield_per=500)
+    )
+
+    loaded = 0
+    start = time.perf_counter()
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(stmt)
+            async for content, additional_data in result:
+                embedding = (
+                    additional_data.get("embedding")
+                    if isinstance(additional_data, dict)
+                    else None
+                )
+                if content and isinstance(embedding, list) and embedding:
+                    await cache.put_embedding(model, content, embedding)
+                    loaded += 1
+    except Exception as e:
+        logger.error(f"Error warming embedding cache after {loaded} embeddings: {e}")
+        return loaded
+
+    logger.info(
+        f"Embedding cache warmed with {loaded} embeddings in "
+        f"{(time.perf_counter() - start) * 1000:.0f}ms"
+    )
+    return loaded
+
+
 async def get_embedding_stats() -> Dict[str, Any]:
     """
     Get statistics about the embedding system.
@@ -286,10 +376,12 @@ async def get_embedding_stats() -> Dict[str, Any]:
     try:
         embedding_model = get_embedding_model()
         cache_stats = embedding_model.get_cache_stats()
+        index = await get_vector_index()
 
         return {
             "embedding_model": "GeminiEmbeddings",
             "cache_stats": cache_stats,
+            "vector_index": index.get_stats(),
             "fallback_used": cache_stats.get("cache_misses", 0) > 0,
         }
 
@@ -341,11 +433,14 @@ async def generate_embeddings_for_content(content: str, metadata: Dict) -> bool:
 
 
 async def generate_missing_embeddings(
-    user_id: int | None = None, batch_size: int = 10
+    user_id: int | None = None, batch_size: int = 100
 ) -> Dict[str, Any]:
     """
     Generate embeddings for chunks that don't have them.
 
+    Runs the streaming backfill (see rag/backfill.py) without a checkpoint, so
+    every document still missing an embedding is attempted.
+
     Args:
         user_id: Specific user ID to process (None for all users)
         batch_size: Number of chunks to process in each batch
@@ -353,140 +448,10 @@ async def generate_missing_embeddings(
     Returns:
         Dict with processing statistics
     """
-    try:
-        async with AsyncSessionLocal() as session:
-            # Build query for messages without embeddings
-            if user_id:
-                stmt = (
-                    select(ConversationMessage)
-                    .where(ConversationMessage.message_type == "rag_document")
-                    .where(
-                        (ConversationMessage.additional_data.is_(None))
-                        | (ConversationMessage.additional_data.notlike('%"embedding"%'))
-                    )
-                )
-            else:
-                stmt = (
-                    select(ConversationMessage)
-                    .where(ConversationMessage.message_type == "rag_document")
-                    .where(
-                        (ConversationMessage.additional_data.is_(None))
-                        | (ConversationMessage.additional_data.notlike('%"embedding"%'))
-                    )
-                )
-
-            result = await session.execute(stmt)
-            messages_without_embeddings = result.scalars().all()
-
-            # Also check for messages with empty/invalid embeddings in Python
-            additional_messages: list[ConversationMessage] = []
-            if user_id:
-                all_messages_stmt = select(ConversationMessage).where(
-                    ConversationMessage.message_type == "rag_document"
-                )
-            else:
-                all_messages_stmt = select(ConversationMessage).where(
-                    ConversationMessage.message_type == "rag_document"
-                )
-
-            all_messages_result = await session.execute(all_messages_stmt)
-            all_messages = all_messages_result.scalars().all()
-
-            for message in all_messages:
-                if message.additional_data and "embedding" in message.additional_data:
-                    # Check if embedding is effectively empty
-                    embedding = message.additional_data["embedding"]
-                    if isinstance(embedding, list) and len(embedding) == 0:
-                        additional_messages.append(message)
-
-            # Combine both lists
-            all_messages_to_process = (
-                list(messages_without_embeddings) + additional_messages
-            )
-
-            if not all_messages_to_process:
-                logger.info("No messages found without embeddings")
-                return {
-                    "total_messages": 0,
-                    "processed": 0,
-                    "successful": 0,
-                    "failed": 0,
-                    "message": "All messages already have embeddings",
-                }
-
-            logger.info(
-                f"Found {len(all_messages_to_process)} messages without embeddings"
-            )
-
-            # Process in batches
-            total_processed = 0
-            total_successful = 0
-            total_failed = 0
-
-            for i in range(0, len(all_messages_to_process), batch_size):
-                batch = all_messages_to_process[i : i + batch_size]
-                logger.info(
-                    f"Processing batch {i//batch_size + 1}/{(len(all_messages_to_process) + batch_size - 1)//batch_size}"
-                )
-
-                for message in batch:
-                    try:
-                        if not message.content:
-                            logger.warning(
-                                f"Message {message.id}: No content, skipping"
-                            )
-                            continue
-
-                        logger.debug(f"Generating embedding for message {message.id}")
-
-                        # Generate embedding
-                        embedding = await embed_text(message.content)
-
-                        if embedding:
-                            # Update the message with the embedding in additional_data
-                            if not message.additional_data:
-                                message.additional_data = {}
-                            message.additional_data["embedding"] = embedding
-                            total_successful += 1
-                            logger.debug(
-                                f"✅ Embedding generated for message {message.id}"
-                            )
-                        else:
-                            total_failed += 1
-                            logger.warning(
-                                f"❌ Failed to generate embedding for message {message.id}"
-                            )
-
-                    except Exception as e:
-                        total_failed += 1
-                        logger.error(f"❌ Error processing message {message.id}: {e}")
-
-                    total_processed += 1
-
-                # Commit batch
-                await session.commit()
-                logger.info(f"Batch committed: {len(batch)} messages processed")
-
-                # Small delay to avoid rate limiting
-                import asyncio
-
-                await asyncio.sleep(1)
-
-            logger.info(f"🎉 Embedding generation complete!")
-            logger.info(f"📊 Total processed: {total_processed}")
-            logger.info(f"✅ Successful: {total_successful}")
-            logger.info(f"❌ Failed: {total_failed}")
-
-            return {
-                "total_messages": len(all_messages_to_process),
-                "processed": total_processed,
-                "successful": total_successful,
-                "failed": total_failed,
-                "success_rate": round((total_successful / total_processed * 100), 2)
-                if total_processed > 0
-                else 0,
-            }
+    from .backfill import EmbeddingBackfill
 
+    try:
+        result = await EmbeddingBackfill(user_id=user_id, page_size=batch_size).run()
     except Exception as e:
         logger.error(f"Error during bulk embedding generation: {e}")
         return {
@@ -497,6 +462,20 @@ async def generate_missing_embeddings(
             "failed": 0,
         }
 
+    processed = result["processed"]
+    stats = {
+        "total_messages": result["remaining_at_start"],
+        "processed": processed,
+        "successful": result["successful"],
+        "failed": result["failed"],
+        "success_rate": round((result["successful"] / processed * 100), 2)
+        if processed > 0
+        else 0,
+    }
+    if "error" in result:
+        stats["error"] = result["error"]
+    return stats
+
 
 async def get_query_performance_stats() -> Dict[str, Any]:
     """
@@ -0,0 +1,588 @@
+"""
+Vector index backends for RAG retrieval.
+
+Retrieval used to load every ``rag_document`` row and score it in Python, so
+latency grew with the whole knowledge base. This module puts a pluggable,
+user-scoped top-k index behind the retriever:
+
+- ``PgVectorIndex``: approximate nearest neighbour search in Postgres using the
+  pgvector extension (HNSW index on ``rag_document_embeddings``).
+- ``NumpyVectorIndex``: in-process fallback holding one contiguous, normalized
+  float32 matrix per user, persisted to disk as a snapshot plus an append-only
+  log so incremental updates never rewrite the whole partition.
+
+``get_vector_index()`` picks the backend from ``RAG_VECTOR_INDEX_BACKEND``.
+"""
+
+import asyncio
+import fcntl
+import os
+import struct
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import text
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+from ..utils.similarity import normalize as _normalize
+from ..utils.similarity import top_k_indices
+
+logger = get_logger("rag")
+
+# Append-only log record header: document id (int64) + vector dimension (uint32).
+# A dimension of 0 marks a removal.
+_WAL_HEADER = struct.Struct("<qI")
+
+
+class VectorIndex(ABC):
+    """Interface for user-scoped top-k vector search over RAG documents."""
+
+    name = "base"
+
+    @abstractmethod
+    async def is_ready(self, user_id: int) -> bool:
+        """Return True if the index holds a complete view of the user's documents."""
+
+    @abstractmethod
+    async def bulk_load(
+        self, user_id: int, items: Iterable[Tuple[int, Sequence[float]]]
+    ) -> int:
+        """Replace the user's partition with the given (doc_id, embedding) pairs."""
+
+    @abstractmethod
+    async def add(self, user_id: int, doc_id: int, embedding: Sequence[float]) -> None:
+        """Insert or replace a single document embedding."""
+
+    @abstractmethod
+    async def remove(self, user_id: int, doc_id: int) -> None:
+        """Remove a document from the user's partition."""
+
+    @abstractmethod
+    async def search(
+        self, user_id: int, query: Sequence[float], top_k: int = 5
+    ) -> List[Tuple[int, float]]:
+        """Return up to ``top_k`` (doc_id, cosine similarity) pairs, best first."""
+
+    def get_stats(self) -> Dict[str, object]:
+        """Get backend statistics."""
+        return {"backend": self.name}
+
+
+class _UserPartition:
+    """Contiguous, growable matrix of normalized embeddings for one user."""
+
+    def __init__(self, dim: int, capacity: int = 64):
+        self.dim = dim
+        self.size = 0
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.vectors = np.empty((capacity, dim), dtype=np.float32)
+        self.positions: Dict[int, int] = {}
+
+    @classmethod
+    def from_arrays(cls, ids: np.ndarray, vectors: np.ndarray) -> "_UserPartition":
+        partition = cls(vectors.shape[1], capacity=max(len(ids), 64))
+        partition.size = len(ids)
+        partition.ids[: len(ids)] = ids
+        partition.vectors[: len(ids)] = vectors
+        partition.positions = {int(doc_id): i for i, doc_id in enumerate(ids)}
+        return partition
+
+    def _grow(self) -> None:
+        capacity = len(self.ids) * 2
+        ids = np.empty(capacity, dtype=np.int64)
+        vectors = np.empty((capacity, self.dim), dtype=np.float32)
+        ids[: self.size] = self.ids[: self.size]
+        vectors[: self.size] = self.vectors[: self.size]
+        self.ids, self.vectors = ids, vectors
+
+    def upsert(self, doc_id: int, vector: np.ndarray) -> None:
+        position = self.positions.get(doc_id)
+        if position is None:
+            if self.size == len(self.ids):
+                self._grow()
+            position = self.size
+            self.size += 1
+            self.ids[position] = doc_id
+            self.positions[doc_id] = position
+        self.vectors[position] = vector
+
+    def delete(self, doc_id: int) -> None:
+        position = self.positions.pop(doc_id, None)
+        if position is None:
+            return
+        last = self.size - 1
+        if position != last:
+            # Swap the last row into the hole to keep the matrix contiguous
+            moved_id = int(self.ids[last])
+            self.ids[position] = moved_id
+            self.vectors[position] = self.vectors[last]
+            self.positions[moved_id] = position
+        self.size = last
+
+    def search(self, query: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        if self.size == 0 or top_k <= 0:
+            return []
+        scores = self.vectors[: self.size] @ query
+        return [
+            (int(self.ids[i]), float(scores[i])) for i in top_k_indices(scores, top_k)
+        ]
+
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    In-process vector index with on-disk persistence.
+
+    Each user's partition is stored as ``user_<id>.npz`` (snapshot) plus
+    ``user_<id>.wal`` (append-only updates). Updates append to the log, and the
+    log is folded into a new snapshot once it grows past ``compact_threshold``
+    records. Logs written by other processes are replayed before each search.
+    """
+
+    name = "numpy"
+
+    def __init__(self, index_dir: Optional[str] = None, compact_threshold: int = 1000):
+        self.index_dir = index_dir or settings.RAG_VECTOR_INDEX_DIR
+        self.compact_threshold = compact_threshold
+        self._partitions: Dict[int, _UserPartition] = {}
+        # Bytes of each user's log already applied to the in-memory partition
+        self._wal_offsets: Dict[int, int] = {}
+        self._wal_records: Dict[int, int] = {}
+        self._snapshot_mtimes: Dict[int, float] = {}
+        self._lock = threading.RLock()
+        os.makedirs(self.index_dir, exist_ok=True)
+
+    def _snapshot_path(self, user_id: int) -> str:
+        return os.path.join(self.index_dir, f"user_{user_id}.npz")
+
+    def _wal_path(self, user_id: int) -> str:
+        return os.path.join(self.index_dir, f"user_{user_id}.wal")
+
+    def _lock_path(self, user_id: int) -> str:
+        return os.path.join(self.index_dir, f"user_{user_id}.lock")
+
+    @contextmanager
+    def _partition_lock(self, user_id: int, exclusive: bool = True) -> Iterator[None]:
+        """
+        Lock a user's partition against other threads and other processes.
+
+        The snapshot and log are shared by every process using the index
+        directory (API and Celery workers), so appends and compaction hold an
+        exclusive ``flock`` and reads a shared one.
+        """
+        with self._lock, open(self._lock_path(user_id), "a") as fh:
+            fcntl.flock(fh, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            yield
+
+    # ---- persistence -------------------------------------------------------
+
+    def _write_snapshot(self, user_id: int, partition: _UserPartition) -> None:
+        path = self._snapshot_path(user_id)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            np.savez(
+                fh,
+                ids=partition.ids[: partition.size],
+                vectors=partition.vectors[: partition.size],
+            )
+        os.replace(tmp_path, path)
+        # The snapshot now covers everything, so start a fresh log
+        with open(self._wal_path(user_id), "wb"):
+            pass
+        self._wal_offsets[user_id] = 0
+        self._wal_records[user_id] = 0
+        self._snapshot_mtimes[user_id] = os.path.getmtime(path)
+
+    def _load_snapshot(self, user_id: int) -> Optional[_UserPartition]:
+        path = self._snapshot_path(user_id)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            ids = data["ids"].astype(np.int64, copy=False)
+            vectors = data["vectors"].astype(np.float32, copy=False)
+        if vectors.ndim != 2 or vectors.shape[1] == 0:
+            return None
+        self._wal_offsets[user_id] = 0
+        self._wal_records[user_id] = 0
+        self._snapshot_mtimes[user_id] = os.path.getmtime(path)
+        return _UserPartition.from_arrays(ids, vectors)
+
+    def _append_wal(
+        self, user_id: int, doc_id: int, vector: Optional[np.ndarray]
+    ) -> None:
+        dim = 0 if vector is None else len(vector)
+        record = _WAL_HEADER.pack(doc_id, dim)
+        if vector is not None:
+            record += vector.astype("<f4", copy=False).tobytes()
+        with open(self._wal_path(user_id), "ab") as fh:
+            fh.write(record)
+        self._wal_offsets[user_id] = self._wal_offsets.get(user_id, 0) + len(record)
+        self._wal_records[user_id] = self._wal_records.get(user_id, 0) + 1
+
+    def _replay_wal(self, user_id: int, partition: _UserPartition) -> None:
+        path = self._wal_path(user_id)
+        if not os.path.exists(path):
+            return
+        offset = self._wal_offsets.get(user_id, 0)
+        if os.path.getsize(path) <= offset:
+            return
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            data = fh.read()
+        position = 0
+        while position + _WAL_HEADER.size <= len(data):
+            doc_id, dim = _WAL_HEADER.unpack_from(data, position)
+            end = position + _WAL_HEADER.size + dim * 4
+            if end > len(data):
+                break  # Partially written record; pick it up next time
+            if dim == 0:
+                partition.delete(doc_id)
+            elif dim == partition.dim:
+                vector = np.frombuffer(
+                    data, dtype="<f4", count=dim, offset=position + _WAL_HEADER.size
+                )
+                partition.upsert(doc_id, vector)
+            position = end
+            self._wal_records[user_id] = self._wal_records.get(user_id, 0) + 1
+        self._wal_offsets[user_id] = offset + position
+
+    def _get_partition(self, user_id: int) -> Optional[_UserPartition]:
+        """Return the user's partition, loading or refreshing it from disk."""
+        partition = self._partitions.get(user_id)
+        snapshot_path = self._snapshot_path(user_id)
+        if partition is not None and os.path.exists(snapshot_path):
+            # Another process may have compacted the partition
+            if os.path.getmtime(snapshot_path) != self._snapshot_mtimes.get(user_id):
+                partition = None
+        if partition is None:
+            partition = self._load_snapshot(user_id)
+            if partition is None:
+                return None
+            self._partitions[user_id] = partition
+        self._replay_wal(user_id, partition)
+        return partition
+
+    # ---- VectorIndex API ---------------------------------------------------
+
+    def _bulk_load_sync(
+        self, user_id: int, items: Iterable[Tuple[int, Sequence[float]]]
+    ) -> int:
+        ids: List[int] = []
+        rows: List[np.ndarray] = []
+        dim: Optional[int] = None
+        for doc_id, embedding in items:
+            vector = _normalize(embedding)
+            if vector is None:
+                continue
+            if dim is None:
+                dim = len(vector)
+            elif len(vector) != dim:
+                logger.warning(
+                    f"Skipping document {doc_id}: embedding dimension {len(vector)} != {dim}"
+                )
+                continue
+            ids.append(int(doc_id))
+            rows.append(vector)
+
+        partition = _UserPartition.from_arrays(
+            np.asarray(ids, dtype=np.int64),
+            np.vstack(rows)
+            if rows
+            else np.empty((0, dim or settings.RAG_EMBEDDING_DIMENSION), np.float32),
+        )
+        with self._partition_lock(user_id):
+            self._write_snapshot(user_id, partition)
+            self._partitions[user_id] = partition
+        return len(ids)
+
+    def _add_sync(self, user_id: int, doc_id: int, vector: np.ndarray) -> None:
+        with self._partition_lock(user_id):
+            partition = self._get_partition(user_id)
+            if partition is None:
+                # No complete view of this user yet; the next query bootstraps it
+                return
+            if len(vector) != partition.dim:
+                logger.warning(
+                    f"Not indexing document {doc_id}: embedding dimension "
+                    f"{len(vector)} != {partition.dim}"
+                )
+                return
+            partition.upsert(doc_id, vector)
+            self._append_wal(user_id, doc_id, vector)
+            if self._wal_records.get(user_id, 0) >= self.compact_threshold:
+                self._write_snapshot(user_id, partition)
+
+    def _remove_sync(self, user_id: int, doc_id: int) -> None:
+        with self._partition_lock(user_id):
+            partition = self._get_partition(user_id)
+            if partition is None or doc_id not in partition.positions:
+                return
+            partition.delete(doc_id)
+            self._append_wal(user_id, doc_id, None)
+
+    def _search_sync(
+        self, user_id: int, vector: np.ndarray, top_k: int
+    ) -> List[Tuple[int, float]]:
+        with self._partition_lock(user_id, exclusive=False):
+            partition = self._get_partition(user_id)
+            if partition is None:
+                return []
+            if len(vector) != partition.dim:
+                logger.warning(
+                    f"Query dimension {len(vector)} does not match index dimension "
+                    f"{partition.dim} for user {user_id}"
+                )
+                return []
+            return partition.search(vector, top_k)
+
+    def _is_ready_sync(self, user_id: int) -> bool:
+        with self._partition_lock(user_id, exclusive=False):
+            return self._get_partition(user_id) is not None
+
+    async def is_ready(self, user_id: int) -> bool:
+        return await asyncio.to_thread(self._is_ready_sync, user_id)
+
+    async def bulk_load(
+        self, user_id: int, items: Iterable[Tuple[int, Sequence[float]]]
+    ) -> int:
+        count = await asyncio.to_thread(self._bulk_load_sync, user_id, list(items))
+        logger.info(f"Vector index loaded {count} documents for user {user_id}")
+        return count
+
+    async def add(self, user_id: int, doc_id: int, embedding: Sequence[float]) -> None:
+        vector = _normalize(embedding)
+        if vector is not None:
+            await asyncio.to_thread(self._add_sync, user_id, int(doc_id), vector)
+
+    async def remove(self, user_id: int, doc_id: int) -> None:
+        await asyncio.to_thread(self._remove_sync, user_id, int(doc_id))
+
+    async def search(
+        self, user_id: int, query: Sequence[float], top_k: int = 5
+    ) -> List[Tuple[int, float]]:
+        vector = _normalize(query)
+        if vector is None:
+            return []
+        return await asyncio.to_thread(self._search_sync, user_id, vector, top_k)
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "backend": self.name,
+            "index_dir": self.index_dir,
+            "loaded_users": len(self._partitions),
+            "loaded_vectors": sum(p.size for p in self._partitions.values()),
+        }
+
+
+def _to_pgvector_literal(vector: Sequence[float]) -> str:
+    """Format a vector as a pgvector text literal."""
+    return "[" + ",".join(repr(float(x)) for x in vector) + "]"
+
+
+class PgVectorIndex(VectorIndex):
+    """
+    Postgres/pgvector backed index.
+
+    Embeddings live in ``rag_document_embeddings`` (see migration
+    ``008_add_rag_vector_index.sql``) with an HNSW index on the halfvec cast,
+    so queries are ``ORDER BY embedding <=> :query LIMIT :k`` scoped by user.
+
+    The user filter applies after the HNSW scan, which only visits
+    ``hnsw.ef_search`` candidates, so a user owning a small share of the table
+    can get fewer than k rows. On pgvector >= 0.8 searches enable iterative
+    scans to keep walking the graph until k rows pass the filter; a search
+    that still comes up short ranks the user's rows exactly instead.
+    """
+
+    name = "pgvector"
+
+    def __init__(self, session_factory=None, dimension: Optional[int] = None):
+        if session_factory is None:
+            from ..database.session import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        self._session_factory = session_factory
+        self.dimension = dimension or settings.RAG_EMBEDDING_DIMENSION
+        # Whether the installed pgvector supports iterative index scans (>= 0.8)
+        self._iterative_scan: Optional[bool] = None
+        self.stats = {"searches": 0, "exact_fallbacks": 0}
+
+    @staticmethod
+    async def is_available(session_factory=None) -> bool:
+        """Check that the pgvector extension and embeddings table exist."""
+        if session_factory is None:
+            from ..database.session import AsyncSessionLocal
+
+            session_factory = AsyncSessionLocal
+        try:
+            async with session_factory() as session:
+                result = await session.execute(
+                    text(
+                        "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'vector') "
+                        "AND to_regclass('rag_document_embeddings') IS NOT NULL"
+                    )
+                )
+                return bool(result.scalar())
+        except Exception as e:
+            logger.debug(f"pgvector not available: {e}")
+            return False
+
+    async def is_ready(self, user_id: int) -> bool:
+        # The table is maintained on write and backfilled by the migration
+        return True
+
+    async def bulk_load(
+        self, user_id: int, items: Iterable[Tuple[int, Sequence[float]]]
+    ) -> int:
+        count = 0
+        async with self._session_factory() as session:
+            for doc_id, embedding in items:
+                if len(embedding) != self.dimension:
+                    continue
+                await self._upsert(session, user_id, doc_id, embedding)
+                count += 1
+            await session.commit()
+        return count
+
+    async def _upsert(self, session, user_id: int, doc_id: int, embedding) -> None:
+        await session.execute(
+            text(
+                "INSERT INTO rag_document_embeddings (message_id, user_id, embedding) "
+                "VALUES (:doc_id, :user_id, CAST(:embedding AS vector)) "
+                "ON CONFLICT (message_id) DO UPDATE "
+                "SET embedding = EXCLUDED.embedding, user_id = EXCLUDED.user_id"
+            ),
+            {
+                "doc_id": int(doc_id),
+                "user_id": int(user_id),
+                "embedding": _to_pgvector_literal(embedding),
+            },
+        )
+
+    async def add(self, user_id: int, doc_id: int, embedding: Sequence[float]) -> None:
+        if len(embedding) != self.dimension:
+            logger.warning(
+                f"Not indexing document {doc_id}: embedding dimension "
+                f"{len(embedding)} != {self.dimension}"
+            )
+            return
+        async with self._session_factory() as session:
+            await self._upsert(session, user_id, doc_id, embedding)
+            await session.commit()
+
+    async def remove(self, user_id: int, doc_id: int) -> None:
+        async with self._session_factory() as session:
+            await session.execute(
+                text(
+                    "DELETE FROM rag_document_embeddings "
+                    "WHERE message_id = :doc_id AND user_id = :user_id"
+                ),
+                {"doc_id": int(doc_id), "user_id": int(user_id)},
+            )
+            await session.commit()
+
+    async def search(
+        self, user_id: int, query: Sequence[float], top_k: int = 5
+    ) -> List[Tuple[int, float]]:
+        if len(query) != self.dimension:
+            logger.warning(
+                f"Query dimension {len(query)} does not match index dimension "
+                f"{self.dimension}"
+            )
+            return []
+        halfvec = f"halfvec({self.dimension})"
+        search_sql = text(
+            f"SELECT message_id, "
+            f"1 - (embedding::{halfvec} <=> CAST(:query AS {halfvec})) AS score "
+            f"FROM rag_document_embeddings WHERE user_id = :user_id "
+            f"ORDER BY embedding::{halfvec} <=> CAST(:query AS {halfvec}) "
+            f"LIMIT :top_k"
+        )
+        params = {
+            "query": _to_pgvector_literal(query),
+            "user_id": int(user_id),
+            "top_k": int(top_k),
+        }
+        self.stats["searches"] += 1
+        async with self._session_factory() as session:
+            # SET LOCAL lasts until the session's transaction ends
+            if await self._supports_iterative_scan(session):
+                await session.execute(
+                    text("SET LOCAL hnsw.iterative_scan = relaxed_order")
+                )
+            rows = (await session.execute(search_sql, params)).all()
+
+            if len(rows) < top_k:
+                # Too few of the scanned candidates belong to this user: rank
+                # the user's rows exactly through the user_id index instead
+                self.stats["exact_fallbacks"] += 1
+                await session.execute(text("SET LOCAL enable_indexscan = off"))
+                rows = (await session.execute(search_sql, params)).all()
+
+        # relaxed_order may return rows slightly out of order
+        results = [(int(row[0]), float(row[1])) for row in rows]
+        return sorted(results, key=lambda item: item[1], reverse=True)
+
+    async def _supports_iterative_scan(self, session) -> bool:
+        if self._iterative_scan is None:
+            result = await session.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            )
+            version = result.scalar() or ""
+            try:
+                major, minor = (int(part) for part in version.split(".")[:2])
+                self._iterative_scan = (major, minor) >= (0, 8)
+            except ValueError:
+                self._iterative_scan = False
+            logger.info(
+                f"pgvector {version or 'unknown'}: iterative scans "
+                f"{'enabled' if self._iterative_scan else 'unavailable'}"
+            )
+        return self._iterative_scan
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            "backend": self.name,
+            "dimension": self.dimension,
+            "iterative_scan": self._iterative_scan,
+            **self.stats,
+        }
+
+
+# Global vector index instance
+_vector_index: Optional[VectorIndex] = None
+
+
+async def get_vector_index() -> VectorIndex:
+    """
+    Get or create the global vector index.
+
+    ``RAG_VECTOR_INDEX_BACKEND`` selects ``pgvector``, ``numpy`` or ``auto``
+    (pgvector when the extension and table are present, NumPy otherwise).
+    """
+    global _vector_index
+    if _vector_index is not None:
+        return _vector_index
+
+    backend = settings.RAG_VECTOR_INDEX_BACKEND.lower()
+    if backend == "pgvector" or (
+        backend == "auto" and await PgVectorIndex.is_available()
+    ):
+        index: VectorIndex = PgVectorIndex()
+    else:
+        index = NumpyVectorIndex()
+
+    # Another coroutine may have finished selection while we were probing
+    if _vector_index is None:
+        _vector_index = index
+        logger.info(f"RAG vector index backend: {_vector_index.name}")
+    return _vector_index
+
+
+def set_vector_index(index: Optional[VectorIndex]) -> None:
+    """Override the global vector index (None resets to lazy selection)."""
+    global _vector_index
+    _vector_index = index
@@ -2,6 +2,20 @@
 SMS Router Service database models.
 """
 
-from .sms_models import SMSRouterConfig, SMSUsageLog, UserPhoneMapping
+from .sms_models import (
+    SMSRouterConfig,
+    SMSUsageDailyRollup,
+    SMSUsageHourlyRollup,
+    SMSUsageLog,
+    SMSUsageRollupState,
+    UserPhoneMapping,
+)
 
-__all__ = ["SMSRouterConfig", "SMSUsageLog", "UserPhoneMapping"]
+__all__ = [
+    "SMSRouterConfig",
+    "SMSUsageLog",
+    "UserPhoneMapping",
+    "SMSUsageHourlyRollup",
+    "SMSUsageDailyRollup",
+    "SMSUsageRollupState",
+]
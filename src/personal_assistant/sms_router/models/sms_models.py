@@ -6,6 +6,7 @@ from datetime import datetime
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     Column,
     DateTime,
@@ -54,6 +55,8 @@ class SMSUsageLog(Base):
     processing_time_ms = Column(Integer)
     error_message = Column(Text)
     country_code = Column(String(10), default="US")  # Country code for pricing
+    # Classified from phone_number when the log is written (international rate)
+    is_international = Column(Boolean, nullable=False, default=False)
     sms_metadata = Column(JSON)
     created_at = Column(DateTime, default=datetime.utcnow)
     
@@ -71,6 +74,70 @@ class SMSUsageLog(Base):
         return f"<SMSUsageLog(id={self.id}, user_id={self.user_id}, direction='{self.message_direction}')>"
 
 
+class SMSUsageRollup(Base):
+    """
+    Pre-aggregated SMS usage per time bucket, user and direction.
+
+    Built from sms_usage_logs by services.usage_rollups; analytics read these
+    instead of the raw log. Processing time measures only count messages with
+    a recorded (non-zero) processing time, and length measures only messages
+    with a non-zero length, matching how the analytics services average them.
+    """
+
+    __abstract__ = True
+
+    id = Column(BigInteger, primary_key=True)
+    bucket_start = Column(DateTime, nullable=False)
+    user_id = Column(Integer)
+    message_direction = Column(String(10), nullable=False)
+    message_count = Column(Integer, nullable=False, default=0)
+    success_count = Column(Integer, nullable=False, default=0)
+    length_count = Column(Integer, nullable=False, default=0)
+    total_message_length = Column(BigInteger, nullable=False, default=0)
+    # Up to 160, 161-320 and over 320 characters
+    short_message_count = Column(Integer, nullable=False, default=0)
+    medium_message_count = Column(Integer, nullable=False, default=0)
+    long_message_count = Column(Integer, nullable=False, default=0)
+    # Messages to or from an international number
+    international_count = Column(Integer, nullable=False, default=0)
+    processing_count = Column(Integer, nullable=False, default=0)
+    processing_total_ms = Column(BigInteger, nullable=False, default=0)
+    processing_min_ms = Column(Integer)
+    processing_max_ms = Column(Integer)
+
+
+class SMSUsageHourlyRollup(SMSUsageRollup):
+    """SMS usage aggregated per hour."""
+
+    __tablename__ = "sms_usage_hourly_rollups"
+
+    def __repr__(self):
+        return f"<SMSUsageHourlyRollup(bucket={self.bucket_start}, user_id={self.user_id}, direction='{self.message_direction}')>"
+
+
+class SMSUsageDailyRollup(SMSUsageRollup):
+    """SMS usage aggregated per day (built from the hourly rollups)."""
+
+    __tablename__ = "sms_usage_daily_rollups"
+
+    def __repr__(self):
+        return f"<SMSUsageDailyRollup(bucket={self.bucket_start}, user_id={self.user_id}, direction='{self.message_direction}')>"
+
+
+class SMSUsageRollupState(Base):
+    """How far the SMS usage rollups are complete."""
+
+    __tablename__ = "sms_usage_rollup_state"
+
+    name = Column(String(50), primary_key=True)
+    # Rollups cover every log created before this time
+    refreshed_through = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<SMSUsageRollupState(name='{self.name}', through={self.refreshed_through})>"
+
+
 class UserPhoneMapping(Base):
     """Additional phone number mappings for users (extends users.phone_number)."""
 
@@ -96,6 +163,19 @@ class UserPhoneMapping(Base):
 Index("idx_sms_usage_logs_user_id", SMSUsageLog.user_id)
 Index("idx_sms_usage_logs_phone_number", SMSUsageLog.phone_number)
 Index("idx_sms_usage_logs_created_at", SMSUsageLog.created_at)
+Index("idx_sms_usage_logs_user_created", SMSUsageLog.user_id, SMSUsageLog.created_at)
+Index("idx_sms_usage_hourly_rollups_bucket", SMSUsageHourlyRollup.bucket_start)
+Index(
+    "idx_sms_usage_hourly_rollups_user_bucket",
+    SMSUsageHourlyRollup.user_id,
+    SMSUsageHourlyRollup.bucket_start,
+)
+Index("idx_sms_usage_daily_rollups_bucket", SMSUsageDailyRollup.bucket_start)
+Index(
+    "idx_sms_usage_daily_rollups_user_bucket",
+    SMSUsageDailyRollup.user_id,
+    SMSUsageDailyRollup.bucket_start,
+)
 Index("idx_user_phone_mappings_user_id", UserPhoneMapping.user_id)
 Index("idx_user_phone_mappings_phone_number", UserPhoneMapping.phone_number)
 Index("idx_sms_router_configs_key", SMSRouterConfig.config_key)
@@ -14,4 +14,5 @@ __all__ = [
     "SMSAnalyticsService",
     "SMSCostCalculator",
     "SMSPerformanceMonitor",
+    "InboundSMSQueue",
 ]
@@ -5,10 +5,7 @@ Agent integration service for SMS Router.
 import logging
 from typing import Any, Dict, Optional
 
-from ...config.settings import settings
-from ...core import AgentCore
-from ...llm.gemini import GeminiLLM
-from ...tools import create_tool_registry
+from ...core import get_agent_core
 
 logger = logging.getLogger(__name__)
 
@@ -19,12 +16,10 @@ class AgentIntegrationService:
     def __init__(self):
         """Initialize Agent Integration Service."""
         try:
-            # Reuse existing Agent Core setup
-            self.tool_registry = create_tool_registry()
-            self.llm = GeminiLLM(
-                api_key=settings.GOOGLE_API_KEY, model=settings.GEMINI_MODEL
-            )
-            self.agent_core = AgentCore(tools=self.tool_registry, llm=self.llm)
+            # Reuse the shared, warm Agent Core
+            self.agent_core = get_agent_core()
+            self.tool_registry = self.agent_core.tools
+            self.llm = self.agent_core.llm
 
             logger.info("Agent Integration Service initialized successfully")
 
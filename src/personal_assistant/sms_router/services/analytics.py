@@ -4,12 +4,17 @@ SMS Analytics Service for usage tracking, cost analysis, and performance monitor
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.sms_models import SMSUsageLog
+from .usage_rollups import (
+    SMSUsageRollups,
+    average_message_length,
+    average_processing_time_ms,
+    merge_measures,
+    success_rate_percent,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +25,7 @@ class SMSAnalyticsService:
     def __init__(self, db_session: AsyncSession):
         """Initialize the analytics service with a database session."""
         self.db = db_session
+        self.rollups = SMSUsageRollups(db_session)
 
     async def get_user_usage_summary(
         self, user_id: int, time_range: str = "30d"
@@ -39,52 +45,30 @@ class SMSAnalyticsService:
             end_date = datetime.utcnow()
             start_date = self._calculate_start_date(end_date, time_range)
 
-            # Build query for the specified time range
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
+            # Aggregate the time range per direction
+            by_direction = await self.rollups.totals_by_direction(
+                start_date, end_date, user_id
             )
-
-            result = await self.db.execute(query)
-            usage_logs = result.scalars().all()
-
-            if not usage_logs:
+            totals = merge_measures(by_direction.values())
+            if not totals["message_count"]:
                 return self._create_empty_usage_summary(user_id, time_range)
 
             # Calculate metrics
-            total_messages = len(usage_logs)
-            inbound_messages = len(
-                [log for log in usage_logs if log.message_direction == "inbound"]
-            )
-            outbound_messages = len(
-                [log for log in usage_logs if log.message_direction == "outbound"]
-            )
-
-            successful_messages = len([log for log in usage_logs if log.success])
-            success_rate = (
-                (successful_messages / total_messages * 100)
-                if total_messages > 0
-                else 0
-            )
+            total_messages = totals["message_count"]
+            inbound_messages = by_direction.get("inbound", {}).get("message_count", 0)
+            outbound_messages = by_direction.get("outbound", {}).get("message_count", 0)
+            success_rate = success_rate_percent(totals)
 
             # Calculate average processing time
-            processing_times = [
-                float(log.processing_time_ms)
-                for log in usage_logs
-                if log.processing_time_ms
-            ]
-            avg_processing_time = (
-                sum(processing_times) / len(processing_times) if processing_times else 0
-            )
+            avg_processing_time = average_processing_time_ms(totals)
 
             # Calculate total message length
-            total_length = sum(log.message_length for log in usage_logs)
+            total_length = totals["total_message_length"]
 
             # Get usage patterns by hour
-            usage_patterns = self._calculate_usage_patterns(list(usage_logs))
+            usage_patterns = self._calculate_usage_patterns(
+                await self.rollups.hourly_distribution(start_date, end_date, user_id)
+            )
 
             return {
                 "user_id": user_id,
@@ -164,43 +148,26 @@ class SMSAnalyticsService:
             start_date = self._calculate_start_date(end_date, time_range)
 
             # Get performance data
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            usage_logs = result.scalars().all()
-
-            if not usage_logs:
+            totals = await self.rollups.totals(start_date, end_date, user_id)
+            if not totals["message_count"]:
                 return self._create_empty_performance_metrics(user_id, time_range)
 
             # Calculate performance metrics
-            total_messages = len(usage_logs)
-            successful_messages = len([log for log in usage_logs if log.success])
+            total_messages = totals["message_count"]
+            successful_messages = totals["success_count"]
             failed_messages = total_messages - successful_messages
 
             # Processing time metrics
-            processing_times = [
-                float(log.processing_time_ms)
-                for log in usage_logs
-                if log.processing_time_ms
-            ]
-            avg_processing_time = (
-                sum(processing_times) / len(processing_times) if processing_times else 0
-            )
-            min_processing_time = min(processing_times) if processing_times else 0
-            max_processing_time = max(processing_times) if processing_times else 0
+            avg_processing_time = average_processing_time_ms(totals)
+            min_processing_time = totals["processing_min_ms"]
+            max_processing_time = totals["processing_max_ms"]
 
             # Error analysis
-            error_messages = [log for log in usage_logs if not log.success]
-            error_types: Dict[str, int] = {}
-            for log in error_messages:
-                error_type = str(log.error_message) if log.error_message else "Unknown"
-                error_types[error_type] = error_types.get(error_type, 0) + 1
+            error_types = (
+                await self.rollups.error_counts(start_date, end_date, user_id)
+                if failed_messages
+                else {}
+            )
 
             return {
                 "user_id": user_id,
@@ -250,30 +217,23 @@ class SMSAnalyticsService:
             start_date = self._calculate_start_date(end_date, time_range)
 
             # Get message breakdown data
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
+            by_direction = await self.rollups.totals_by_direction(
+                start_date, end_date, user_id
             )
-
-            result = await self.db.execute(query)
-            usage_logs = result.scalars().all()
-
-            if not usage_logs:
+            totals = merge_measures(by_direction.values())
+            if not totals["message_count"]:
                 return self._create_empty_message_breakdown(user_id, time_range)
 
             # Analyze message breakdown
             inbound_breakdown = self._analyze_message_direction(
-                list(usage_logs), "inbound"
+                by_direction.get("inbound")
             )
             outbound_breakdown = self._analyze_message_direction(
-                list(usage_logs), "outbound"
+                by_direction.get("outbound")
             )
 
             # Message length analysis
-            length_analysis = self._analyze_message_lengths(list(usage_logs))
+            length_analysis = self._analyze_message_lengths(totals)
 
             return {
                 "user_id": user_id,
@@ -281,7 +241,7 @@ class SMSAnalyticsService:
                 "inbound_breakdown": inbound_breakdown,
                 "outbound_breakdown": outbound_breakdown,
                 "length_analysis": length_analysis,
-                "total_messages": len(usage_logs),
+                "total_messages": totals["message_count"],
                 "period": {
                     "start_date": start_date.isoformat(),
                     "end_date": end_date.isoformat(),
@@ -311,37 +271,25 @@ class SMSAnalyticsService:
             start_date = self._calculate_start_date(end_date, time_range)
 
             # Get system-wide data
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            all_logs = result.scalars().all()
-
-            if not all_logs:
+            totals = await self.rollups.totals(start_date, end_date)
+            if not totals["message_count"]:
                 return self._create_empty_system_metrics(time_range)
 
             # Calculate system metrics
-            total_messages = len(all_logs)
-            successful_messages = len([log for log in all_logs if log.success])
+            total_messages = totals["message_count"]
+            successful_messages = totals["success_count"]
             failed_messages = total_messages - successful_messages
 
             # Processing time metrics
-            processing_times = [
-                log.processing_time_ms for log in all_logs if log.processing_time_ms
-            ]
-            avg_processing_time = (
-                sum(processing_times) / len(processing_times) if processing_times else 0
-            )
+            avg_processing_time = average_processing_time_ms(totals)
 
             # User activity metrics
-            unique_users = len(set(log.user_id for log in all_logs))
+            unique_users = totals["unique_users"]
 
             # Hourly activity patterns
-            hourly_patterns = self._calculate_hourly_activity_patterns(list(all_logs))
+            hourly_patterns = self._calculate_hourly_activity_patterns(
+                await self.rollups.hourly_distribution(start_date, end_date)
+            )
 
             return {
                 "time_range": time_range,
@@ -383,17 +331,9 @@ class SMSAnalyticsService:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(hours=24)
 
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            recent_logs = result.scalars().all()
+            totals = await self.rollups.totals(start_date, end_date)
 
-            if not recent_logs:
+            if not totals["message_count"]:
                 return {
                     "sla_status": "insufficient_data",
                     "compliance_percentage": 0,
@@ -403,19 +343,10 @@ class SMSAnalyticsService:
                 }
 
             # Calculate current metrics
-            total_messages = len(recent_logs)
-            successful_messages = len([log for log in recent_logs if log.success])
-            success_rate = (
-                (successful_messages / total_messages * 100)
-                if total_messages > 0
-                else 0
-            )
-
-            processing_times = [
-                log.processing_time_ms for log in recent_logs if log.processing_time_ms
-            ]
-            avg_response_time = (
-                sum(processing_times) / len(processing_times) if processing_times else 0
+            success_rate = success_rate_percent(totals)
+            avg_response_time = average_processing_time_ms(totals)
+            percentiles = await self.rollups.processing_time_percentiles(
+                start_date, end_date, (0.95,)
             )
 
             # Check SLA compliance
@@ -474,6 +405,7 @@ class SMSAnalyticsService:
                     "response_time_ms": round(avg_response_time, 2),
                     "success_rate_percent": round(success_rate, 2),
                     "availability_percent": availability,
+                    "p95_response_time_ms": percentiles["p95"],
                 },
                 "violations": sla_violations,
                 "period": {
@@ -594,22 +526,11 @@ class SMSAnalyticsService:
             return end_date - timedelta(days=30)  # Default to 30 days
 
     def _calculate_usage_patterns(
-        self, usage_logs: List[SMSUsageLog]
+        self, hourly_counts: Dict[int, int]
     ) -> Dict[str, Any]:
-        """Calculate usage patterns from usage logs."""
-        hourly_counts: Dict[int, int] = {}
-        for log in usage_logs:
-            if log.created_at and hasattr(log.created_at, "hour"):
-                hour = log.created_at.hour
-            else:
-                hour = 0
-            hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
-
-        # Sort by hour
-        sorted_hours = sorted(hourly_counts.items())
-
+        """Calculate usage patterns from message counts by hour of day."""
         return {
-            "hourly_distribution": dict(sorted_hours),
+            "hourly_distribution": dict(sorted(hourly_counts.items())),
             "peak_hour": max(hourly_counts.items(), key=lambda x: x[1])[0]
             if hourly_counts
             else None,
@@ -622,31 +543,19 @@ class SMSAnalyticsService:
         self, user_id: int, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get daily usage counts for a user."""
+        daily_series = await self.rollups.daily_series(start_date, end_date, user_id)
         daily_counts = []
         current_date = start_date.date()
 
         while current_date <= end_date.date():
-            next_date = current_date + timedelta(days=1)
-
-            # Count messages for this day
-            query = select(func.count(SMSUsageLog.id)).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at
-                    >= datetime.combine(current_date, datetime.min.time()),
-                    SMSUsageLog.created_at
-                    < datetime.combine(next_date, datetime.min.time()),
-                )
-            )
-
-            result = await self.db.execute(query)
-            count = result.scalar() or 0
-
+            day = daily_series.get(current_date)
             daily_counts.append(
-                {"date": current_date.isoformat(), "message_count": count}
+                {
+                    "date": current_date.isoformat(),
+                    "message_count": day["message_count"] if day else 0,
+                }
             )
-
-            current_date = next_date
+            current_date += timedelta(days=1)
 
         return daily_counts
 
@@ -692,14 +601,10 @@ class SMSAnalyticsService:
         }
 
     def _analyze_message_direction(
-        self, usage_logs: List[SMSUsageLog], direction: str
+        self, measures: Optional[Dict[str, Any]]
     ) -> Dict[str, Any]:
-        """Analyze messages for a specific direction."""
-        direction_logs = [
-            log for log in usage_logs if log.message_direction == direction
-        ]
-
-        if not direction_logs:
+        """Analyze the aggregated measures of one message direction."""
+        if not measures or not measures["message_count"]:
             return {
                 "total_messages": 0,
                 "success_rate": 0,
@@ -707,32 +612,16 @@ class SMSAnalyticsService:
                 "average_processing_time": 0,
             }
 
-        total = len(direction_logs)
-        successful = len([log for log in direction_logs if log.success])
-        success_rate = (successful / total * 100) if total > 0 else 0
-
-        lengths = [log.message_length for log in direction_logs if log.message_length]
-        avg_length = sum(lengths) / len(lengths) if lengths else 0
-
-        processing_times = [
-            log.processing_time_ms for log in direction_logs if log.processing_time_ms
-        ]
-        avg_processing_time = (
-            sum(processing_times) / len(processing_times) if processing_times else 0
-        )
-
         return {
-            "total_messages": total,
-            "success_rate": round(success_rate, 2),
-            "average_length": round(avg_length, 2),
-            "average_processing_time": round(avg_processing_time, 2),
+            "total_messages": measures["message_count"],
+            "success_rate": round(success_rate_percent(measures), 2),
+            "average_length": round(average_message_length(measures), 2),
+            "average_processing_time": round(average_processing_time_ms(measures), 2),
         }
 
-    def _analyze_message_lengths(self, usage_logs: List[SMSUsageLog]) -> Dict[str, Any]:
+    def _analyze_message_lengths(self, measures: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze message length patterns."""
-        lengths = [log.message_length for log in usage_logs if log.message_length]
-
-        if not lengths:
+        if not measures["length_count"]:
             return {
                 "average_length": 0,
                 "short_messages": 0,
@@ -740,43 +629,21 @@ class SMSAnalyticsService:
                 "long_messages": 0,
             }
 
-        avg_length = sum(lengths) / len(lengths)
-
-        # Categorize by length
-        short_messages = len(
-            [length for length in lengths if length <= 160]
-        )  # Standard SMS
-        medium_messages = len(
-            [length for length in lengths if 160 < length <= 320]
-        )  # Multi-part SMS
-        # Very long messages
-        long_messages = len([length for length in lengths if length > 320])
-
         return {
-            "average_length": round(avg_length, 2),
-            "short_messages": short_messages,
-            "medium_messages": medium_messages,
-            "long_messages": long_messages,
-            "total_messages": len(lengths),
+            "average_length": round(average_message_length(measures), 2),
+            # Standard SMS, multi-part SMS and very long messages
+            "short_messages": measures["short_message_count"],
+            "medium_messages": measures["medium_message_count"],
+            "long_messages": measures["long_message_count"],
+            "total_messages": measures["length_count"],
         }
 
     def _calculate_hourly_activity_patterns(
-        self, usage_logs: List[SMSUsageLog]
+        self, hourly_counts: Dict[int, int]
     ) -> Dict[str, Any]:
         """Calculate hourly activity patterns for system-wide usage."""
-        hourly_counts: Dict[int, int] = {}
-        for log in usage_logs:
-            if log.created_at and hasattr(log.created_at, "hour"):
-                hour = log.created_at.hour
-            else:
-                hour = 0
-            hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
-
-        # Sort by hour
-        sorted_hours = sorted(hourly_counts.items())
-
         return {
-            "hourly_distribution": dict(sorted_hours),
+            "hourly_distribution": dict(sorted(hourly_counts.items())),
             "peak_hour": max(hourly_counts.items(), key=lambda x: x[1])[0]
             if hourly_counts
             else None,
@@ -790,45 +657,21 @@ class SMSAnalyticsService:
         self, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get daily performance data for the system."""
+        daily_series = await self.rollups.daily_series(start_date, end_date)
         daily_data = []
         current_date = start_date.date()
 
         while current_date <= end_date.date():
-            next_date = current_date + timedelta(days=1)
-
-            # Get data for this day
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at
-                    >= datetime.combine(current_date, datetime.min.time()),
-                    SMSUsageLog.created_at
-                    < datetime.combine(next_date, datetime.min.time()),
-                )
-            )
-
-            result = await self.db.execute(query)
-            day_logs = result.scalars().all()
-
-            if day_logs:
-                total = len(day_logs)
-                successful = len([log for log in day_logs if log.success])
-                success_rate = (successful / total * 100) if total > 0 else 0
-
-                processing_times = [
-                    log.processing_time_ms for log in day_logs if log.processing_time_ms
-                ]
-                avg_processing_time = (
-                    sum(processing_times) / len(processing_times)
-                    if processing_times
-                    else 0
-                )
-
+            day = daily_series.get(current_date)
+            if day and day["message_count"]:
                 daily_data.append(
                     {
                         "date": current_date.isoformat(),
-                        "total_messages": total,
-                        "success_rate": round(success_rate, 2),
-                        "average_processing_time_ms": round(avg_processing_time, 2),
+                        "total_messages": day["message_count"],
+                        "success_rate": round(success_rate_percent(day), 2),
+                        "average_processing_time_ms": round(
+                            average_processing_time_ms(day), 2
+                        ),
                     }
                 )
             else:
@@ -841,7 +684,7 @@ class SMSAnalyticsService:
                     }
                 )
 
-            current_date = next_date
+            current_date += timedelta(days=1)
 
         return daily_data
 
@@ -5,12 +5,17 @@ SMS Cost Calculator for Twilio pricing integration and cost analysis.
 import logging
 import os
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional
 
-from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.sms_models import SMSUsageLog
+from .cost_engine import (
+    DEFAULT_PRICING,
+    UsageCounts,
+    get_pricing_cache,
+    simulate_pricing,
+)
+from .usage_rollups import SMSUsageRollups, merge_measures, success_rate_percent
 
 logger = logging.getLogger(__name__)
 
@@ -21,24 +26,12 @@ class SMSCostCalculator:
     def __init__(self, db_session: AsyncSession):
         """Initialize the cost calculator with a database session."""
         self.db = db_session
+        self.rollups = SMSUsageRollups(db_session)
         self.twilio_account_sid = os.getenv("TWILIO_ACCOUNT_SID")
         self.twilio_auth_token = os.getenv("TWILIO_AUTH_TOKEN")
 
         # Default Twilio pricing (US rates as fallback)
-        self.default_pricing = {
-            "inbound": 0.0075,  # $0.0075 per message
-            "outbound": 0.0079,  # $0.0079 per message
-            # $0.15 per message (varies by country)
-            "international_outbound": 0.15,
-            "mms": 0.02,  # $0.02 per MMS
-            "long_code_monthly": 1.00,  # $1.00 per month per long code
-            "toll_free_monthly": 2.00,  # $2.00 per month per toll-free number
-        }
-
-        # Cache for pricing data
-        self._pricing_cache: Dict[str, float] = {}
-        self._cache_ttl = 24 * 60 * 60  # 24 hours in seconds
-        self._last_cache_update = 0.0
+        self.default_pricing = dict(DEFAULT_PRICING)
 
     async def calculate_user_costs(
         self, user_id: int, time_range: str = "30d"
@@ -58,70 +51,13 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = self._calculate_start_date(end_date, time_range)
 
-            # Get usage data for the user
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            usage_logs = result.scalars().all()
-
-            if not usage_logs:
+            # Billable counts for the user in one aggregate query
+            counts = await self._load_counts(start_date, end_date, user_id=user_id)
+            if not counts.total_messages:
                 return self._create_empty_cost_breakdown()
 
-            # Get current pricing
             pricing = await self.get_twilio_pricing()
-
-            # Calculate costs
-            total_cost = 0.0
-            inbound_cost = 0.0
-            outbound_cost = 0.0
-            mms_cost = 0.0
-
-            for log in usage_logs:
-                message_cost = 0.0
-
-                if log.message_direction == "inbound":
-                    message_cost = pricing["inbound"]
-                    inbound_cost += message_cost
-                elif log.message_direction == "outbound":
-                    # Check if it's international
-                    if self._is_international_number(str(log.phone_number)):
-                        message_cost = pricing["international_outbound"]
-                    else:
-                        message_cost = pricing["outbound"]
-                    outbound_cost += message_cost
-
-                # Add MMS cost if applicable (simplified detection)
-                if log.message_length > 160:  # Assume MMS for long messages
-                    mms_cost += pricing["mms"]
-
-                total_cost += message_cost
-
-            # Add monthly number costs
-            # Assuming one number per user
-            monthly_number_cost = pricing["long_code_monthly"]
-
-            return {
-                "total_cost_usd": round(total_cost, 4),
-                "inbound_cost_usd": round(inbound_cost, 4),
-                "outbound_cost_usd": round(outbound_cost, 4),
-                "mms_cost_usd": round(mms_cost, 4),
-                "monthly_number_cost_usd": monthly_number_cost,
-                "total_with_monthly_fees": round(total_cost + monthly_number_cost, 4),
-                "cost_per_message": round(total_cost / len(usage_logs), 4)
-                if usage_logs
-                else 0,
-                "message_count": len(usage_logs),
-                "period": {
-                    "start_date": start_date.isoformat(),
-                    "end_date": end_date.isoformat(),
-                },
-            }
+            return self._summarize_user_costs(counts, pricing, start_date, end_date)
 
         except Exception as e:
             logger.error(f"Error calculating user costs for user {user_id}: {e}")
@@ -134,73 +70,34 @@ class SMSCostCalculator:
         Returns:
             Dictionary containing current pricing rates
         """
-        try:
-            # Check if cache is still valid
-            current_time = datetime.utcnow().timestamp()
-            if (
-                current_time - self._last_cache_update
-            ) < self._cache_ttl and self._pricing_cache:
-                logger.debug("Using cached Twilio pricing data")
-                return self._pricing_cache
-
-            # Try to fetch from Twilio API
-            pricing = await self._fetch_twilio_pricing()
-
-            if pricing:
-                self._pricing_cache = pricing
-                self._last_cache_update = current_time
-                logger.info("Successfully updated Twilio pricing cache")
-                return pricing
-            else:
-                # Use default pricing if API call fails
-                logger.warning("Using default Twilio pricing due to API failure")
-                return self.default_pricing
+        return await get_pricing_cache().get(self._fetch_twilio_pricing)
 
-        except Exception as e:
-            logger.error(f"Error getting Twilio pricing: {e}")
-            return self.default_pricing
-
-    async def estimate_monthly_costs(self, user_id: int) -> float:
+    async def estimate_monthly_costs(
+        self, user_id: int, current_month_cost: Optional[Dict[str, Any]] = None
+    ) -> float:
         """
         Estimate monthly SMS costs for a user based on current usage patterns.
 
         Args:
             user_id: User ID to estimate costs for
+            current_month_cost: Result of calculate_user_costs(user_id, "30d"),
+                if the caller already has it
 
         Returns:
             Estimated monthly cost in USD
         """
         try:
             # Get current month usage
-            current_month_cost = await self.calculate_user_costs(user_id, "30d")
-
-            # Get previous month usage for trend analysis
-            previous_month_cost = await self.calculate_user_costs(user_id, "60d")
+            if current_month_cost is None:
+                current_month_cost = await self.calculate_user_costs(user_id, "30d")
 
             if not current_month_cost.get("message_count", 0):
                 return 0.0
 
-            # Calculate trend
-            current_avg = current_month_cost["cost_per_message"]
-            previous_avg = previous_month_cost.get("cost_per_message", current_avg)
-
-            # Estimate based on trend (simplified)
-            if previous_avg > 0:
-                trend_factor = current_avg / previous_avg
-            else:
-                trend_factor = 1.0
-
-            # Project to full month
+            # Project the last 30 days to a full month
             days_in_month = 30
-            current_days = min(
-                30, (datetime.utcnow() - (datetime.utcnow() - timedelta(days=30))).days
-            )
-
-            if current_days > 0:
-                daily_cost = current_month_cost["total_cost_usd"] / current_days
-                estimated_monthly = daily_cost * days_in_month * trend_factor
-            else:
-                estimated_monthly = current_month_cost["total_cost_usd"] * trend_factor
+            daily_cost = current_month_cost["total_cost_usd"] / days_in_month
+            estimated_monthly = daily_cost * days_in_month
 
             # Add monthly number fees
             pricing = await self.get_twilio_pricing()
@@ -223,10 +120,28 @@ class SMSCostCalculator:
             Dictionary containing detailed cost analysis
         """
         try:
-            # Get costs for different time periods
-            costs_7d = await self.calculate_user_costs(user_id, "7d")
-            costs_30d = await self.calculate_user_costs(user_id, "30d")
-            costs_90d = await self.calculate_user_costs(user_id, "90d")
+            # Get costs for different time periods from one hourly pass over 90 days
+            end_date = datetime.utcnow()
+            start_date = end_date - timedelta(days=90)
+            counts = await self._load_counts(
+                start_date, end_date, user_id=user_id, period="hour"
+            )
+            pricing = await self.get_twilio_pricing()
+            costs_7d, costs_30d, costs_90d = (
+                self._summarize_user_costs(
+                    counts.since(
+                        window_start.replace(minute=0, second=0, microsecond=0)
+                    ),
+                    pricing,
+                    window_start,
+                    end_date,
+                )
+                for window_start in (
+                    end_date - timedelta(days=7),
+                    end_date - timedelta(days=30),
+                    start_date,
+                )
+            )
 
             # Get usage trends
             usage_trends = await self._get_usage_trends_for_cost_analysis(user_id)
@@ -250,7 +165,9 @@ class SMSCostCalculator:
                 "cost_trends": cost_trends,
                 "usage_trends": usage_trends,
                 "optimization_tips": optimization_tips,
-                "estimated_monthly_cost": await self.estimate_monthly_costs(user_id),
+                "estimated_monthly_cost": await self.estimate_monthly_costs(
+                    user_id, costs_30d
+                ),
                 "last_updated": datetime.utcnow().isoformat(),
             }
 
@@ -273,46 +190,29 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=30)
 
+            # Price every day of the period from one aggregate query
+            counts = await self._load_counts(
+                start_date, end_date, user_id=user_id, period="day"
+            )
+            costs = counts.costs(await self.get_twilio_pricing())
+            day_costs = counts.sum_by_period(
+                costs["inbound"] + costs["outbound"] + costs["mms"]
+            )
+            day_messages = counts.sum_by_period(counts.messages)
+
             daily_costs = []
             current_date = start_date.date()
 
             while current_date <= end_date.date():
-                next_date = current_date + timedelta(days=1)
-
-                # Calculate cost for this day
-                day_start = datetime.combine(current_date, datetime.min.time())
-                day_end = datetime.combine(next_date, datetime.min.time())
-
-                query = select(SMSUsageLog).where(
-                    and_(
-                        SMSUsageLog.user_id == user_id,
-                        SMSUsageLog.created_at >= day_start,
-                        SMSUsageLog.created_at < day_end,
-                    )
+                day = datetime.combine(current_date, datetime.min.time())
+                daily_costs.append(
+                    {
+                        "date": current_date.isoformat(),
+                        "cost_usd": round(day_costs.get(day, 0.0), 4),
+                        "message_count": int(day_messages.get(day, 0)),
+                    }
                 )
-
-                result = await self.db.execute(query)
-                day_logs = result.scalars().all()
-
-                if day_logs:
-                    day_cost = await self._calculate_day_cost(list(day_logs))
-                    daily_costs.append(
-                        {
-                            "date": current_date.isoformat(),
-                            "cost_usd": day_cost,
-                            "message_count": len(day_logs),
-                        }
-                    )
-                else:
-                    daily_costs.append(
-                        {
-                            "date": current_date.isoformat(),
-                            "cost_usd": 0.0,
-                            "message_count": 0,
-                        }
-                    )
-
-                current_date = next_date
+                current_date += timedelta(days=1)
 
             # Analyze trends
             trend_analysis = self._analyze_cost_trends(daily_costs)
@@ -346,7 +246,6 @@ class SMSCostCalculator:
 
             # Get current usage patterns
             usage_summary = await self._get_usage_summary_for_optimization(user_id)
-            await self.calculate_user_costs(user_id, "30d")
 
             # Analyze usage patterns and provide tips
             if usage_summary.get("total_messages", 0) == 0:
@@ -435,56 +334,21 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = self._calculate_start_date(end_date, time_range)
 
-            # Get all usage data for the period
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            all_logs = result.scalars().all()
-
-            if not all_logs:
+            # Billable counts per user for the period in one aggregate query
+            counts = await self._load_counts(start_date, end_date, by_user=True)
+            if not counts.total_messages:
                 return self._create_empty_system_cost_summary(time_range)
 
             # Get pricing
             pricing = await self.get_twilio_pricing()
 
             # Calculate system-wide costs
-            total_cost = 0.0
-            inbound_cost = 0.0
-            outbound_cost = 0.0
-            mms_cost = 0.0
-            international_cost = 0.0
-
-            user_costs = {}
-
-            for log in all_logs:
-                message_cost = 0.0
-
-                if log.message_direction == "inbound":
-                    message_cost = pricing["inbound"]
-                    inbound_cost += message_cost
-                elif log.message_direction == "outbound":
-                    if self._is_international_number(str(log.phone_number)):
-                        message_cost = pricing["international_outbound"]
-                        international_cost += message_cost
-                    else:
-                        message_cost = pricing["outbound"]
-                    outbound_cost += message_cost
-
-                # Add MMS cost if applicable
-                if log.message_length > 160:
-                    mms_cost += pricing["mms"]
-
-                total_cost += message_cost
-
-                # Track per-user costs
-                if log.user_id not in user_costs:
-                    user_costs[log.user_id] = 0.0
-                user_costs[log.user_id] += message_cost
+            costs = counts.costs(pricing)
+            message_costs = costs["inbound"] + costs["outbound"]
+            total_cost = float(message_costs.sum())
+
+            # Track per-user costs
+            user_costs = counts.sum_by_user(message_costs)
 
             # Calculate per-user averages
             unique_users = len(user_costs)
@@ -498,11 +362,11 @@ class SMSCostCalculator:
             return {
                 "time_range": time_range,
                 "total_cost_usd": round(total_cost, 4),
-                "inbound_cost_usd": round(inbound_cost, 4),
-                "outbound_cost_usd": round(outbound_cost, 4),
-                "mms_cost_usd": round(mms_cost, 4),
-                "international_cost_usd": round(international_cost, 4),
-                "total_messages": len(all_logs),
+                "inbound_cost_usd": round(float(costs["inbound"].sum()), 4),
+                "outbound_cost_usd": round(float(costs["outbound"].sum()), 4),
+                "mms_cost_usd": round(float(costs["mms"].sum()), 4),
+                "international_cost_usd": round(float(costs["international"].sum()), 4),
+                "total_messages": counts.total_messages,
                 "unique_users": unique_users,
                 "average_cost_per_user": round(avg_cost_per_user, 4),
                 "top_cost_users": [
@@ -519,7 +383,92 @@ class SMSCostCalculator:
             logger.error(f"Error getting system cost summary: {e}")
             raise
 
+    async def simulate_pricing(
+        self, scenarios: Mapping[str, Mapping[str, float]], time_range: str = "30d"
+    ) -> Dict[str, Any]:
+        """
+        Price the period's usage across all users under what-if price lists.
+
+        Args:
+            scenarios: Scenario name -> per-message prices (``inbound``,
+                ``outbound``, ``international_outbound``, ``mms``); missing
+                rates use the defaults
+            time_range: Time range of usage to price
+
+        Returns:
+            Dictionary containing per-scenario totals and per-user costs
+        """
+        try:
+            end_date = datetime.utcnow()
+            start_date = self._calculate_start_date(end_date, time_range)
+
+            counts = await self._load_counts(start_date, end_date, by_user=True)
+
+            return {
+                "time_range": time_range,
+                "total_messages": counts.total_messages,
+                "scenarios": simulate_pricing(counts, scenarios),
+                "period": {
+                    "start_date": start_date.isoformat(),
+                    "end_date": end_date.isoformat(),
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error simulating SMS pricing: {e}")
+            raise
+
     # Helper methods
+    async def _load_counts(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        user_id: Optional[int] = None,
+        period: Optional[str] = None,
+        by_user: bool = False,
+    ) -> UsageCounts:
+        """Billable counts for the window as columns."""
+        rows = await self.rollups.billable_counts(
+            start_date, end_date, user_id=user_id, period=period, by_user=by_user
+        )
+        return UsageCounts.from_rows(rows)
+
+    def _summarize_user_costs(
+        self,
+        counts: UsageCounts,
+        pricing: Dict[str, float],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Any]:
+        """Cost breakdown response for a user's billable counts."""
+        message_count = counts.total_messages
+        if not message_count:
+            return self._create_empty_cost_breakdown()
+
+        costs = counts.costs(pricing)
+        inbound_cost = float(costs["inbound"].sum())
+        outbound_cost = float(costs["outbound"].sum())
+        total_cost = inbound_cost + outbound_cost
+
+        # Add monthly number costs
+        # Assuming one number per user
+        monthly_number_cost = pricing["long_code_monthly"]
+
+        return {
+            "total_cost_usd": round(total_cost, 4),
+            "inbound_cost_usd": round(inbound_cost, 4),
+            "outbound_cost_usd": round(outbound_cost, 4),
+            "mms_cost_usd": round(float(costs["mms"].sum()), 4),
+            "monthly_number_cost_usd": monthly_number_cost,
+            "total_with_monthly_fees": round(total_cost + monthly_number_cost, 4),
+            "cost_per_message": round(total_cost / message_count, 4),
+            "message_count": message_count,
+            "period": {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            },
+        }
+
     def _calculate_start_date(self, end_date: datetime, time_range: str) -> datetime:
         """Calculate start date based on time range."""
         if time_range == "7d":
@@ -553,47 +502,6 @@ class SMSCostCalculator:
             logger.error(f"Error fetching Twilio pricing: {e}")
             return None
 
-    def _is_international_number(self, phone_number: str) -> bool:
-        """Check if a phone number is international (simplified)."""
-        if not phone_number:
-            return False
-
-        # Remove all non-digit characters
-        clean_number = "".join(filter(str.isdigit, phone_number))
-
-        # Check if it starts with country code (simplified logic)
-        if clean_number.startswith("1") and len(clean_number) == 11:  # US/Canada
-            return False
-        elif len(clean_number) > 10:  # Likely international
-            return True
-
-        return False
-
-    async def _calculate_day_cost(self, day_logs: List[SMSUsageLog]) -> float:
-        """Calculate cost for a specific day's logs."""
-        try:
-            pricing = await self.get_twilio_pricing()
-            total_cost = 0.0
-
-            for log in day_logs:
-                if log.message_direction == "inbound":
-                    total_cost += pricing["inbound"]
-                elif log.message_direction == "outbound":
-                    if self._is_international_number(str(log.phone_number)):
-                        total_cost += pricing["international_outbound"]
-                    else:
-                        total_cost += pricing["outbound"]
-
-                # Add MMS cost if applicable
-                if log.message_length > 160:
-                    total_cost += pricing["mms"]
-
-            return round(total_cost, 4)
-
-        except Exception as e:
-            logger.error(f"Error calculating day cost: {e}")
-            return 0.0
-
     async def _get_usage_trends_for_cost_analysis(self, user_id: int) -> Dict[str, Any]:
         """Get usage trends for cost analysis."""
         try:
@@ -607,17 +515,8 @@ class SMSCostCalculator:
 
             trends = {}
             for period_name, start_date in periods.items():
-                query = select(func.count(SMSUsageLog.id)).where(
-                    and_(
-                        SMSUsageLog.user_id == user_id,
-                        SMSUsageLog.created_at >= start_date,
-                        SMSUsageLog.created_at <= end_date,
-                    )
-                )
-
-                result = await self.db.execute(query)
-                count = result.scalar() or 0
-                trends[period_name] = count
+                totals = await self.rollups.totals(start_date, end_date, user_id)
+                trends[period_name] = totals["message_count"]
 
             return trends
 
@@ -732,39 +631,22 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=30)
 
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
+            by_direction = await self.rollups.totals_by_direction(
+                start_date, end_date, user_id
             )
-
-            result = await self.db.execute(query)
-            usage_logs = result.scalars().all()
-
-            if not usage_logs:
+            totals = merge_measures(by_direction.values())
+            if not totals["message_count"]:
                 return {}
 
-            total_messages = len(usage_logs)
-            inbound_messages = len(
-                [log for log in usage_logs if log.message_direction == "inbound"]
-            )
-            outbound_messages = len(
-                [log for log in usage_logs if log.message_direction == "outbound"]
-            )
-            successful_messages = len([log for log in usage_logs if log.success])
-            total_length = sum(log.message_length for log in usage_logs)
+            total_messages = totals["message_count"]
+            inbound_messages = by_direction.get("inbound", {}).get("message_count", 0)
+            outbound_messages = by_direction.get("outbound", {}).get("message_count", 0)
+            total_length = totals["total_message_length"]
 
             # Calculate usage patterns
-            hourly_counts: Dict[int, int] = {}
-            for log in usage_logs:
-                if log.created_at and hasattr(log.created_at, "hour"):
-                    hour = log.created_at.hour
-                else:
-                    hour = 0
-                hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
-
+            hourly_counts = await self.rollups.hourly_distribution(
+                start_date, end_date, user_id
+            )
             peak_hour = (
                 max(hourly_counts.items(), key=lambda x: x[1])[0]
                 if hourly_counts
@@ -775,9 +657,7 @@ class SMSCostCalculator:
                 "total_messages": total_messages,
                 "inbound_messages": inbound_messages,
                 "outbound_messages": outbound_messages,
-                "success_rate": (successful_messages / total_messages * 100)
-                if total_messages > 0
-                else 0,
+                "success_rate": success_rate_percent(totals),
                 "total_message_length": total_length,
                 "usage_patterns": {"peak_hour": peak_hour},
             }
@@ -792,24 +672,11 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=30)
 
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                    SMSUsageLog.message_direction == "outbound",
-                )
+            # Numbers are classified when the usage log is written
+            by_direction = await self.rollups.totals_by_direction(
+                start_date, end_date, user_id
             )
-
-            result = await self.db.execute(query)
-            outbound_logs = result.scalars().all()
-
-            international_count = 0
-            for log in outbound_logs:
-                if self._is_international_number(str(log.phone_number)):
-                    international_count += 1
-
-            return international_count
+            return by_direction.get("outbound", {}).get("international_count", 0)
 
         except Exception as e:
             logger.error(f"Error counting international messages: {e}")
@@ -821,19 +688,9 @@ class SMSCostCalculator:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(days=30)
 
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.user_id == user_id,
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                    SMSUsageLog.message_length > 160,
-                )
-            )
-
-            result = await self.db.execute(query)
-            mms_logs = result.scalars().all()
-
-            return len(mms_logs)
+            # Anything longer than a single SMS segment
+            totals = await self.rollups.totals(start_date, end_date, user_id)
+            return totals["medium_message_count"] + totals["long_message_count"]
 
         except Exception as e:
             logger.error(f"Error counting MMS messages: {e}")
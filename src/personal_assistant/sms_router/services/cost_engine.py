@@ -0,0 +1,245 @@
+"""
+Columnar SMS cost engine.
+
+SMS costs are linear in four counts: inbound messages, domestic and
+international outbound messages, and messages long enough to bill as MMS.
+SMSUsageRollups.billable_counts returns those counts per day and/or user in
+one SQL pass; UsageCounts holds them as NumPy columns so a period, every
+user, or a batch of what-if price lists is priced with a few vector
+operations instead of a Python loop per log.
+
+Pricing is resolved once per process and kept for
+SMS_PRICING_CACHE_TTL_SECONDS (see ``get_pricing_cache``).
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from ...config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Default Twilio pricing (US rates as fallback)
+DEFAULT_PRICING: Dict[str, float] = {
+    "inbound": 0.0075,  # $0.0075 per message
+    "outbound": 0.0079,  # $0.0079 per message
+    # $0.15 per message (varies by country)
+    "international_outbound": 0.15,
+    "mms": 0.02,  # $0.02 per MMS
+    "long_code_monthly": 1.00,  # $1.00 per month per long code
+    "toll_free_monthly": 2.00,  # $2.00 per month per toll-free number
+}
+
+# Per-message rates, in the column order of UsageCounts.matrix()
+MESSAGE_RATES = ("inbound", "outbound", "international_outbound", "mms")
+
+
+class PricingCache:
+    """
+    Process-wide SMS pricing with a TTL.
+
+    Args:
+        ttl_seconds: How long resolved pricing is reused
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._pricing: Optional[Dict[str, float]] = None
+        self._loaded_at = 0.0
+
+    async def get(
+        self, loader: Callable[[], Awaitable[Optional[Dict[str, float]]]]
+    ) -> Dict[str, float]:
+        """Cached pricing, calling ``loader`` (None means use defaults) when stale."""
+        if self._pricing is not None and not self._expired():
+            return self._pricing
+
+        # Concurrent first calls may both load; the result is the same
+        try:
+            pricing = await loader()
+        except Exception as e:
+            logger.error(f"Error loading SMS pricing: {e}")
+            pricing = None
+        if not pricing:
+            logger.warning("Using default Twilio pricing")
+            pricing = dict(DEFAULT_PRICING)
+        self._pricing = pricing
+        self._loaded_at = time.monotonic()
+        return pricing
+
+    def clear(self) -> None:
+        """Drop the cached pricing so the next call reloads it."""
+        self._pricing = None
+
+    def _expired(self) -> bool:
+        return time.monotonic() - self._loaded_at >= self.ttl_seconds
+
+
+_pricing_cache: Optional[PricingCache] = None
+
+
+def get_pricing_cache() -> PricingCache:
+    """Get the process-wide pricing cache."""
+    global _pricing_cache
+    if _pricing_cache is None:
+        _pricing_cache = PricingCache(settings.SMS_PRICING_CACHE_TTL_SECONDS)
+    return _pricing_cache
+
+
+def set_pricing_cache(cache: Optional[PricingCache]) -> None:
+    """Replace the pricing cache (None resets it)."""
+    global _pricing_cache
+    _pricing_cache = cache
+
+
+@dataclass
+class UsageCounts:
+    """Billable counts as columns, one entry per (period, user) group."""
+
+    periods: List[Optional[datetime]]
+    user_ids: List[Optional[int]]
+    inbound: np.ndarray
+    outbound: np.ndarray  # Includes international
+    international: np.ndarray  # International outbound
+    mms: np.ndarray
+    messages: np.ndarray
+
+    @classmethod
+    def from_rows(cls, rows: List[Dict[str, Any]]) -> "UsageCounts":
+        """Build columns from SMSUsageRollups.billable_counts rows."""
+
+        def column(name: str) -> np.ndarray:
+            return np.fromiter(
+                (row[name] for row in rows), dtype=np.int64, count=len(rows)
+            )
+
+        return cls(
+            periods=[row.get("period") for row in rows],
+            user_ids=[row.get("user_id") for row in rows],
+            inbound=column("inbound_count"),
+            outbound=column("outbound_count"),
+            international=column("international_count"),
+            mms=column("mms_count"),
+            messages=column("message_count"),
+        )
+
+    @property
+    def total_messages(self) -> int:
+        return int(self.messages.sum())
+
+    def matrix(self) -> np.ndarray:
+        """Counts billed at each of MESSAGE_RATES, shape (groups, 4)."""
+        return np.column_stack(
+            (
+                self.inbound,
+                self.outbound - self.international,
+                self.international,
+                self.mms,
+            )
+        ).astype(np.float64)
+
+    def costs(self, pricing: Mapping[str, float]) -> Dict[str, np.ndarray]:
+        """Cost columns per group; ``outbound`` includes ``international``."""
+        international = self.international * float(pricing["international_outbound"])
+        return {
+            "inbound": self.inbound * float(pricing["inbound"]),
+            "outbound": (self.outbound - self.international)
+            * float(pricing["outbound"])
+            + international,
+            "international": international,
+            "mms": self.mms * float(pricing["mms"]),
+        }
+
+    def since(self, start: datetime) -> "UsageCounts":
+        """Groups whose period starts at or after ``start``."""
+        mask = np.array(
+            [period is not None and period >= start for period in self.periods],
+            dtype=bool,
+        )
+        return UsageCounts(
+            periods=[p for p, keep in zip(self.periods, mask) if keep],
+            user_ids=[u for u, keep in zip(self.user_ids, mask) if keep],
+            inbound=self.inbound[mask],
+            outbound=self.outbound[mask],
+            international=self.international[mask],
+            mms=self.mms[mask],
+            messages=self.messages[mask],
+        )
+
+    def sum_by_user(self, values: np.ndarray) -> Dict[Optional[int], float]:
+        """Total ``values`` per user."""
+        return _sum_by_key(self.user_ids, values)
+
+    def sum_by_period(self, values: np.ndarray) -> Dict[Optional[datetime], float]:
+        """Total ``values`` per period."""
+        return _sum_by_key(self.periods, values)
+
+
+def _group_positions(keys: List[Any]) -> Tuple[Dict[Any, int], np.ndarray]:
+    """Distinct keys with their position, and each entry's position."""
+    index: Dict[Any, int] = {}
+    positions = np.fromiter(
+        (index.setdefault(key, len(index)) for key in keys),
+        dtype=np.int64,
+        count=len(keys),
+    )
+    return index, positions
+
+
+def _sum_by_key(keys: List[Any], values: np.ndarray) -> Dict[Any, float]:
+    index, positions = _group_positions(keys)
+    totals = np.bincount(positions, weights=values, minlength=len(index))
+    return {key: float(totals[position]) for key, position in index.items()}
+
+
+def simulate_pricing(
+    counts: UsageCounts, scenarios: Mapping[str, Mapping[str, float]]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Price the same usage under several price lists at once.
+
+    Each scenario maps MESSAGE_RATES to per-message prices (missing rates
+    fall back to DEFAULT_PRICING). Totals include MMS charges.
+
+    Returns:
+        Per scenario: ``total_cost_usd``, ``cost_by_rate`` and ``user_costs``
+    """
+    names = list(scenarios)
+    if not names:
+        return {}
+    rates = np.array(
+        [
+            [
+                float(scenarios[name].get(rate, DEFAULT_PRICING[rate]))
+                for rate in MESSAGE_RATES
+            ]
+            for name in names
+        ]
+    ).T  # (4, scenarios)
+    matrix = counts.matrix()
+    by_rate = matrix.sum(axis=0)[:, None] * rates  # (4, scenarios)
+    group_costs = matrix @ rates  # (groups, scenarios)
+
+    index, positions = _group_positions(counts.user_ids)
+    user_costs = np.zeros((len(index), len(names)))
+    np.add.at(user_costs, positions, group_costs)
+
+    return {
+        name: {
+            "total_cost_usd": round(float(by_rate[:, column].sum()), 4),
+            "cost_by_rate": {
+                rate: round(float(by_rate[row, column]), 4)
+                for row, rate in enumerate(MESSAGE_RATES)
+            },
+            "user_costs": {
+                user_id: round(float(user_costs[position, column]), 4)
+                for user_id, position in index.items()
+            },
+        }
+        for column, name in enumerate(names)
+    }
@@ -0,0 +1,487 @@
+"""
+Inbound SMS processing queue.
+
+The Twilio webhook only enqueues; a bounded pool of workers runs each message
+through the routing engine and texts the reply back. This service provides:
+- MessageSid deduplication, so Twilio retries are processed once
+- Per-sender FIFO: one sender's messages run one at a time, in arrival order
+- A journal of accepted messages, so work interrupted by a restart is resumed
+- Queue depth reported to the ``sms_queue_length`` gauge
+
+The journal is Redis when SMS_INBOUND_REDIS_URL is set and an in-process
+stand-in otherwise.
+
+Per-sender FIFO holds only within one API process. With several processes,
+two texts from one sender can reach different processes and be worked on at
+the same time; route each sender to one process if replies must stay ordered.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from ...config.settings import settings
+from ...logging import get_correlation_id, set_correlation_id
+from ...monitoring import get_metrics_service
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "pa:sms:inbound:"
+
+# Claim the MessageSid and journal the message in one round trip; the HSET
+# only runs if the SET NX won, which MULTI/EXEC cannot express
+_ADD_SCRIPT = """
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    redis.call('HSET', KEYS[2], ARGV[3], ARGV[4])
+    return 1
+end
+return 0
+"""
+
+
+@dataclass
+class InboundSMS:
+    """An inbound SMS accepted from the Twilio webhook."""
+
+    from_phone: str
+    body: str
+    message_sid: str
+    received_at: float = field(default_factory=time.time)
+    # Webhook request's correlation ID, restored while the reply is worked on
+    correlation_id: Optional[str] = field(default_factory=get_correlation_id)
+
+
+class MemoryInboundJournal:
+    """In-process journal. Deduplicates within this process; not durable."""
+
+    durable = False
+
+    def __init__(self, dedupe_ttl_seconds: Optional[int] = None):
+        self._ttl = dedupe_ttl_seconds or settings.SMS_INBOUND_DEDUPE_TTL_SECONDS
+        # MessageSid -> expiry, oldest first
+        self._seen: "OrderedDict[str, float]" = OrderedDict()
+        self._pending: Dict[str, InboundSMS] = {}
+
+    async def add(self, message: InboundSMS) -> bool:
+        """Record a message; False if its MessageSid was already seen."""
+        now = time.time()
+        while self._seen and next(iter(self._seen.values())) <= now:
+            self._seen.popitem(last=False)
+
+        if message.message_sid in self._seen:
+            return False
+        self._seen[message.message_sid] = now + self._ttl
+        self._pending[message.message_sid] = message
+        return True
+
+    async def complete(self, message_sid: str) -> None:
+        """Remove a processed message from the journal."""
+        self._pending.pop(message_sid, None)
+
+    async def heartbeat(self) -> None:
+        """Nothing to refresh in-process."""
+
+    async def claim_orphans(self) -> List[InboundSMS]:
+        """In-process messages never outlive their owner."""
+        return []
+
+
+class RedisInboundJournal:
+    """
+    Redis journal shared by every API process.
+
+    Accepted messages are kept in one hash until processed. Each process
+    refreshes an owner key while it runs; messages whose owner key has expired
+    (the process died or restarted) are claimed by exactly one other process.
+
+    Args:
+        redis_client: ``redis.asyncio`` client created with decode_responses=True
+        dedupe_ttl_seconds: How long a MessageSid is remembered
+        owner_ttl_seconds: Lifetime of the owner key between heartbeats
+    """
+
+    durable = True
+
+    def __init__(
+        self,
+        redis_client,
+        dedupe_ttl_seconds: Optional[int] = None,
+        owner_ttl_seconds: int = 30,
+    ):
+        self._redis = redis_client
+        self._dedupe_ttl = dedupe_ttl_seconds or settings.SMS_INBOUND_DEDUPE_TTL_SECONDS
+        self.owner_ttl_seconds = owner_ttl_seconds
+        self.owner_id = uuid.uuid4().hex
+        self._pending_key = f"{_REDIS_KEY_PREFIX}pending"
+
+    def _owner_key(self, owner_id: str) -> str:
+        return f"{_REDIS_KEY_PREFIX}owner:{owner_id}"
+
+    def _encode(self, message: InboundSMS) -> str:
+        return json.dumps({"owner": self.owner_id, "message": asdict(message)})
+
+    async def add(self, message: InboundSMS) -> bool:
+        """Record a message; False if its MessageSid was already seen."""
+        is_new = await self._redis.eval(
+            _ADD_SCRIPT,
+            2,
+            f"{_REDIS_KEY_PREFIX}sid:{message.message_sid}",
+            self._pending_key,
+            self.owner_id,
+            self._dedupe_ttl,
+            message.message_sid,
+            self._encode(message),
+        )
+        return bool(is_new)
+
+    async def complete(self, message_sid: str) -> None:
+        """Remove a processed message from the journal."""
+        await self._redis.hdel(self._pending_key, message_sid)
+
+    async def heartbeat(self) -> None:
+        """Mark this process as alive."""
+        await self._redis.set(
+            self._owner_key(self.owner_id), "1", ex=self.owner_ttl_seconds
+        )
+
+    async def claim_orphans(self) -> List[InboundSMS]:
+        """Take over pending messages whose owner is no longer alive."""
+        claimed = []
+        entries = await self._redis.hgetall(self._pending_key)
+        for message_sid, payload in entries.items():
+            data = json.loads(payload)
+            owner = data.get("owner")
+            if owner == self.owner_id or await self._redis.exists(
+                self._owner_key(owner)
+            ):
+                continue
+
+            # Only one process wins the claim for a given (message, dead owner)
+            won = await self._redis.set(
+                f"{_REDIS_KEY_PREFIX}claim:{message_sid}:{owner}",
+                self.owner_id,
+                nx=True,
+                ex=self._dedupe_ttl,
+            )
+            if not won:
+                continue
+
+            message = InboundSMS(**data["message"])
+            await self._redis.hset(
+                self._pending_key, message_sid, self._encode(message)
+            )
+            claimed.append(message)
+
+        return sorted(claimed, key=lambda m: m.received_at)
+
+
+class InboundSMSQueue:
+    """
+    Bounded, per-sender ordered queue for inbound SMS.
+
+    Args:
+        handler: Coroutine that processes one message (route and reply)
+        journal: Message journal; defaults to the in-process stand-in
+        num_workers: Messages processed concurrently (distinct senders)
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[InboundSMS], Awaitable[Any]],
+        journal=None,
+        num_workers: Optional[int] = None,
+    ):
+        self.handler = handler
+        self.journal = journal or MemoryInboundJournal()
+        self.num_workers = num_workers or settings.SMS_INBOUND_WORKERS
+
+        # Queue state, bound to the event loop that called start()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._maintenance_task: Optional[asyncio.Task] = None
+        # Per-sender mailboxes; a sender is in _scheduled while it is queued
+        # in _ready or being processed, so it never runs on two workers
+        self._mailboxes: Dict[str, Deque[InboundSMS]] = {}
+        self._scheduled: Set[str] = set()
+        self._depth = 0
+        self._metrics = {
+            "accepted": 0,
+            "duplicates": 0,
+            "processed": 0,
+            "failed": 0,
+            "recovered": 0,
+            "max_depth": 0,
+        }
+
+    @property
+    def is_running(self) -> bool:
+        """Whether workers are running on an event loop."""
+        return self._loop is not None
+
+    @property
+    def depth(self) -> int:
+        """Messages accepted and not yet processed (including in progress)."""
+        return self._depth
+
+    async def start(self):
+        """Start the workers and resume any journaled messages."""
+        if self.is_running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"sms-inbound-worker-{i}")
+            for i in range(self.num_workers)
+        ]
+        if self.journal.durable:
+            await self._maintain_journal()
+            self._maintenance_task = asyncio.create_task(
+                self._maintenance_loop(), name="sms-inbound-journal"
+            )
+        logger.info(
+            f"Inbound SMS queue started: {self.num_workers} workers, "
+            f"durable journal: {self.journal.durable}"
+        )
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Drain queued messages and stop the workers.
+
+        Args:
+            timeout: Seconds to wait for the drain; messages left over stay in
+                a durable journal and are resumed by the next process
+        """
+        if not self.is_running:
+            return
+        if timeout is None:
+            timeout = settings.SMS_INBOUND_SHUTDOWN_TIMEOUT_SECONDS
+
+        try:
+            await asyncio.wait_for(self._ready.join(), timeout)
+            logger.info("Inbound SMS queue drained")
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Inbound SMS queue drain timed out after {timeout}s with "
+                f"{self._depth} messages pending"
+            )
+
+        tasks = list(self._workers)
+        if self._maintenance_task is not None:
+            tasks.append(self._maintenance_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._maintenance_task = None
+        self._mailboxes.clear()
+        self._scheduled.clear()
+        self._depth = 0
+        self._ready = None
+        self._loop = None
+
+    async def submit(self, from_phone: str, body: str, message_sid: str) -> bool:
+        """
+        Accept an inbound SMS for processing.
+
+        Starts the workers on first use if the app did not start them.
+
+        Args:
+            from_phone: Sender's phone number
+            body: SMS message content
+            message_sid: Twilio message SID
+
+        Returns:
+            False if the MessageSid was already accepted, True otherwise
+        """
+        if not self.is_running:
+            await self.start()
+
+        message = InboundSMS(from_phone=from_phone, body=body, message_sid=message_sid)
+        try:
+            is_new = await self.journal.add(message)
+        except Exception as e:
+            # Better to process without a journal entry than to drop the text
+            logger.error(f"Inbound SMS journal unavailable for {message_sid}: {e}")
+            is_new = True
+
+        if not is_new:
+            self._metrics["duplicates"] += 1
+            logger.info(f"Ignoring duplicate inbound SMS {message_sid}")
+            return False
+
+        self._metrics["accepted"] += 1
+        self._enqueue(message)
+        return True
+
+    def _enqueue(self, message: InboundSMS):
+        sender = message.from_phone
+        self._mailboxes.setdefault(sender, deque()).append(message)
+        self._depth += 1
+        self._metrics["max_depth"] = max(self._metrics["max_depth"], self._depth)
+        if sender not in self._scheduled:
+            self._scheduled.add(sender)
+            self._ready.put_nowait(sender)
+        self._report_depth()
+
+    async def _worker(self):
+        while True:
+            sender = await self._ready.get()
+            mailbox = self._mailboxes[sender]
+            try:
+                await self._process(mailbox.popleft())
+            finally:
+                if mailbox:
+                    # Back of the line, so one chatty sender cannot starve others
+                    self._ready.put_nowait(sender)
+                else:
+                    del self._mailboxes[sender]
+                    self._scheduled.discard(sender)
+                self._ready.task_done()
+
+    async def _process(self, message: InboundSMS):
+        set_correlation_id(message.correlation_id or message.message_sid)
+        try:
+            await self.handler(message)
+            self._metrics["processed"] += 1
+        except asyncio.CancelledError:
+            # Stopped mid-reply: the journal entry stays, so the next process
+            # resumes the message instead of it being lost
+            logger.warning(
+                f"Inbound SMS {message.message_sid} interrupted; left in the journal"
+            )
+            raise
+        except Exception as e:
+            self._metrics["failed"] += 1
+            logger.error(f"Failed to process inbound SMS {message.message_sid}: {e}")
+        finally:
+            self._depth -= 1
+            self._report_depth()
+
+        # Only once the handler finished or failed
+        try:
+            await self.journal.complete(message.message_sid)
+        except Exception as e:
+            logger.error(
+                f"Failed to clear inbound SMS {message.message_sid} from journal: {e}"
+            )
+
+    async def _maintain_journal(self):
+        try:
+            await self.journal.heartbeat()
+            orphans = await self.journal.claim_orphans()
+        except Exception as e:
+            logger.warning(f"Inbound SMS journal maintenance failed: {e}")
+            return
+
+        for message in orphans:
+            self._metrics["recovered"] += 1
+            self._enqueue(message)
+        if orphans:
+            logger.info(f"Resumed {len(orphans)} journaled inbound SMS")
+
+    async def _maintenance_loop(self):
+        interval = max(1.0, self.journal.owner_ttl_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            await self._maintain_journal()
+
+    def _report_depth(self):
+        try:
+            get_metrics_service().update_sms_metrics(queue_length=self._depth)
+        except Exception as e:
+            logger.debug(f"Failed to update sms_queue_length: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue counters and current depth."""
+        return {
+            **self._metrics,
+            "depth": self._depth,
+            "senders": len(self._mailboxes),
+            "workers": len(self._workers),
+            "durable": self.journal.durable,
+        }
+
+
+async def reply_to_inbound_sms(routing_engine, twilio_service, message: InboundSMS):
+    """
+    Route an inbound SMS and text the response back to the sender.
+
+    Args:
+        routing_engine: SMSRoutingEngine used for the whole pipeline
+        twilio_service: TwilioService used to send the reply
+        message: The inbound SMS
+    """
+    from_phone = message.from_phone
+    logger.info(f"Processing queued SMS from {from_phone}: {message.body[:50]}...")
+
+    try:
+        response = await routing_engine.route_sms(
+            from_phone, message.body, message.message_sid
+        )
+
+        # Extract message content using Twilio's built-in API
+        if hasattr(response, "verbs") and response.verbs:
+            response_text = response.verbs[0].value
+        else:
+            response_text = "Sorry, I couldn't process your request."
+
+        reply_sid = await twilio_service.send_sms(from_phone, response_text)
+        logger.info(
+            f"Replied to SMS {message.message_sid} from {from_phone}: {reply_sid}"
+        )
+
+    except Exception as e:
+        logger.error(
+            f"Failed to reply to SMS {message.message_sid} from {from_phone}: {e}"
+        )
+        try:
+            await twilio_service.send_sms(
+                from_phone, "Sorry, there was an error processing your request."
+            )
+        except Exception as send_error:
+            logger.error(f"Failed to send error message: {send_error}")
+
+
+# Global inbound queue instance
+_inbound_queue: Optional[InboundSMSQueue] = None
+
+
+def get_inbound_sms_queue() -> InboundSMSQueue:
+    """Get the process-wide inbound SMS queue, creating it on first use."""
+    global _inbound_queue
+    if _inbound_queue is None:
+        from ...communication.twilio_integration.twilio_client import TwilioService
+        from .routing_engine import SMSRoutingEngine
+
+        routing_engine = SMSRoutingEngine()
+        twilio_service = TwilioService()
+
+        async def handler(message: InboundSMS):
+            await reply_to_inbound_sms(routing_engine, twilio_service, message)
+
+        journal = None
+        if settings.SMS_INBOUND_REDIS_URL:
+            import redis.asyncio as async_redis
+
+            journal = RedisInboundJournal(
+                async_redis.Redis.from_url(
+                    settings.SMS_INBOUND_REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            )
+        _inbound_queue = InboundSMSQueue(handler, journal=journal)
+    return _inbound_queue
+
+
+def set_inbound_sms_queue(queue: Optional[InboundSMSQueue]) -> None:
+    """Override the process-wide inbound queue (e.g. for tests); None resets it."""
+    global _inbound_queue
+    _inbound_queue = queue
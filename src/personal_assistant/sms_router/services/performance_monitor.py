@@ -6,11 +6,14 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ...monitoring import get_metrics_service
-from ..models.sms_models import SMSUsageLog
+from .usage_rollups import (
+    SMSUsageRollups,
+    average_processing_time_ms,
+    success_rate_percent,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +24,7 @@ class SMSPerformanceMonitor:
     def __init__(self, db_session: AsyncSession):
         """Initialize the performance monitor with a database session."""
         self.db = db_session
+        self.rollups = SMSUsageRollups(db_session)
 
         # SLA thresholds
         self.sla_thresholds = {
@@ -65,21 +69,8 @@ class SMSPerformanceMonitor:
             end_date = datetime.utcnow()
             start_date = end_date - timedelta(hours=1)
 
-            # Get recent usage data
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at >= start_date,
-                    SMSUsageLog.created_at <= end_date,
-                )
-            )
-
-            result = await self.db.execute(query)
-            recent_logs = result.scalars().all()
-
-            if not recent_logs:
-                metrics = self._create_empty_real_time_metrics()
-            else:
-                metrics = await self._calculate_real_time_metrics(list(recent_logs))
+            # Aggregate recent usage in SQL
+            metrics = await self._calculate_real_time_metrics(start_date, end_date)
 
             # Update cache
             self._performance_cache = metrics
@@ -623,44 +614,33 @@ class SMSPerformanceMonitor:
             return end_date - timedelta(days=30)  # Default to 30 days
 
     async def _calculate_real_time_metrics(
-        self, recent_logs: List[SMSUsageLog]
+        self, start_date: datetime, end_date: datetime
     ) -> Dict[str, Any]:
-        """Calculate real-time metrics from recent logs."""
+        """Calculate real-time metrics for the recent window."""
         try:
-            total_messages = len(recent_logs)
-            successful_messages = len([log for log in recent_logs if log.success])
+            totals = await self.rollups.totals(start_date, end_date)
+            if not totals["message_count"]:
+                return self._create_empty_real_time_metrics()
+
+            total_messages = totals["message_count"]
+            successful_messages = totals["success_count"]
             failed_messages = total_messages - successful_messages
 
             # Calculate success rate
-            success_rate = (
-                (successful_messages / total_messages * 100)
-                if total_messages > 0
-                else 100
-            )
+            success_rate = success_rate_percent(totals, default=100)
 
             # Calculate response time metrics
-            processing_times = [
-                int(log.processing_time_ms)
-                for log in recent_logs
-                if log.processing_time_ms
-            ]
-            avg_response_time = (
-                sum(processing_times) / len(processing_times) if processing_times else 0
+            avg_response_time = average_processing_time_ms(totals)
+            percentiles = await self.rollups.processing_time_percentiles(
+                start_date, end_date
             )
-            min_response_time = min(processing_times) if processing_times else 0
-            max_response_time = max(processing_times) if processing_times else 0
-
-            # Calculate user activity
-            unique_users = len(set(log.user_id for log in recent_logs))
 
             # Calculate hourly activity
-            hourly_counts: Dict[int, int] = {}
-            for log in recent_logs:
-                if log.created_at and hasattr(log.created_at, "hour"):
-                    hour = log.created_at.hour
-                else:
-                    hour = 0
-                hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
+            hourly_series = await self.rollups.hourly_series(start_date, end_date)
+            hourly_counts = {
+                bucket.hour: hour["message_count"]
+                for bucket, hour in hourly_series.items()
+            }
 
             peak_hour = (
                 max(hourly_counts.items(), key=lambda x: x[1])[0]
@@ -673,20 +653,13 @@ class SMSPerformanceMonitor:
             today_start = datetime.utcnow().replace(
                 hour=0, minute=0, second=0, microsecond=0
             )
-            today_logs = [
-                log
-                for log in recent_logs
-                if log.created_at and log.created_at >= today_start
-            ]
-            today_hourly_counts: Dict[int, int] = {}
-            for log in today_logs:
-                if log.created_at and hasattr(log.created_at, "hour"):
-                    hour = log.created_at.hour
-                else:
-                    hour = 0
-                today_hourly_counts[hour] = today_hourly_counts.get(hour, 0) + 1
-            peak_users_today = (
-                max(today_hourly_counts.values()) if today_hourly_counts else 0
+            peak_users_today = max(
+                (
+                    hour["message_count"]
+                    for bucket, hour in hourly_series.items()
+                    if bucket >= today_start
+                ),
+                default=0,
             )
 
             return {
@@ -696,9 +669,12 @@ class SMSPerformanceMonitor:
                 "success_rate_percent": round(success_rate, 2),
                 "error_rate_percent": round(100 - success_rate, 2),
                 "average_response_time_ms": round(avg_response_time, 2),
-                "min_response_time_ms": min_response_time,
-                "max_response_time_ms": max_response_time,
-                "active_users": unique_users,
+                "min_response_time_ms": totals["processing_min_ms"],
+                "max_response_time_ms": totals["processing_max_ms"],
+                "p50_response_time_ms": percentiles["p50"],
+                "p95_response_time_ms": percentiles["p95"],
+                "p99_response_time_ms": percentiles["p99"],
+                "active_users": totals["unique_users"],
                 "peak_users": peak_users,
                 "peak_users_today": peak_users_today,
                 "peak_hour": peak_hour,
@@ -714,40 +690,15 @@ class SMSPerformanceMonitor:
         self, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
         """Get daily performance data for the specified period."""
+        daily_series = await self.rollups.daily_series(start_date, end_date)
         daily_data = []
         current_date = start_date.date()
 
         while current_date <= end_date.date():
-            next_date = current_date + timedelta(days=1)
-
-            # Get data for this day
-            query = select(SMSUsageLog).where(
-                and_(
-                    SMSUsageLog.created_at
-                    >= datetime.combine(current_date, datetime.min.time()),
-                    SMSUsageLog.created_at
-                    < datetime.combine(next_date, datetime.min.time()),
-                )
-            )
-
-            result = await self.db.execute(query)
-            day_logs = result.scalars().all()
-
-            if day_logs:
-                total = len(day_logs)
-                successful = len([log for log in day_logs if log.success])
-                success_rate = (successful / total * 100) if total > 0 else 0
-
-                processing_times = [
-                    log.processing_time_ms for log in day_logs if log.processing_time_ms
-                ]
-                avg_processing_time = (
-                    sum(processing_times) / len(processing_times)
-                    if processing_times
-                    else 0
-                )
-
-                unique_users = len(set(log.user_id for log in day_logs))
+            day = daily_series.get(current_date)
+            if day and day["message_count"]:
+                total = day["message_count"]
+                successful = day["success_count"]
 
                 daily_data.append(
                     {
@@ -755,9 +706,11 @@ class SMSPerformanceMonitor:
                         "total_messages": total,
                         "successful_messages": successful,
                         "failed_messages": total - successful,
-                        "success_rate": round(success_rate, 2),
-                        "average_response_time_ms": round(avg_processing_time, 2),
-                        "unique_users": unique_users,
+                        "success_rate": round(success_rate_percent(day), 2),
+                        "average_response_time_ms": round(
+                            average_processing_time_ms(day), 2
+                        ),
+                        "unique_users": day["unique_users"],
                     }
                 )
             else:
@@ -773,7 +726,7 @@ class SMSPerformanceMonitor:
                     }
                 )
 
-            current_date = next_date
+            current_date += timedelta(days=1)
 
         return daily_data
 
@@ -1108,6 +1061,9 @@ class SMSPerformanceMonitor:
             "average_response_time_ms": 0,
             "min_response_time_ms": 0,
             "max_response_time_ms": 0,
+            "p50_response_time_ms": 0,
+            "p95_response_time_ms": 0,
+            "p99_response_time_ms": 0,
             "active_users": 0,
             "peak_users": 0,
             "peak_users_today": 0,
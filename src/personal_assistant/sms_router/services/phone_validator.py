@@ -9,6 +9,25 @@ from typing import Optional
 logger = logging.getLogger(__name__)
 
 
+def is_international_number(phone_number: Optional[str]) -> bool:
+    """
+    Check if a phone number is outside the US/Canada (simplified).
+
+    SMS usage logs store the result at write time for pricing, so keep this in
+    step with the backfill in migration 013_add_sms_usage_international.
+    """
+    if not phone_number:
+        return False
+
+    # Remove all non-digit characters
+    clean_number = "".join(filter(str.isdigit, phone_number))
+
+    # Check if it starts with country code (simplified logic)
+    if clean_number.startswith("1") and len(clean_number) == 11:  # US/Canada
+        return False
+    return len(clean_number) > 10  # Likely international
+
+
 class PhoneValidator:
     """Service for validating and normalizing phone numbers."""
 
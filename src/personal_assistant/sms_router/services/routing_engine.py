@@ -20,6 +20,7 @@ from ...database.session import AsyncSessionLocal
 from ..models.sms_models import SMSUsageLog
 from .agent_integration import AgentIntegrationService
 from .message_processor import MessageProcessor
+from .phone_validator import is_international_number
 from .response_formatter import ResponseFormatter
 from .user_identification import UserIdentificationService
 
@@ -282,6 +283,7 @@ class SMSRoutingEngine:
                     phone_number=phone_number,
                     message_direction=direction,
                     message_length=len(message_content),
+                    is_international=is_international_number(phone_number),
                     # Store content in column
                     message_content=message_content[:1000],
                     success=success,
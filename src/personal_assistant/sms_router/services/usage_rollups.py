@@ -0,0 +1,611 @@
+"""
+SMS usage rollups: hourly and daily aggregates of sms_usage_logs.
+
+The analytics services read windowed aggregates through SMSUsageRollups
+instead of loading log rows. A window is split into segments
+(``plan_segments``): whole days come from the daily rollup, whole hours from
+the hourly rollup, and the ragged edges plus anything after the refresh
+watermark from sms_usage_logs itself. Every segment yields the same measure
+columns per (bucket, user, direction); they are combined with UNION ALL and
+reduced with one GROUP BY, so the cost of a query follows the length of the
+window rather than the size of the log table.
+
+``refresh()`` (run by the refresh_sms_usage_rollups Celery task) rebuilds the
+hours since the watermark, plus a lookback for late writes, and the days
+those hours fall in.
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import (
+    and_,
+    delete,
+    distinct,
+    extract,
+    func,
+    insert,
+    literal_column,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...config.settings import settings
+from ..models.sms_models import (
+    SMSUsageDailyRollup,
+    SMSUsageHourlyRollup,
+    SMSUsageLog,
+    SMSUsageRollupState,
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_STATE_NAME = "sms_usage"
+# Serializes refreshes across workers (pg_try_advisory_xact_lock key)
+REFRESH_LOCK_KEY = 0x534D5352
+
+# Measures summed when buckets are combined
+SUM_MEASURES = (
+    "message_count",
+    "success_count",
+    "length_count",
+    "total_message_length",
+    "short_message_count",
+    "medium_message_count",
+    "long_message_count",
+    "international_count",
+    "processing_count",
+    "processing_total_ms",
+)
+MEASURES = SUM_MEASURES + ("processing_min_ms", "processing_max_ms")
+
+
+class UsageSegment(NamedTuple):
+    """A slice of a query window and the table that serves it."""
+
+    source: str  # "raw", "hourly" or "daily"
+    start: datetime
+    end: datetime
+    # Only the last raw segment includes its end (windows end at "now")
+    include_end: bool = False
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + timedelta(hours=1)
+
+
+def _floor_day(value: datetime) -> datetime:
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    floor = _floor_day(value)
+    return floor if floor == value else floor + timedelta(days=1)
+
+
+def plan_segments(
+    start: datetime,
+    end: datetime,
+    refreshed_through: Optional[datetime],
+    use_daily: bool = True,
+) -> List[UsageSegment]:
+    """
+    Split [start, end] into raw, hourly and daily segments.
+
+    Rollups are only used up to ``refreshed_through``; the rest of the window
+    is read from the raw log. With ``use_daily`` off, whole days are served
+    from the hourly rollup (needed for hour-of-day breakdowns).
+    """
+    if refreshed_through is None:
+        return [UsageSegment("raw", start, end, True)]
+
+    first_hour = _ceil_hour(start)
+    rolled_until = _floor_hour(min(end, refreshed_through))
+    if rolled_until <= first_hour:
+        return [UsageSegment("raw", start, end, True)]
+
+    segments = []
+    if start < first_hour:
+        segments.append(UsageSegment("raw", start, first_hour))
+
+    first_day, last_day = _ceil_day(first_hour), _floor_day(rolled_until)
+    if use_daily and first_day < last_day:
+        if first_hour < first_day:
+            segments.append(UsageSegment("hourly", first_hour, first_day))
+        segments.append(UsageSegment("daily", first_day, last_day))
+        if last_day < rolled_until:
+            segments.append(UsageSegment("hourly", last_day, rolled_until))
+    else:
+        segments.append(UsageSegment("hourly", first_hour, rolled_until))
+
+    segments.append(UsageSegment("raw", rolled_until, end, True))
+    return segments
+
+
+def _date_trunc(unit: str, column):
+    # Literal unit so the expression renders identically in SELECT and GROUP BY
+    return func.date_trunc(literal_column(f"'{unit}'"), column)
+
+
+def _raw_measures() -> list:
+    """Rollup measures computed from sms_usage_logs rows."""
+    log = SMSUsageLog
+    timed = log.processing_time_ms > 0
+    return [
+        func.count().label("message_count"),
+        func.count().filter(log.success.is_(True)).label("success_count"),
+        func.count().filter(log.message_length > 0).label("length_count"),
+        func.coalesce(func.sum(log.message_length), 0).label("total_message_length"),
+        func.count()
+        .filter(log.message_length.between(1, 160))
+        .label("short_message_count"),
+        func.count()
+        .filter(and_(log.message_length > 160, log.message_length <= 320))
+        .label("medium_message_count"),
+        func.count().filter(log.message_length > 320).label("long_message_count"),
+        func.count()
+        .filter(log.is_international.is_(True))
+        .label("international_count"),
+        func.count().filter(timed).label("processing_count"),
+        func.coalesce(func.sum(log.processing_time_ms).filter(timed), 0).label(
+            "processing_total_ms"
+        ),
+        func.min(log.processing_time_ms).filter(timed).label("processing_min_ms"),
+        func.max(log.processing_time_ms).filter(timed).label("processing_max_ms"),
+    ]
+
+
+def _combined_measures(columns) -> list:
+    """Measures re-aggregated from rollup-shaped rows."""
+    return [
+        func.coalesce(func.sum(columns[name]), 0).label(name) for name in SUM_MEASURES
+    ] + [
+        func.min(columns.processing_min_ms).label("processing_min_ms"),
+        func.max(columns.processing_max_ms).label("processing_max_ms"),
+    ]
+
+
+def _measures_from_row(row: Any) -> Dict[str, Any]:
+    mapping = row._mapping
+    measures: Dict[str, Any] = {name: int(mapping[name] or 0) for name in SUM_MEASURES}
+    for name in ("processing_min_ms", "processing_max_ms"):
+        measures[name] = int(mapping[name]) if mapping[name] is not None else 0
+    return measures
+
+
+def merge_measures(parts: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine measures of disjoint groups (e.g. the per-direction totals)."""
+    parts = list(parts)
+    merged: Dict[str, Any] = {
+        name: sum(part[name] for part in parts) for name in SUM_MEASURES
+    }
+    timed = [part for part in parts if part["processing_count"]]
+    merged["processing_min_ms"] = min(
+        (part["processing_min_ms"] for part in timed), default=0
+    )
+    merged["processing_max_ms"] = max(
+        (part["processing_max_ms"] for part in timed), default=0
+    )
+    return merged
+
+
+def success_rate_percent(measures: Dict[str, Any], default: float = 0.0) -> float:
+    """Percentage of successful messages."""
+    if not measures["message_count"]:
+        return default
+    return measures["success_count"] / measures["message_count"] * 100
+
+
+def average_processing_time_ms(measures: Dict[str, Any]) -> float:
+    """Mean processing time over messages with a recorded processing time."""
+    if not measures["processing_count"]:
+        return 0.0
+    return measures["processing_total_ms"] / measures["processing_count"]
+
+
+def average_message_length(measures: Dict[str, Any]) -> float:
+    """Mean length over messages with a non-zero length."""
+    if not measures["length_count"]:
+        return 0.0
+    return measures["total_message_length"] / measures["length_count"]
+
+
+class SMSUsageRollups:
+    """Windowed SMS usage aggregates served from the rollup tables."""
+
+    def __init__(self, db_session: AsyncSession):
+        """Initialize the rollup reader with a database session."""
+        self.db = db_session
+        self._watermark: Optional[datetime] = None
+        self._watermark_loaded = False
+
+    async def get_watermark(self) -> Optional[datetime]:
+        """Time before which the rollups are complete (None before the first refresh)."""
+        if not self._watermark_loaded:
+            result = await self.db.execute(
+                select(SMSUsageRollupState.refreshed_through).where(
+                    SMSUsageRollupState.name == ROLLUP_STATE_NAME
+                )
+            )
+            self._watermark = result.scalar()
+            self._watermark_loaded = True
+        return self._watermark
+
+    async def totals(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Measures for the whole window, plus ``unique_users``."""
+        usage = await self._usage(start, end, user_id)
+        query = select(
+            *_combined_measures(usage.c),
+            func.count(distinct(usage.c.user_id)).label("unique_users"),
+        )
+        row = (await self.db.execute(query)).one()
+        measures = _measures_from_row(row)
+        measures["unique_users"] = int(row.unique_users or 0)
+        return measures
+
+    async def totals_by_direction(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Measures for the window keyed by message direction."""
+        usage = await self._usage(start, end, user_id)
+        query = select(
+            usage.c.message_direction, *_combined_measures(usage.c)
+        ).group_by(usage.c.message_direction)
+        result = await self.db.execute(query)
+        return {row.message_direction: _measures_from_row(row) for row in result}
+
+    async def hourly_distribution(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Message counts by hour of day (0-23)."""
+        usage = await self._usage(start, end, user_id, use_daily=False)
+        hour = extract("hour", usage.c.bucket)
+        query = (
+            select(hour.label("hour"), func.sum(usage.c.message_count).label("count"))
+            .group_by(hour)
+            .order_by(hour)
+        )
+        result = await self.db.execute(query)
+        return {int(row.hour): int(row.count) for row in result}
+
+    async def hourly_series(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[datetime, Dict[str, Any]]:
+        """Measures and ``unique_users`` per hour bucket."""
+        usage = await self._usage(start, end, user_id, use_daily=False)
+        return await self._series(usage, usage.c.bucket)
+
+    async def daily_series(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[date, Dict[str, Any]]:
+        """Measures and ``unique_users`` per day, keyed by date."""
+        usage = await self._usage(start, end, user_id)
+        series = await self._series(usage, _date_trunc("day", usage.c.bucket))
+        return {bucket.date(): measures for bucket, measures in series.items()}
+
+    async def billable_counts(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[int] = None,
+        period: Optional[str] = None,
+        by_user: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        Counts SMS pricing applies to, in one pass over the window.
+
+        Rows carry ``inbound_count``, ``outbound_count`` (including
+        international), ``international_count`` (outbound only),
+        ``mms_count`` (messages over one segment) and ``message_count``,
+        grouped by ``period`` ("hour" or "day") and/or ``user_id``.
+        """
+        usage = await self._usage(start, end, user_id, use_daily=period != "hour")
+        keys = []
+        if period == "hour":
+            keys.append(("period", usage.c.bucket))
+        elif period == "day":
+            keys.append(("period", _date_trunc("day", usage.c.bucket)))
+        if by_user:
+            keys.append(("user_id", usage.c.user_id))
+
+        inbound = usage.c.message_direction == "inbound"
+        outbound = usage.c.message_direction == "outbound"
+        query = select(
+            *[expression.label(name) for name, expression in keys],
+            func.coalesce(func.sum(usage.c.message_count).filter(inbound), 0).label(
+                "inbound_count"
+            ),
+            func.coalesce(func.sum(usage.c.message_count).filter(outbound), 0).label(
+                "outbound_count"
+            ),
+            func.coalesce(
+                func.sum(usage.c.international_count).filter(outbound), 0
+            ).label("international_count"),
+            func.coalesce(
+                func.sum(usage.c.medium_message_count + usage.c.long_message_count), 0
+            ).label("mms_count"),
+            func.coalesce(func.sum(usage.c.message_count), 0).label("message_count"),
+        )
+        if keys:
+            expressions = [expression for _, expression in keys]
+            query = query.group_by(*expressions).order_by(*expressions)
+
+        result = await self.db.execute(query)
+        return [dict(row._mapping) for row in result]
+
+    async def error_counts(
+        self, start: datetime, end: datetime, user_id: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Failed messages grouped by error message (read from the raw log)."""
+        error = func.coalesce(func.nullif(SMSUsageLog.error_message, ""), "Unknown")
+        query = (
+            select(error.label("error"), func.count().label("count"))
+            .where(
+                and_(
+                    *self._raw_window(start, end, user_id),
+                    SMSUsageLog.success.is_(False),
+                )
+            )
+            .group_by(error)
+        )
+        result = await self.db.execute(query)
+        return {row.error: int(row.count) for row in result}
+
+    async def processing_time_percentiles(
+        self,
+        start: datetime,
+        end: datetime,
+        percentiles: Sequence[float] = (0.5, 0.95, 0.99),
+        user_id: Optional[int] = None,
+    ) -> Dict[str, float]:
+        """
+        Processing time percentiles (``p50``, ``p95``...) with percentile_cont.
+
+        Percentiles cannot be merged across buckets, so this reads the raw log;
+        use it for short windows (the last hour or day).
+        """
+        query = select(
+            *[
+                func.percentile_cont(fraction)
+                .within_group(SMSUsageLog.processing_time_ms)
+                .label(f"p{round(fraction * 100)}")
+                for fraction in percentiles
+            ]
+        ).where(
+            and_(
+                *self._raw_window(start, end, user_id),
+                SMSUsageLog.processing_time_ms > 0,
+            )
+        )
+        row = (await self.db.execute(query)).one()
+        return {
+            key: round(float(value), 2) if value is not None else 0.0
+            for key, value in row._mapping.items()
+        }
+
+    async def refresh(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Rebuild the rollups up to the start of the current hour.
+
+        The first run backfills from the oldest log in chunks of
+        SMS_ROLLUP_BACKFILL_CHUNK_DAYS, committing after each; later runs
+        rebuild from the watermark, or SMS_ROLLUP_LOOKBACK_HOURS back if that
+        is earlier, to pick up late-arriving logs.
+        """
+        through = _floor_hour(now or datetime.utcnow())
+        watermark = await self.get_watermark()
+        if watermark is None:
+            oldest = (
+                await self.db.execute(select(func.min(SMSUsageLog.created_at)))
+            ).scalar()
+            start = _floor_hour(oldest) if oldest else through
+        else:
+            lookback = through - timedelta(hours=settings.SMS_ROLLUP_LOOKBACK_HOURS)
+            start = min(watermark, lookback)
+
+        stats: Dict[str, Any] = {
+            "status": "success",
+            "refreshed_from": start.isoformat(),
+            "refreshed_through": through.isoformat(),
+            "hourly_rows": 0,
+            "daily_rows": 0,
+        }
+        chunk = timedelta(days=settings.SMS_ROLLUP_BACKFILL_CHUNK_DAYS)
+        chunk_start = start
+        while True:
+            chunk_end = min(chunk_start + chunk, through)
+            if not await self._try_lock():
+                await self.db.rollback()
+                logger.info("SMS usage rollup refresh already running, skipping")
+                stats["status"] = "skipped"
+                return stats
+            if chunk_start < chunk_end:
+                stats["hourly_rows"] += await self._rebuild_hourly(
+                    chunk_start, chunk_end
+                )
+                stats["daily_rows"] += await self._rebuild_daily(
+                    _floor_day(chunk_start), _ceil_day(chunk_end)
+                )
+            await self._set_watermark(max(chunk_end, watermark or chunk_end))
+            await self.db.commit()
+            if chunk_end >= through:
+                break
+            chunk_start = chunk_end
+
+        self._watermark = max(through, watermark or through)
+        logger.info(f"SMS usage rollups refreshed: {stats}")
+        return stats
+
+    # Helper methods
+    async def _usage(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[int],
+        use_daily: bool = True,
+    ):
+        """UNION ALL of the window's segments as rollup-shaped rows."""
+        segments = plan_segments(start, end, await self.get_watermark(), use_daily)
+        selects = [self._segment_select(segment, user_id) for segment in segments]
+        if len(selects) == 1:
+            return selects[0].subquery("usage")
+        return union_all(*selects).subquery("usage")
+
+    def _segment_select(self, segment: UsageSegment, user_id: Optional[int]):
+        if segment.source == "raw":
+            bucket = _date_trunc("hour", SMSUsageLog.created_at)
+            return (
+                select(
+                    bucket.label("bucket"),
+                    SMSUsageLog.user_id,
+                    SMSUsageLog.message_direction,
+                    *_raw_measures(),
+                )
+                .where(
+                    and_(
+                        *self._raw_window(
+                            segment.start, segment.end, user_id, segment.include_end
+                        )
+                    )
+                )
+                .group_by(bucket, SMSUsageLog.user_id, SMSUsageLog.message_direction)
+            )
+
+        rollup = (
+            SMSUsageDailyRollup if segment.source == "daily" else SMSUsageHourlyRollup
+        )
+        conditions = [
+            rollup.bucket_start >= segment.start,
+            rollup.bucket_start < segment.end,
+        ]
+        if user_id is not None:
+            conditions.append(rollup.user_id == user_id)
+        return select(
+            rollup.bucket_start.label("bucket"),
+            rollup.user_id,
+            rollup.message_direction,
+            *[getattr(rollup, name) for name in MEASURES],
+        ).where(and_(*conditions))
+
+    def _raw_window(
+        self,
+        start: datetime,
+        end: datetime,
+        user_id: Optional[int],
+        include_end: bool = True,
+    ) -> list:
+        conditions = [
+            SMSUsageLog.created_at >= start,
+            SMSUsageLog.created_at <= end
+            if include_end
+            else SMSUsageLog.created_at < end,
+        ]
+        if user_id is not None:
+            conditions.append(SMSUsageLog.user_id == user_id)
+        return conditions
+
+    async def _series(self, usage, bucket) -> Dict[datetime, Dict[str, Any]]:
+        query = (
+            select(
+                bucket.label("period"),
+                *_combined_measures(usage.c),
+                func.count(distinct(usage.c.user_id)).label("unique_users"),
+            )
+            .group_by(bucket)
+            .order_by(bucket)
+        )
+        series = {}
+        for row in await self.db.execute(query):
+            measures = _measures_from_row(row)
+            measures["unique_users"] = int(row.unique_users or 0)
+            series[row.period] = measures
+        return series
+
+    async def _try_lock(self) -> bool:
+        result = await self.db.execute(
+            select(func.pg_try_advisory_xact_lock(REFRESH_LOCK_KEY))
+        )
+        return bool(result.scalar())
+
+    async def _rebuild_hourly(self, start: datetime, end: datetime) -> int:
+        """Replace the hourly rollups for [start, end) from the raw log."""
+        await self.db.execute(
+            delete(SMSUsageHourlyRollup).where(
+                and_(
+                    SMSUsageHourlyRollup.bucket_start >= start,
+                    SMSUsageHourlyRollup.bucket_start < end,
+                )
+            )
+        )
+        bucket = _date_trunc("hour", SMSUsageLog.created_at)
+        source = (
+            select(
+                bucket,
+                SMSUsageLog.user_id,
+                SMSUsageLog.message_direction,
+                *_raw_measures(),
+            )
+            .where(and_(*self._raw_window(start, end, None, include_end=False)))
+            .group_by(bucket, SMSUsageLog.user_id, SMSUsageLog.message_direction)
+        )
+        result = await self.db.execute(
+            insert(SMSUsageHourlyRollup).from_select(
+                ["bucket_start", "user_id", "message_direction", *MEASURES], source
+            )
+        )
+        return result.rowcount or 0
+
+    async def _rebuild_daily(self, start: datetime, end: datetime) -> int:
+        """Replace the daily rollups for [start, end) from the hourly rollups."""
+        hourly = SMSUsageHourlyRollup
+        await self.db.execute(
+            delete(SMSUsageDailyRollup).where(
+                and_(
+                    SMSUsageDailyRollup.bucket_start >= start,
+                    SMSUsageDailyRollup.bucket_start < end,
+                )
+            )
+        )
+        day = _date_trunc("day", hourly.bucket_start)
+        source = (
+            select(
+                day,
+                hourly.user_id,
+                hourly.message_direction,
+                *_combined_measures(hourly.__table__.c),
+            )
+            .where(and_(hourly.bucket_start >= start, hourly.bucket_start < end))
+            .group_by(day, hourly.user_id, hourly.message_direction)
+        )
+        result = await self.db.execute(
+            insert(SMSUsageDailyRollup).from_select(
+                ["bucket_start", "user_id", "message_direction", *MEASURES], source
+            )
+        )
+        return result.rowcount or 0
+
+    async def _set_watermark(self, refreshed_through: datetime) -> None:
+        statement = pg_insert(SMSUsageRollupState).values(
+            name=ROLLUP_STATE_NAME,
+            refreshed_through=refreshed_through,
+            updated_at=datetime.utcnow(),
+        )
+        await self.db.execute(
+            statement.on_conflict_do_update(
+                index_elements=[SMSUsageRollupState.name],
+                set_={
+                    "refreshed_through": statement.excluded.refreshed_through,
+                    "updated_at": statement.excluded.updated_at,
+                },
+            )
+        )
@@ -12,7 +12,7 @@ Structure:
 """
 
 # Core components
-from .core import AITaskManager, TaskScheduler, create_task_scheduler, TaskExecutor
+from .core import AITaskManager, TaskScheduler, create_task_scheduler, TaskExecutor, DueTaskDispatcher
 
 # Evaluation components  
 from .evaluation import AIEventEvaluator, create_ai_evaluator, EventContext, EventContextBuilder, EventEvaluationEngine
@@ -32,6 +32,7 @@ __all__ = [
     "TaskScheduler",
     "create_task_scheduler", 
     "TaskExecutor",
+    "DueTaskDispatcher",
     
     # Evaluation components
     "AIEventEvaluator",
@@ -8,10 +8,16 @@ including task creation, scheduling, and execution.
 from .task_manager import AITaskManager
 from .scheduler import TaskScheduler, create_task_scheduler
 from .executor import TaskExecutor
+from .dispatcher import DueTaskDispatcher
+from .timer import AITaskTimer, AITaskTimerIndex, get_ai_task_timer_index
 
 __all__ = [
     "AITaskManager",
     "TaskScheduler", 
     "create_task_scheduler",
     "TaskExecutor",
+    "DueTaskDispatcher",
+    "AITaskTimer",
+    "AITaskTimerIndex",
+    "get_ai_task_timer_index",
 ]
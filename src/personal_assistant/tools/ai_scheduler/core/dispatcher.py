@@ -0,0 +1,185 @@
+"""
+Due task dispatcher for AI tasks.
+
+This module claims due AI tasks with a lease and executes them concurrently,
+so one slow agent run no longer delays every other user's reminder and
+overlapping dispatcher runs never execute the same task twice.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from personal_assistant.config.settings import settings
+from personal_assistant.database.models.ai_tasks import AITask
+
+from .task_manager import AITaskManager
+
+logger = logging.getLogger(__name__)
+
+
+class DueTaskDispatcher:
+    """
+    Claims due AI tasks and runs them in a bounded async task group.
+
+    Args:
+        task_manager: Task store (defaults to AITaskManager)
+        task_executor: Runs one task through the agent (defaults to TaskExecutor)
+        notification_service: Sends completion notifications (defaults to NotificationService)
+        max_concurrency: Tasks executed at once (defaults to AI_TASK_MAX_CONCURRENCY)
+    """
+
+    def __init__(
+        self,
+        task_manager=None,
+        task_executor=None,
+        notification_service=None,
+        max_concurrency: Optional[int] = None,
+    ):
+        if task_executor is None:
+            from .executor import TaskExecutor
+
+            task_executor = TaskExecutor()
+        if notification_service is None:
+            from ..notifications.service import NotificationService
+
+            notification_service = NotificationService()
+
+        self.task_manager = task_manager or AITaskManager()
+        self.task_executor = task_executor
+        self.notification_service = notification_service
+        self.max_concurrency = max(
+            1, max_concurrency or settings.AI_TASK_MAX_CONCURRENCY
+        )
+        self.logger = logger
+
+    async def dispatch(
+        self, worker_id: str, limit: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Claim up to ``limit`` due tasks and execute them concurrently.
+
+        Args:
+            worker_id: Lease owner, unique per dispatcher run
+            limit: Tasks to claim (defaults to AI_TASK_DISPATCH_BATCH_SIZE)
+
+        Returns:
+            Dictionary with processed/failed counts and per-task results
+        """
+        start = time.perf_counter()
+        tasks = await self.task_manager.claim_due_tasks(
+            worker_id, limit=limit or settings.AI_TASK_DISPATCH_BATCH_SIZE
+        )
+        if not tasks:
+            return {
+                "tasks_claimed": 0,
+                "tasks_processed": 0,
+                "tasks_failed": 0,
+                "results": [],
+            }
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(task: AITask) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.run_task(task, worker_id)
+
+        results = await asyncio.gather(*(run(task) for task in tasks))
+        processed = sum(1 for result in results if result["success"])
+        elapsed = time.perf_counter() - start
+
+        self.logger.info(
+            f"Dispatched {len(tasks)} AI tasks in {elapsed:.2f}s "
+            f"({processed} processed, {len(tasks) - processed} failed)"
+        )
+        return {
+            "tasks_claimed": len(tasks),
+            "tasks_processed": processed,
+            "tasks_failed": len(tasks) - processed,
+            "results": results,
+            "elapsed_seconds": round(elapsed, 3),
+        }
+
+    async def run_task(self, task: AITask, worker_id: str) -> Dict[str, Any]:
+        """
+        Execute one claimed task, reschedule it and send its notification.
+
+        Status updates are fenced on the lease, so a run that outlived its
+        lease cannot overwrite the outcome of the dispatcher that reclaimed it.
+        """
+        try:
+            execution_result = await self.task_executor.execute_task(task)
+
+            if task.schedule_type == "once":
+                # One-time tasks are marked as completed
+                status, next_run_at = "completed", None
+            else:
+                # Recurring tasks: calculate next run time and keep status as active
+                next_run_at = await self.task_manager.calculate_next_run(
+                    schedule_type=task.schedule_type,
+                    schedule_config=task.schedule_config,
+                    current_time=datetime.utcnow(),
+                )
+                if next_run_at:
+                    status = "active"
+                    self.logger.info(
+                        f"Rescheduled recurring task {task.id} for next run at {next_run_at}"
+                    )
+                else:
+                    self.logger.error(
+                        f"Could not calculate next run for task {task.id} (schedule_type: "
+                        f"{task.schedule_type}, schedule_config: {task.schedule_config}), "
+                        f"marking as completed"
+                    )
+                    status = "completed"
+
+            updated = await self.task_manager.update_task_status(
+                task_id=int(task.id),
+                status=status,
+                last_run_at=datetime.utcnow(),
+                next_run_at=next_run_at,
+                claimed_by=worker_id,
+            )
+            if not updated:
+                return self._result(task, False, "Task lease lost before completion")
+
+            if task.should_notify():
+                await self.notification_service.send_task_completion_notification(
+                    task, execution_result
+                )
+
+            self.logger.info(f"Successfully processed AI task: {task.title}")
+            return self._result(
+                task,
+                True,
+                "Task executed successfully",
+                ai_response=execution_result.get("ai_response", "No response"),
+            )
+
+        except Exception as e:
+            self.logger.error(f"Failed to process AI task {task.id}: {e}")
+            await self.task_manager.update_task_status(
+                task_id=int(task.id),
+                status="failed",
+                last_run_at=datetime.utcnow(),
+                claimed_by=worker_id,
+            )
+            return self._result(
+                task, False, f"Task execution failed: {e}", error=str(e)
+            )
+
+    @staticmethod
+    def _result(
+        task: AITask, success: bool, message: str, **extra: Any
+    ) -> Dict[str, Any]:
+        return {
+            "success": success,
+            "message": message,
+            "task_id": task.id,
+            "task_title": task.title,
+            "task_type": task.task_type,
+            "execution_time": datetime.utcnow().isoformat(),
+            **extra,
+        }
@@ -64,9 +64,8 @@ class TaskExecutor:
             self.logger.info(f"🔍 BREAKPOINT 11: Executing task: {task.title} (ID: {task.id})")
             print(f"🔍 BREAKPOINT 11: Executing task: {task.title} (ID: {task.id})")
 
-            # Import AgentCore here to avoid circular imports
-            from ....core import AgentCore
-            from ....tools import create_tool_registry
+            # Import here to avoid circular imports
+            from ....core import get_agent_core
 
             # Create task context
             task_context = self._build_task_context(task)
@@ -76,12 +75,9 @@ class TaskExecutor:
             ai_prompt = self._create_ai_prompt(task, task_context)
             print(f"🔍 BREAKPOINT 13: AI prompt created: {ai_prompt[:200]}...")
 
-            # Create tool registry with all available tools
-            tool_registry = create_tool_registry()
-            print(f"🔍 BREAKPOINT 13.5: Created tool registry with {len(tool_registry.tools)} tools: {list(tool_registry.tools.keys())}")
-
-            # Execute with AI assistant using proper tool registry
-            agent = AgentCore(tools=tool_registry)
+            # Execute with the shared, warm AI assistant
+            agent = get_agent_core()
+            print(f"🔍 BREAKPOINT 13.5: Using shared agent with {len(agent.tools.tools)} tools")
             print("🔍 BREAKPOINT 14: About to call AgentCore.run() - LLM CALL")
             response = await agent.run(ai_prompt, int(task.user_id))
             print(f"🔍 BREAKPOINT 15: AgentCore.run() completed, response: {response[:200]}...")
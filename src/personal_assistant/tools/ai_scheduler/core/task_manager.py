@@ -7,13 +7,16 @@ AI tasks that can be executed by the AI assistant.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, select
+from sqlalchemy import and_, or_, select
 
+from personal_assistant.config.settings import settings
 from personal_assistant.database.models.ai_tasks import AITask
 from personal_assistant.database.session import AsyncSessionLocal
 
+from .timer import get_ai_task_timer_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -76,6 +79,7 @@ class AITaskManager:
                 await session.refresh(task)
 
                 self.logger.info(f"Created AI task: {task.title} (ID: {task.id})")
+                await self._sync_timer_index(task)
                 return task
 
             except Exception as e:
@@ -150,6 +154,119 @@ class AITaskManager:
                 print(f"❌ DATABASE ERROR: Error getting due tasks: {e}")
                 return []
 
+    async def claim_due_tasks(
+        self, worker_id: str, limit: int = 50, lease_seconds: Optional[int] = None
+    ) -> List[AITask]:
+        """
+        Atomically claim due tasks for one dispatcher run.
+
+        Due active tasks, and processing tasks whose lease has expired (their
+        worker died), are locked with FOR UPDATE SKIP LOCKED and marked
+        processing with a lease held by ``worker_id``. Concurrent dispatchers
+        skip each other's rows, so every task is claimed by exactly one of them.
+
+        Args:
+            worker_id: Lease owner, unique per dispatcher run
+            limit: Maximum number of tasks to claim
+            lease_seconds: Lease length (defaults to AI_TASK_LEASE_SECONDS)
+
+        Returns:
+            List of claimed tasks
+        """
+        current_time = datetime.utcnow()
+        lease_until = current_time + timedelta(
+            seconds=lease_seconds or settings.AI_TASK_LEASE_SECONDS
+        )
+
+        async with AsyncSessionLocal() as session:
+            try:
+                query = (
+                    select(AITask)
+                    .where(
+                        or_(
+                            and_(
+                                AITask.status == "active",
+                                AITask.next_run_at <= current_time,
+                            ),
+                            and_(
+                                AITask.status == "processing",
+                                or_(
+                                    AITask.locked_until.is_(None),
+                                    AITask.locked_until <= current_time,
+                                ),
+                            ),
+                        )
+                    )
+                    .order_by(AITask.next_run_at.asc())
+                    .limit(limit)
+                    .with_for_update(skip_locked=True)
+                )
+                result = await session.execute(query)
+                tasks = list(result.scalars().all())
+
+                recovered = [task.id for task in tasks if task.status == "processing"]
+                for task in tasks:
+                    task.status = "processing"
+                    task.locked_by = worker_id
+                    task.locked_until = lease_until
+                await session.commit()
+
+                if recovered:
+                    self.logger.warning(
+                        f"Recovered {len(recovered)} AI tasks with expired leases: {recovered}"
+                    )
+                self.logger.info(f"Claimed {len(tasks)} due tasks for {worker_id}")
+                return tasks
+
+            except Exception as e:
+                self.logger.error(f"Error claiming due tasks: {e}")
+                await session.rollback()
+                return []
+
+    async def get_upcoming_tasks(
+        self, before: datetime, limit: int = 10000
+    ) -> List[Tuple[int, datetime]]:
+        """
+        Get (id, next_run_at) of active tasks due before a given time.
+
+        Used to reconcile the due-time index with the database.
+
+        Args:
+            before: Upper bound for next_run_at
+            limit: Maximum number of tasks to return
+
+        Returns:
+            List of (task id, next run time) pairs, earliest first
+        """
+        async with AsyncSessionLocal() as session:
+            try:
+                result = await session.execute(
+                    select(AITask.id, AITask.next_run_at)
+                    .where(
+                        and_(
+                            AITask.status == "active",
+                            AITask.next_run_at <= before,
+                        )
+                    )
+                    .order_by(AITask.next_run_at.asc())
+                    .limit(limit)
+                )
+                return [(row.id, row.next_run_at) for row in result.all()]
+
+            except Exception as e:
+                self.logger.error(f"Error getting upcoming tasks: {e}")
+                return []
+
+    async def _sync_timer_index(self, task: AITask) -> None:
+        """Keep the due-time index in step with a task's status and next run."""
+        index = get_ai_task_timer_index()
+        if index is None:
+            return
+        if task.status == "active" and task.next_run_at:
+            await index.schedule(int(task.id), task.next_run_at)
+        else:
+            await index.unschedule(int(task.id))
+
     async def get_user_tasks(
         self,
         user_id: int,
@@ -192,31 +309,46 @@ class AITaskManager:
         status: str,
         last_run_at: Optional[datetime] = None,
         next_run_at: Optional[datetime] = None,
+        claimed_by: Optional[str] = None,
     ) -> bool:
         """
         Update task status and timing.
 
+        Leaving the processing status releases the task's lease.
+
         Args:
             task_id: Task ID
             status: New status
             last_run_at: When the task was last run
             next_run_at: When the task should run next
+            claimed_by: Only update if this worker still holds the lease
 
         Returns:
             True if successful, False otherwise
         """
         async with AsyncSessionLocal() as session:
             try:
-                result = await session.execute(
-                    select(AITask).where(AITask.id == task_id)
-                )
+                query = select(AITask).where(AITask.id == task_id)
+                if claimed_by:
+                    query = query.with_for_update()
+                result = await session.execute(query)
                 task = result.scalar_one_or_none()
 
                 if not task:
                     self.logger.warning(f"Task not found: {task_id}")
                     return False
 
+                if claimed_by and task.locked_by != claimed_by:
+                    # The lease expired and another dispatcher reclaimed the task
+                    self.logger.warning(
+                        f"Not updating task {task_id}: lease held by {task.locked_by}, not {claimed_by}"
+                    )
+                    return False
+
                 task.status = status
+                if status != "processing":
+                    task.locked_by = None
+                    task.locked_until = None
                 if last_run_at:
                     task.last_run_at = last_run_at
                 if next_run_at:
@@ -224,6 +356,7 @@ class AITaskManager:
 
                 await session.commit()
                 self.logger.info(f"Updated task {task_id} status to {status}")
+                await self._sync_timer_index(task)
                 return True
 
             except Exception as e:
@@ -321,6 +454,7 @@ class AITaskManager:
 
                 await session.commit()
                 self.logger.info(f"Updated task {task_id} fields: {', '.join(updated_fields)}")
+                await self._sync_timer_index(task)
                 
                 return {
                     "success": True,
@@ -362,6 +496,9 @@ class AITaskManager:
                 await session.delete(task)
                 await session.commit()
                 self.logger.info(f"Deleted task: {task_id}")
+                index = get_ai_task_timer_index()
+                if index is not None:
+                    await index.unschedule(task_id)
                 return True
 
             except Exception as e:
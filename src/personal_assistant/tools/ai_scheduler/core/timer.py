@@ -0,0 +1,287 @@
+"""
+Due-time index and timer for AI tasks.
+
+This module keeps active AI tasks in a Redis sorted set scored by
+next_run_at, so a single timer can sleep until the earliest task is due and
+trigger a dispatch at that moment instead of polling the database every
+minute. AITaskManager keeps the index in step on every write; the timer
+reconciles it from the database periodically, and the Celery beat poll
+remains as a low-frequency safety net.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from personal_assistant.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY = "pa:ai_tasks:due"
+
+DISPATCH_TASK_NAME = "personal_assistant.workers.tasks.ai_tasks.process_due_ai_tasks"
+
+
+def due_score(next_run_at: datetime) -> float:
+    """Epoch seconds for a next_run_at (naive values are UTC, as stored)."""
+    if next_run_at.tzinfo is None:
+        next_run_at = next_run_at.replace(tzinfo=timezone.utc)
+    return next_run_at.timestamp()
+
+
+class AITaskTimerIndex:
+    """
+    Redis sorted set of active task ids scored by their due time.
+
+    Redis failures are logged and ignored: the database stays the source of
+    truth, and reconciliation plus the beat poll cover anything missed.
+
+    Args:
+        redis_client: ``redis.asyncio`` client created with decode_responses=True
+        key: Sorted set key
+    """
+
+    def __init__(self, redis_client, key: str = _REDIS_KEY):
+        self._redis = redis_client
+        self.key = key
+        # Called with the new score so an in-process timer can wake early
+        self._listeners: List[Callable[[float], None]] = []
+
+    def add_listener(self, listener: Callable[[float], None]) -> None:
+        self._listeners.append(listener)
+
+    async def schedule(self, task_id: int, next_run_at: datetime) -> None:
+        """Add or move a task to its due time."""
+        await self.schedule_many([(task_id, next_run_at)])
+
+    async def schedule_many(self, items: Iterable[Tuple[int, datetime]]) -> int:
+        mapping = {str(task_id): due_score(when) for task_id, when in items if when}
+        if not mapping:
+            return 0
+        try:
+            await self._redis.zadd(self.key, mapping)
+        except Exception as e:
+            logger.warning(f"AI task timer index update failed: {e}")
+            return 0
+        earliest = min(mapping.values())
+        for listener in self._listeners:
+            listener(earliest)
+        return len(mapping)
+
+    async def unschedule(self, task_id: int) -> None:
+        """Remove a task that is no longer active."""
+        try:
+            await self._redis.zrem(self.key, str(task_id))
+        except Exception as e:
+            logger.warning(
+                f"AI task timer index removal failed for task {task_id}: {e}"
+            )
+
+    async def next_due_at(self) -> Optional[float]:
+        """Epoch seconds of the earliest scheduled task, or None if empty."""
+        entries = await self._redis.zrange(self.key, 0, 0, withscores=True)
+        return float(entries[0][1]) if entries else None
+
+    async def pop_due(self, now: float, limit: int = 500) -> List[Tuple[int, float]]:
+        """
+        Remove and return (task id, score) pairs due at ``now``.
+
+        Each entry is returned to exactly one caller: when several processes
+        run a timer, only the one whose ZREM removed an entry gets it.
+        """
+        entries = await self._redis.zrangebyscore(
+            self.key, "-inf", now, start=0, num=limit, withscores=True
+        )
+        popped = []
+        for member, score in entries:
+            if await self._redis.zrem(self.key, member):
+                popped.append((int(member), float(score)))
+        return popped
+
+    async def restore(self, entries: List[Tuple[int, float]]) -> None:
+        """Put popped entries back, e.g. after a failed dispatch."""
+        if entries:
+            await self._redis.zadd(
+                self.key, {str(task_id): score for task_id, score in entries}
+            )
+
+
+class AITaskTimer:
+    """
+    Sleeps until the earliest task in the index is due, then dispatches.
+
+    Args:
+        index: Due-time index
+        dispatch: Called with the due task ids; the default sends the
+            process_due_ai_tasks Celery task, which claims them from the database
+        task_manager: Source for reconciliation (defaults to AITaskManager)
+        max_sleep: Longest sleep between index checks, which bounds the delay
+            for tasks scheduled by other processes (defaults to
+            AI_TASK_TIMER_MAX_SLEEP_SECONDS)
+        reconcile_interval: Seconds between reloads of upcoming tasks from the
+            database (defaults to AI_TASK_TIMER_RECONCILE_SECONDS)
+    """
+
+    def __init__(
+        self,
+        index: AITaskTimerIndex,
+        dispatch: Optional[Callable[[List[int]], Awaitable[None]]] = None,
+        task_manager=None,
+        max_sleep: Optional[float] = None,
+        reconcile_interval: Optional[float] = None,
+    ):
+        if task_manager is None:
+            from .task_manager import AITaskManager
+
+            task_manager = AITaskManager()
+
+        self.index = index
+        self._dispatch = dispatch or dispatch_via_celery
+        self.task_manager = task_manager
+        self.max_sleep = (
+            max_sleep
+            if max_sleep is not None
+            else settings.AI_TASK_TIMER_MAX_SLEEP_SECONDS
+        )
+        self.reconcile_interval = (
+            reconcile_interval
+            if reconcile_interval is not None
+            else settings.AI_TASK_TIMER_RECONCILE_SECONDS
+        )
+        self.dispatch_count = 0
+        self.tasks_fired = 0
+        self.max_lateness = 0.0
+        self._wake_at: Optional[float] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        index.add_listener(self._on_schedule)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the timer on the running event loop."""
+        if self.running:
+            return
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        logger.info("AI task timer started")
+
+    async def stop(self):
+        """Stop the timer."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _on_schedule(self, score: float) -> None:
+        # A task scheduled in this process before the current wake-up time
+        if self._wake is not None and (self._wake_at is None or score < self._wake_at):
+            self._wake.set()
+
+    async def reconcile(self) -> int:
+        """Re-add active tasks due within the next day from the database."""
+        upcoming = await self.task_manager.get_upcoming_tasks(
+            before=datetime.utcnow() + timedelta(days=1)
+        )
+        return await self.index.schedule_many(upcoming)
+
+    async def fire_due(self) -> int:
+        """Dispatch every task that is due now; returns how many were due."""
+        now = time.time()
+        due = await self.index.pop_due(now)
+        if not due:
+            return 0
+        try:
+            await self._dispatch([task_id for task_id, _ in due])
+        except Exception:
+            await self.index.restore(due)
+            raise
+        self.dispatch_count += 1
+        self.tasks_fired += len(due)
+        self.max_lateness = max(self.max_lateness, now - min(score for _, score in due))
+        logger.info(f"AI task timer dispatched {len(due)} due tasks")
+        return len(due)
+
+    async def _run(self):
+        next_reconcile = 0.0
+        while True:
+            # Cleared before reading the index, so a task scheduled meanwhile still wakes us
+            self._wake.clear()
+            try:
+                if time.monotonic() >= next_reconcile:
+                    added = await self.reconcile()
+                    logger.debug(f"AI task timer reconciled {added} upcoming tasks")
+                    next_reconcile = time.monotonic() + self.reconcile_interval
+
+                await self.fire_due()
+                next_due = await self.index.next_due_at()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"AI task timer error: {e}")
+                next_due = None
+
+            delay = self.max_sleep
+            if next_due is not None:
+                delay = min(delay, max(0.0, next_due - time.time()))
+            self._wake_at = time.time() + delay
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def get_metrics(self) -> dict:
+        """Dispatch counters since start."""
+        return {
+            "dispatches": self.dispatch_count,
+            "tasks_fired": self.tasks_fired,
+            "max_lateness_ms": round(self.max_lateness * 1000, 1),
+        }
+
+
+async def dispatch_via_celery(task_ids: List[int]) -> None:
+    """Queue enough process_due_ai_tasks runs to claim all of the given due tasks."""
+    from ....tools.execution import run_blocking
+    from ....workers.celery_app import app
+
+    # Each run claims at most AI_TASK_DISPATCH_BATCH_SIZE tasks
+    runs = math.ceil(len(task_ids) / settings.AI_TASK_DISPATCH_BATCH_SIZE)
+    for _ in range(runs):
+        await run_blocking("AI Tasks", app.send_task, DISPATCH_TASK_NAME)
+
+
+# Global timer index instance
+_timer_index: Optional[AITaskTimerIndex] = None
+
+
+def get_ai_task_timer_index() -> Optional[AITaskTimerIndex]:
+    """Get the process-wide due-time index, or None when AI_TASK_TIMER_REDIS_URL is unset."""
+    global _timer_index
+    if _timer_index is None and settings.AI_TASK_TIMER_REDIS_URL:
+        import redis.asyncio as async_redis
+
+        _timer_index = AITaskTimerIndex(
+            async_redis.Redis.from_url(
+                settings.AI_TASK_TIMER_REDIS_URL,
+                decode_responses=True,
+                socket_connect_timeout=5,
+                socket_timeout=5,
+            )
+        )
+        logger.info("AI task timer index initialized")
+    return _timer_index
+
+
+def set_ai_task_timer_index(index: Optional[AITaskTimerIndex]) -> None:
+    """Override the process-wide due-time index (e.g. for tests); None resets it."""
+    global _timer_index
+    _timer_index = index
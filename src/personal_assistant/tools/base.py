@@ -6,12 +6,15 @@ Defines Tool and ToolRegistry. Also handles schema generation and safe execution
 """
 
 import asyncio
-from typing import TYPE_CHECKING, Any, Callable, Dict
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 import jsonschema
 
 from personal_assistant.config.logging_config import get_logger
 
+from .execution import run_blocking
+from .result_cache import MISS, get_tool_result_cache
+
 # Configure module logger
 logger = get_logger("tools")
 
@@ -21,12 +24,36 @@ if TYPE_CHECKING:
 
 
 class Tool:
-    def __init__(self, name: str, func: Callable, description: str, parameters: Dict):
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        description: str,
+        parameters: Dict,
+        blocking: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        invalidates: Optional[List[str]] = None,
+        cache_if: Optional[Callable[[Any], bool]] = None,
+    ):
         self.name = name
         self.func = func
         self.description = description
         self.parameters = parameters
         self.category: str | None = None  # Add category for tool organization
+        # Blocking tools run on their category's thread pool instead of the
+        # event loop; synchronous functions are assumed to block
+        self.blocking = (
+            not asyncio.iscoroutinefunction(func) if blocking is None else blocking
+        )
+        self.timeout = timeout  # None uses TOOL_BLOCKING_TIMEOUT_SECONDS
+        # Read-only tools opt into result caching for cache_ttl seconds;
+        # mutating tools name the cached tools their calls make stale
+        self.cache_ttl = cache_ttl
+        self.invalidates = list(invalidates or [])
+        # Extra success check for results worth caching, on top of
+        # result_cache.is_error_result
+        self.cache_if = cache_if
         self._last_user_intent: str | None = (
             None  # Store last user intent for error context
         )
@@ -35,6 +62,12 @@ class Tool:
         if not isinstance(parameters, dict):
             raise ValueError("Parameters must be a JSON schema dict")
 
+        if self.blocking and asyncio.iscoroutinefunction(func):
+            raise ValueError(
+                f"Tool {name} is a coroutine and cannot be blocking; "
+                "offload its blocking calls with run_blocking()"
+            )
+
     def set_category(self, category: str):
         """Sets the tool category (e.g., 'Calendar', 'Email', 'Notes', etc.)"""
         self.category = category
@@ -119,6 +152,10 @@ class Tool:
             # Check if the function is a coroutine
             if asyncio.iscoroutinefunction(self.func):
                 return await self.func(**kwargs)
+            elif self.blocking:
+                return await run_blocking(
+                    self.category, self.func, timeout=self.timeout, **kwargs
+                )
             else:
                 return self.func(**kwargs)
         except Exception as e:
@@ -191,6 +228,9 @@ class ToolRegistry:
         self.tools: Dict[str, Tool] = {}
         self._llm_planner = None
         self._categories: Dict[str, set] = {}  # Track tools by category
+        # Bumped on every registration; prompt and schema caches key on it
+        self.version = 0
+        self._schema_cache: Optional[dict] = None
         logger.info("ToolRegistry initialized.")
 
     def set_planner(self, planner: "LLMPlanner"):
@@ -224,10 +264,20 @@ class ToolRegistry:
             if tool.category not in self._categories:
                 self._categories[tool.category] = set()
             self._categories[tool.category].add(tool.name)
+        self.version += 1
+        self._schema_cache = None
         logger.info(f"Registered tool: {tool.name} in category: {tool.category}")
 
     def get_schema(self) -> dict:
-        """Get tool schemas for LLM function calling"""
+        """
+        Get tool schemas for LLM function calling.
+
+        The schema is built once per registry version and the same dict is
+        returned until another tool is registered, so callers must not modify it.
+        """
+        if self._schema_cache is not None:
+            return self._schema_cache
+
         if not self.tools:
             logger.warning("No tools registered in ToolRegistry.")
 
@@ -240,6 +290,7 @@ class ToolRegistry:
                 "category": tool.category,  # Include category in schema
                 "parameters": tool.parameters,  # Use the full parameters schema
             }
+        self._schema_cache = schema
         return schema
 
     def get_tools_by_category(self, category: str) -> Dict[str, Tool]:
@@ -256,10 +307,25 @@ class ToolRegistry:
         if name not in self.tools:
             raise ValueError(f"Tool {name} not found")
 
-        # Await the tool execution
-        logger.debug(f"=== TOOL REGISTRY: CALLING TOOL.EXECUTE {name} ===")
-        result = await self.tools[name].execute(**kwargs)
-        logger.debug(f"=== TOOL REGISTRY: TOOL EXECUTION COMPLETED ===")
+        tool = self.tools[name]
+        cache = get_tool_result_cache() if tool.cache_ttl or tool.invalidates else None
+
+        result = MISS
+        if cache is not None and tool.cache_ttl:
+            result = await cache.get(tool, kwargs)
+
+        if result is MISS:
+            # Await the tool execution
+            logger.debug(f"=== TOOL REGISTRY: CALLING TOOL.EXECUTE {name} ===")
+            result = await tool.execute(**kwargs)
+            logger.debug(f"=== TOOL REGISTRY: TOOL EXECUTION COMPLETED ===")
+
+            if cache is not None:
+                if tool.cache_ttl:
+                    await cache.put(tool, kwargs, result)
+                if tool.invalidates:
+                    # Also on failure: the call may have partially applied
+                    await cache.invalidate(tool.invalidates, kwargs.get("user_id"))
         logger.debug(f"=== TOOL REGISTRY: RESULT {result} ===")
 
         # Notify planner of tool execution if needed
@@ -63,6 +63,7 @@ class CalendarTool:
                     "description": "Number of days to look ahead",
                 },
             },
+            cache_ttl=60,
         )
 
         self.create_calendar_event_tool = Tool(
@@ -86,6 +87,7 @@ class CalendarTool:
                     "description": "Comma-separated list of attendee email addresses (e.g., 'user@example.com,user2@example.com')",
                 },
             },
+            invalidates=["view_calendar_events"],
         )
 
         self.delete_calendar_event_tool = Tool(
@@ -102,6 +104,7 @@ class CalendarTool:
                     "description": "The ID of the specific event to delete (get this from view_calendar_events first)",
                 }
             },
+            invalidates=["view_calendar_events"],
         )
 
     def __iter__(self):
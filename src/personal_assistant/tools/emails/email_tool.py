@@ -40,6 +40,9 @@ from personal_assistant.oauth.services.token_service import OAuthTokenService
 from personal_assistant.oauth.services.integration_service import OAuthIntegrationService
 from personal_assistant.database.session import AsyncSessionLocal
 
+# Cached read tools made stale when a message is deleted or moved
+EMAIL_READ_TOOLS = ["read_emails", "search_emails", "get_email_content", "get_sent_emails"]
+
 
 class EmailTool:
     def __init__(self):
@@ -120,6 +123,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            cache_ttl=60,
         )
 
         self.send_email_tool = Tool(
@@ -145,6 +149,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            invalidates=["get_sent_emails", "search_emails"],
         )
 
         self.delete_email_tool = Tool(
@@ -161,6 +166,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 }
             },
+            invalidates=EMAIL_READ_TOOLS,
         )
 
         self.get_email_content_tool = Tool(
@@ -177,6 +183,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 }
             },
+            cache_ttl=300,
         )
 
         self.get_sent_emails_tool = Tool(
@@ -197,6 +204,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            cache_ttl=60,
         )
 
         self.search_emails_tool = Tool(
@@ -241,6 +249,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            cache_ttl=60,
         )
 
         self.move_email_tool = Tool(
@@ -261,6 +270,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            invalidates=EMAIL_READ_TOOLS,
         )
 
         self.find_all_email_folders_tool = Tool(
@@ -273,6 +283,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            cache_ttl=300,
         )
 
         self.create_email_folder_tool = Tool(
@@ -298,6 +309,7 @@ class EmailTool:
                     "description": "User ID for authentication (required for OAuth access)",
                 },
             },
+            invalidates=["find_all_email_folders"],
         )
 
 
@@ -0,0 +1,186 @@
+"""
+Off-loop execution for blocking tools and SDK calls.
+
+📁 tools/execution.py
+Bounded per-category thread pools with timeouts, plus a debug detector that
+reports event-loop stalls.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+
+# Configure module logger
+logger = get_logger("tools")
+
+DEFAULT_CATEGORY = "default"
+
+# One pool per tool category, so a slow Notion or YouTube call can only
+# exhaust the threads of its own category
+_executors: Dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when a blocking call does not finish within its timeout."""
+
+
+def get_tool_executor(category: Optional[str] = None) -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool for a tool category, creating it on first use.
+
+    Args:
+        category (str): Tool category (e.g. 'Notes'); None uses the default pool
+
+    Returns:
+        ThreadPoolExecutor: Pool with TOOL_EXECUTOR_MAX_WORKERS threads
+    """
+    key = (category or DEFAULT_CATEGORY).lower()
+    with _executors_lock:
+        executor = _executors.get(key)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.TOOL_EXECUTOR_MAX_WORKERS),
+                thread_name_prefix=f"tool-{key}",
+            )
+            _executors[key] = executor
+    return executor
+
+
+async def run_blocking(
+    category: Optional[str],
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a blocking callable on its category's thread pool.
+
+    The caller's context variables (e.g. the correlation ID) are carried into
+    the worker thread. On timeout the caller is released, but the thread keeps
+    running until the underlying call returns.
+
+    Args:
+        category (str): Tool category whose pool runs the call
+        func (Callable): Blocking callable
+        *args: Positional arguments for func
+        timeout (float): Seconds to wait; defaults to TOOL_BLOCKING_TIMEOUT_SECONDS,
+            0 waits indefinitely
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Any: The value returned by func
+
+    Raises:
+        ToolTimeoutError: If func does not return within the timeout
+    """
+    if timeout is None:
+        timeout = settings.TOOL_BLOCKING_TIMEOUT_SECONDS
+
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    future = loop.run_in_executor(get_tool_executor(category), call)
+
+    try:
+        return await asyncio.wait_for(future, timeout=timeout or None)
+    except asyncio.TimeoutError:
+        name = getattr(func, "__qualname__", repr(func))
+        logger.warning(
+            f"Blocking call {name} in category '{category or DEFAULT_CATEGORY}' "
+            f"timed out after {timeout}s"
+        )
+        raise ToolTimeoutError(f"{name} timed out after {timeout}s") from None
+
+
+def shutdown_tool_executors(wait: bool = False):
+    """Shut down all category pools; new calls create fresh ones."""
+    with _executors_lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=wait)
+
+
+class LoopStallDetector:
+    """
+    Debug aid that reports when the event loop is blocked.
+
+    A heartbeat task sleeps for ``interval`` seconds and measures how late it
+    wakes up; a lag above ``threshold`` means something ran on the loop
+    without yielding. When asyncio debug mode is on, the loop's own
+    slow-callback warning (which names the offending callback) is set to the
+    same threshold.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, interval: float = 0.05):
+        """
+        Initialize the detector.
+
+        Args:
+            threshold (float): Lag in seconds reported as a stall; defaults to
+                LOOP_STALL_THRESHOLD_MS
+            interval (float): Heartbeat period in seconds
+        """
+        self.threshold = (
+            threshold
+            if threshold is not None
+            else settings.LOOP_STALL_THRESHOLD_MS / 1000
+        )
+        self.interval = interval
+        self.stall_count = 0
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the heartbeat on the running event loop."""
+        if self.running:
+            return
+        loop = asyncio.get_running_loop()
+        if loop.get_debug():
+            loop.slow_callback_duration = self.threshold
+        self._task = loop.create_task(self._heartbeat())
+        logger.info(
+            f"Event loop stall detector started (threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self):
+        """Stop the heartbeat."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _heartbeat(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            if lag > self.threshold:
+                self.stall_count += 1
+                self.max_lag = max(self.max_lag, lag)
+                logger.warning(f"Event loop stalled for {lag * 1000:.0f}ms")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Stall counters since start."""
+        return {
+            "stall_count": self.stall_count,
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "threshold_ms": round(self.threshold * 1000, 1),
+        }
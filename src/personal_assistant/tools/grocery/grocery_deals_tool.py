@@ -71,7 +71,8 @@ class GroceryDealsTool:
                         "description": "Maximum number of results (default: 20)"
                     }
                 }
-            }
+            },
+            cache_ttl=900,
         )
         
         # Budget meal planning tool
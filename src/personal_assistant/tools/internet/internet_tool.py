@@ -4,6 +4,7 @@ Internet Tool for web search, news, weather, and content processing.
 import logging
 
 from ..base import Tool
+from ..execution import run_blocking
 
 # Import internet-specific error handling
 from .internet_error_handler import InternetErrorHandler
@@ -95,6 +96,7 @@ class InternetTool:
                     "description": "User ID (automatically injected by system)",
                 },
             },
+            cache_ttl=300,
         )
 
 
@@ -187,8 +189,13 @@ class InternetTool:
                     raise ValueError(
                         f"max_results must be int, got {type(max_results)}: {max_results}"
                     )
-                search_results = process_duckduckgo_text_results(
-                    self._ddgs, query, max_results, USE_DDGS
+                search_results = await run_blocking(
+                    "Internet",
+                    process_duckduckgo_text_results,
+                    self._ddgs,
+                    query,
+                    max_results,
+                    USE_DDGS,
                 )
 
                 return format_web_search_results(query, search_results, safe_search)
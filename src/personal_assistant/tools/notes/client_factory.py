@@ -13,6 +13,7 @@ from personal_assistant.oauth.services.token_service import OAuthTokenService
 from personal_assistant.oauth.services.integration_service import OAuthIntegrationService
 from personal_assistant.auth.session_service import SessionService
 from personal_assistant.config.logging_config import get_logger
+from personal_assistant.tools.execution import run_blocking
 
 logger = get_logger(__name__)
 
@@ -157,7 +158,9 @@ class NotionClientFactory:
         """
         try:
             # Test workspace access by making a simple API call
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="",
                 filter={"property": "object", "value": "page"},
                 page_size=1
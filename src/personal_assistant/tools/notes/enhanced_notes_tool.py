@@ -11,6 +11,7 @@ from .llm_notes_enhancer import LLMNotesEnhancer, StrategyEnhancedNote
 from .prompt_templates import NoteType
 from .note_internal import NoteInternal
 from ..base import Tool
+from ..execution import run_blocking
 from ...llm.gemini import GeminiLLM
 from ...config.logging_config import get_logger
 from ...config.settings import settings
@@ -411,7 +412,9 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Use Notion's native search API
-            search_results = notion_client.search(
+            search_results = await run_blocking(
+                "Notes",
+                notion_client.search,
                 query=query,
                 filter={"property": "object", "value": "page"},
                 page_size=min(limit, 100)  # Notion API limit
@@ -425,8 +428,10 @@ class EnhancedNotesTool:
                     "query": query
                 }
             
-            # Extract note information
-            notes = self.note_internal.format_notes_for_search(search_results, notion_client)
+            # Extract note information (fetches each page's blocks via the sync client)
+            notes = await run_blocking(
+                "Notes", self.note_internal.format_notes_for_search, search_results, notion_client
+            )
             
             # Use LLM to select the most relevant note
             if len(notes) > 1:
@@ -497,8 +502,8 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Get current note content
-            page = notion_client.pages.retrieve(page_id)
-            blocks = notion_client.blocks.children.list(page_id)
+            page = await run_blocking("Notes", notion_client.pages.retrieve, page_id)
+            blocks = await run_blocking("Notes", notion_client.blocks.children.list, page_id)
             
             # Extract content
             content = self.note_internal.extract_note_content(blocks)
@@ -582,13 +587,15 @@ class EnhancedNotesTool:
         """Apply replace strategy (current behavior)"""
         try:
             # Clear existing content
-            blocks = notion_client.blocks.children.list(page_id)
+            blocks = await run_blocking("Notes", notion_client.blocks.children.list, page_id)
             for block in blocks.get("results", []):
                 if not block.get("archived", False):
-                    notion_client.blocks.delete(block["id"])
+                    await run_blocking("Notes", notion_client.blocks.delete, block["id"])
             
             # Add enhanced content
-            notion_client.blocks.children.append(
+            await run_blocking(
+                "Notes",
+                notion_client.blocks.children.append,
                 page_id,
                 children=[{
                     "object": "block",
@@ -607,7 +614,9 @@ class EnhancedNotesTool:
         """Apply append strategy - add new content at the end"""
         try:
             # Add new content at the end
-            notion_client.blocks.children.append(
+            await run_blocking(
+                "Notes",
+                notion_client.blocks.children.append,
                 page_id,
                 children=[{
                     "object": "block",
@@ -628,7 +637,7 @@ class EnhancedNotesTool:
             self.logger.info(f"Applying insert strategy at: {strategy_note.insertion_point}")
             
             # Get current blocks to find insertion point
-            blocks_response = notion_client.blocks.children.list(page_id)
+            blocks_response = await run_blocking("Notes", notion_client.blocks.children.list, page_id)
             blocks = blocks_response.get("results", [])
             
             # Find the best insertion point based on content analysis
@@ -639,7 +648,9 @@ class EnhancedNotesTool:
             # Insert the new content
             if insert_after_block_id:
                 # Insert after the specified block
-                notion_client.blocks.children.append(
+                await run_blocking(
+                    "Notes",
+                    notion_client.blocks.children.append,
                     page_id,
                     children=[{
                         "object": "block",
@@ -683,8 +694,8 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Get note content
-            page = notion_client.pages.retrieve(page_id)
-            blocks = notion_client.blocks.children.list(page_id)
+            page = await run_blocking("Notes", notion_client.pages.retrieve, page_id)
+            blocks = await run_blocking("Notes", notion_client.blocks.children.list, page_id)
             
             content = self.note_internal.extract_note_content(blocks)
             title = self.note_internal.extract_note_title(page)
@@ -730,8 +741,8 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Get note content
-            page = notion_client.pages.retrieve(page_id)
-            blocks = notion_client.blocks.children.list(page_id)
+            page = await run_blocking("Notes", notion_client.pages.retrieve, page_id)
+            blocks = await run_blocking("Notes", notion_client.blocks.children.list, page_id)
             
             content = self.note_internal.extract_note_content(blocks)
             title = self.note_internal.extract_note_title(page)
@@ -776,7 +787,9 @@ class EnhancedNotesTool:
                     self.logger.info(f"Successfully obtained Notion client for user {user_id}")
                 
                 # Search for notes
-                search_results = notion_client.search(
+                search_results = await run_blocking(
+                    "Notes",
+                    notion_client.search,
                     query=search_query,
                     filter={"property": "object", "value": "page"}
                 )
@@ -805,14 +818,16 @@ class EnhancedNotesTool:
             
             # Get note details before deletion
             try:
-                page = notion_client.pages.retrieve(page_id)
+                page = await run_blocking("Notes", notion_client.pages.retrieve, page_id)
                 title = self.note_internal.extract_note_title(page) or "Untitled"
             except Exception as e:
                 self.logger.warning(f"Could not retrieve page details: {e}")
                 title = "Unknown"
             
             # Archive the page (Notion's way of "deleting")
-            notion_client.pages.update(
+            await run_blocking(
+                "Notes",
+                notion_client.pages.update,
                 page_id,
                 archived=True
             )
@@ -851,7 +866,9 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Add the link to the source page
-            notion_client.blocks.children.append(
+            await run_blocking(
+                "Notes",
+                notion_client.blocks.children.append,
                 source_page_id,
                 children=[{
                     "object": "block",
@@ -885,11 +902,13 @@ class EnhancedNotesTool:
                 self.logger.info(f"Successfully obtained Notion client for user {user_id}")
             
             # Get the target page to find its title
-            target_page = notion_client.pages.retrieve(page_id)
+            target_page = await run_blocking("Notes", notion_client.pages.retrieve, page_id)
             target_title = self.note_internal.extract_note_title(target_page)
             
             # Search for pages that contain links to this page
-            search_results = notion_client.search(
+            search_results = await run_blocking(
+                "Notes",
+                notion_client.search,
                 query=f"[[{target_title}]]",
                 filter={"property": "object", "value": "page"}
             )
@@ -937,7 +956,7 @@ class EnhancedNotesTool:
             main_page_id = await self.notion_internal.ensure_user_main_page_exists(db, user_id)
             
             # Get the page content
-            blocks = notion_client.blocks.children.list(main_page_id)
+            blocks = await run_blocking("Notes", notion_client.blocks.children.list, main_page_id)
             
             # Extract table of contents
             toc_content = self.note_internal.extract_note_content(blocks)
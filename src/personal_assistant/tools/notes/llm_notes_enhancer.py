@@ -475,8 +475,8 @@ Return ONLY valid JSON in this exact format:
     async def _get_llm_response(self, prompt: str) -> str:
         """Get response from LLM with error handling"""
         try:
-            # Use the LLM client to generate response
-            response = self.llm_client.complete(prompt, functions={})
+            # Use the LLM client to generate response without blocking the event loop
+            response = await self.llm_client.acomplete(prompt, functions={})
             
             # Extract content from response
             if isinstance(response, dict):
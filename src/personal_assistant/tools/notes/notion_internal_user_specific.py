@@ -14,6 +14,7 @@ from notion_client import Client
 
 from .workspace_manager import NotionWorkspaceManager
 from .client_factory import NotionClientFactory, NotionNotConnectedError, NotionWorkspaceError
+from ..execution import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,9 @@ class UserSpecificNotionInternal:
             client = await self.get_user_client(db, user_id, session_id)
             
             # Search for pages with the specified title
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query=title,
                 filter={"property": "object", "value": "page"}
             )
@@ -173,7 +176,9 @@ class UserSpecificNotionInternal:
                 })
             
             # Create the page
-            page = client.pages.create(
+            page = await run_blocking(
+                "Notes",
+                client.pages.create,
                 parent={"type": "page_id", "page_id": parent_page_id},
                 properties={
                     "title": [{"type": "text", "text": {"content": title}}]
@@ -217,7 +222,9 @@ class UserSpecificNotionInternal:
             
             # Update page properties if title is provided
             if title:
-                client.pages.update(
+                await run_blocking(
+                    "Notes",
+                    client.pages.update,
                     page_id=page_id,
                     properties={
                         "title": [{"type": "text", "text": {"content": title}}]
@@ -227,16 +234,18 @@ class UserSpecificNotionInternal:
             # Update page content if provided
             if content:
                 # Get existing blocks
-                blocks_response = client.blocks.children.list(block_id=page_id)
+                blocks_response = await run_blocking("Notes", client.blocks.children.list, block_id=page_id)
                 existing_blocks = blocks_response.get("results", [])
                 
                 # Remove existing content blocks (keep structural blocks)
                 for block in existing_blocks:
                     if block.get("type") == "paragraph":
-                        client.blocks.delete(block_id=block["id"])
+                        await run_blocking("Notes", client.blocks.delete, block_id=block["id"])
                 
                 # Add new content
-                client.blocks.children.append(
+                await run_blocking(
+                    "Notes",
+                    client.blocks.children.append,
                     block_id=page_id,
                     children=[{
                         "object": "block",
@@ -280,7 +289,9 @@ class UserSpecificNotionInternal:
             client = await self.get_user_client(db, user_id, session_id)
             
             # Archive the page
-            client.pages.update(
+            await run_blocking(
+                "Notes",
+                client.pages.update,
                 page_id=page_id,
                 archived=True
             )
@@ -314,7 +325,9 @@ class UserSpecificNotionInternal:
         try:
             client = await self.get_user_client(db, user_id, session_id)
             
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query=query,
                 filter={"property": "object", "value": "page"}
             )
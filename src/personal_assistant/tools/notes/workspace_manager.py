@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from .client_factory import NotionClientFactory, NotionNotConnectedError, NotionWorkspaceError
 from personal_assistant.config.logging_config import get_logger
+from personal_assistant.tools.execution import run_blocking
 
 logger = get_logger(__name__)
 
@@ -93,7 +94,9 @@ class NotionWorkspaceManager:
                 self.logger.info(f"Creating Personal Assistant page under existing page: {workspace_root_id}")
 
             # Create Personal Assistant page
-            personal_assistant_page = client.pages.create(
+            personal_assistant_page = await run_blocking(
+                "Notes",
+                client.pages.create,
                 parent=parent,
                 properties={
                     "title": [{"type": "text", "text": {"content": "Personal Assistant"}}]
@@ -135,7 +138,9 @@ class NotionWorkspaceManager:
         """
         try:
             # Search for pages with "Personal Assistant" title
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="Personal Assistant",
                 filter={"property": "object", "value": "page"}
             )
@@ -198,7 +203,9 @@ class NotionWorkspaceManager:
     async def _find_existing_personal_assistant_page_at_root(self, client: Client) -> Optional[str]:
         """Find an existing Personal Assistant page at workspace root level."""
         try:
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="Personal Assistant",
                 filter={"property": "object", "value": "page"},
                 page_size=10
@@ -224,7 +231,9 @@ class NotionWorkspaceManager:
     async def _find_existing_personal_assistant_page(self, client: Client) -> Optional[str]:
         """Find an existing Personal Assistant page anywhere in the workspace."""
         try:
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="Personal Assistant",
                 filter={"property": "object", "value": "page"},
                 page_size=10
@@ -251,7 +260,9 @@ class NotionWorkspaceManager:
         3. Are not project-specific or dated pages
         """
         try:
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="",
                 filter={"property": "object", "value": "page"},
                 page_size=50
@@ -301,7 +312,9 @@ class NotionWorkspaceManager:
         """
         try:
             # Test workspace access by making a simple API call
-            response = client.search(
+            response = await run_blocking(
+                "Notes",
+                client.search,
                 query="",
                 filter={"property": "object", "value": "page"},
                 page_size=1
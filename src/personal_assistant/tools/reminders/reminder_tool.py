@@ -58,6 +58,7 @@ class ReminderTool:
                 },
                 "required": ["text", "time"],
             },
+            invalidates=["list_reminders"],
         )
 
         self.list_reminders_tool = Tool(
@@ -74,6 +75,7 @@ class ReminderTool:
                     }
                 },
             },
+            cache_ttl=30,
         )
 
         self.delete_reminder_tool = Tool(
@@ -90,6 +92,7 @@ class ReminderTool:
                 },
                 "required": ["reminder_id"],
             },
+            invalidates=["list_reminders"],
         )
 
         self.update_reminder_tool = Tool(
@@ -123,6 +126,7 @@ class ReminderTool:
                 },
                 "required": ["reminder_id"],
             },
+            invalidates=["list_reminders"],
         )
 
     async def create_reminder(self, **kwargs) -> str:
@@ -0,0 +1,265 @@
+"""
+Result cache for read-only tool calls.
+
+📁 tools/result_cache.py
+Tools opt in with ``Tool(cache_ttl=...)``; ToolRegistry.run_tool then serves
+repeated calls with the same normalized arguments from this cache, per user.
+Mutating tools list the read tools they invalidate with
+``Tool(invalidates=[...])`` (e.g. send_email drops get_sent_emails).
+
+Many tools report failures by returning an error value instead of raising, so
+results that look like errors (see is_error_result) are never cached; a tool
+whose errors take another shape passes ``Tool(cache_if=...)`` as well.
+
+Entries live in a bounded in-process LRU, or in Redis when
+TOOL_RESULT_CACHE_REDIS_URL is set so invalidations reach every process.
+"""
+
+import copy
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from ..config.logging_config import get_logger
+from ..config.settings import settings
+
+if TYPE_CHECKING:
+    from .base import Tool
+
+# Configure module logger
+logger = get_logger("tools")
+
+_REDIS_KEY_PREFIX = "pa:tools:cache:"
+
+# Returned by lookups that find nothing (None is a valid tool result)
+MISS = object()
+
+
+# Prefixes of the error strings tools return instead of raising: the "❌ ..."
+# messages of the error handlers, "Error ...: ..." messages, Tool.execute's
+# fallback message and stringified format_tool_error_response dicts
+_ERROR_STRING_PREFIXES = ("❌", "error", "the tool '", "{'error': true")
+
+
+def is_error_result(result: Any) -> bool:
+    """Whether a tool result is one of the error shapes tools return instead of raising."""
+    if isinstance(result, dict):
+        return bool(result.get("error")) or result.get("success") is False
+    if isinstance(result, (list, tuple)):
+        # e.g. view_calendar_events returns [error_dict]
+        return any(isinstance(item, dict) and is_error_result(item) for item in result)
+    if isinstance(result, str):
+        return result.lstrip().lower().startswith(_ERROR_STRING_PREFIXES)
+    return False
+
+
+def _scope(tool_name: str, user_id: Any) -> str:
+    return f"{tool_name}:{user_id}"
+
+
+def _args_key(args: Dict[str, Any]) -> str:
+    """Hash arguments so that key order and formatting do not matter."""
+    normalized = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
+
+
+class MemoryToolResultBackend:
+    """
+    Bounded in-process LRU. Invalidation bumps a per-scope generation, so
+    dropping every cached call of a tool for a user is O(1).
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or settings.TOOL_RESULT_CACHE_MAX_ENTRIES
+        # Key -> (expiry, result), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    def _key(self, scope: str, args_key: str) -> str:
+        return f"{scope}:{self._generations.get(scope, 0)}:{args_key}"
+
+    async def get(self, scope: str, args_key: str) -> Any:
+        key = self._key(scope, args_key)
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return MISS
+        self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    async def set(self, scope: str, args_key: str, value: Any, ttl: float) -> None:
+        key = self._key(scope, args_key)
+        self._entries[key] = (time.time() + ttl, copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, scope: str) -> None:
+        # Old-generation entries become unreachable and age out of the LRU
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisToolResultBackend:
+    """
+    Redis backend shared by every process. Each (tool, user) scope is one hash
+    of argument key -> entry, so invalidation is a single DEL. Results must be
+    JSON-serializable; others are not cached.
+
+    Args:
+        redis_client: ``redis.asyncio`` client created with decode_responses=True
+    """
+
+    def __init__(self, redis_client):
+        self._redis = redis_client
+
+    async def get(self, scope: str, args_key: str) -> Any:
+        payload = await self._redis.hget(f"{_REDIS_KEY_PREFIX}{scope}", args_key)
+        if not payload:
+            return MISS
+        entry = json.loads(payload)
+        if entry["expires_at"] <= time.time():
+            return MISS
+        return entry["value"]
+
+    async def set(self, scope: str, args_key: str, value: Any, ttl: float) -> None:
+        try:
+            payload = json.dumps({"expires_at": time.time() + ttl, "value": value})
+        except (TypeError, ValueError):
+            logger.debug(
+                f"Tool result for {scope} is not JSON-serializable; not cached"
+            )
+            return
+        key = f"{_REDIS_KEY_PREFIX}{scope}"
+        await self._redis.hset(key, args_key, payload)
+        # The hash outlives its newest entry by at most one TTL
+        await self._redis.expire(key, max(1, int(ttl)))
+
+    async def invalidate(self, scope: str) -> None:
+        await self._redis.delete(f"{_REDIS_KEY_PREFIX}{scope}")
+
+    def size(self) -> int:
+        return -1  # Not tracked per process
+
+
+class ToolResultCache:
+    """
+    Per-user cache of tool results keyed on tool name and normalized arguments.
+
+    Backend failures are logged and treated as misses, so the cache never
+    fails a tool call.
+
+    Args:
+        backend: MemoryToolResultBackend (default) or RedisToolResultBackend
+    """
+
+    def __init__(self, backend=None):
+        self._backend = backend or MemoryToolResultBackend()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "invalidations": 0,
+            "errors": 0,
+        }
+
+    @staticmethod
+    def _split(kwargs: Dict[str, Any]):
+        args = dict(kwargs)
+        return args.pop("user_id", None), _args_key(args)
+
+    async def get(self, tool: "Tool", kwargs: Dict[str, Any]) -> Any:
+        """Get the cached result of a call, or MISS."""
+        user_id, args_key = self._split(kwargs)
+        try:
+            result = await self._backend.get(_scope(tool.name, user_id), args_key)
+        except Exception as e:
+            logger.warning(f"Tool result cache read failed for {tool.name}: {e}")
+            self.stats["errors"] += 1
+            result = MISS
+
+        if result is MISS:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+            logger.debug(f"Tool result cache hit for {tool.name} (user {user_id})")
+        return result
+
+    async def put(self, tool: "Tool", kwargs: Dict[str, Any], result: Any) -> None:
+        """Cache a successful result for the tool's cache_ttl."""
+        if is_error_result(result) or (tool.cache_if and not tool.cache_if(result)):
+            logger.debug(f"Tool result for {tool.name} looks like an error; not cached")
+            return
+        user_id, args_key = self._split(kwargs)
+        try:
+            await self._backend.set(
+                _scope(tool.name, user_id), args_key, result, tool.cache_ttl
+            )
+            self.stats["stores"] += 1
+        except Exception as e:
+            logger.warning(f"Tool result cache write failed for {tool.name}: {e}")
+            self.stats["errors"] += 1
+
+    async def invalidate(self, tool_names: Iterable[str], user_id: Any) -> None:
+        """Drop every cached call of the given tools for a user."""
+        for tool_name in tool_names:
+            try:
+                await self._backend.invalidate(_scope(tool_name, user_id))
+                self.stats["invalidations"] += 1
+            except Exception as e:
+                logger.warning(
+                    f"Tool result cache invalidation failed for {tool_name}: {e}"
+                )
+                self.stats["errors"] += 1
+
+    def get_stats(self) -> dict:
+        """Hit/miss counters and in-process size."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "size": self._backend.size(),
+            "backend": type(self._backend).__name__,
+        }
+
+
+# Global tool result cache instance
+_tool_result_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_result_cache() -> Optional[ToolResultCache]:
+    """Get the process-wide tool result cache, or None when TOOL_RESULT_CACHE_ENABLED is off."""
+    global _tool_result_cache
+    if not settings.TOOL_RESULT_CACHE_ENABLED:
+        return None
+    if _tool_result_cache is None:
+        backend = None
+        if settings.TOOL_RESULT_CACHE_REDIS_URL:
+            import redis.asyncio as async_redis
+
+            backend = RedisToolResultBackend(
+                async_redis.Redis.from_url(
+                    settings.TOOL_RESULT_CACHE_REDIS_URL,
+                    decode_responses=True,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+            )
+        _tool_result_cache = ToolResultCache(backend)
+        logger.info(
+            f"Tool result cache initialized (backend: {type(_tool_result_cache._backend).__name__})"
+        )
+    return _tool_result_cache
+
+
+def set_tool_result_cache(cache: Optional[ToolResultCache]) -> None:
+    """Override the process-wide tool result cache (e.g. for tests); None resets it."""
+    global _tool_result_cache
+    _tool_result_cache = cache
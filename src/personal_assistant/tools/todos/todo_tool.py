@@ -16,6 +16,9 @@ from personal_assistant.config.logging_config import get_logger
 
 logger = get_logger("todo_tool")
 
+# Cached read tools made stale by any todo write
+TODO_READ_TOOLS = ["get_todos", "get_overdue_todos", "get_todo_stats", "get_analytics"]
+
 
 class TodoTool:
     """Enhanced todo tool with missed counter and segmentation features."""
@@ -488,7 +491,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": ["title"]
-            }
+            },
+            invalidates=TODO_READ_TOOLS,
         ).set_category("Todos"),
         
         Tool(
@@ -522,7 +526,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": []
-            }
+            },
+            cache_ttl=30,
         ).set_category("Todos"),
         
         Tool(
@@ -569,7 +574,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": ["todo_id"]
-            }
+            },
+            invalidates=TODO_READ_TOOLS,
         ).set_category("Todos"),
         
         Tool(
@@ -589,7 +595,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": ["todo_id"]
-            }
+            },
+            invalidates=TODO_READ_TOOLS,
         ).set_category("Todos"),
         
         Tool(
@@ -609,7 +616,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": ["todo_id"]
-            }
+            },
+            invalidates=TODO_READ_TOOLS,
         ).set_category("Todos"),
         
         # Advanced features
@@ -626,7 +634,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": []
-            }
+            },
+            cache_ttl=30,
         ).set_category("Todos"),
         
         Tool(
@@ -642,7 +651,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": []
-            }
+            },
+            cache_ttl=30,
         ).set_category("Todos"),
         
         Tool(
@@ -662,7 +672,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": ["todo_id"]
-            }
+            },
+            invalidates=TODO_READ_TOOLS,
         ).set_category("Todos"),
         
         Tool(
@@ -678,7 +689,8 @@ def create_todo_tools() -> List[Tool]:
                     }
                 },
                 "required": []
-            }
+            },
+            cache_ttl=30,
         ).set_category("Todos")
     ]
     
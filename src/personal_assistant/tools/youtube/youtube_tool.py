@@ -4,11 +4,13 @@ YouTube Tool for video information, transcripts, and content analysis.
 import logging
 from typing import Any, Optional, Union
 
+import httplib2
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from ...config.settings import settings
 from ..base import Tool
+from ..execution import run_blocking
 
 # Import YouTube-specific error handling
 from .youtube_error_handler import YouTubeErrorHandler
@@ -104,6 +106,7 @@ class YouTubeTool:
                     {"required": ["video_url"]}
                 ]
             },
+            cache_ttl=600,
         )
 
         self.get_video_transcript_tool = Tool(
@@ -136,6 +139,7 @@ class YouTubeTool:
                     {"required": ["video_url"]}
                 ]
             },
+            cache_ttl=3600,
         )
 
         self.search_videos_tool = Tool(
@@ -163,6 +167,7 @@ class YouTubeTool:
                 },
                 "required": ["query"]
             },
+            cache_ttl=600,
         )
 
         self.get_channel_info_tool = Tool(
@@ -187,6 +192,7 @@ class YouTubeTool:
                 },
                 "required": ["channel_id"]
             },
+            cache_ttl=600,
         )
 
         self.get_playlist_info_tool = Tool(
@@ -211,6 +217,7 @@ class YouTubeTool:
                 },
                 "required": ["playlist_id"]
             },
+            cache_ttl=600,
         )
 
     def __iter__(self):
@@ -225,6 +232,14 @@ class YouTubeTool:
             ]
         )
 
+    async def _execute(self, request: Any) -> Any:
+        """Execute a YouTube API request on the tool thread pool.
+
+        The service is shared by every user, and httplib2 connections are not
+        thread-safe, so each call gets its own Http object.
+        """
+        return await run_blocking("YouTube", request.execute, http=httplib2.Http())
+
     async def get_video_info(
         self,
         video_id: str = None,
@@ -291,10 +306,9 @@ class YouTubeTool:
 
             try:
                 # Get video details
-                video_response = (
+                video_response = await self._execute(
                     self._youtube.videos()
                     .list(part="snippet,statistics,contentDetails", id=video_id)
-                    .execute()
                 )
 
                 if not video_response.get("items"):
@@ -332,7 +346,9 @@ class YouTubeTool:
                 if include_transcript:
                     if YOUTUBE_TRANSCRIPT_AVAILABLE:
                         try:
-                            transcript = YouTubeTranscriptApi.get_transcript(video_id)  # type: ignore
+                            transcript = await run_blocking(
+                                "YouTube", YouTubeTranscriptApi.get_transcript, video_id  # type: ignore
+                            )
                             if transcript:
                                 # Get first few lines of transcript
                                 first_lines = transcript[:3]
@@ -447,19 +463,29 @@ class YouTubeTool:
                 try:
                     # For version 1.2.2+, use the fetch method
                     if language == "auto":
-                        transcript = YouTubeTranscriptApi().fetch(video_id)
+                        transcript = await run_blocking(
+                            "YouTube", YouTubeTranscriptApi().fetch, video_id
+                        )
                     else:
-                        transcript = YouTubeTranscriptApi().fetch(
-                            video_id, languages=[language]
+                        transcript = await run_blocking(
+                            "YouTube",
+                            YouTubeTranscriptApi().fetch,
+                            video_id,
+                            languages=[language],
                         )
                 except Exception as fetch_error:
                     # Fallback to older method if available
                     try:
                         if language == "auto":
-                            transcript = YouTubeTranscriptApi.get_transcript(video_id)  # type: ignore
+                            transcript = await run_blocking(
+                                "YouTube", YouTubeTranscriptApi.get_transcript, video_id  # type: ignore
+                            )
                         else:
-                            transcript = YouTubeTranscriptApi.get_transcript(  # type: ignore
-                                video_id, languages=[language]
+                            transcript = await run_blocking(
+                                "YouTube",
+                                YouTubeTranscriptApi.get_transcript,  # type: ignore
+                                video_id,
+                                languages=[language],
                             )
                     except Exception:
                         return YouTubeErrorHandler.handle_youtube_error(
@@ -585,7 +611,9 @@ class YouTubeTool:
                 )
 
                 # Perform search
-                search_response = self._youtube.search().list(**search_params).execute()
+                search_response = await self._execute(
+                    self._youtube.search().list(**search_params)
+                )
 
                 if not search_response.get("items"):
                     return f"No videos found for query: '{query}'"
@@ -721,10 +749,9 @@ class YouTubeTool:
 
             try:
                 # Get channel information
-                channel_response = (
+                channel_response = await self._execute(
                     self._youtube.channels()
                     .list(part="snippet,statistics", id=channel_id)
-                    .execute()
                 )
 
                 if not channel_response.get("items"):
@@ -760,7 +787,7 @@ class YouTubeTool:
                 if include_recent_videos:
                     try:
                         # Get recent videos
-                        videos_response = (
+                        videos_response = await self._execute(
                             self._youtube.search()
                             .list(
                                 part="snippet",
@@ -769,7 +796,6 @@ class YouTubeTool:
                                 type="video",
                                 maxResults=5,
                             )
-                            .execute()
                         )
 
                         if videos_response.get("items"):
@@ -909,10 +935,9 @@ class YouTubeTool:
 
             try:
                 # Get playlist information
-                playlist_response = (
+                playlist_response = await self._execute(
                     self._youtube.playlists()
                     .list(part="snippet,contentDetails", id=playlist_id)
-                    .execute()
                 )
 
                 if not playlist_response.get("items"):
@@ -943,14 +968,13 @@ class YouTubeTool:
                 if include_video_details:
                     try:
                         # Get playlist items
-                        items_response = (
+                        items_response = await self._execute(
                             self._youtube.playlistItems()
                             .list(
                                 part="snippet",
                                 playlistId=playlist_id,
                                 maxResults=min(max_videos, 50),
                             )
-                            .execute()
                         )
 
                         if items_response.get("items"):
@@ -15,6 +15,16 @@ class ToolCall:
         return False
 
 
+class ToolCallBatch:
+    """Several tool calls requested by the LLM in one step."""
+
+    def __init__(self, calls: list):
+        self.calls = calls
+
+    def is_final(self):
+        return False
+
+
 class FinalAnswer:
     def __init__(self, output: str):
         self.output = output
@@ -200,6 +200,24 @@ class AgentState:
         if len(self.conversation_history) > self.config.max_conversation_history_size:
             self._conversation_history_needs_pruning = True
 
+    def add_tool_results(self, results: List[Tuple[ToolCall, Any]]):
+        """Record the results of one step's tool calls, in the order given"""
+        if not results:
+            return
+        self.step_count += 1
+        self.last_tool_result = (
+            results[0][1] if len(results) == 1 else [result for _, result in results]
+        )
+
+        self.conversation_history.extend(
+            {"role": "tool", "name": tool_call.name, "content": result}
+            for tool_call, result in results
+        )
+
+        # Mark that pruning might be needed (lazy evaluation)
+        if len(self.conversation_history) > self.config.max_conversation_history_size:
+            self._conversation_history_needs_pruning = True
+
     def get_context_window(self, max_items: int | None = None) -> List[Tuple[Any, Any]]:
         """Gets recent history for context window with size limit"""
         if max_items is None:
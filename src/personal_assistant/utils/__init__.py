@@ -1,5 +1,6 @@
 # Import utility functions and classes
 from .metrics import MetricsLogger
+from .similarity import EmbeddingMatrix, cosine_similarity, jaccard_matrix
 from .tag_utils import (
     build_tag_query,
     get_related_tags,
@@ -13,6 +14,9 @@ from .text_cleaner import clean_html_content
 
 __all__ = [
     "MetricsLogger",
+    "EmbeddingMatrix",
+    "cosine_similarity",
+    "jaccard_matrix",
     "normalize_tag",
     "normalize_tags",
     "get_related_tags",
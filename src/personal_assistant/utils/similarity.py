@@ -0,0 +1,213 @@
+"""
+Vectorized similarity kernels shared by RAG retrieval and LTM memory code.
+
+Embeddings are held as one contiguous, pre-normalized float32 matrix so a
+top-k query is a single matrix-vector product followed by ``argpartition``
+instead of a Python loop of pairwise cosine calls. Set-overlap (Jaccard)
+scores used by the LTM retriever and memory consolidation are computed the
+same way from a binary incidence matrix.
+"""
+
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Rows per block when scoring an int8 matrix, bounding the float32 scratch space
+_INT8_BLOCK_ROWS = 8192
+
+
+def normalize(vector: Sequence[float]) -> Optional[np.ndarray]:
+    """Convert a vector to a unit-length float32 array, or None if degenerate."""
+    arr = np.asarray(vector, dtype=np.float32).reshape(-1)
+    if arr.size == 0:
+        return None
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0 or not np.isfinite(norm):
+        return None
+    return arr / norm
+
+
+def normalize_rows(matrix) -> np.ndarray:
+    """Return a C-contiguous float32 copy of ``matrix`` with unit-length rows.
+
+    All-zero rows are left as zeros so they score 0 against any query.
+    """
+    arr = np.array(matrix, dtype=np.float32, ndmin=2, order="C")
+    norms = np.linalg.norm(arr, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    arr /= norms
+    return arr
+
+
+def cosine_similarity(vec1: Sequence[float], vec2: Sequence[float]) -> float:
+    """Cosine similarity between two vectors (0.0 for empty or zero vectors)."""
+    v1, v2 = normalize(vec1), normalize(vec2)
+    if v1 is None or v2 is None or v1.shape != v2.shape:
+        return 0.0
+    return float(v1 @ v2)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores, best first.
+
+    Uses ``argpartition`` so only the selected candidates are sorted.
+    """
+    n = scores.shape[0]
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp)
+    k = min(k, n)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-row int8 quantization.
+
+    Returns the int8 matrix and the float32 per-row scales such that
+    ``matrix ≈ q.astype(float32) * scales[:, None]``.
+    """
+    arr = np.asarray(matrix, dtype=np.float32)
+    max_abs = np.abs(arr).max(axis=1, initial=0.0)
+    scales = (max_abs / 127.0).astype(np.float32)
+    safe = np.where(scales == 0, 1.0, scales).astype(np.float32)
+    quantized = np.clip(np.rint(arr / safe[:, None]), -127, 127).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales
+
+
+class EmbeddingMatrix:
+    """
+    Contiguous matrix of normalized embeddings with vectorized top-k search.
+
+    Args:
+        vectors: 2-D array-like of embeddings (one per row)
+        ids: Optional identifiers returned alongside scores (defaults to row index)
+        quantize: Store rows as int8 with per-row scales (4x less memory,
+            small loss of precision)
+    """
+
+    def __init__(
+        self,
+        vectors,
+        ids: Optional[Sequence] = None,
+        quantize: bool = False,
+    ):
+        if len(vectors):
+            normalized = normalize_rows(vectors)
+        else:
+            normalized = np.empty((0, 0), dtype=np.float32)
+        self.dim = normalized.shape[1]
+        self.quantized = quantize
+        self.ids = list(ids) if ids is not None else None
+        if quantize:
+            self._int8, self._scales = quantize_int8(normalized)
+            self._matrix: Optional[np.ndarray] = None
+        else:
+            self._matrix = normalized
+        self._size = normalized.shape[0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the stored vectors."""
+        if self._matrix is not None:
+            return int(self._matrix.nbytes)
+        return int(self._int8.nbytes + self._scales.nbytes)
+
+    def _prepare_queries(self, queries) -> np.ndarray:
+        q = normalize_rows(queries)
+        if q.shape[1] != self.dim:
+            raise ValueError(
+                f"Query dimension {q.shape[1]} does not match matrix dimension {self.dim}"
+            )
+        return q
+
+    def scores(self, queries) -> np.ndarray:
+        """Cosine scores of every row against each query, shape (n_queries, n_rows)."""
+        q = self._prepare_queries(queries)
+        if self._matrix is not None:
+            return q @ self._matrix.T
+
+        out = np.empty((q.shape[0], self._size), dtype=np.float32)
+        for start in range(0, self._size, _INT8_BLOCK_ROWS):
+            stop = min(start + _INT8_BLOCK_ROWS, self._size)
+            block = self._int8[start:stop].astype(np.float32)
+            out[:, start:stop] = (q @ block.T) * self._scales[start:stop]
+        return out
+
+    def top_k(self, query, k: int = 5) -> List[Tuple[object, float]]:
+        """Top-k (id, score) pairs for a single query, best first."""
+        if self._size == 0:
+            return []
+        return self.batch_top_k([query], k)[0]
+
+    def batch_top_k(self, queries, k: int = 5) -> List[List[Tuple[object, float]]]:
+        """Top-k (id, score) pairs for each query, computed with one matmul."""
+        if self._size == 0:
+            return [[] for _ in range(len(queries))]
+        all_scores = self.scores(queries)
+        results = []
+        for row in all_scores:
+            indices = top_k_indices(row, k)
+            results.append(
+                [
+                    (self.ids[i] if self.ids is not None else int(i), float(row[i]))
+                    for i in indices
+                ]
+            )
+        return results
+
+
+def incidence_matrix(
+    token_sets: Sequence[Iterable[str]], vocabulary: Optional[dict] = None
+) -> Tuple[np.ndarray, dict]:
+    """Binary (n_sets, n_tokens) float32 matrix marking which tokens each set has."""
+    vocabulary = {} if vocabulary is None else vocabulary
+    rows: List[List[int]] = []
+    for tokens in token_sets:
+        row = []
+        for token in set(tokens):
+            index = vocabulary.get(token)
+            if index is None:
+                index = vocabulary[token] = len(vocabulary)
+            row.append(index)
+        rows.append(row)
+
+    matrix = np.zeros((len(rows), len(vocabulary)), dtype=np.float32)
+    for i, row in enumerate(rows):
+        matrix[i, row] = 1.0
+    return matrix, vocabulary
+
+
+def jaccard_matrix(
+    sets_a: Sequence[Iterable[str]], sets_b: Optional[Sequence[Iterable[str]]] = None
+) -> np.ndarray:
+    """
+    Pairwise Jaccard similarity, shape (len(sets_a), len(sets_b)).
+
+    Intersections come from one matmul of the incidence matrices; pairs where
+    both sets are empty score 0. With ``sets_b`` omitted, compares ``sets_a``
+    with itself.
+    """
+    a, vocabulary = incidence_matrix(sets_a)
+    if sets_b is None:
+        b = a
+    else:
+        b, vocabulary = incidence_matrix(sets_b, vocabulary)
+        if a.shape[1] < len(vocabulary):
+            a = np.pad(a, ((0, 0), (0, len(vocabulary) - a.shape[1])))
+
+    # Counts are exact in float32; divide in float64 so threshold comparisons
+    # match the equivalent len(a & b) / len(a | b) computed in Python
+    intersection = (a @ b.T).astype(np.float64)
+    union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :] - intersection
+    return np.divide(
+        intersection,
+        union,
+        out=np.zeros_like(intersection),
+        where=union > 0,
+    )
@@ -11,7 +11,14 @@ from datetime import datetime
 
 from celery import Celery
 from celery.schedules import crontab
-from celery.signals import task_failure, task_postrun, task_prerun
+from celery.signals import (
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_shutdown,
+)
 from kombu import Queue
 from dotenv import load_dotenv
 
@@ -41,6 +48,10 @@ REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", REDIS_URL)
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", REDIS_URL)
 
+# With the due-time index enabled the API timer dispatches AI tasks when they
+# are due, so the beat poll only needs to run as a safety net
+AI_TASK_POLL_MINUTES = "*/5" if os.getenv("AI_TASK_TIMER_REDIS_URL") else "*/1"
+
 print(f"🔧 Celery Configuration:")
 print(f"   Broker: {CELERY_BROKER_URL}")
 print(f"   Backend: {CELERY_RESULT_BACKEND}")
@@ -86,12 +97,19 @@ app.conf.update(
             "queue": "grocery_tasks",
             "priority": 6,
         },
+        # Long-running maintenance jobs get their own queue so they never hold
+        # an ai_tasks worker for their soft time limit
+        "personal_assistant.workers.tasks.rag_tasks.*": {
+            "queue": "rag_tasks",
+            "priority": 3,
+        },
     },
     # Explicit queue declarations with explicit exchange names
     task_queues=(
         Queue('ai_tasks', exchange='ai_tasks', routing_key='ai_tasks'),
         Queue('sms_tasks', exchange='sms_tasks', routing_key='sms_tasks'),
         Queue('grocery_tasks', exchange='grocery_tasks', routing_key='grocery_tasks'),
+        Queue('rag_tasks', exchange='rag_tasks', routing_key='rag_tasks'),
     ),
     # Default queue configuration
     task_default_queue='ai_tasks',
@@ -106,7 +124,7 @@ app.conf.update(
         # AI tasks (high priority)
         "process-due-ai-tasks": {
             "task": "personal_assistant.workers.tasks.ai_tasks.process_due_ai_tasks",
-            "schedule": crontab(minute="*/1"),
+            "schedule": crontab(minute=AI_TASK_POLL_MINUTES),
             "options": {"priority": 10},
         },
         "test-scheduler-connection": {
@@ -135,6 +153,11 @@ app.conf.update(
             "schedule": crontab(minute="*/15"),
             "options": {"priority": 7},
         },
+        "refresh-sms-usage-rollups": {
+            "task": "personal_assistant.workers.tasks.sms_tasks.refresh_sms_usage_rollups",
+            "schedule": crontab(minute="*/5"),
+            "options": {"priority": 5},
+        },
         # Grocery tasks (medium priority)
         "fetch-iga-flyer-data": {
             "task": "personal_assistant.workers.tasks.grocery_tasks.fetch_iga_flyer_data",
@@ -182,16 +205,18 @@ app.conf.update(
 
 # Log the beat schedule configuration
 logger.info("🚀 CELERY BEAT SCHEDULE CONFIGURED:")
-logger.info(f"📅 process-due-ai-tasks: Every minute (crontab: */1)")
+logger.info(f"📅 process-due-ai-tasks: crontab {AI_TASK_POLL_MINUTES}")
 logger.info(f"📅 test-scheduler-connection: Every 30 minutes")
 logger.info(f"📅 cleanup-old-logs: Daily at 2:00 AM")
+logger.info(f"📅 refresh-sms-usage-rollups: Every 5 minutes")
 logger.info(f"📅 fetch-iga-flyer-data: Weekly on Monday at 6:00 AM")
 logger.info(f"📅 test-grocery-task-connection: Every 30 minutes")
 logger.info(f"📅 cleanup-expired-grocery-deals: Daily at 7:00 AM")
 print("🚀 CELERY BEAT SCHEDULE CONFIGURED:")
-print(f"📅 process-due-ai-tasks: Every minute (crontab: */1)")
+print(f"📅 process-due-ai-tasks: crontab {AI_TASK_POLL_MINUTES}")
 print(f"📅 test-scheduler-connection: Every 30 minutes")
 print(f"📅 cleanup-old-logs: Daily at 2:00 AM")
+print(f"📅 refresh-sms-usage-rollups: Every 5 minutes")
 print(f"📅 fetch-iga-flyer-data: Weekly on Monday at 6:00 AM")
 print(f"📅 test-grocery-task-connection: Every 30 minutes")
 print(f"📅 cleanup-expired-grocery-deals: Daily at 7:00 AM")
@@ -209,6 +234,55 @@ print(f"📋 Task Routes: {app.conf.task_routes}")
 # Enhanced signal handlers for monitoring
 
 
+@worker_process_init.connect
+def worker_process_init_handler(**kwargs):
+    """Reset the shared DB pool, start the async runtime and build the AgentCore once per worker process, after fork."""
+    try:
+        from personal_assistant.config.database import db_config
+
+        db_config.dispose_after_fork()
+    except Exception as e:
+        logger.error(f"Failed to reset database pool in worker: {e}")
+
+    # One event loop per process, shared by every task it runs
+    from .runtime import get_worker_runtime
+
+    get_worker_runtime()
+
+    try:
+        from personal_assistant.core import get_agent_core
+
+        get_agent_core()
+        logger.info("Shared AgentCore warmed up for worker process")
+    except Exception as e:
+        # Tasks will retry initialization lazily
+        logger.error(f"Failed to warm up AgentCore in worker: {e}")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def worker_runtime_shutdown_handler(**kwargs):
+    """Drain the worker's async runtime and close its pooled connections."""
+    try:
+        from .runtime import shutdown_worker_runtime
+
+        shutdown_worker_runtime()
+    except Exception as e:
+        logger.error(f"Failed to shut down worker async runtime: {e}")
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def worker_log_shipping_shutdown_handler(**kwargs):
+    """Flush log records still buffered for Loki (pool processes skip atexit)."""
+    try:
+        from ..logging.loki_handler import shutdown_loki_logging
+
+        shutdown_loki_logging()
+    except Exception as e:
+        logger.error(f"Failed to flush Loki log shipping: {e}")
+
+
 @task_prerun.connect
 def task_prerun_handler(sender=None, task_id=None, task=None, **kwargs):
     """Handle task pre-run events for monitoring."""
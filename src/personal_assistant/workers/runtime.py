@@ -0,0 +1,182 @@
+"""
+Persistent asyncio runtime for Celery worker processes.
+
+Celery runs task functions synchronously, so async work needs an event loop.
+Creating one per task (``asyncio.run``/``new_event_loop`` plus nest_asyncio)
+throws away everything bound to the loop between tasks: pooled database
+connections, Redis and HTTP clients. This module keeps one long-lived loop
+per worker process on a dedicated thread; tasks submit their coroutine to it
+and block until it finishes, so loop-bound resources are created once and
+reused by every task the process runs.
+"""
+
+import asyncio
+import functools
+import logging
+import sys
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class WorkerAsyncRuntime:
+    """
+    A long-lived event loop running on a background thread.
+
+    Args:
+        name: Thread name, for debugging and stack dumps
+    """
+
+    def __init__(self, name: str = "celery-async-runtime"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.tasks_run = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Start the loop thread (idempotent)."""
+        with self._lock:
+            if self.running:
+                return
+            self.loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run_loop, args=(ready,), name=self.name, daemon=True
+            )
+            self._thread.start()
+            ready.wait()
+        logger.info("Worker async runtime started")
+
+    def _run_loop(self, ready: threading.Event) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(ready.set)
+        self.loop.run_forever()
+
+    def run(self, coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+        """
+        Run a coroutine on the runtime loop and wait for its result.
+
+        Exceptions raised by the coroutine (including Celery's Retry) are
+        re-raised in the calling thread. If the wait itself is interrupted
+        (timeout, or Celery's SoftTimeLimitExceeded), the coroutine is cancelled.
+        """
+        if not self.running:
+            self.start()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("WorkerAsyncRuntime.run() called from its own loop")
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            self.tasks_run += 1
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """
+        Flush background saves, cancel leftover tasks, release loop-bound
+        resources and stop the loop. Half the timeout goes to the flush.
+        """
+        with self._lock:
+            if not self.running:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(
+                    self._drain(timeout / 2), self.loop
+                ).result(timeout)
+            except Exception as e:
+                logger.warning(f"Worker async runtime did not drain cleanly: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            if not self._thread.is_alive():
+                self.loop.close()
+            self._thread = None
+        logger.info(f"Worker async runtime stopped after {self.tasks_run} tasks")
+
+    async def _drain(self, flush_timeout: float) -> None:
+        # State saves run as detached BackgroundService tasks on this loop;
+        # let them finish before everything left over is cancelled
+        background = sys.modules.get(
+            "personal_assistant.core.services.background_service"
+        )
+        if background is not None:
+            await background.stop_background_services(flush_timeout)
+
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        # Connections in the shared pool belong to this loop; importing the
+        # module here would create an engine just to dispose it
+        database = sys.modules.get("personal_assistant.config.database")
+        if database is not None and database.db_config.engine is not None:
+            try:
+                await database.db_config.engine.dispose()
+            except Exception as e:
+                logger.warning(f"Failed to dispose database engine: {e}")
+
+        await self.loop.shutdown_asyncgens()
+
+
+# Global runtime instance
+_runtime: Optional[WorkerAsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_worker_runtime() -> WorkerAsyncRuntime:
+    """Get the worker process's async runtime, starting it on first use."""
+    global _runtime
+    if _runtime is None:
+        with _runtime_lock:
+            if _runtime is None:
+                _runtime = WorkerAsyncRuntime()
+    if not _runtime.running:
+        _runtime.start()
+    return _runtime
+
+
+def set_worker_runtime(runtime: Optional[WorkerAsyncRuntime]) -> None:
+    """Override the worker's async runtime (e.g. for tests); None resets it."""
+    global _runtime
+    _runtime = runtime
+
+
+def shutdown_worker_runtime(timeout: float = 10.0) -> None:
+    """Shut down the worker's async runtime if one was started."""
+    if _runtime is not None:
+        _runtime.shutdown(timeout)
+
+
+def run_async(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Run a coroutine on the worker's async runtime from synchronous task code."""
+    return get_worker_runtime().run(coro, timeout)
+
+
+def async_task(func: Callable[..., Awaitable[T]]) -> Callable[..., T]:
+    """
+    Adapt an ``async def`` task body for Celery.
+
+    Apply it beneath ``@app.task`` so Celery registers a synchronous function
+    that runs the coroutine on the worker's persistent loop::
+
+        @app.task(bind=True)
+        @async_task
+        async def my_task(self): ...
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        return run_async(func(*args, **kwargs))
+
+    return wrapper
@@ -8,17 +8,20 @@ This package contains all background task implementations for the Personal Assis
 from . import ai_tasks
 from . import sms_tasks
 from . import grocery_tasks
+from . import rag_tasks
 
 # Create task registry for test compatibility
 TASK_REGISTRY = {
     "ai_tasks": ai_tasks,
     "sms_tasks": sms_tasks,
     "grocery_tasks": grocery_tasks,
+    "rag_tasks": rag_tasks,
 }
 
 __all__ = [
     "ai_tasks",
     "sms_tasks", 
     "grocery_tasks",
+    "rag_tasks",
     "TASK_REGISTRY",
 ]
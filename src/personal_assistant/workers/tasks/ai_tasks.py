@@ -7,17 +7,18 @@ This module handles AI-specific background tasks including:
 - Managing AI task lifecycle
 """
 
-import asyncio
 import logging
+import os
+import socket
+import uuid
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 # Import the existing AI scheduler components
+from ...tools.ai_scheduler.core.dispatcher import DueTaskDispatcher
 from ...tools.ai_scheduler.core.task_manager import AITaskManager
 from ..celery_app import app
-
-from ...tools.ai_scheduler.notifications.service import NotificationService
-from ...tools.ai_scheduler.core.executor import TaskExecutor
+from ..runtime import run_async
 
 logger = logging.getLogger(__name__)
 
@@ -45,22 +46,9 @@ def process_due_ai_tasks(self) -> Dict[str, Any]:
     print(f"⏰ Current UTC time: {current_time}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-
-        # Apply nest_asyncio to allow nested event loops
-        nest_asyncio.apply()
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function
+        # Run on the worker's persistent event loop
         print("🔍 BREAKPOINT 2: About to call _process_due_ai_tasks_async")
-        result = loop.run_until_complete(_process_due_ai_tasks_async(task_id))
+        result = run_async(_process_due_ai_tasks_async(task_id))
         print(f"🔍 BREAKPOINT 3: _process_due_ai_tasks_async completed, result: {result}")
         return result
 
@@ -73,30 +61,25 @@ def process_due_ai_tasks(self) -> Dict[str, Any]:
 async def _process_due_ai_tasks_async(task_id: str) -> Dict[str, Any]:
     """
     Async implementation of the AI task processing logic.
+
+    Due tasks are claimed with a lease (FOR UPDATE SKIP LOCKED), so
+    overlapping beats and several workers never run the same task twice, and
+    are executed concurrently up to AI_TASK_MAX_CONCURRENCY.
     """
     current_time = datetime.utcnow()
     logger.info(f"🔄 ASYNC PROCESSING: Starting _process_due_ai_tasks_async at {current_time}")
-    print(f"🔄 ASYNC PROCESSING: Starting _process_due_ai_tasks_async at {current_time}")
-    
-    task_manager = AITaskManager()
-    notification_service = NotificationService()
-    task_executor = TaskExecutor()
+
+    # Lease owner for this run; a retry of the same Celery task gets a new claim
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{task_id}:{uuid.uuid4().hex[:8]}"
 
     try:
-        # Get due tasks
-        logger.info(f"🔍 DATABASE QUERY: Checking for due tasks...")
-        print(f"🔍 DATABASE QUERY: Checking for due tasks...")
-        
-        due_tasks = await task_manager.get_due_tasks(limit=50)
-        logger.info(f"📊 DUE TASKS FOUND: {len(due_tasks)} due AI tasks")
-        print(f"📊 DUE TASKS FOUND: {len(due_tasks)} due AI tasks")
-        
-        # Log details of each due task
-        for i, task in enumerate(due_tasks):
-            logger.info(f"📋 Task {i+1}: ID={task.id}, Title='{task.title}', Due={task.next_run_at}")
-            print(f"📋 Task {i+1}: ID={task.id}, Title='{task.title}', Due={task.next_run_at}")
-
-        if not due_tasks:
+        summary = await DueTaskDispatcher().dispatch(worker_id)
+        logger.info(
+            f"📊 DUE TASKS: claimed {summary['tasks_claimed']}, "
+            f"processed {summary['tasks_processed']}, failed {summary['tasks_failed']}"
+        )
+
+        if not summary["tasks_claimed"]:
             return {
                 "task_id": task_id,
                 "status": "success",
@@ -106,118 +89,12 @@ async def _process_due_ai_tasks_async(task_id: str) -> Dict[str, Any]:
                 "timestamp": datetime.utcnow().isoformat(),
             }
 
-        processed_tasks = 0
-        failed_tasks = 0
-        results = []
-
-        for task in due_tasks:
-            try:
-                logger.info(f"🔍 BREAKPOINT 6: Processing AI task: {task.title} (ID: {task.id})")
-                print(f"🔍 BREAKPOINT 6: Processing AI task: {task.title} (ID: {task.id})")
-
-                # Mark task as processing
-                await task_manager.update_task_status(
-                    task_id=int(task.id),
-                    status="processing",
-                    last_run_at=datetime.utcnow(),
-                )
-
-                # Execute the task
-                print("🔍 BREAKPOINT 7: About to call TaskExecutor.execute_task")
-                execution_result = await task_executor.execute_task(task)
-                print(f"🔍 BREAKPOINT 8: TaskExecutor.execute_task completed, result: {execution_result}")
-
-                # Handle task completion and rescheduling
-                if task.schedule_type == "once":
-                    # One-time tasks are marked as completed
-                    await task_manager.update_task_status(
-                        task_id=int(task.id),
-                        status="completed",
-                        last_run_at=datetime.utcnow(),
-                    )
-                else:
-                    # Recurring tasks: calculate next run time and keep status as active
-                    logger.info(f"Processing recurring task {task.id} (schedule_type: {task.schedule_type}, schedule_config: {task.schedule_config})")
-                    next_run_at = await task_manager.calculate_next_run(
-                        schedule_type=task.schedule_type,
-                        schedule_config=task.schedule_config,
-                        current_time=datetime.utcnow()
-                    )
-                    logger.info(f"Calculated next_run_at for task {task.id}: {next_run_at}")
-                    
-                    if next_run_at:
-                        await task_manager.update_task_status(
-                            task_id=int(task.id),
-                            status="active",  # Keep as active for recurring tasks
-                            last_run_at=datetime.utcnow(),
-                            next_run_at=next_run_at,
-                        )
-                        logger.info(f"Rescheduled recurring task {task.id} for next run at {next_run_at}")
-                    else:
-                        # If we can't calculate next run, log detailed error and mark as completed
-                        logger.error(f"Could not calculate next run for task {task.id} (schedule_type: {task.schedule_type}, schedule_config: {task.schedule_config}), marking as completed")
-                        await task_manager.update_task_status(
-                            task_id=int(task.id),
-                            status="completed",
-                            last_run_at=datetime.utcnow(),
-                        )
-
-                # Send notification if configured
-                if task.should_notify():
-                    print(f"🔍 BREAKPOINT 9: About to send SMS notification")
-                    await notification_service.send_task_completion_notification(
-                        task, execution_result
-                    )
-                    print(f"🔍 BREAKPOINT 10: SMS notification sent")
-                else:
-                    print(f"🔍 BREAKPOINT 9: Task should_notify() returned False, skipping SMS")
-
-                processed_tasks += 1
-                results.append(
-                    {
-                        "success": True,
-                        "message": "Task executed successfully",
-                        "task_id": task.id,
-                        "task_title": task.title,
-                        "task_type": task.task_type,
-                        "execution_time": datetime.utcnow().isoformat(),
-                        "ai_response": execution_result.get(
-                            "ai_response", "No response"
-                        ),
-                    }
-                )
-
-                logger.info(f"Successfully processed AI task: {task.title}")
-
-            except Exception as e:
-                logger.error(f"Failed to process AI task {task.id}: {e}")
-                failed_tasks += 1
-
-                # Mark task as failed
-                await task_manager.update_task_status(
-                    task_id=int(task.id),
-                    status="failed",
-                    last_run_at=datetime.utcnow(),
-                )
-
-                results.append(
-                    {
-                        "success": False,
-                        "message": f"Task execution failed: {str(e)}",
-                        "task_id": task.id,
-                        "task_title": task.title,
-                        "task_type": task.task_type,
-                        "execution_time": datetime.utcnow().isoformat(),
-                        "error": str(e),
-                    }
-                )
-
         return {
             "task_id": task_id,
             "status": "success",
-            "tasks_processed": processed_tasks,
-            "tasks_failed": failed_tasks,
-            "results": results,
+            "tasks_processed": summary["tasks_processed"],
+            "tasks_failed": summary["tasks_failed"],
+            "results": summary["results"],
             "timestamp": datetime.utcnow().isoformat(),
         }
 
@@ -257,20 +134,8 @@ def create_ai_reminder(
     logger.info(f"Creating AI reminder task {task_id} for user {user_id}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-
-        nest_asyncio.apply()
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function
-        result = loop.run_until_complete(
+        # Run on the worker's persistent event loop
+        result = run_async(
             _create_ai_reminder_async(
                 user_id, title, remind_at, description, notification_channels
             )
@@ -360,20 +225,8 @@ def create_periodic_ai_task(
     logger.info(f"Creating periodic AI task {task_id} for user {user_id}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-
-        nest_asyncio.apply()
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function
-        result = loop.run_until_complete(
+        # Run on the worker's persistent event loop
+        result = run_async(
             _create_periodic_ai_task_async(
                 user_id,
                 title,
@@ -458,20 +311,8 @@ def test_scheduler_connection(self) -> Dict[str, Any]:
     print(f"📋 Test Task ID: {task_id}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-
-        nest_asyncio.apply()
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function
-        result = loop.run_until_complete(_test_scheduler_connection_async())
+        # Run on the worker's persistent event loop
+        result = run_async(_test_scheduler_connection_async())
         return result
 
     except Exception as e:
@@ -526,20 +367,8 @@ def cleanup_old_logs(self) -> Dict[str, Any]:
     logger.info(f"Starting log cleanup task {task_id}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-
-        nest_asyncio.apply()
-
-        # Get or create event loop
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        # Run the async function
-        result = loop.run_until_complete(_cleanup_old_logs_async())
+        # Run on the worker's persistent event loop
+        result = run_async(_cleanup_old_logs_async())
         return result
 
     except Exception as e:
@@ -7,7 +7,6 @@ This module handles grocery-related background tasks including:
 - Database storage with cleanup
 """
 
-import asyncio
 import logging
 import re
 from datetime import datetime
@@ -15,6 +14,7 @@ from typing import Any, Dict, List, Optional
 import aiohttp
 
 from ..celery_app import app
+from ..runtime import run_async
 from ...config.database import db_config
 from ...database.models.grocery_deals import GroceryDeal
 from sqlalchemy import delete, text
@@ -53,11 +53,8 @@ def fetch_iga_flyer_data(self) -> Dict[str, Any]:
     print(f"⏰ Current UTC time: {current_time}")
 
     try:
-        # Use asyncio.run() with proper event loop handling
-        import nest_asyncio
-        nest_asyncio.apply()
-        
-        result = asyncio.run(_fetch_and_process_iga_data())
+        # Run on the worker's persistent event loop
+        result = run_async(_fetch_and_process_iga_data())
         
         logger.info(f"✅ GROCERY TASK COMPLETED: {result}")
         print(f"✅ GROCERY TASK COMPLETED: {result}")
@@ -679,10 +676,7 @@ def test_grocery_task_connection(self) -> Dict[str, Any]:
                 count = result.scalar()
                 return count
         
-        import nest_asyncio
-        nest_asyncio.apply()
-        
-        deal_count = asyncio.run(_test_db())
+        deal_count = run_async(_test_db())
         
         result = {
             "status": "success",
@@ -729,10 +723,7 @@ def cleanup_expired_grocery_deals(self) -> Dict[str, Any]:
                 await session.commit()
                 return deleted_count
         
-        import nest_asyncio
-        nest_asyncio.apply()
-        
-        deleted_count = asyncio.run(_cleanup_expired())
+        deleted_count = run_async(_cleanup_expired())
         
         result = {
             "status": "success",
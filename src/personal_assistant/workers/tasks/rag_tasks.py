@@ -0,0 +1,48 @@
+"""
+RAG Maintenance Tasks
+
+This module handles RAG background tasks including:
+- Resumable embedding backfill for stored documents
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from ...rag.backfill import run_embedding_backfill
+from ..celery_app import app
+from ..runtime import run_async
+
+logger = logging.getLogger(__name__)
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=300)
+def backfill_embeddings(
+    self, user_id: Optional[int] = None, restart: bool = False
+) -> Dict[str, Any]:
+    """
+    Embed stored RAG documents that have no embedding yet.
+
+    Progress is checkpointed after every page, so a retry (or the next
+    invocation) resumes where the previous run stopped.
+    """
+    task_id = self.request.id
+    logger.info(f"📚 RAG TASK STARTED: backfill_embeddings (user: {user_id or 'all'})")
+
+    try:
+        result = run_async(run_embedding_backfill(user_id=user_id, restart=restart))
+    except Exception as e:
+        logger.error(f"❌ RAG TASK FAILED: {e}", exc_info=True)
+        raise self.retry(countdown=self.default_retry_delay, exc=e)
+
+    if "error" in result and self.request.retries < self.max_retries:
+        logger.info(f"🔄 Backfill stopped at id {result['last_id']}, retrying to resume")
+        raise self.retry(countdown=self.default_retry_delay)
+
+    logger.info(f"✅ RAG TASK COMPLETED: {result}")
+    return {
+        "status": "failed" if "error" in result else "success",
+        "task_id": task_id,
+        "timestamp": datetime.utcnow().isoformat(),
+        "result": result,
+    }
@@ -9,12 +9,14 @@ from datetime import datetime
 from typing import Any, Dict
 
 from ..celery_app import app
+from ..runtime import async_task
 from ...sms_router.services.simple_retry_service import SimpleSMSRetryService
 
 logger = logging.getLogger(__name__)
 
 
 @app.task(bind=True, max_retries=3, default_retry_delay=300)
+@async_task
 async def process_sms_retries(self) -> Dict[str, Any]:
     """
     Process SMS retries every 2 minutes.
@@ -50,6 +52,7 @@ async def process_sms_retries(self) -> Dict[str, Any]:
 
 
 @app.task(bind=True, max_retries=3, default_retry_delay=300)
+@async_task
 async def cleanup_old_retries(self) -> Dict[str, Any]:
     """
     Clean up old retry records.
@@ -82,6 +85,7 @@ async def cleanup_old_retries(self) -> Dict[str, Any]:
 
 
 @app.task(bind=True, max_retries=3, default_retry_delay=300)
+@async_task
 async def sms_retry_health_check(self) -> Dict[str, Any]:
     """
     Health check for SMS retry system.
@@ -142,3 +146,39 @@ async def sms_retry_health_check(self) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"SMS retry health check failed: {e}")
         raise self.retry(countdown=300, max_retries=3)
+
+
+@app.task(bind=True, max_retries=3, default_retry_delay=300)
+@async_task
+async def refresh_sms_usage_rollups(self) -> Dict[str, Any]:
+    """
+    Refresh the SMS usage rollups every 5 minutes.
+
+    This task:
+    1. Rebuilds hourly rollups since the last refresh (plus a short lookback)
+    2. Rebuilds the daily rollups for the affected days
+    3. Advances the rollup watermark used by the SMS analytics
+    """
+    task_id = self.request.id
+    logger.info(f"Starting SMS usage rollup refresh task {task_id}")
+
+    try:
+        from ...database.session import _get_session_factory
+        from ...sms_router.services.usage_rollups import SMSUsageRollups
+
+        session_factory = _get_session_factory()
+        async with session_factory() as db:
+            stats = await SMSUsageRollups(db).refresh()
+
+        result = {
+            "task_id": task_id,
+            **stats,
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+        logger.info(f"SMS usage rollup refresh completed: {result}")
+        return result
+
+    except Exception as e:
+        logger.error(f"SMS usage rollup refresh failed: {e}")
+        raise self.retry(countdown=300, max_retries=3)
@@ -558,6 +558,78 @@ class DatabaseMockManager:
         }
 
 
+class MockAITask:
+    """Minimal AITask with the fields the due-task dispatcher reads."""
+
+    def __init__(self, task_id: int, schedule_type: str = "once", next_run_at=None,
+                 status: str = "active", notify: bool = False):
+        self.id = task_id
+        self.user_id = 1
+        self.title = f"Task {task_id}"
+        self.task_type = "reminder"
+        self.schedule_type = schedule_type
+        self.schedule_config = {}
+        self.next_run_at = next_run_at or datetime.utcnow() - timedelta(minutes=1)
+        self.last_run_at = None
+        self.status = status
+        self.locked_by = None
+        self.locked_until = None
+        self.notification_channels = ["sms"] if notify else []
+
+    def should_notify(self) -> bool:
+        return "sms" in self.notification_channels
+
+
+class MockAITaskStore:
+    """
+    In-memory stand-in for AITaskManager with the same claim semantics.
+
+    Claims are atomic, like SELECT ... FOR UPDATE SKIP LOCKED: concurrent
+    dispatchers never receive the same task, and tasks whose lease expired
+    are claimable again.
+    """
+
+    def __init__(self, tasks: List[MockAITask]):
+        self.tasks = {task.id: task for task in tasks}
+        self.status_updates = []
+
+    async def claim_due_tasks(self, worker_id: str, limit: int = 50,
+                              lease_seconds: Optional[int] = None) -> List[MockAITask]:
+        now = datetime.utcnow()
+        claimable = [
+            task for task in self.tasks.values()
+            if (task.status == "active" and task.next_run_at <= now)
+            or (task.status == "processing" and (task.locked_until is None or task.locked_until <= now))
+        ]
+        claimed = sorted(claimable, key=lambda task: task.next_run_at)[:limit]
+        for task in claimed:
+            task.status = "processing"
+            task.locked_by = worker_id
+            task.locked_until = now + timedelta(seconds=lease_seconds or 900)
+        # Yield like a database round trip would
+        await asyncio.sleep(0)
+        return claimed
+
+    async def update_task_status(self, task_id: int, status: str, last_run_at=None,
+                                 next_run_at=None, claimed_by: Optional[str] = None) -> bool:
+        task = self.tasks[task_id]
+        if claimed_by and task.locked_by != claimed_by:
+            return False
+        task.status = status
+        if status != "processing":
+            task.locked_by = None
+            task.locked_until = None
+        if last_run_at:
+            task.last_run_at = last_run_at
+        if next_run_at:
+            task.next_run_at = next_run_at
+        self.status_updates.append((task_id, status))
+        return True
+
+    async def calculate_next_run(self, schedule_type: str, schedule_config, current_time):
+        return current_time + timedelta(days=1)
+
+
 # Global database mock manager instance
 db_mock_manager = DatabaseMockManager()
 
@@ -0,0 +1,754 @@
+"""
+End-to-end agent turn benchmark harness.
+
+Drives a full AgentCore.run turn, the chat route and the SMS routing pipeline
+against local stand-ins:
+
+- a scripted LLM whose tool-call script replays per turn, with fixed latency
+  on the shared LLM executor
+- in-memory conversation storage and context retrieval, each access costing
+  one simulated database round trip
+- a local HTTP server standing in for Microsoft Graph, Notion and YouTube.
+  The real calendar and email tools are pointed at it.
+
+It records per-stage p50/p95/p99 latency, throughput at N concurrent users and
+allocations per turn. Results are written as JSON so CI can diff them against
+a stored baseline. Run it from the repository root:
+
+    python -m tests.performance.agent_turn_benchmark --output results.json
+    python -m tests.performance.agent_turn_benchmark --compare baseline.json results.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import copy
+import functools
+import itertools
+import json
+import math
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+# Add src to Python path for imports (as in tests/conftest.py)
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from personal_assistant.llm.fake_llm import FakeLLM  # noqa: E402
+from personal_assistant.llm.llm_client import get_llm_executor  # noqa: E402
+
+CALENDAR_CALL = {"name": "view_calendar_events", "arguments": {"count": 5, "days": 7}}
+EMAIL_CALL = {"name": "read_emails", "arguments": {"count": 10, "batch_size": 10}}
+NOTION_CALL = {"name": "search_notion_pages", "arguments": {"query": "project plan"}}
+VIDEO_CALL = {"name": "get_video_info", "arguments": {"video_id": "dQw4w9WgXcQ"}}
+FINAL_ANSWER = "You have 5 meetings, 10 new emails, a project plan page and the video you asked about."
+
+# Two parallel tool steps, then the answer
+DEFAULT_SCRIPT = [
+    {"function_call": CALENDAR_CALL, "function_calls": [CALENDAR_CALL, EMAIL_CALL]},
+    {"function_call": NOTION_CALL, "function_calls": [NOTION_CALL, VIDEO_CALL]},
+    {"content": FINAL_ANSWER},
+]
+
+SCENARIOS = ("agent_core", "chat_route", "sms_route")
+
+
+@dataclass
+class BenchmarkConfig:
+    """Latencies (seconds) of the stand-ins and the load to apply."""
+
+    llm_latency: float = 0.05
+    db_latency: float = 0.002
+    context_latency: float = 0.01
+    http_latency: float = 0.02
+    concurrency: List[int] = field(default_factory=lambda: [1, 8, 32])
+    turns_per_user: int = 3
+    allocation_turns: int = 10
+    scenarios: List[str] = field(default_factory=lambda: list(SCENARIOS))
+    script: List[dict] = field(default_factory=lambda: list(DEFAULT_SCRIPT))
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+class StageRecorder:
+    """Collects per-stage durations from wrapped coroutine functions."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                self.samples[stage].append(time.perf_counter() - start)
+
+        return timed
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage: {
+                "count": len(values),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+            }
+            for stage, values in sorted(self.samples.items())
+            if values
+        }
+
+
+# ---------------------------------------------------------------------------
+# Stand-ins
+# ---------------------------------------------------------------------------
+
+# Position in the LLM script for the turn running in the current task
+_script_step: contextvars.ContextVar[List[int]] = contextvars.ContextVar("script_step")
+
+
+class ScriptedLLM(FakeLLM):
+    """
+    FakeLLM that replays the same script in every agent turn.
+
+    Concurrent turns each follow their own copy of the script. The step is
+    chosen in the calling task, then the blocking call sleeps ``latency`` on
+    the shared LLM executor, like the real client.
+    """
+
+    def __init__(self, script: List[dict], latency: float):
+        super().__init__(latency=latency, default_response=script[-1])
+        self.script = list(script)
+
+    @staticmethod
+    def start_turn() -> None:
+        _script_step.set([0])
+
+    async def acomplete(self, prompt: str, functions: list) -> dict:
+        step = _script_step.get(None)
+        if step is None:
+            response = self.default_response
+        else:
+            response = self.script[min(step[0], len(self.script) - 1)]
+            step[0] += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_llm_executor(), functools.partial(self._respond, response)
+        )
+
+    def _respond(self, response: dict) -> dict:
+        if self.latency > 0:
+            time.sleep(self.latency)
+        with self._lock:
+            self.call_count += 1
+        return dict(response)
+
+
+class InMemoryConversationStore:
+    """Conversation ids and saved states, each access costing one database round trip."""
+
+    def __init__(self, db_latency: float):
+        self.db_latency = db_latency
+        self.conversations: Dict[int, str] = {}
+        self.states: Dict[str, Any] = {}
+        self.updated_at: Dict[str, datetime] = {}
+
+    async def _round_trip(self) -> None:
+        await asyncio.sleep(self.db_latency)
+
+    async def get_conversation_id(self, user_id: int) -> Optional[str]:
+        await self._round_trip()
+        return self.conversations.get(user_id)
+
+    async def create_new_conversation(self, user_id: int) -> str:
+        await self._round_trip()
+        conversation_id = str(uuid.uuid4())
+        self.conversations[user_id] = conversation_id
+        return conversation_id
+
+    async def get_conversation_timestamp(self, user_id: int, conversation_id: str):
+        await self._round_trip()
+        return self.updated_at.get(conversation_id)
+
+    async def load_state(self, conversation_id: str, user_id: int, max_messages: int = 50):
+        await self._round_trip()
+        state = self.states.get(conversation_id)
+        return copy.deepcopy(state) if state is not None else None
+
+    async def save_state(self, conversation_id: str, state, user_id: int) -> bool:
+        await self._round_trip()
+        self.states[conversation_id] = copy.deepcopy(state)
+        self.updated_at[conversation_id] = datetime.now(timezone.utc)
+        return True
+
+
+class FakeResult:
+    def scalar_one_or_none(self):
+        return None
+
+    def scalar(self):
+        return None
+
+    def first(self):
+        return None
+
+
+class FakeSession:
+    """AsyncSession stand-in; every statement and commit costs one round trip."""
+
+    def __init__(self, db_latency: float):
+        self.db_latency = db_latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, *args, **kwargs):
+        await asyncio.sleep(self.db_latency)
+        return FakeResult()
+
+    def add(self, instance):
+        pass
+
+    async def commit(self):
+        await asyncio.sleep(self.db_latency)
+
+    async def close(self):
+        pass
+
+
+class FakeLTMRetriever:
+    """SmartLTMRetriever stand-in returning a few memories after a fixed delay."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def get_relevant_memories(self, user_id, context, state_context=None, query_complexity="medium"):
+        await asyncio.sleep(self.latency)
+        return [{"content": f"User {user_id} prefers morning meetings"}]
+
+
+def _graph_events() -> dict:
+    return {
+        "value": [
+            {
+                "id": f"event-{i}",
+                "subject": f"Meeting {i}",
+                "start": {"dateTime": f"2025-01-0{i + 1}T09:00:00"},
+                "end": {"dateTime": f"2025-01-0{i + 1}T10:00:00"},
+                "location": {"displayName": "Room 1"},
+                "bodyPreview": "Agenda attached",
+                "organizer": {"emailAddress": {"name": "Alex"}},
+            }
+            for i in range(5)
+        ]
+    }
+
+
+def _graph_messages() -> dict:
+    return {
+        "value": [
+            {
+                "id": f"message-{i}",
+                "subject": f"Status update {i}",
+                "bodyPreview": "Here is where things stand",
+                "receivedDateTime": "2025-01-01T08:00:00Z",
+                "from": {"emailAddress": {"name": "Sam", "address": "sam@example.com"}},
+                "isDraft": False,
+            }
+            for i in range(10)
+        ]
+    }
+
+
+RESPONSES = {
+    ("GET", "/graph/v1.0/me/calendarView"): _graph_events(),
+    ("GET", "/graph/v1.0/me/messages"): _graph_messages(),
+    ("POST", "/notion/v1/search"): {
+        "object": "list",
+        "results": [
+            {
+                "object": "page",
+                "id": f"page-{i}",
+                "properties": {"title": {"title": [{"plain_text": f"Project plan {i}"}]}},
+            }
+            for i in range(3)
+        ],
+    },
+    ("GET", "/youtube/v3/videos"): {
+        "items": [
+            {
+                "id": "dQw4w9WgXcQ",
+                "snippet": {"title": "Quarterly review", "channelTitle": "Team"},
+                "statistics": {"viewCount": "1000"},
+            }
+        ]
+    },
+}
+
+
+class FakeExternalServices:
+    """Local HTTP server standing in for Microsoft Graph, Notion and YouTube."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.requests: Counter = Counter()
+        services = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                path = self.path.split("?", 1)[0]
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                body = RESPONSES.get((self.command, path))
+                services.requests[path.split("/")[1]] += 1
+                time.sleep(services.latency)
+                payload = json.dumps(body if body is not None else {"error": "not found"}).encode()
+                self.send_response(200 if body is not None else 404)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _rest_tool(name: str, description: str, category: str, call: Callable):
+    from personal_assistant.tools.base import Tool
+
+    tool = Tool(
+        name,
+        call,
+        description,
+        {
+            "type": "object",
+            "properties": {
+                "query": {"type": "string"},
+                "video_id": {"type": "string"},
+                "user_id": {"type": "integer"},
+            },
+        },
+    )
+    return tool.set_category(category)
+
+
+def build_tool_registry(services: FakeExternalServices, http_client, db_latency: float):
+    """
+    Tool registry pointed at the fake services.
+
+    The real calendar and email tools run unchanged apart from the Graph URL
+    and the OAuth token lookup (a database round trip). The Notion and YouTube
+    tools reach their APIs through SDK clients, so stand-ins issue the same
+    REST calls instead. Result caching is off, so every turn reaches the
+    services.
+    """
+    from personal_assistant.tools.base import ToolRegistry
+    from personal_assistant.tools.calendar.calendar_tool import CalendarTool
+    from personal_assistant.tools.emails.email_tool import EmailTool
+
+    async def oauth_token(user_id: int) -> str:
+        await asyncio.sleep(db_latency)
+        return "benchmark-token"
+
+    calendar, email = CalendarTool(), EmailTool()
+    registry = ToolRegistry()
+    for integration, tool, category in (
+        (calendar, calendar.view_calendar_events_tool, "Calendar"),
+        (email, email.read_emails_tool, "Email"),
+    ):
+        integration.ms_graph_url = f"{services.url}/graph/v1.0"
+        integration._get_oauth_access_token = oauth_token
+        tool.cache_ttl = None
+        registry.register(tool.set_category(category))
+
+    async def search_notion_pages(user_id: int = None, query: str = "", **kwargs):
+        response = await http_client.post(
+            f"{services.url}/notion/v1/search", json={"query": query, "page_size": 10}
+        )
+        response.raise_for_status()
+        return [
+            page["properties"]["title"]["title"][0]["plain_text"]
+            for page in response.json()["results"]
+        ]
+
+    async def get_video_info(user_id: int = None, video_id: str = "", **kwargs):
+        response = await http_client.get(
+            f"{services.url}/youtube/v3/videos",
+            params={"id": video_id, "part": "snippet,statistics"},
+        )
+        response.raise_for_status()
+        return response.json()["items"][0]["snippet"]
+
+    registry.register(
+        _rest_tool("search_notion_pages", "Search Notion pages", "Notion", search_notion_pages)
+    )
+    registry.register(_rest_tool("get_video_info", "Get video details", "YouTube", get_video_info))
+    return registry
+
+
+class AgentTurnBench:
+    """An AgentCore wired to the stand-ins, with every stage timed."""
+
+    def __init__(self, config: BenchmarkConfig, services: FakeExternalServices, http_client):
+        from personal_assistant.core.agent import AgentCore
+        from personal_assistant.core.services import ContextService, ConversationService
+
+        self.config = config
+        self.recorder = StageRecorder()
+        self.store = InMemoryConversationStore(config.db_latency)
+        self.llm = ScriptedLLM(config.script, config.llm_latency)
+        self.final_answer = config.script[-1]["content"]
+
+        core = AgentCore(
+            tools=build_tool_registry(services, http_client, config.db_latency), llm=self.llm
+        )
+        core.storage_manager = self.store
+        core.conversation_service = ConversationService(self.store)
+        core.context_service = ContextService(ltm_retriever=FakeLTMRetriever(config.context_latency))
+
+        wrap = self.recorder.wrap
+        core.conversation_service.get_conversation_context = wrap(
+            "conversation", core.conversation_service.get_conversation_context
+        )
+        core.context_service.get_enhanced_context = wrap(
+            "context", core.context_service.get_enhanced_context
+        )
+        core.planner.achoose_action = wrap("plan", core.planner.achoose_action)
+        self.llm.acomplete = wrap("llm", self.llm.acomplete)
+        core.tool_execution_service.execute_tool = wrap(
+            "tool", core.tool_execution_service.execute_tool
+        )
+        self.store.save_state = wrap("save", self.store.save_state)
+        core.run = wrap("turn", core.run)
+        self.core = core
+
+    async def _rag_context(self, user_id: int, user_input: str) -> list:
+        # Query embedding plus vector search
+        await asyncio.sleep(self.config.context_latency)
+        return [{"content": "Project plan: ship the beta in March", "score": 0.9}]
+
+
+    @contextlib.contextmanager
+    def stand_ins(self):
+        """Route database and RAG access through the stand-ins for the duration."""
+        from personal_assistant.core.agent import set_agent_core
+
+        session = functools.partial(FakeSession, self.config.db_latency)
+        with contextlib.ExitStack() as stack:
+            for target, replacement in (
+                ("personal_assistant.core.services.conversation_service.get_conversation_id",
+                 self.store.get_conversation_id),
+                ("personal_assistant.core.services.conversation_service.create_new_conversation",
+                 self.store.create_new_conversation),
+                ("personal_assistant.memory.conversation_manager.get_conversation_id",
+                 self.store.get_conversation_id),
+                ("personal_assistant.core.services.context_service.query_knowledge_base",
+                 self._rag_context),
+                ("personal_assistant.sms_router.services.routing_engine.AsyncSessionLocal",
+                 session),
+            ):
+                stack.enter_context(patch(target, replacement))
+            # The SMS agent integration picks up the shared AgentCore
+            set_agent_core(self.core)
+            stack.callback(set_agent_core, None)
+            yield
+
+    async def agent_turn(self, user_id: int, message: str) -> bool:
+        ScriptedLLM.start_turn()
+        response = await self.core.run(message, user_id, enable_background_processing=False)
+        return response == self.final_answer
+
+    @contextlib.asynccontextmanager
+    async def chat_route(self):
+        """POST /api/v1/chat/messages through the ASGI app, auth and DB overridden."""
+        import httpx
+        from fastapi import FastAPI, Request
+
+        from apps.fastapi_app.routes import chat
+        from apps.fastapi_app.services.chat_service import ChatService
+
+        app = FastAPI()
+        app.include_router(chat.router)
+
+        def current_user(request: Request):
+            return SimpleNamespace(id=int(request.headers["X-Benchmark-User"]))
+
+        async def db():
+            yield FakeSession(self.config.db_latency)
+
+        app.dependency_overrides[chat.get_current_user] = current_user
+        app.dependency_overrides[chat.get_db] = db
+        app.dependency_overrides[chat.get_chat_service] = lambda: ChatService(self.core)
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+        ) as client:
+
+            async def turn(user_id: int, message: str) -> bool:
+                ScriptedLLM.start_turn()
+                response = await client.post(
+                    "/api/v1/chat/messages",
+                    json={"content": message},
+                    headers={"X-Benchmark-User": str(user_id)},
+                )
+                return (
+                    response.status_code == 200
+                    and response.json()["ai_message"]["content"] == self.final_answer
+                )
+
+            yield self.recorder.wrap("request", turn)
+
+    @contextlib.asynccontextmanager
+    async def sms_route(self):
+        """SMSRoutingEngine.route_sms with the user lookup served from memory."""
+        from personal_assistant.sms_router.services.routing_engine import SMSRoutingEngine
+
+        engine = SMSRoutingEngine()
+        db_latency = self.config.db_latency
+
+        async def lookup_user(phone_number: str):
+            await asyncio.sleep(db_latency)
+            return {
+                "id": int(phone_number[-7:]),
+                "email": None,
+                "full_name": "Benchmark User",
+                "is_active": True,
+                "phone_number": phone_number,
+                "source": "primary",
+            }
+
+        engine.user_identification._lookup_user_in_database = lookup_user
+
+        async def turn(user_id: int, message: str) -> bool:
+            ScriptedLLM.start_turn()
+            twiml = await engine.route_sms(
+                f"+1415{user_id:07d}", message, f"SM{uuid.uuid4().hex}"
+            )
+            return self.final_answer in str(twiml)
+
+        yield self.recorder.wrap("request", turn)
+
+    @contextlib.asynccontextmanager
+    async def scenario(self, name: str):
+        """Yield the turn function for a scenario."""
+        if name == "agent_core":
+            yield self.agent_turn
+        else:
+            async with getattr(self, name)() as turn:
+                yield turn
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+
+async def run_load(bench: AgentTurnBench, turn, concurrency: int, user_ids) -> Dict[str, Any]:
+    """Run ``concurrency`` users, each sending turns_per_user messages in sequence."""
+    turns_per_user = bench.config.turns_per_user
+    failures = 0
+
+    async def user(user_id: int):
+        nonlocal failures
+        for i in range(turns_per_user):
+            if not await turn(user_id, f"What is on my plate today? ({i})"):
+                failures += 1
+
+    bench.recorder.reset()
+    start = time.perf_counter()
+    await asyncio.gather(*(user(next(user_ids)) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    turns = concurrency * turns_per_user
+
+    return {
+        "turns": turns,
+        "failures": failures,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_turns_per_s": round(turns / elapsed, 2),
+        "stages": bench.recorder.summary(),
+    }
+
+
+async def measure_allocations(turn, turns: int, user_ids) -> Dict[str, Any]:
+    """Peak and retained traced memory over ``turns`` sequential turns."""
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(turns):
+            await turn(next(user_ids), "What is on my plate today?")
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "turns": turns,
+        "peak_kb": round((peak - baseline) / 1024, 1),
+        "retained_kb_per_turn": round((current - baseline) / 1024 / turns, 2),
+    }
+
+
+async def run_benchmark(config: Optional[BenchmarkConfig] = None) -> Dict[str, Any]:
+    """Run every configured scenario and return the results document."""
+    import httpx
+
+    config = config or BenchmarkConfig()
+    results: Dict[str, Any] = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "config": {key: value for key, value in asdict(config).items() if key != "script"},
+        "scenarios": {},
+    }
+    user_ids = itertools.count(1)
+
+    with FakeExternalServices(config.http_latency) as services:
+        async with httpx.AsyncClient() as http_client:
+            for name in config.scenarios:
+                bench = AgentTurnBench(config, services, http_client)
+                with bench.stand_ins():
+                    async with bench.scenario(name) as turn:
+                        # Warm-up: first-use imports and connection setup
+                        await turn(next(user_ids), "hello")
+
+                        scenario: Dict[str, Any] = {"concurrency": {}}
+                        for concurrency in config.concurrency:
+                            scenario["concurrency"][str(concurrency)] = await run_load(
+                                bench, turn, concurrency, user_ids
+                            )
+                        scenario["allocations"] = await measure_allocations(
+                            turn, config.allocation_turns, user_ids
+                        )
+                        scenario["llm_calls"] = bench.llm.call_count
+                results["scenarios"][name] = scenario
+        results["external_requests"] = dict(services.requests)
+
+    return results
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_delta_ms: float = 5.0,
+) -> List[str]:
+    """
+    List regressions of ``current`` against ``baseline``.
+
+    A stage regresses when its p95 grows by more than ``tolerance`` and by at
+    least ``min_delta_ms`` (so sub-millisecond noise is ignored); a load level
+    regresses when its throughput drops by more than ``tolerance``.
+    """
+    regressions = []
+    for name, scenario in current.get("scenarios", {}).items():
+        base_scenario = baseline.get("scenarios", {}).get(name)
+        if not base_scenario:
+            continue
+        for level, run in scenario["concurrency"].items():
+            base_run = base_scenario["concurrency"].get(level)
+            if not base_run:
+                continue
+            label = f"{name} @ {level} users"
+            if run["throughput_turns_per_s"] < base_run["throughput_turns_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"{label}: throughput {base_run['throughput_turns_per_s']} -> "
+                    f"{run['throughput_turns_per_s']} turns/s"
+                )
+            for stage, stats in run["stages"].items():
+                base_stats = base_run["stages"].get(stage)
+                if not base_stats:
+                    continue
+                before, after = base_stats["p95_ms"], stats["p95_ms"]
+                if after > before * (1 + tolerance) and after - before >= min_delta_ms:
+                    regressions.append(f"{label}: {stage} p95 {before}ms -> {after}ms")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end agent turn benchmark")
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument(
+        "--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+        help="Compare two results files and exit non-zero on regressions",
+    )
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--concurrency", type=int, nargs="+")
+    parser.add_argument("--turns-per-user", type=int)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS)
+    parser.add_argument("--llm-latency", type=float)
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        baseline, current = (json.loads(Path(path).read_text()) for path in args.compare)
+        regressions = compare_results(baseline, current, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        print(f"{len(regressions)} regressions (tolerance {args.tolerance:.0%})")
+        return 1 if regressions else 0
+
+    config = BenchmarkConfig()
+    if args.concurrency:
+        config.concurrency = args.concurrency
+    if args.turns_per_user:
+        config.turns_per_user = args.turns_per_user
+    if args.scenarios:
+        config.scenarios = args.scenarios
+    if args.llm_latency is not None:
+        config.llm_latency = args.llm_latency
+
+    results = asyncio.run(run_benchmark(config))
+    document = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.output).write_text(document)
+    print(document)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""
+Performance tests for AgentCore construction.
+
+Compares the previous per-request setup (a new tool registry and AgentCore
+for every request) with fetching the shared instance from get_agent_core().
+"""
+
+import time
+
+import pytest
+
+from personal_assistant.core.agent import AgentCore, get_agent_core, set_agent_core
+from personal_assistant.tools import create_tool_registry
+
+REQUESTS = 20
+
+
+@pytest.mark.performance
+class TestAgentCorePerformance:
+    """Benchmark per-request AgentCore construction against the shared instance"""
+
+    def test_shared_agent_core_overhead(self):
+        set_agent_core(None)
+        try:
+            start = time.perf_counter()
+            get_agent_core()
+            startup_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                AgentCore(tools=create_tool_registry())
+            per_request_before = (time.perf_counter() - start) / REQUESTS
+
+            start = time.perf_counter()
+            for _ in range(REQUESTS):
+                get_agent_core()
+            per_request_after = (time.perf_counter() - start) / REQUESTS
+        finally:
+            set_agent_core(None)
+
+        print(
+            f"\nAgentCore startup {startup_time * 1000:.1f}ms; per request: "
+            f"before {per_request_before * 1000:.2f}ms, "
+            f"after {per_request_after * 1000:.4f}ms"
+        )
+
+        assert per_request_after < per_request_before
@@ -0,0 +1,105 @@
+"""
+Performance tests for a full agent turn.
+
+Runs AgentCore.run, the chat route and the SMS routing pipeline end to end
+against the local stand-ins in agent_turn_benchmark. Checks that turns
+complete and that every stage is measured, and reports how throughput scales
+with concurrent users. The scaling depends on the runner, so it is only
+printed; compare against a run on the same machine for that.
+
+Set AGENT_BENCHMARK_OUTPUT to write the results JSON. Set
+AGENT_BENCHMARK_BASELINE to fail on regressions against a stored run.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from tests.performance.agent_turn_benchmark import (
+    BenchmarkConfig,
+    compare_results,
+    percentile,
+    run_benchmark,
+)
+
+LLM_LATENCY = 0.02
+CONFIG = BenchmarkConfig(
+    llm_latency=LLM_LATENCY,
+    http_latency=0.01,
+    concurrency=[1, 8],
+    turns_per_user=2,
+    allocation_turns=5,
+)
+
+
+def _results(throughput, turn_p95):
+    return {
+        "scenarios": {
+            "agent_core": {
+                "concurrency": {
+                    "8": {
+                        "throughput_turns_per_s": throughput,
+                        "stages": {"turn": {"p95_ms": turn_p95}},
+                    }
+                }
+            }
+        }
+    }
+
+
+@pytest.mark.performance
+class TestAgentTurnPerformance:
+    """Benchmark complete agent turns through each entry point"""
+
+    @pytest.mark.asyncio
+    async def test_end_to_end_turns(self):
+        results = await run_benchmark(CONFIG)
+
+        output = os.getenv("AGENT_BENCHMARK_OUTPUT")
+        if output:
+            Path(output).parent.mkdir(parents=True, exist_ok=True)
+            Path(output).write_text(json.dumps(results, indent=2))
+
+        for name, scenario in results["scenarios"].items():
+            single, loaded = scenario["concurrency"]["1"], scenario["concurrency"]["8"]
+            stage = "turn" if name == "agent_core" else "request"
+            print(
+                f"\n{name}: p50 {single['stages'][stage]['p50_ms']}ms, "
+                f"p95 {loaded['stages'][stage]['p95_ms']}ms at 8 users; "
+                f"{single['throughput_turns_per_s']} -> {loaded['throughput_turns_per_s']} turns/s "
+                f"({loaded['throughput_turns_per_s'] / single['throughput_turns_per_s']:.1f}x); "
+                f"{scenario['allocations']['peak_kb']}KB peak"
+            )
+
+            assert single["failures"] == loaded["failures"] == 0
+            # Three LLM calls and two parallel pairs of tool calls per turn
+            assert single["stages"]["llm"]["count"] == 3 * single["turns"]
+            assert single["stages"]["tool"]["count"] == 4 * single["turns"]
+            assert single["stages"]["turn"]["p50_ms"] >= 3 * LLM_LATENCY * 1000
+
+        assert set(results["external_requests"]) == {"graph", "notion", "youtube"}
+
+        baseline = os.getenv("AGENT_BENCHMARK_BASELINE")
+        if baseline:
+            regressions = compare_results(json.loads(Path(baseline).read_text()), results)
+            assert not regressions, "\n".join(regressions)
+
+    def test_compare_flags_regressions(self):
+        baseline = _results(throughput=100.0, turn_p95=200.0)
+
+        assert compare_results(baseline, _results(95.0, 210.0)) == []
+        assert compare_results(baseline, _results(100.0, 300.0)) == [
+            "agent_core @ 8 users: turn p95 200.0ms -> 300.0ms"
+        ]
+        assert len(compare_results(baseline, _results(50.0, 200.0))) == 1
+
+    def test_percentile_nearest_rank(self):
+        values = [float(i) for i in range(1, 101)]
+
+        assert (percentile(values, 50), percentile(values, 95), percentile(values, 99)) == (
+            50.0,
+            95.0,
+            99.0,
+        )
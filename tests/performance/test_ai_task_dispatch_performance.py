@@ -0,0 +1,84 @@
+"""
+Performance tests for due AI task dispatch.
+
+Runs a batch of due tasks through DueTaskDispatcher with a fake agent of
+fixed latency, comparing sequential execution (the previous behaviour) with
+the bounded concurrent task group, and measuring throughput when several
+dispatchers claim from the same backlog.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from personal_assistant.tools.ai_scheduler.core.dispatcher import DueTaskDispatcher
+from tests.mocks.database_mocks import MockAITask, MockAITaskStore
+
+AGENT_LATENCY = 0.05
+TASK_COUNT = 40
+
+
+class FakeAgentExecutor:
+    """TaskExecutor stand-in whose agent run takes AGENT_LATENCY seconds."""
+
+    def __init__(self):
+        self.runs = []
+
+    async def execute_task(self, task):
+        await asyncio.sleep(AGENT_LATENCY)
+        self.runs.append(task.id)
+        return {"success": True, "ai_response": "ok"}
+
+
+async def _dispatch(max_concurrency, dispatchers=1):
+    store = MockAITaskStore([MockAITask(i) for i in range(1, TASK_COUNT + 1)])
+    executor = FakeAgentExecutor()
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            DueTaskDispatcher(
+                task_manager=store,
+                task_executor=executor,
+                notification_service=AsyncMock(),
+                max_concurrency=max_concurrency,
+            ).dispatch(f"worker-{n}", limit=TASK_COUNT // dispatchers)
+            for n in range(dispatchers)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    assert sorted(executor.runs) == list(range(1, TASK_COUNT + 1))
+    return elapsed
+
+
+@pytest.mark.performance
+class TestAITaskDispatchPerformance:
+    """Benchmark sequential against concurrent due-task execution"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_dispatch_throughput(self):
+        sequential_time = await _dispatch(max_concurrency=1)
+        concurrent_time = await _dispatch(max_concurrency=8)
+
+        print(
+            f"\n{TASK_COUNT} tasks at {AGENT_LATENCY * 1000:.0f}ms each: "
+            f"sequential {sequential_time * 1000:.0f}ms "
+            f"({TASK_COUNT / sequential_time:.0f} tasks/s), "
+            f"concurrent(8) {concurrent_time * 1000:.0f}ms "
+            f"({TASK_COUNT / concurrent_time:.0f} tasks/s)"
+        )
+
+        assert sequential_time >= TASK_COUNT * AGENT_LATENCY
+        assert concurrent_time < sequential_time / 4
+
+    @pytest.mark.asyncio
+    async def test_overlapping_dispatchers_share_backlog(self):
+        elapsed = await _dispatch(max_concurrency=4, dispatchers=2)
+
+        print(f"\n2 dispatchers x 4 concurrent: {elapsed * 1000:.0f}ms for {TASK_COUNT} tasks")
+
+        # Each task ran exactly once (asserted in _dispatch) across both
+        assert elapsed < TASK_COUNT * AGENT_LATENCY / 4
@@ -0,0 +1,61 @@
+"""
+Load test for the shared database connection pool.
+
+Runs many concurrent sessions through one DatabaseConfig engine and checks
+that the number of physical connections stays within the configured pool,
+however many coroutines are waiting for one.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from personal_assistant.config.database import DatabaseConfig
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy import text  # noqa: E402
+
+CONCURRENT_SESSIONS = 200
+POOL_SIZE = 5
+MAX_OVERFLOW = 3
+
+
+@pytest.mark.performance
+class TestSharedPoolLoad:
+    """Connection counts under concurrent load"""
+
+    @pytest.mark.asyncio
+    async def test_connections_bounded_under_concurrency(self, tmp_path):
+        config = DatabaseConfig(
+            auto_initialize=False,
+            database_url=f"sqlite+aiosqlite:///{tmp_path / 'load.db'}",
+        )
+        config.pool_size, config.max_overflow = POOL_SIZE, MAX_OVERFLOW
+        factory = config.get_session_factory()
+
+        async def request():
+            async with factory() as session:
+                await session.execute(text("SELECT 1"))
+                # Hold the connection like a request doing real work
+                await asyncio.sleep(0.005)
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(request() for _ in range(CONCURRENT_SESSIONS)))
+            elapsed = time.perf_counter() - start
+            stats = await config.get_pool_stats()
+        finally:
+            await config.close()
+
+        print(
+            f"\n{CONCURRENT_SESSIONS} concurrent sessions in {elapsed:.2f}s: "
+            f"{stats.connections_created} connections opened, "
+            f"peak {stats.peak_checked_out} checked out "
+            f"(limit {POOL_SIZE + MAX_OVERFLOW})"
+        )
+
+        assert stats.peak_checked_out == POOL_SIZE + MAX_OVERFLOW
+        assert stats.connections_created <= POOL_SIZE + MAX_OVERFLOW
+        assert stats.checked_out == 0
+        assert stats.total_connections <= POOL_SIZE
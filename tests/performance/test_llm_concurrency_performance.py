@@ -0,0 +1,62 @@
+"""
+Performance tests for async LLM completions.
+
+Runs several concurrent planner turns against a fake LLM with fixed latency,
+comparing the previous path (blocking complete() on the event loop) with
+acomplete() on the bounded LLM executor.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from personal_assistant.config.settings import settings
+from personal_assistant.llm.fake_llm import FakeLLM
+from personal_assistant.llm.planner import LLMPlanner
+
+LATENCY = 0.1
+CONCURRENT_TURNS = 8
+
+
+def _planner(llm):
+    tool_registry = MagicMock()
+    tool_registry.get_schema.return_value = {}
+    prompt_builder = MagicMock()
+    prompt_builder.build.return_value = "prompt"
+    return LLMPlanner(llm, tool_registry, prompt_builder=prompt_builder)
+
+
+@pytest.mark.performance
+class TestLLMConcurrencyPerformance:
+    """Benchmark concurrent planner turns with and without the async client"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_turns_overlap(self):
+        planner = _planner(FakeLLM(latency=LATENCY))
+        state = MagicMock()
+
+        async def blocking_turn():
+            return planner.choose_action(state)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(blocking_turn() for _ in range(CONCURRENT_TURNS)))
+        blocking_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(planner.achoose_action(state) for _ in range(CONCURRENT_TURNS))
+        )
+        async_time = time.perf_counter() - start
+
+        speedup = blocking_time / async_time
+        print(
+            f"\n{CONCURRENT_TURNS} turns @ {LATENCY * 1000:.0f}ms: "
+            f"blocking {blocking_time * 1000:.0f}ms, async {async_time * 1000:.0f}ms "
+            f"({speedup:.1f}x)"
+        )
+
+        assert blocking_time >= CONCURRENT_TURNS * LATENCY
+        if settings.LLM_MAX_CONCURRENCY >= CONCURRENT_TURNS:
+            assert speedup > CONCURRENT_TURNS / 2
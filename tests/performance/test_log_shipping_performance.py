@@ -0,0 +1,124 @@
+"""
+Performance tests for Loki log shipping.
+
+Measures event-loop latency while a coroutine logs a burst of records, with
+the previous pattern (one blocking HTTP push per record from the logging
+thread, as python-logging-loki's LokiHandler did) and with LokiQueueHandler
+feeding the background shipper. The local sink answers each push after
+PUSH_LATENCY, standing in for a network round trip to Loki.
+"""
+
+import asyncio
+import logging
+import statistics
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from personal_assistant.logging import StructuredJSONFormatter
+from personal_assistant.logging.loki_handler import LokiQueueHandler, LokiShipper
+
+PUSH_LATENCY = 0.01
+RECORD_COUNT = 50
+PROBE_INTERVAL = 0.002
+
+
+class SlowSink(BaseHTTPRequestHandler):
+    """Loki stand-in answering each push after PUSH_LATENCY."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(PUSH_LATENCY)
+        self.send_response(204)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class BlockingPushHandler(logging.Handler):
+    """The previous behaviour: one synchronous push per record."""
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+
+    def emit(self, record):
+        request = urllib.request.Request(
+            self.url, data=self.format(record).encode(), method="POST"
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            response.read()
+
+
+async def _loop_lag_while_logging(handler):
+    """Log RECORD_COUNT records from a coroutine while probing loop lag."""
+    logger = logging.getLogger("personal_assistant.loki_benchmark")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+    async def turn():
+        for i in range(RECORD_COUNT):
+            logger.info(f"tool call {i} finished", extra={"user_id": 7})
+            await asyncio.sleep(0)
+        done.set()
+
+    start = time.perf_counter()
+    await asyncio.gather(probe(), turn())
+    elapsed = time.perf_counter() - start
+    logger.handlers = []
+    return elapsed, max(lags), statistics.median(lags)
+
+
+@pytest.mark.performance
+class TestLogShippingPerformance:
+    """Benchmark event-loop latency with blocking and queued Loki handlers"""
+
+    @pytest.mark.asyncio
+    async def test_queued_shipping_keeps_loop_responsive(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), SlowSink)
+        threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/loki/api/v1/push"
+
+        try:
+            blocking = BlockingPushHandler(url)
+            blocking_time, blocking_max, blocking_median = await _loop_lag_while_logging(
+                blocking
+            )
+
+            shipper = LokiShipper(url, batch_size=RECORD_COUNT, flush_interval=0.05)
+            shipper.start()
+            queued = LokiQueueHandler(shipper, {"application": "personal_assistant"})
+            queued.setFormatter(StructuredJSONFormatter())
+            queued_time, queued_max, queued_median = await _loop_lag_while_logging(queued)
+            await asyncio.to_thread(shipper.close, 2)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        print(
+            f"\n{RECORD_COUNT} records: blocking push {blocking_time * 1000:.0f}ms "
+            f"(loop lag max {blocking_max * 1000:.1f}ms, median {blocking_median * 1000:.2f}ms), "
+            f"queued {queued_time * 1000:.0f}ms "
+            f"(loop lag max {queued_max * 1000:.1f}ms, median {queued_median * 1000:.2f}ms, "
+            f"{shipper.stats()['batches']} pushes)"
+        )
+
+        assert blocking_max >= PUSH_LATENCY
+        assert queued_max < blocking_max / 2
+        assert queued_time < blocking_time / 5
+        assert shipper.stats()["sent"] == RECORD_COUNT
+        assert shipper.stats()["dropped"] == 0
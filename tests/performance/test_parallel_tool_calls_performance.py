@@ -0,0 +1,90 @@
+"""
+Performance tests for multiple tool calls per planner step.
+
+Runs a two-tool request ("check my calendar and inbox") through the agent
+loop with a fake LLM, comparing one tool call per step with both calls
+requested in a single step and executed in parallel.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from personal_assistant.core.services.agent_loop_service import AgentLoopService
+from personal_assistant.core.services.tool_execution_service import ToolExecutionService
+from personal_assistant.llm.fake_llm import FakeLLM
+from personal_assistant.llm.planner import LLMPlanner
+from personal_assistant.tools.base import Tool, ToolRegistry
+from personal_assistant.types.state import AgentState
+
+LLM_LATENCY = 0.1
+TOOL_LATENCY = 0.1
+
+CALENDAR = {"name": "list_events", "arguments": {}}
+INBOX = {"name": "list_emails", "arguments": {}}
+ANSWER = {"content": "You have 2 meetings and 3 unread emails."}
+
+
+def _tools():
+    async def slow_tool(user_id: int = None):
+        await asyncio.sleep(TOOL_LATENCY)
+        return "ok"
+
+    registry = ToolRegistry()
+    parameters = {"type": "object", "properties": {}}
+    registry.register(
+        Tool("list_events", slow_tool, "List events", parameters).set_category("Calendar")
+    )
+    registry.register(
+        Tool("list_emails", slow_tool, "List emails", parameters).set_category("Email")
+    )
+    return registry
+
+
+def _loop(responses):
+    tools = _tools()
+    prompt_builder = MagicMock()
+    prompt_builder.build.return_value = "prompt"
+    llm = FakeLLM(latency=LLM_LATENCY, responses=responses)
+    planner = LLMPlanner(llm, tools, prompt_builder=prompt_builder)
+    return AgentLoopService(planner, ToolExecutionService(tools)), llm
+
+
+async def _run(responses):
+    loop, llm = _loop(responses)
+    state = AgentState(user_input="check my calendar and inbox")
+
+    start = time.perf_counter()
+    response, state = await loop.execute_loop(state, state.user_input, user_id=1)
+    elapsed = time.perf_counter() - start
+
+    assert response == ANSWER["content"]
+    return elapsed, llm.call_count, state.step_count
+
+
+@pytest.mark.performance
+class TestParallelToolCallsPerformance:
+    """Benchmark one tool call per step against a batched step"""
+
+    @pytest.mark.asyncio
+    async def test_batched_step_saves_round_trip(self):
+        sequential_time, sequential_llm_calls, sequential_steps = await _run(
+            [{"function_call": CALENDAR}, {"function_call": INBOX}, ANSWER]
+        )
+        batched_time, batched_llm_calls, batched_steps = await _run(
+            [{"function_call": CALENDAR, "function_calls": [CALENDAR, INBOX]}, ANSWER]
+        )
+
+        print(
+            f"\nsequential: {sequential_llm_calls} LLM calls, {sequential_steps} steps, "
+            f"{sequential_time * 1000:.0f}ms; batched: {batched_llm_calls} LLM calls, "
+            f"{batched_steps} steps, {batched_time * 1000:.0f}ms"
+        )
+
+        assert sequential_llm_calls == 3
+        assert batched_llm_calls == 2
+        assert batched_steps < sequential_steps
+        # One LLM round trip and one tool latency fewer
+        assert batched_time < sequential_time - (LLM_LATENCY + TOOL_LATENCY) / 2
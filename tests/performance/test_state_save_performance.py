@@ -0,0 +1,98 @@
+"""
+Performance tests for conversation state persistence.
+
+Saves 1,000 consecutive turns of one conversation with the previous full
+rewrite (delete every message/context row, insert everything again) and
+with incremental saves, counting the rows each mode writes.
+"""
+
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+import pytest_asyncio
+
+from personal_assistant.database.models.base import Base
+from personal_assistant.database.models.conversation_message import ConversationMessage
+from personal_assistant.database.models.conversation_state import ConversationState
+from personal_assistant.database.models.memory_context_item import MemoryContextItem
+from personal_assistant.memory import normalized_storage
+from personal_assistant.memory.normalized_storage import save_state_normalized
+from personal_assistant.types.state import AgentState
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+TURNS = 1000
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                ConversationState.__table__,
+                ConversationMessage.__table__,
+                MemoryContextItem.__table__,
+            ],
+        )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    with patch.object(normalized_storage, "AsyncSessionLocal", factory), patch.object(
+        normalized_storage, "embed_and_index", AsyncMock()
+    ):
+        yield engine
+    await engine.dispose()
+
+
+def _count_written_rows(engine) -> dict:
+    """Track rows touched by INSERT and DELETE statements on ``engine``."""
+    written = {"rows": 0}
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(("INSERT", "DELETE")):
+            written["rows"] += max(cursor.rowcount, 0)
+
+    return written
+
+
+async def _save_turns(conversation_id: str, incremental: bool) -> float:
+    state = AgentState(user_input="")
+    start = time.perf_counter()
+    for turn in range(TURNS):
+        state.user_input = f"question {turn}"
+        state.conversation_history.append({"role": "user", "content": f"question {turn}"})
+        state.conversation_history.append({"role": "assistant", "content": f"answer {turn}"})
+        state._apply_size_limits()
+        await save_state_normalized(
+            conversation_id, state, user_id=1, incremental=incremental
+        )
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+class TestStateSavePerformance:
+    """Benchmark incremental saves against full rewrites"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_save_writes_fewer_rows(self, engine):
+        written = _count_written_rows(engine)
+
+        full_time = await _save_turns("full", incremental=False)
+        full_rows = written["rows"]
+
+        written["rows"] = 0
+        incremental_time = await _save_turns("incremental", incremental=True)
+        incremental_rows = written["rows"]
+
+        print(
+            f"\n{TURNS} turns: full rewrite {full_time:.2f}s / {full_rows} rows, "
+            f"incremental {incremental_time:.2f}s / {incremental_rows} rows "
+            f"({full_rows / incremental_rows:.1f}x fewer rows)"
+        )
+
+        assert incremental_rows < full_rows / 2
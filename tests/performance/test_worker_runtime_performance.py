@@ -0,0 +1,83 @@
+"""
+Performance tests for the Celery worker async runtime.
+
+Compares the per-task overhead of the previous pattern, a fresh event loop
+per task, with submitting to the worker's persistent loop. Each simulated
+task uses a loop-bound client (like a pooled DB connection) that costs
+CONNECT_LATENCY to establish, so a fresh loop pays it on every task.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from personal_assistant.workers.runtime import WorkerAsyncRuntime
+
+CONNECT_LATENCY = 0.005
+TASK_COUNT = 100
+
+
+class LoopBoundPool:
+    """A connection pool whose connections only work on the loop that created them."""
+
+    def __init__(self):
+        self.connections = {}
+        self.connects = 0
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        if loop not in self.connections:
+            await asyncio.sleep(CONNECT_LATENCY)
+            self.connects += 1
+            self.connections[loop] = object()
+        return self.connections[loop]
+
+
+async def _task_body(pool):
+    await pool.acquire()
+
+
+def _per_task_loop(pool):
+    start = time.perf_counter()
+    for _ in range(TASK_COUNT):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(_task_body(pool))
+        finally:
+            loop.close()
+    return time.perf_counter() - start
+
+
+def _persistent_loop(pool):
+    runtime = WorkerAsyncRuntime()
+    runtime.start()
+    try:
+        start = time.perf_counter()
+        for _ in range(TASK_COUNT):
+            runtime.run(_task_body(pool))
+        return time.perf_counter() - start
+    finally:
+        runtime.shutdown()
+
+
+@pytest.mark.performance
+class TestWorkerRuntimePerformance:
+    """Benchmark per-task event loop overhead"""
+
+    def test_persistent_loop_overhead(self):
+        fresh_pool, shared_pool = LoopBoundPool(), LoopBoundPool()
+
+        fresh_time = _per_task_loop(fresh_pool)
+        persistent_time = _persistent_loop(shared_pool)
+
+        print(
+            f"\n{TASK_COUNT} tasks: new loop per task {fresh_time * 1000:.0f}ms "
+            f"({fresh_time / TASK_COUNT * 1e6:.0f}us/task, {fresh_pool.connects} connects), "
+            f"persistent loop {persistent_time * 1000:.0f}ms "
+            f"({persistent_time / TASK_COUNT * 1e6:.0f}us/task, {shared_pool.connects} connects)"
+        )
+
+        assert fresh_pool.connects == TASK_COUNT
+        assert shared_pool.connects == 1
+        assert persistent_time < fresh_time / 2
@@ -0,0 +1,272 @@
+"""
+Unit tests for the SMS cost engine.
+
+Tests the process-wide pricing cache, write-time international
+classification, pricing of billable count columns, what-if pricing, and the
+cost calculator responses built from rollup counts.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from personal_assistant.sms_router.services.cost_calculator import SMSCostCalculator
+from personal_assistant.sms_router.services.cost_engine import (
+    DEFAULT_PRICING,
+    PricingCache,
+    UsageCounts,
+    set_pricing_cache,
+    simulate_pricing,
+)
+from personal_assistant.sms_router.services.phone_validator import (
+    is_international_number,
+)
+from personal_assistant.sms_router.services.usage_rollups import SMSUsageRollups
+
+
+def _row(inbound=0, outbound=0, international=0, mms=0, **keys):
+    row = dict(keys)
+    row.update(
+        inbound_count=inbound,
+        outbound_count=outbound,
+        international_count=international,
+        mms_count=mms,
+        message_count=inbound + outbound,
+    )
+    return row
+
+
+@pytest.fixture(autouse=True)
+def pricing_cache():
+    cache = PricingCache(ttl_seconds=3600)
+    set_pricing_cache(cache)
+    yield cache
+    set_pricing_cache(None)
+
+
+@pytest.fixture
+def calculator():
+    calculator = SMSCostCalculator(MagicMock())
+    calculator._fetch_twilio_pricing = AsyncMock(return_value=None)
+    calculator.rollups.billable_counts = AsyncMock(return_value=[])
+    return calculator
+
+
+class TestPricingCache:
+    """Test the process-wide pricing cache"""
+
+    @pytest.mark.asyncio
+    async def test_pricing_loaded_once_across_calculators(self):
+        loader = AsyncMock(return_value={**DEFAULT_PRICING, "outbound": 0.01})
+
+        first = SMSCostCalculator(MagicMock())
+        second = SMSCostCalculator(MagicMock())
+        first._fetch_twilio_pricing = second._fetch_twilio_pricing = loader
+
+        assert (await first.get_twilio_pricing())["outbound"] == 0.01
+        assert (await second.get_twilio_pricing())["outbound"] == 0.01
+        loader.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_expired_pricing_is_reloaded(self, pricing_cache):
+        loader = AsyncMock(return_value=dict(DEFAULT_PRICING))
+
+        with patch(
+            "personal_assistant.sms_router.services.cost_engine.time.monotonic",
+            side_effect=[100.0, 200.0, 5000.0, 5000.0],
+        ):
+            await pricing_cache.get(loader)
+            await pricing_cache.get(loader)
+            await pricing_cache.get(loader)
+
+        assert loader.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_load_falls_back_to_defaults(self, pricing_cache):
+        pricing = await pricing_cache.get(AsyncMock(side_effect=RuntimeError("down")))
+
+        assert pricing == DEFAULT_PRICING
+        assert pricing is not DEFAULT_PRICING
+
+
+class TestInternationalClassification:
+    """Test write-time classification of phone numbers"""
+
+    @pytest.mark.parametrize(
+        "phone_number,expected",
+        [
+            ("+15551234567", False),
+            ("5551234567", False),
+            ("(555) 123-4567", False),
+            ("+447911123456", True),
+            ("+33612345678", True),
+            ("", False),
+            (None, False),
+        ],
+    )
+    def test_is_international_number(self, phone_number, expected):
+        assert is_international_number(phone_number) is expected
+
+
+class TestUsageCounts:
+    """Test pricing of billable count columns"""
+
+    def test_costs_split_international_outbound(self):
+        counts = UsageCounts.from_rows([_row(inbound=10, outbound=4, international=1, mms=2)])
+
+        costs = counts.costs(DEFAULT_PRICING)
+
+        assert costs["inbound"][0] == pytest.approx(0.075)
+        assert costs["outbound"][0] == pytest.approx(3 * 0.0079 + 0.15)
+        assert costs["international"][0] == pytest.approx(0.15)
+        assert costs["mms"][0] == pytest.approx(0.04)
+
+    def test_since_and_grouping(self):
+        hour = datetime(2026, 1, 10, 9)
+        counts = UsageCounts.from_rows(
+            [
+                _row(inbound=1, period=hour - timedelta(days=2), user_id=1),
+                _row(inbound=2, period=hour, user_id=1),
+                _row(outbound=3, period=hour, user_id=2),
+            ]
+        )
+
+        recent = counts.since(hour)
+
+        assert recent.total_messages == 5
+        assert counts.sum_by_user(counts.messages) == {1: 3.0, 2: 3.0}
+        assert recent.sum_by_period(recent.messages) == {hour: 5.0}
+
+    def test_simulate_pricing_prices_every_scenario(self):
+        counts = UsageCounts.from_rows(
+            [
+                _row(inbound=100, outbound=50, international=10, mms=5, user_id=1),
+                _row(outbound=20, user_id=2),
+            ]
+        )
+
+        results = simulate_pricing(
+            counts,
+            {
+                "current": {},
+                "cheaper_outbound": {"outbound": 0.005, "international_outbound": 0.1},
+            },
+        )
+
+        current = results["current"]
+        assert current["cost_by_rate"]["outbound"] == round(60 * 0.0079, 4)
+        assert current["total_cost_usd"] == round(
+            100 * 0.0075 + 60 * 0.0079 + 10 * 0.15 + 5 * 0.02, 4
+        )
+        assert current["user_costs"][2] == round(20 * 0.0079, 4)
+        assert results["cheaper_outbound"]["cost_by_rate"]["international_outbound"] == 1.0
+        assert results["cheaper_outbound"]["user_costs"][2] == 0.1
+
+
+class TestBillableCountsQuery:
+    """Test the billable counts SQL"""
+
+    @pytest.mark.asyncio
+    async def test_daily_counts_per_user(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=[])
+        rollups = SMSUsageRollups(db)
+        rollups.get_watermark = AsyncMock(return_value=datetime(2026, 1, 31, 9))
+
+        await rollups.billable_counts(
+            datetime(2026, 1, 1), datetime(2026, 1, 31, 10), period="day", by_user=True
+        )
+
+        sql = str(
+            db.execute.call_args.args[0].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        assert "FROM sms_usage_daily_rollups" in sql
+        assert "count(*) FILTER (WHERE sms_usage_logs.is_international IS true)" in sql
+        assert "sum(usage.international_count) FILTER (WHERE" in sql
+        assert "GROUP BY date_trunc('day', usage.bucket), usage.user_id" in sql
+
+
+class TestCostCalculator:
+    """Test cost responses built from rollup counts"""
+
+    @pytest.mark.asyncio
+    async def test_user_costs(self, calculator):
+        calculator.rollups.billable_counts.return_value = [
+            _row(inbound=10, outbound=4, international=1, mms=2)
+        ]
+
+        costs = await calculator.calculate_user_costs(7, "30d")
+
+        assert costs["message_count"] == 14
+        assert costs["inbound_cost_usd"] == 0.075
+        assert costs["outbound_cost_usd"] == round(3 * 0.0079 + 0.15, 4)
+        assert costs["mms_cost_usd"] == 0.04
+        assert costs["total_with_monthly_fees"] == round(
+            costs["total_cost_usd"] + 1.0, 4
+        )
+
+    @pytest.mark.asyncio
+    async def test_breakdown_slices_one_hourly_query(self, calculator):
+        now = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        calculator.rollups.billable_counts.return_value = [
+            _row(inbound=1, period=now - timedelta(days=60)),
+            _row(inbound=2, period=now - timedelta(days=20)),
+            _row(inbound=4, period=now - timedelta(days=1)),
+        ]
+        calculator.rollups.totals = AsyncMock(return_value={"message_count": 0})
+        calculator.rollups.totals_by_direction = AsyncMock(return_value={})
+        calculator.rollups.hourly_distribution = AsyncMock(return_value={})
+
+        breakdown = await calculator.get_cost_breakdown(7)
+
+        calculator.rollups.billable_counts.assert_awaited_once()
+        assert calculator.rollups.billable_counts.await_args.kwargs["period"] == "hour"
+        history = breakdown["historical_costs"]
+        assert [history[key]["message_count"] for key in ("7_days", "30_days", "90_days")] == [
+            4,
+            6,
+            7,
+        ]
+        assert breakdown["estimated_monthly_cost"] == round(6 * 0.0075 + 1.0, 4)
+
+    @pytest.mark.asyncio
+    async def test_cost_trends_fill_missing_days(self, calculator):
+        today = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+        calculator.rollups.billable_counts.return_value = [
+            _row(outbound=2, mms=1, period=today - timedelta(days=2))
+        ]
+
+        trends = await calculator.get_cost_trends(7)
+
+        daily = trends["daily_costs"]
+        assert len(daily) == 31
+        assert daily[-3]["message_count"] == 2
+        assert daily[-3]["cost_usd"] == round(2 * 0.0079 + 0.02, 4)
+        assert sum(day["message_count"] for day in daily) == 2
+
+    @pytest.mark.asyncio
+    async def test_system_summary_ranks_users(self, calculator):
+        calculator.rollups.billable_counts.return_value = [
+            _row(inbound=10, user_id=1),
+            _row(outbound=10, international=2, user_id=2),
+        ]
+
+        summary = await calculator.get_system_cost_summary("7d")
+
+        assert calculator.rollups.billable_counts.await_args.kwargs["by_user"] is True
+        assert summary["unique_users"] == 2
+        assert summary["international_cost_usd"] == 0.3
+        assert [user["user_id"] for user in summary["top_cost_users"]] == [2, 1]
+
+    @pytest.mark.asyncio
+    async def test_simulate_pricing(self, calculator):
+        calculator.rollups.billable_counts.return_value = [_row(outbound=100, user_id=1)]
+
+        result = await calculator.simulate_pricing({"promo": {"outbound": 0.005}})
+
+        assert result["total_messages"] == 100
+        assert result["scenarios"]["promo"]["total_cost_usd"] == 0.5
@@ -0,0 +1,257 @@
+"""
+Unit tests for the inbound SMS queue.
+
+Tests MessageSid deduplication, per-sender ordering, the worker bound,
+queue-depth reporting and recovery of journaled messages.
+"""
+
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from personal_assistant.sms_router.services.inbound_queue import (
+    InboundSMS,
+    InboundSMSQueue,
+    RedisInboundJournal,
+)
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by RedisInboundJournal (no expiry)."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.commands = []
+
+    async def eval(self, script, numkeys, *keys_and_args):
+        # Only the journal's add script: SET NX, then HSET if the SET won
+        self.commands.append("eval")
+        (sid_key, pending_key), (owner, _ttl, field, value) = (
+            keys_and_args[:numkeys],
+            keys_and_args[numkeys:],
+        )
+        if sid_key in self.values:
+            return 0
+        self.values[sid_key] = owner
+        self.hashes.setdefault(pending_key, {})[field] = value
+        return 1
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class RecordingHandler:
+    """Handler that records calls and can hold messages until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.active = 0
+        self.max_active = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, message: InboundSMS):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+            await asyncio.sleep(0)
+            self.calls.append((message.from_phone, message.body))
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture
+def metrics_service():
+    service = MagicMock()
+    with patch(
+        "personal_assistant.sms_router.services.inbound_queue.get_metrics_service",
+        return_value=service,
+    ):
+        yield service
+
+
+class TestInboundSMSQueue:
+    """Test the InboundSMSQueue"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_message_sid_processed_once(self, metrics_service):
+        handler = RecordingHandler()
+        queue = InboundSMSQueue(handler, num_workers=2)
+
+        assert await queue.submit("+15550001", "hello", "SM1") is True
+        assert await queue.submit("+15550001", "hello", "SM1") is False
+        await queue.stop()
+
+        assert handler.calls == [("+15550001", "hello")]
+        assert queue.get_metrics()["duplicates"] == 1
+
+    @pytest.mark.asyncio
+    async def test_per_sender_fifo(self, metrics_service):
+        handler = RecordingHandler()
+        queue = InboundSMSQueue(handler, num_workers=4)
+
+        for i in range(5):
+            await queue.submit("+15550001", f"msg {i}", f"SM{i}")
+        await queue.stop()
+
+        assert handler.calls == [("+15550001", f"msg {i}") for i in range(5)]
+        # One sender never runs on two workers at once
+        assert handler.max_active == 1
+
+    @pytest.mark.asyncio
+    async def test_workers_bound_concurrency(self, metrics_service):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = InboundSMSQueue(handler, num_workers=2)
+
+        for i in range(6):
+            await queue.submit(f"+1555000{i}", "hi", f"SM{i}")
+        await asyncio.sleep(0.01)
+
+        assert handler.active == 2
+        assert queue.depth == 6
+
+        handler.release.set()
+        await queue.stop()
+
+        assert len(handler.calls) == 6
+        assert handler.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_depth_reported_to_gauge(self, metrics_service):
+        handler = RecordingHandler()
+        handler.release.clear()
+        queue = InboundSMSQueue(handler, num_workers=1)
+
+        await queue.submit("+15550001", "a", "SM1")
+        await queue.submit("+15550002", "b", "SM2")
+        metrics_service.update_sms_metrics.assert_called_with(queue_length=2)
+
+        handler.release.set()
+        await queue.stop()
+
+        metrics_service.update_sms_metrics.assert_called_with(queue_length=0)
+        assert queue.get_metrics()["max_depth"] == 2
+
+    @pytest.mark.asyncio
+    async def test_handler_failure_does_not_stop_sender(self, metrics_service):
+        calls = []
+
+        async def handler(message):
+            calls.append(message.body)
+            if message.body == "boom":
+                raise RuntimeError("agent failed")
+
+        queue = InboundSMSQueue(handler, num_workers=1)
+        await queue.submit("+15550001", "boom", "SM1")
+        await queue.submit("+15550001", "after", "SM2")
+        await queue.stop()
+
+        assert calls == ["boom", "after"]
+        assert queue.get_metrics()["failed"] == 1
+
+
+class TestRedisInboundJournal:
+    """Test the Redis journal and recovery of orphaned messages"""
+
+    @pytest.mark.asyncio
+    async def test_dedupe_shared_across_processes(self):
+        redis = FakeRedis()
+        first, second = RedisInboundJournal(redis), RedisInboundJournal(redis)
+
+        assert await first.add(InboundSMS("+15550001", "hi", "SM1")) is True
+        assert await second.add(InboundSMS("+15550001", "hi", "SM1")) is False
+
+    @pytest.mark.asyncio
+    async def test_add_is_one_round_trip(self):
+        redis = FakeRedis()
+        journal = RedisInboundJournal(redis)
+
+        assert await journal.add(InboundSMS("+15550001", "hi", "SM1")) is True
+        assert await journal.add(InboundSMS("+15550001", "again", "SM1")) is False
+
+        assert redis.commands == ["eval", "eval"]
+        assert '"hi"' in redis.hashes[journal._pending_key]["SM1"]
+
+    @pytest.mark.asyncio
+    async def test_orphans_claimed_once_in_order(self):
+        redis = FakeRedis()
+        dead = RedisInboundJournal(redis)  # Never heartbeats
+        await dead.add(InboundSMS("+15550001", "second", "SM2", received_at=2.0))
+        await dead.add(InboundSMS("+15550001", "first", "SM1", received_at=1.0))
+
+        survivor, other = RedisInboundJournal(redis), RedisInboundJournal(redis)
+        await survivor.heartbeat()
+        await other.heartbeat()
+
+        claimed = await survivor.claim_orphans()
+
+        assert [m.body for m in claimed] == ["first", "second"]
+        assert await other.claim_orphans() == []
+
+    @pytest.mark.asyncio
+    async def test_live_owner_messages_not_claimed(self):
+        redis = FakeRedis()
+        live = RedisInboundJournal(redis)
+        await live.heartbeat()
+        await live.add(InboundSMS("+15550001", "hi", "SM1"))
+
+        assert await RedisInboundJournal(redis).claim_orphans() == []
+
+    @pytest.mark.asyncio
+    async def test_interrupted_message_stays_journaled(self, metrics_service):
+        redis = FakeRedis()
+        handler = RecordingHandler()
+        handler.release.clear()  # Still replying when the queue stops
+        queue = InboundSMSQueue(handler, journal=RedisInboundJournal(redis))
+
+        await queue.submit("+15550001", "slow", "SM1")
+        while not handler.active:
+            await asyncio.sleep(0)
+        await queue.stop(timeout=0.01)
+
+        assert handler.calls == []
+        assert queue.get_metrics()["failed"] == 0
+        assert list(await redis.hgetall("pa:sms:inbound:pending")) == ["SM1"]
+
+        # The next process resumes it once the stopped one's owner key expires
+        del redis.values[f"pa:sms:inbound:owner:{queue.journal.owner_id}"]
+        handler.release.set()
+        resumed = InboundSMSQueue(handler, journal=RedisInboundJournal(redis))
+        await resumed.start()
+        await resumed.stop()
+
+        assert handler.calls == [("+15550001", "slow")]
+        assert await redis.hgetall("pa:sms:inbound:pending") == {}
+
+    @pytest.mark.asyncio
+    async def test_queue_resumes_journaled_messages(self, metrics_service):
+        redis = FakeRedis()
+        await RedisInboundJournal(redis).add(InboundSMS("+15550001", "lost", "SM1"))
+
+        handler = RecordingHandler()
+        queue = InboundSMSQueue(handler, journal=RedisInboundJournal(redis))
+        await queue.start()
+        await queue.stop()
+
+        assert handler.calls == [("+15550001", "lost")]
+        assert queue.get_metrics()["recovered"] == 1
+        assert await redis.hgetall("pa:sms:inbound:pending") == {}
@@ -0,0 +1,276 @@
+"""
+Unit tests for the SMS usage rollups.
+
+Tests how query windows are split between the raw log and the rollups, the
+SQL generated for PostgreSQL, incremental and backfill refreshes, and the
+analytics responses built from aggregated measures.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from personal_assistant.sms_router.services.analytics import SMSAnalyticsService
+from personal_assistant.sms_router.services.usage_rollups import (
+    MEASURES,
+    SMSUsageRollups,
+    UsageSegment,
+    merge_measures,
+    plan_segments,
+)
+
+SETTINGS = "personal_assistant.sms_router.services.usage_rollups.settings"
+
+
+def _measures(**values):
+    measures = {name: 0 for name in MEASURES}
+    measures.update(values)
+    return measures
+
+
+def _sql(statement) -> str:
+    return str(
+        statement.compile(
+            dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+        )
+    )
+
+
+def _result(scalar=None):
+    result = MagicMock()
+    result.scalar.return_value = scalar
+    result.rowcount = 3
+    return result
+
+
+class TestPlanSegments:
+    """Test how query windows are split across sources"""
+
+    def test_no_watermark_reads_raw_log(self):
+        start, end = datetime(2026, 1, 1, 10, 30), datetime(2026, 1, 31, 10, 30)
+
+        assert plan_segments(start, end, None) == [UsageSegment("raw", start, end, True)]
+
+    def test_long_window_uses_days_and_hours(self):
+        start = datetime(2026, 1, 1, 10, 30)
+        end = datetime(2026, 1, 31, 10, 30)
+        watermark = datetime(2026, 1, 31, 9)
+
+        assert plan_segments(start, end, watermark) == [
+            UsageSegment("raw", start, datetime(2026, 1, 1, 11)),
+            UsageSegment("hourly", datetime(2026, 1, 1, 11), datetime(2026, 1, 2)),
+            UsageSegment("daily", datetime(2026, 1, 2), datetime(2026, 1, 31)),
+            UsageSegment("hourly", datetime(2026, 1, 31), watermark),
+            UsageSegment("raw", watermark, end, True),
+        ]
+
+    def test_segments_cover_window_without_overlap(self):
+        start = datetime(2026, 3, 4, 7, 15, 12)
+        end = datetime(2026, 6, 2, 18, 40)
+        watermark = datetime(2026, 6, 2, 18)
+
+        for use_daily in (True, False):
+            segments = plan_segments(start, end, watermark, use_daily)
+            assert segments[0].start == start
+            assert segments[-1].end == end and segments[-1].include_end
+            for previous, segment in zip(segments, segments[1:]):
+                assert previous.end == segment.start
+            assert ("daily" in {s.source for s in segments}) is use_daily
+
+    def test_short_window_reads_raw_log(self):
+        start, end = datetime(2026, 1, 1, 10, 5), datetime(2026, 1, 1, 11, 5)
+
+        assert plan_segments(start, end, datetime(2026, 1, 1, 11)) == [
+            UsageSegment("raw", start, end, True)
+        ]
+
+    def test_stale_watermark_extends_raw_tail(self):
+        start, end = datetime(2026, 1, 1), datetime(2026, 1, 8)
+        watermark = datetime(2026, 1, 5, 6, 0)
+
+        segments = plan_segments(start, end, watermark)
+
+        assert segments[-2] == UsageSegment("hourly", datetime(2026, 1, 5), watermark)
+        assert segments[-1] == UsageSegment("raw", watermark, end, True)
+
+
+class TestRollupQueries:
+    """Test the SQL built for PostgreSQL"""
+
+    @pytest.mark.asyncio
+    async def test_window_unions_rollups_and_raw_tail(self):
+        rollups = SMSUsageRollups(MagicMock())
+        rollups.get_watermark = AsyncMock(return_value=datetime(2026, 1, 31, 9))
+
+        usage = await rollups._usage(
+            datetime(2026, 1, 1, 10, 30), datetime(2026, 1, 31, 10, 30), user_id=7
+        )
+        sql = _sql(usage.select())
+
+        assert sql.count("UNION ALL") == 4
+        assert "FROM sms_usage_daily_rollups" in sql
+        assert "FROM sms_usage_hourly_rollups" in sql
+        assert "date_trunc('hour', sms_usage_logs.created_at)" in sql
+        assert "count(*) FILTER (WHERE sms_usage_logs.success IS true)" in sql
+        assert "sms_usage_logs.user_id = 7" in sql
+
+    @pytest.mark.asyncio
+    async def test_hourly_rebuild_aggregates_in_sql(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result())
+
+        rows = await SMSUsageRollups(db)._rebuild_hourly(
+            datetime(2026, 1, 1), datetime(2026, 1, 2)
+        )
+        delete_sql, insert_sql = (_sql(call.args[0]) for call in db.execute.call_args_list)
+
+        assert delete_sql.startswith("DELETE FROM sms_usage_hourly_rollups")
+        assert insert_sql.startswith("INSERT INTO sms_usage_hourly_rollups")
+        assert "GROUP BY date_trunc('hour', sms_usage_logs.created_at)" in insert_sql
+        assert "sms_usage_logs.created_at < '2026-01-02 00:00:00'" in insert_sql
+        assert rows == 3
+
+    @pytest.mark.asyncio
+    async def test_percentiles_use_percentile_cont(self):
+        db = MagicMock()
+        row = MagicMock()
+        row._mapping = {"p50": 120.0, "p95": 480.25, "p99": None}
+        db.execute = AsyncMock(return_value=MagicMock(one=MagicMock(return_value=row)))
+
+        percentiles = await SMSUsageRollups(db).processing_time_percentiles(
+            datetime(2026, 1, 1), datetime(2026, 1, 1, 1)
+        )
+
+        sql = _sql(db.execute.call_args.args[0])
+        assert "percentile_cont(0.95) WITHIN GROUP (ORDER BY" in sql
+        assert percentiles == {"p50": 120.0, "p95": 480.25, "p99": 0.0}
+
+
+class TestRollupRefresh:
+    """Test incremental and backfill refreshes"""
+
+    @pytest.mark.asyncio
+    async def test_incremental_refresh_rebuilds_lookback(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result(True))
+        db.commit = AsyncMock()
+        rollups = SMSUsageRollups(db)
+        rollups.get_watermark = AsyncMock(return_value=datetime(2026, 1, 10, 11))
+        rollups._rebuild_hourly = AsyncMock(return_value=4)
+        rollups._rebuild_daily = AsyncMock(return_value=2)
+
+        with patch(f"{SETTINGS}.SMS_ROLLUP_LOOKBACK_HOURS", 6):
+            stats = await rollups.refresh(now=datetime(2026, 1, 10, 12, 3))
+
+        rollups._rebuild_hourly.assert_awaited_once_with(
+            datetime(2026, 1, 10, 6), datetime(2026, 1, 10, 12)
+        )
+        rollups._rebuild_daily.assert_awaited_once_with(
+            datetime(2026, 1, 10), datetime(2026, 1, 11)
+        )
+        assert stats["status"] == "success"
+        assert stats["hourly_rows"] == 4
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_first_refresh_backfills_in_chunks(self):
+        db = MagicMock()
+        # Oldest log, then the advisory lock and watermark upsert per chunk
+        db.execute = AsyncMock(
+            side_effect=[_result(datetime(2026, 1, 1, 8, 20))] + [_result(True)] * 6
+        )
+        db.commit = AsyncMock()
+        rollups = SMSUsageRollups(db)
+        rollups.get_watermark = AsyncMock(return_value=None)
+        rollups._rebuild_hourly = AsyncMock(return_value=1)
+        rollups._rebuild_daily = AsyncMock(return_value=1)
+
+        with patch(f"{SETTINGS}.SMS_ROLLUP_BACKFILL_CHUNK_DAYS", 7):
+            stats = await rollups.refresh(now=datetime(2026, 1, 16, 9, 30))
+
+        chunks = [call.args for call in rollups._rebuild_hourly.await_args_list]
+        assert chunks == [
+            (datetime(2026, 1, 1, 8), datetime(2026, 1, 8, 8)),
+            (datetime(2026, 1, 8, 8), datetime(2026, 1, 15, 8)),
+            (datetime(2026, 1, 15, 8), datetime(2026, 1, 16, 9)),
+        ]
+        assert db.commit.await_count == 3
+        assert stats["refreshed_through"] == "2026-01-16T09:00:00"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_refresh_is_skipped(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_result(False))
+        db.rollback = AsyncMock()
+        db.commit = AsyncMock()
+        rollups = SMSUsageRollups(db)
+        rollups.get_watermark = AsyncMock(return_value=datetime(2026, 1, 10, 11))
+        rollups._rebuild_hourly = AsyncMock()
+
+        stats = await rollups.refresh(now=datetime(2026, 1, 10, 12, 3))
+
+        assert stats["status"] == "skipped"
+        rollups._rebuild_hourly.assert_not_awaited()
+        db.commit.assert_not_awaited()
+
+
+class TestAggregatedAnalytics:
+    """Test analytics responses built from rollup measures"""
+
+    def test_merge_measures_ignores_untimed_groups(self):
+        merged = merge_measures(
+            [
+                _measures(message_count=3, processing_count=2, processing_min_ms=40),
+                _measures(message_count=1),
+            ]
+        )
+
+        assert merged["message_count"] == 4
+        assert merged["processing_min_ms"] == 40
+
+    @pytest.mark.asyncio
+    async def test_user_usage_summary(self):
+        service = SMSAnalyticsService(MagicMock())
+        service.rollups.totals_by_direction = AsyncMock(
+            return_value={
+                "inbound": _measures(
+                    message_count=6,
+                    success_count=6,
+                    processing_count=4,
+                    processing_total_ms=800,
+                    total_message_length=300,
+                ),
+                "outbound": _measures(
+                    message_count=4,
+                    success_count=3,
+                    processing_count=1,
+                    processing_total_ms=200,
+                    total_message_length=500,
+                ),
+            }
+        )
+        service.rollups.hourly_distribution = AsyncMock(return_value={9: 7, 21: 3})
+
+        summary = await service.get_user_usage_summary(7, "90d")
+
+        assert summary["total_messages"] == 10
+        assert (summary["inbound_messages"], summary["outbound_messages"]) == (6, 4)
+        assert summary["success_rate"] == 90.0
+        assert summary["average_processing_time_ms"] == 200.0
+        assert summary["total_message_length"] == 800
+        assert summary["usage_patterns"]["peak_hour"] == 9
+        assert summary["usage_patterns"]["low_activity_hour"] == 21
+
+    @pytest.mark.asyncio
+    async def test_daily_usage_fills_missing_days(self):
+        service = SMSAnalyticsService(MagicMock())
+        start = datetime(2026, 1, 1, 15)
+        service.rollups.daily_series = AsyncMock(
+            return_value={start.date() + timedelta(days=1): _measures(message_count=5)}
+        )
+
+        daily = await service._get_daily_usage_counts(7, start, start + timedelta(days=2))
+
+        assert [day["message_count"] for day in daily] == [0, 5, 0]
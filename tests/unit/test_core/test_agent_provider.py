@@ -0,0 +1,102 @@
+"""
+Unit tests for the shared AgentCore provider
+
+Tests that one AgentCore is built per process and that concurrent runs on
+the shared instance keep their per-request state separate.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from personal_assistant.core import agent as agent_module
+from personal_assistant.core.agent import AgentCore, get_agent_core, set_agent_core
+from personal_assistant.types.state import AgentState
+
+
+class TestAgentCoreProvider:
+    """Test get_agent_core/set_agent_core"""
+
+    @pytest.fixture(autouse=True)
+    def reset_provider(self):
+        set_agent_core(None)
+        yield
+        set_agent_core(None)
+
+    def test_builds_agent_once(self):
+        with patch.object(agent_module, "AgentCore") as mock_agent_core, patch.object(
+            agent_module, "create_tool_registry"
+        ) as mock_registry, patch.object(agent_module, "GeminiLLM") as mock_llm:
+            first = get_agent_core()
+            second = get_agent_core()
+
+        assert first is second
+        mock_agent_core.assert_called_once_with(
+            tools=mock_registry.return_value, llm=mock_llm.return_value
+        )
+        mock_registry.assert_called_once()
+
+    def test_llm_uses_configured_google_api_key(self):
+        with patch.object(agent_module, "AgentCore") as mock_agent_core, patch.object(
+            agent_module, "create_tool_registry"
+        ), patch.object(agent_module, "GeminiLLM") as mock_llm, patch.object(
+            agent_module.settings, "GOOGLE_API_KEY", "google-key"
+        ), patch.object(
+            agent_module.settings, "GEMINI_MODEL", "gemini-test"
+        ):
+            get_agent_core()
+
+        mock_llm.assert_called_once_with(api_key="google-key", model="gemini-test")
+        assert mock_agent_core.call_args.kwargs["llm"] is mock_llm.return_value
+
+    def test_set_agent_core_overrides_instance(self):
+        fake = MagicMock()
+        set_agent_core(fake)
+
+        assert get_agent_core() is fake
+
+
+class TestSharedAgentCoreRuns:
+    """Test per-request state isolation on a shared AgentCore"""
+
+    @pytest.fixture
+    def agent(self):
+        # Skip the heavy constructor; only wire the services run() touches
+        agent = AgentCore.__new__(AgentCore)
+        agent.conversation_service = MagicMock()
+        agent.context_service = MagicMock()
+        agent.context_injection_service = MagicMock()
+        agent.context_injection_service.inject_context = AsyncMock()
+        agent.storage_manager = MagicMock()
+        agent.storage_manager.save_state = AsyncMock()
+        agent.error_handler = MagicMock()
+        agent.agent_loop_service = MagicMock()
+        return agent
+
+    @pytest.mark.asyncio
+    async def test_concurrent_runs_use_their_own_state(self, agent):
+        states = {1: AgentState(user_input="first"), 2: AgentState(user_input="second")}
+
+        async def get_conversation_context(user_id, user_input):
+            return f"conv-{user_id}", states[user_id]
+
+        async def get_enhanced_context(user_id, user_input, agent_state):
+            # The first request finishes context retrieval last
+            await asyncio.sleep(0.05 if user_id == 1 else 0.0)
+            return {"ltm_context": None, "rag_context": None}
+
+        async def execute_loop(state, user_input, user_id):
+            return state.user_input, state
+
+        agent.conversation_service.get_conversation_context = get_conversation_context
+        agent.context_service.get_enhanced_context = get_enhanced_context
+        agent.agent_loop_service.execute_loop = execute_loop
+
+        responses = await asyncio.gather(
+            agent.run("first", 1, enable_background_processing=False),
+            agent.run("second", 2, enable_background_processing=False),
+        )
+
+        assert responses == ["first", "second"]
+        assert not hasattr(agent, "current_state")
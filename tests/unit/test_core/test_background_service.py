@@ -0,0 +1,177 @@
+"""
+Unit tests for BackgroundService
+
+Tests the write-behind queue: coalescing of pending saves, read-back of
+unsaved state, backpressure, shutdown flush and the detached fallback.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+
+from personal_assistant.core.services.background_service import BackgroundService
+from personal_assistant.core.services.conversation_service import ConversationService
+from personal_assistant.types.state import AgentState
+
+
+def _state(text: str) -> AgentState:
+    state = AgentState(user_input=text)
+    state.conversation_history.append({"role": "user", "content": text})
+    return state
+
+
+class TestBackgroundService:
+    """Test the BackgroundService write-behind queue"""
+
+    @pytest.fixture
+    def save_gate(self):
+        return asyncio.Event()
+
+    @pytest.fixture
+    def storage_manager(self, save_gate):
+        manager = MagicMock()
+        saved = []
+
+        async def save_state(conversation_id, state, user_id):
+            await save_gate.wait()
+            saved.append((conversation_id, state.user_input))
+            return True
+
+        manager.save_state = AsyncMock(side_effect=save_state)
+        manager.log_agent_interaction = AsyncMock(return_value=True)
+        manager.saved = saved
+        return manager
+
+    @pytest.fixture
+    def ltm_learning_manager(self):
+        manager = MagicMock()
+        manager.optimize_after_interaction = AsyncMock()
+        manager.is_memory_request.return_value = False
+        return manager
+
+    @pytest_asyncio.fixture
+    async def service(self, storage_manager, ltm_learning_manager):
+        service = BackgroundService(
+            storage_manager,
+            ltm_learning_manager=ltm_learning_manager,
+            max_pending=2,
+            num_workers=1,
+            batch_size=4,
+        )
+        await service.start()
+        yield service
+        await service.stop(timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_coalesces_saves_of_same_conversation(
+        self, service, storage_manager, ltm_learning_manager, save_gate
+    ):
+        # Hold the worker on conversation "a" so later turns queue up behind it
+        await service.submit(1, "a1", "r", _state("a1"), "a", 0.0)
+        await asyncio.sleep(0)
+        await service.submit(1, "a2", "r", _state("a2"), "a", 0.0)
+        await service.submit(1, "a3", "r", _state("a3"), "a", 0.0)
+
+        save_gate.set()
+        await service.stop(timeout=1)
+
+        assert storage_manager.saved == [("a", "a1"), ("a", "a3")]
+        assert ltm_learning_manager.optimize_after_interaction.await_count == 3
+        metrics = service.get_metrics()
+        assert metrics["coalesced"] == 1
+        assert metrics["saves"] == 2
+
+    @pytest.mark.asyncio
+    async def test_pending_state_is_readable_before_save(self, service, save_gate):
+        await service.submit(1, "hello", "r", _state("hello"), "a", 0.0)
+
+        pending = service.get_pending_state("a")
+        assert pending.user_input == "hello"
+        assert service.get_pending_state("b") is None
+
+        save_gate.set()
+        await service.stop(timeout=1)
+        assert service.get_pending_state("a") is None
+
+    @pytest.mark.asyncio
+    async def test_conversation_service_reads_pending_state(self, service):
+        await service.submit(1, "first", "r", _state("first"), "conv-1", 0.0)
+        storage_manager = MagicMock()
+        storage_manager.load_state = AsyncMock()
+        conversation_service = ConversationService(storage_manager, background_service=service)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(
+                "personal_assistant.core.services.conversation_service.get_conversation_id",
+                AsyncMock(return_value="conv-1"),
+            )
+            conversation_id, state = await conversation_service.get_conversation_context(
+                1, "second"
+            )
+
+        assert conversation_id == "conv-1"
+        assert state.user_input == "second"
+        assert state.conversation_history[0]["content"] == "first"
+        storage_manager.load_state.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_when_queue_is_full(self, storage_manager, save_gate):
+        service = BackgroundService(storage_manager, max_pending=2, num_workers=1, batch_size=1)
+        await service.start()
+        for cid in ("a", "b", "c"):
+            await service.submit(1, cid, "r", _state(cid), cid, 0.0)
+
+        # Worker holds "a"; "b" and "c" fill the queue, so "d" must wait
+        blocked = asyncio.create_task(service.submit(1, "d", "r", _state("d"), "d", 0.0))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        save_gate.set()
+        await asyncio.wait_for(blocked, 1)
+        await service.stop(timeout=1)
+        assert [cid for cid, _ in storage_manager.saved] == ["a", "b", "c", "d"]
+        assert service.get_metrics()["backpressure_waits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_enqueue_does_not_strand_conversation(
+        self, storage_manager, save_gate
+    ):
+        service = BackgroundService(storage_manager, max_pending=2, num_workers=1, batch_size=1)
+        await service.start()
+        for cid in ("a", "b", "c"):
+            await service.submit(1, cid, "r", _state(cid), cid, 0.0)
+
+        blocked = asyncio.create_task(service.submit(1, "d1", "r", _state("d1"), "d", 0.0))
+        await asyncio.sleep(0.05)
+        blocked.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await blocked
+        assert service.get_pending_state("d") is None
+
+        save_gate.set()
+        await service.submit(1, "d2", "r", _state("d2"), "d", 0.0)
+        await service.stop(timeout=1)
+        assert ("d", "d2") in storage_manager.saved
+
+    @pytest.mark.asyncio
+    async def test_runs_detached_when_queue_not_started(self, storage_manager, save_gate):
+        service = BackgroundService(storage_manager)
+        save_gate.set()
+
+        await service.submit(1, "hi", "r", _state("hi"), "a", 0.0)
+        await asyncio.gather(*service._detached_tasks)
+
+        assert storage_manager.saved == [("a", "hi")]
+        assert service.get_metrics()["submitted"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_detached_tasks(self, storage_manager, save_gate):
+        service = BackgroundService(storage_manager)
+
+        await service.submit(1, "hi", "r", _state("hi"), "a", 0.0)
+        asyncio.get_running_loop().call_later(0.05, save_gate.set)
+        await service.stop(timeout=1)
+
+        assert storage_manager.saved == [("a", "hi")]
@@ -0,0 +1,114 @@
+"""
+Unit tests for ContextService
+
+Tests concurrent LTM/RAG retrieval, per-source deadlines with partial
+results, and per-source timings.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from personal_assistant.core.services.context_service import ContextService
+from personal_assistant.types.state import AgentState
+
+
+def _slow(value, delay):
+    """Build an async side effect that returns ``value`` after ``delay`` seconds."""
+
+    async def side_effect(*args, **kwargs):
+        await asyncio.sleep(delay)
+        return value
+
+    return side_effect
+
+
+class TestContextService:
+    """Test the ContextService class"""
+
+    @pytest.fixture
+    def agent_state(self):
+        return AgentState(user_input="what is on my calendar?")
+
+    @pytest.fixture
+    def ltm_retriever(self):
+        retriever = MagicMock()
+        retriever.get_relevant_memories = AsyncMock(
+            side_effect=_slow([{"content": "Prefers mornings"}], 0.2)
+        )
+        return retriever
+
+    @pytest.mark.asyncio
+    async def test_sources_run_concurrently(self, ltm_retriever, agent_state):
+        service = ContextService(ltm_retriever=ltm_retriever)
+
+        with patch(
+            "personal_assistant.core.services.context_service.query_knowledge_base",
+            new=AsyncMock(side_effect=_slow([{"content": "doc"}], 0.2)),
+        ):
+            start = time.perf_counter()
+            result = await service.get_enhanced_context(1, "hi", agent_state)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.35
+        assert result["ltm_context"] == "Prefers mornings"
+        assert result["rag_context"] == [{"content": "doc"}]
+        assert result["timings"]["ltm"]["status"] == "ok"
+        assert result["timings"]["rag"]["status"] == "ok"
+        assert result["timings"]["rag"]["duration_ms"] >= 190
+
+    @pytest.mark.asyncio
+    async def test_rag_timeout_returns_default(self, ltm_retriever, agent_state):
+        service = ContextService(ltm_retriever=ltm_retriever, rag_timeout=0.05)
+
+        with patch(
+            "personal_assistant.core.services.context_service.query_knowledge_base",
+            new=AsyncMock(side_effect=_slow([{"content": "doc"}], 1.0)),
+        ):
+            start = time.perf_counter()
+            result = await service.get_enhanced_context(1, "hi", agent_state)
+            elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.5
+        assert result["rag_context"] == []
+        assert result["timings"]["rag"]["status"] == "timeout"
+        assert result["ltm_context"] == "Prefers mornings"
+
+    @pytest.mark.asyncio
+    async def test_ltm_timeout_returns_partial_result(self, ltm_retriever, agent_state):
+        context_manager = MagicMock()
+        context_manager.optimize_context_with_state = AsyncMock(
+            side_effect=_slow("optimized", 1.0)
+        )
+        service = ContextService(
+            ltm_retriever=ltm_retriever,
+            context_manager=context_manager,
+            ltm_timeout=0.4,
+        )
+
+        with patch(
+            "personal_assistant.core.services.context_service.query_knowledge_base",
+            new=AsyncMock(return_value=[]),
+        ):
+            result = await service.get_enhanced_context(1, "hi", agent_state)
+
+        assert result["ltm_context"] == "Prefers mornings"
+        assert result["timings"]["ltm"]["status"] == "partial"
+
+    @pytest.mark.asyncio
+    async def test_source_error_is_isolated(self, agent_state):
+        service = ContextService()
+
+        with patch.object(
+            service, "_get_ltm_context", new=AsyncMock(side_effect=RuntimeError("boom"))
+        ), patch(
+            "personal_assistant.core.services.context_service.query_knowledge_base",
+            new=AsyncMock(return_value=[{"content": "doc"}]),
+        ):
+            result = await service.get_enhanced_context(1, "hi", agent_state)
+
+        assert result["ltm_context"] is None
+        assert result["timings"]["ltm"]["status"] == "error"
+        assert result["rag_context"] == [{"content": "doc"}]
@@ -0,0 +1,164 @@
+"""
+Unit tests for multi-tool-call steps.
+
+Tests that ToolExecutionService runs independent calls concurrently, keeps
+same-category calls in order, caps concurrency per user and merges results
+into AgentState in request order as a single step.
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from personal_assistant.core.services.tool_execution_service import ToolExecutionService
+from personal_assistant.llm.fake_llm import FakeLLM
+from personal_assistant.tools.base import Tool, ToolRegistry
+from personal_assistant.types.messages import ToolCall, ToolCallBatch
+from personal_assistant.types.state import AgentState
+
+PARAMETERS = {"type": "object", "properties": {"delay": {"type": "number"}}}
+
+
+class Recorder:
+    """Tracks tool start/finish order and peak concurrency."""
+
+    def __init__(self):
+        self.events = []
+        self.active = 0
+        self.max_active = 0
+
+    def tool(self, name: str, category: str) -> Tool:
+        async def run(delay: float = 0.0, user_id: int = None):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.events.append(("start", name))
+            await asyncio.sleep(delay)
+            self.events.append(("end", name))
+            self.active -= 1
+            return f"{name} done"
+
+        return Tool(name, run, f"{name} tool", PARAMETERS).set_category(category)
+
+
+@pytest.fixture
+def recorder():
+    return Recorder()
+
+
+@pytest.fixture
+def service(recorder):
+    registry = ToolRegistry()
+    for name, category in [
+        ("list_events", "Calendar"),
+        ("list_emails", "Email"),
+        ("create_todo", "Todos"),
+        ("list_todos", "Todos"),
+    ]:
+        registry.register(recorder.tool(name, category))
+    return ToolExecutionService(registry)
+
+
+class TestToolCallBatch:
+    """Test ToolExecutionService batch execution"""
+
+    @pytest.mark.asyncio
+    async def test_independent_calls_run_concurrently(self, service, recorder):
+        calls = [
+            ToolCall("list_events", {"delay": 0.05}),
+            ToolCall("list_emails", {"delay": 0.01}),
+        ]
+
+        results = await service.execute_batch(calls, AgentState(user_input="hi"), 1)
+
+        assert results == [("list_events done", True), ("list_emails done", True)]
+        assert recorder.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_same_category_calls_run_in_order(self, service, recorder):
+        calls = [
+            ToolCall("create_todo", {"delay": 0.02}),
+            ToolCall("list_todos", {"delay": 0.0}),
+        ]
+
+        await service.execute_batch(calls, AgentState(user_input="hi"), 1)
+
+        assert recorder.events == [
+            ("start", "create_todo"),
+            ("end", "create_todo"),
+            ("start", "list_todos"),
+            ("end", "list_todos"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_per_user_concurrency_cap(self, service, recorder):
+        calls = [
+            ToolCall("list_events", {"delay": 0.02}),
+            ToolCall("list_emails", {"delay": 0.02}),
+            ToolCall("list_todos", {"delay": 0.02}),
+        ]
+
+        with patch(
+            "personal_assistant.core.services.tool_execution_service.settings.TOOL_MAX_PARALLEL_CALLS_PER_USER",
+            2,
+        ):
+            await service.execute_batch(calls, AgentState(user_input="hi"), 1)
+
+        assert recorder.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_results_merged_in_request_order_as_one_step(self, service):
+        state = AgentState(user_input="check my calendar and inbox")
+        calls = [
+            # The first call finishes last
+            ToolCall("list_events", {"delay": 0.03}),
+            ToolCall("list_emails", {"delay": 0.0}),
+        ]
+
+        await service.execute_batch_and_update(calls, state, 1)
+
+        assert state.step_count == 1
+        assert [item["name"] for item in state.conversation_history[-2:]] == [
+            "list_events",
+            "list_emails",
+        ]
+        assert state.last_tool_result == ["list_events done", "list_emails done"]
+
+    @pytest.mark.asyncio
+    async def test_failed_call_not_merged(self, service):
+        state = AgentState(user_input="hi")
+        calls = [ToolCall("list_events", {}), ToolCall("missing_tool", {})]
+
+        results = await service.execute_batch_and_update(calls, state, 1)
+
+        assert results[0] == ("list_events done", True)
+        assert results[1][1] is False
+        assert [item["name"] for item in state.conversation_history if item["role"] == "tool"] == [
+            "list_events"
+        ]
+
+
+class TestParseMultipleCalls:
+    """Test parsing of responses with several function calls"""
+
+    def test_function_calls_parsed_as_batch(self):
+        action = FakeLLM().parse_response(
+            {
+                "function_call": {"name": "list_events", "arguments": {}},
+                "function_calls": [
+                    {"name": "list_events", "arguments": {}},
+                    {"name": "list_emails", "arguments": {"limit": 5}},
+                ],
+            }
+        )
+
+        assert isinstance(action, ToolCallBatch)
+        assert [call.name for call in action.calls] == ["list_events", "list_emails"]
+        assert action.calls[1].args == {"limit": 5}
+
+    def test_single_function_call_stays_tool_call(self):
+        action = FakeLLM().parse_response(
+            {"function_call": {"name": "list_events", "arguments": {}}}
+        )
+
+        assert isinstance(action, ToolCall)
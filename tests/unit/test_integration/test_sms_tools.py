@@ -24,14 +24,10 @@ class TestSMSTools:
     async def test_agent_integration_service_initialization(self):
         """Test agent integration service initialization."""
         # Mock the dependencies
-        with patch('personal_assistant.sms_router.services.agent_integration.create_tool_registry') as mock_tool_registry, \
-             patch('personal_assistant.sms_router.services.agent_integration.GeminiLLM') as mock_llm, \
-             patch('personal_assistant.sms_router.services.agent_integration.AgentCore') as mock_agent_core:
+        with patch('personal_assistant.sms_router.services.agent_integration.get_agent_core') as mock_get_agent_core:
             
             # Mock successful initialization
-            mock_tool_registry.return_value = Mock()
-            mock_llm.return_value = Mock()
-            mock_agent_core.return_value = Mock()
+            mock_get_agent_core.return_value = Mock()
             
             from personal_assistant.sms_router.services.agent_integration import AgentIntegrationService
             
@@ -45,8 +41,8 @@ class TestSMSTools:
     async def test_agent_integration_service_initialization_failure(self):
         """Test agent integration service initialization failure."""
         # Mock initialization failure
-        with patch('personal_assistant.sms_router.services.agent_integration.create_tool_registry') as mock_tool_registry:
-            mock_tool_registry.side_effect = Exception("Initialization failed")
+        with patch('personal_assistant.sms_router.services.agent_integration.get_agent_core') as mock_get_agent_core:
+            mock_get_agent_core.side_effect = Exception("Initialization failed")
             
             from personal_assistant.sms_router.services.agent_integration import AgentIntegrationService
             
@@ -0,0 +1,81 @@
+"""
+Unit tests for the async LLM planner path.
+
+Covers achoose_action/aforce_finish and checks that a slow, blocking LLM
+call no longer stalls the event loop.
+"""
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from personal_assistant.llm.fake_llm import FakeLLM
+from personal_assistant.llm.planner import LLMPlanner
+from personal_assistant.types.messages import FinalAnswer, ToolCall
+
+
+def _planner(llm):
+    tool_registry = MagicMock()
+    tool_registry.get_schema.return_value = {
+        "get_weather": {"name": "get_weather", "description": "", "parameters": {}}
+    }
+    prompt_builder = MagicMock()
+    prompt_builder.build.return_value = "prompt"
+    return LLMPlanner(llm, tool_registry, prompt_builder=prompt_builder)
+
+
+class TestAsyncPlanner:
+    """Test the non-blocking planner methods"""
+
+    @pytest.mark.asyncio
+    async def test_achoose_action_returns_tool_call(self):
+        llm = FakeLLM(
+            responses=[
+                {"function_call": {"name": "get_weather", "arguments": {"city": "Paris"}}}
+            ]
+        )
+
+        action = await _planner(llm).achoose_action(MagicMock())
+
+        assert isinstance(action, ToolCall)
+        assert action.name == "get_weather"
+        assert action.args == {"city": "Paris"}
+        assert llm.prompts == ["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_achoose_action_returns_final_answer(self):
+        action = await _planner(FakeLLM(default_response={"content": "Hi"})).achoose_action(
+            MagicMock()
+        )
+
+        assert isinstance(action, FinalAnswer)
+        assert action.output == "Hi"
+
+    @pytest.mark.asyncio
+    async def test_aforce_finish(self):
+        message = await _planner(FakeLLM(default_response={"content": "Done."})).aforce_finish(
+            MagicMock()
+        )
+
+        assert message == "I need to wrap up now. Done."
+
+    @pytest.mark.asyncio
+    async def test_slow_completion_does_not_block_event_loop(self):
+        planner = _planner(FakeLLM(latency=0.3))
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticker_task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        await planner.achoose_action(MagicMock())
+        ticker_task.cancel()
+
+        # The loop kept running while the completion was in flight
+        assert len(ticks) > 10
+        assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.15
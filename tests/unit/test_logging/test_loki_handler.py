@@ -0,0 +1,189 @@
+"""
+Unit tests for Loki log shipping
+
+Tests the non-blocking queue handler and background shipper against a local
+HTTP sink: size- and time-based batches, gzip payloads and stream labels,
+drop-oldest buffering, retries with backoff and the flush on shutdown.
+"""
+
+import gzip
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from personal_assistant.logging import StructuredJSONFormatter
+from personal_assistant.logging.loki_handler import LokiQueueHandler, LokiShipper
+
+
+class LokiSink:
+    """Local HTTP server recording Loki pushes."""
+
+    def __init__(self, statuses=(), delay=0.0):
+        self.statuses = list(statuses)
+        self.delay = delay
+        self.pushes = []
+        self.requests = 0
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                time.sleep(sink.delay)
+                sink.requests += 1
+                status = sink.statuses.pop(0) if sink.statuses else 204
+                if status == 204:
+                    assert self.headers["Content-Encoding"] == "gzip"
+                    sink.pushes.append(json.loads(gzip.decompress(body)))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/loki/api/v1/push"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def lines(self):
+        return [
+            json.loads(line)["message"]
+            for push in self.pushes
+            for stream in push["streams"]
+            for _, line in stream["values"]
+        ]
+
+    def wait_for(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while len(self.lines()) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return self.lines()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def sink():
+    sink = LokiSink()
+    yield sink
+    sink.close()
+
+
+def _logger(shipper, name="loki"):
+    handler = LokiQueueHandler(shipper, {"application": "personal_assistant", "module": "core"})
+    handler.setFormatter(StructuredJSONFormatter())
+    logger = logging.getLogger(f"personal_assistant.test_{name}")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    return logger
+
+
+class TestLokiShipping:
+    """Test batching and delivery to a local sink"""
+
+    def test_batches_by_size_and_flushes_on_close(self, sink):
+        shipper = LokiShipper(sink.url, batch_size=10, flush_interval=30)
+        shipper.start()
+        logger = _logger(shipper)
+
+        for i in range(25):
+            logger.info(f"record {i}")
+        assert len(sink.wait_for(20)) == 20
+
+        shipper.close(timeout=2)
+
+        assert sink.lines() == [f"record {i}" for i in range(25)]
+        assert [len(push["streams"][0]["values"]) for push in sink.pushes] == [10, 10, 5]
+        assert sink.pushes[0]["streams"][0]["stream"] == {
+            "application": "personal_assistant",
+            "module": "core",
+            "level": "info",
+        }
+        assert shipper.stats()["sent"] == 25
+        assert shipper.stats()["batches"] == 3
+
+    def test_partial_batch_sent_after_interval(self, sink):
+        shipper = LokiShipper(sink.url, batch_size=100, flush_interval=0.05)
+        shipper.start()
+        logger = _logger(shipper)
+
+        logger.info("starting")
+        logger.error("failed")
+
+        try:
+            assert sink.wait_for(2) == ["starting", "failed"]
+            levels = {s["stream"]["level"] for p in sink.pushes for s in p["streams"]}
+            assert levels == {"info", "error"}
+        finally:
+            shipper.close(timeout=2)
+
+    def test_full_buffer_drops_oldest(self, sink):
+        shipper = LokiShipper(sink.url, batch_size=10, max_buffered=5)
+        logger = _logger(shipper)
+
+        for i in range(8):
+            logger.info(f"record {i}")
+
+        assert shipper.stats()["dropped"] == 3
+        shipper.start()
+        shipper.close(timeout=2)
+        assert sink.lines() == [f"record {i}" for i in range(3, 8)]
+
+    def test_emit_does_not_wait_for_slow_sink(self):
+        slow_sink = LokiSink(delay=0.2)
+        shipper = LokiShipper(slow_sink.url, batch_size=1, flush_interval=30)
+        shipper.start()
+        logger = _logger(shipper)
+
+        try:
+            start = time.perf_counter()
+            for i in range(100):
+                logger.info(f"record {i}")
+            assert time.perf_counter() - start < 0.1
+        finally:
+            slow_sink.close()
+            shipper.close(timeout=2)
+
+
+class TestLokiRetries:
+    """Test retries with backoff"""
+
+    def test_server_errors_are_retried(self):
+        sink = LokiSink(statuses=[503, 429])
+        shipper = LokiShipper(sink.url, batch_size=3, flush_interval=30, retry_backoff=0.01)
+        shipper.start()
+        logger = _logger(shipper)
+
+        try:
+            for i in range(3):
+                logger.info(f"record {i}")
+            assert len(sink.wait_for(3)) == 3
+            assert shipper.stats()["retries"] == 2
+            assert shipper.stats()["failed"] == 0
+        finally:
+            shipper.close(timeout=2)
+            sink.close()
+
+    def test_rejected_batches_are_not_retried(self):
+        sink = LokiSink(statuses=[400])
+        shipper = LokiShipper(sink.url, batch_size=2, max_retries=3, retry_backoff=0.01)
+        logger = _logger(shipper)
+
+        try:
+            logger.info("first")
+            logger.info("second")
+            shipper.start()
+            shipper.close(timeout=2)
+
+            assert sink.requests == 1
+            assert shipper.stats()["failed"] == 2
+            assert shipper.stats()["retries"] == 0
+        finally:
+            sink.close()
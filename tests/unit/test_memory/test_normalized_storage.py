@@ -0,0 +1,293 @@
+"""
+Unit tests for normalized conversation state storage
+
+Tests that incremental saves only insert new rows and delete pruned ones,
+that the stored conversation matches a full rewrite, and that the state
+written through to the state cache matches what a load returns.
+"""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+import pytest_asyncio
+
+from personal_assistant.database.models.base import Base
+from personal_assistant.database.models.conversation_message import ConversationMessage
+from personal_assistant.database.models.conversation_state import ConversationState
+from personal_assistant.database.models.memory_context_item import MemoryContextItem
+from personal_assistant.memory import normalized_storage
+from personal_assistant.memory.normalized_storage import (
+    _build_message_rows,
+    _diff_ordered_rows,
+    _diff_rows,
+    load_state_normalized,
+    save_state_normalized,
+    update_state_partial,
+)
+from personal_assistant.memory.state_cache import (
+    ConversationStateCache,
+    set_state_cache,
+)
+from personal_assistant.types.state import AgentState
+
+pytest.importorskip("aiosqlite")
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def session_factory():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            Base.metadata.create_all,
+            tables=[
+                ConversationState.__table__,
+                ConversationMessage.__table__,
+                MemoryContextItem.__table__,
+            ],
+        )
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    with patch.object(normalized_storage, "AsyncSessionLocal", factory), patch.object(
+        normalized_storage, "embed_and_index", AsyncMock()
+    ):
+        yield factory
+    await engine.dispose()
+
+
+def _state(turns: int) -> AgentState:
+    history = []
+    for i in range(turns):
+        history.append({"role": "user", "content": f"question {i}"})
+        history.append({"role": "assistant", "content": f"answer {i}"})
+    return AgentState(
+        user_input=f"question {turns - 1}",
+        conversation_history=history,
+        memory_context=[{"content": "Prefers mornings", "relevance_score": 0.9}],
+    )
+
+
+async def _rows(factory, model):
+    async with factory() as session:
+        result = await session.execute(select(model).order_by(model.id))
+        return result.scalars().all()
+
+
+class TestDiffRows:
+    """Test matching wanted rows against persisted hashes"""
+
+    def test_keeps_matches_inserts_new_deletes_pruned(self):
+        rows = _build_message_rows(
+            "c1",
+            [{"role": "user", "content": "b"}, {"role": "user", "content": "c"}],
+        )
+        persisted = [
+            (1, _build_message_rows("c1", [{"role": "user", "content": "a"}])[0].content_hash),
+            (2, rows[0].content_hash),
+        ]
+
+        to_insert, to_delete = _diff_rows(persisted, rows)
+
+        assert to_insert == [rows[1]]
+        assert to_delete == [1]
+
+    def test_duplicates_match_one_for_one(self):
+        rows = _build_message_rows("c1", [{"role": "user", "content": "hi"}] * 2)
+
+        to_insert, to_delete = _diff_rows([(1, rows[0].content_hash)], rows)
+
+        assert to_insert == [rows[1]]
+        assert to_delete == []
+
+    def test_unhashed_rows_are_replaced(self):
+        rows = _build_message_rows("c1", [{"role": "user", "content": "hi"}])
+
+        to_insert, to_delete = _diff_rows([(1, None)], rows)
+
+        assert to_insert == rows
+        assert to_delete == [1]
+
+
+    def test_replacement_reuses_freed_position(self):
+        rows = _build_message_rows(
+            "c1",
+            [
+                {"role": "user", "content": "a"},
+                {"role": "user", "content": "b (edited)"},
+                {"role": "user", "content": "c"},
+            ],
+        )
+        persisted = [
+            (1, rows[0].content_hash, 1024),
+            (2, "old-b", 2048),
+            (3, rows[2].content_hash, 3072),
+        ]
+
+        to_insert, to_delete, updates = _diff_ordered_rows(persisted, rows)
+
+        assert to_insert == [rows[1]]
+        assert rows[1].position == 2048
+        assert to_delete == [2]
+        assert updates == {}
+
+    def test_out_of_order_rows_are_renumbered(self):
+        rows = _build_message_rows(
+            "c1",
+            [{"role": "user", "content": "a"}, {"role": "user", "content": "b"}],
+        )
+        persisted = [(1, rows[0].content_hash, 2048), (2, rows[1].content_hash, 1024)]
+
+        to_insert, to_delete, updates = _diff_ordered_rows(persisted, rows)
+
+        assert (to_insert, to_delete) == ([], [])
+        assert updates == {1: 1024, 2: 2048}
+
+
+class TestIncrementalSave:
+    """Test save_state_normalized in incremental mode"""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rows_are_not_rewritten(self, session_factory):
+        await save_state_normalized("c1", _state(2), user_id=1, incremental=True)
+        first_ids = [m.id for m in await _rows(session_factory, ConversationMessage)]
+
+        await save_state_normalized("c1", _state(3), user_id=1, incremental=True)
+        messages = await _rows(session_factory, ConversationMessage)
+
+        assert [m.id for m in messages][: len(first_ids)] == first_ids
+        assert [m.content for m in messages][-2:] == ["question 2", "answer 2"]
+        assert len(messages) == 6
+
+    @pytest.mark.asyncio
+    async def test_pruned_items_are_deleted(self, session_factory):
+        await save_state_normalized("c1", _state(3), user_id=1, incremental=True)
+
+        state = _state(3)
+        state.conversation_history = state.conversation_history[2:]
+        await save_state_normalized("c1", state, user_id=1, incremental=True)
+
+        messages = await _rows(session_factory, ConversationMessage)
+        assert [m.content for m in messages] == [
+            "question 1",
+            "answer 1",
+            "question 2",
+            "answer 2",
+        ]
+        context = [c.content for c in await _rows(session_factory, MemoryContextItem)]
+        assert "question 0" not in context
+
+    @pytest.mark.asyncio
+    async def test_edited_item_keeps_its_place(self, session_factory):
+        await save_state_normalized("c1", _state(3), user_id=1, incremental=True)
+
+        state = _state(3)
+        state.conversation_history[1]["content"] = "answer 0 (compressed)"
+        await save_state_normalized("c1", state, user_id=1, incremental=True)
+        state.conversation_history.append({"role": "user", "content": "question 3"})
+        await save_state_normalized("c1", state, user_id=1, incremental=True)
+
+        loaded = await load_state_normalized("c1", user_id=1)
+        assert [item["content"] for item in loaded.conversation_history] == [
+            "question 0",
+            "answer 0 (compressed)",
+            "question 1",
+            "answer 1",
+            "question 2",
+            "answer 2",
+            "question 3",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_partial_append_lands_after_saved_history(self, session_factory):
+        await save_state_normalized("c1", _state(2), user_id=1, incremental=True)
+
+        assert await update_state_partial(
+            "c1",
+            {"new_messages": [{"role": "user", "content": "question 2"}]},
+            user_id=1,
+        )
+
+        loaded = await load_state_normalized("c1", user_id=1)
+        assert [item["content"] for item in loaded.conversation_history] == [
+            "question 0",
+            "answer 0",
+            "question 1",
+            "answer 1",
+            "question 2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_round_trip_through_load_is_stable(self, session_factory):
+        await save_state_normalized("c1", _state(2), user_id=1, incremental=True)
+        ids = [m.id for m in await _rows(session_factory, ConversationMessage)]
+
+        loaded = await load_state_normalized("c1", user_id=1)
+        await save_state_normalized("c1", loaded, user_id=1, incremental=True)
+
+        assert [m.id for m in await _rows(session_factory, ConversationMessage)] == ids
+
+    @pytest.mark.asyncio
+    async def test_matches_full_rewrite(self, session_factory):
+        for turns in (1, 2, 3):
+            await save_state_normalized("inc", _state(turns), user_id=1, incremental=True)
+            await save_state_normalized("full", _state(turns), user_id=1, incremental=False)
+
+        loaded_inc = await load_state_normalized("inc", user_id=1)
+        loaded_full = await load_state_normalized("full", user_id=1)
+
+        def strip(items):
+            return [(item.get("role") or "", item["content"]) for item in items]
+
+        assert strip(loaded_inc.conversation_history) == strip(
+            loaded_full.conversation_history
+        )
+        assert sorted(strip(loaded_inc.memory_context)) == sorted(
+            strip(loaded_full.memory_context)
+        )
+
+
+class TestStateCacheWriteThrough:
+    """Test the state a save writes through to the state cache"""
+
+    @pytest.mark.asyncio
+    async def test_cached_state_matches_load(self, session_factory):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        state = _state(40)
+        state.memory_context = [
+            {"content": f"fact {i}", "relevance_score": round(0.05 * i, 2)}
+            for i in range(30)
+        ]
+        # Save the state as is, beyond the load limits
+        optimizer = MagicMock()
+        optimizer.optimize_state_for_saving = AsyncMock(side_effect=lambda s: s)
+        set_state_cache(cache)
+        try:
+            with patch.object(
+                normalized_storage.settings, "STATE_CACHE_ENABLED", True
+            ), patch.object(
+                normalized_storage,
+                "_get_state_optimization_manager",
+                return_value=optimizer,
+            ):
+                await save_state_normalized("c1", state, user_id=1)
+        finally:
+            set_state_cache(None)
+
+        cached = (await cache.get(1)).state
+        loaded = await load_state_normalized("c1", user_id=1)
+
+        def strip(items):
+            # Server-side timestamps are only known after a re-read
+            return [{k: v for k, v in item.items() if k != "timestamp"} for item in items]
+
+        assert strip(cached.conversation_history) == strip(loaded.conversation_history)
+        # Load leaves items with equal relevance in no particular order
+        def by_content(items):
+            return sorted(items, key=lambda item: item["content"])
+
+        assert by_content(cached.memory_context) == by_content(loaded.memory_context)
+        assert len(cached.conversation_history) == 50
+        assert len(cached.memory_context) == 20
+        assert min(item["relevance_score"] for item in cached.memory_context) >= 0.3
+        assert sorted(cached.focus) == sorted(loaded.focus)
+        assert cached.step_count == loaded.step_count
@@ -0,0 +1,240 @@
+"""
+Unit tests for the hot conversation-state cache
+
+Tests the in-process and Redis tiers, copy-on-read semantics, invalidation,
+when the process-wide cache is enabled, and that ConversationService resumes
+a cached conversation without touching the database.
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from personal_assistant.core.services.conversation_service import ConversationService
+from personal_assistant.memory.state_cache import (
+    ConversationStateCache,
+    get_state_cache,
+    set_state_cache,
+)
+from personal_assistant.types.state import AgentState
+
+
+class FakeRedis:
+    """Dict-backed stand-in for the redis.asyncio client"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+
+def _state() -> AgentState:
+    return AgentState(
+        user_input="hello",
+        conversation_history=[
+            {"role": "user", "content": "hello"},
+            {"role": "assistant", "content": "hi"},
+        ],
+        memory_context=[{"content": "Prefers mornings", "relevance_score": 0.9}],
+        focus=["calendar"],
+    )
+
+
+class TestConversationStateCache:
+    """Test cache reads, writes and invalidation"""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        assert await cache.get(1) is None
+
+        await cache.put(1, "conv-1", _state())
+        cached = await cache.get(1)
+
+        assert cached.conversation_id == "conv-1"
+        assert cached.state.conversation_history[1]["content"] == "hi"
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_returned_state_is_a_copy(self):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        state = _state()
+        await cache.put(1, "conv-1", state)
+        state.conversation_history.append({"role": "user", "content": "later"})
+
+        first = await cache.get(1)
+        first.state.conversation_history.clear()
+
+        second = await cache.get(1)
+        assert len(second.state.conversation_history) == 2
+
+    @pytest.mark.asyncio
+    async def test_lru_evicts_least_recent_user(self):
+        cache = ConversationStateCache(max_users=2, local_ttl_seconds=60)
+        await cache.put(1, "conv-1", _state())
+        await cache.put(2, "conv-2", _state())
+        await cache.get(1)
+        await cache.put(3, "conv-3", _state())
+
+        assert await cache.get(2) is None
+        assert (await cache.get(1)).conversation_id == "conv-1"
+
+    @pytest.mark.asyncio
+    async def test_invalidate_user(self):
+        redis = FakeRedis()
+        cache = ConversationStateCache(
+            max_users=10, local_ttl_seconds=60, redis_client=redis
+        )
+        await cache.put(1, "conv-1", _state())
+
+        await cache.invalidate_user(1)
+
+        assert await cache.get(1) is None
+        assert redis.data == {}
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_processes(self):
+        redis = FakeRedis()
+        writer = ConversationStateCache(
+            max_users=10, local_ttl_seconds=60, redis_client=redis
+        )
+        reader = ConversationStateCache(
+            max_users=10, local_ttl_seconds=60, redis_client=redis
+        )
+        updated_at = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        await writer.put(1, "conv-1", _state(), updated_at)
+
+        cached = await reader.get(1)
+
+        assert cached.conversation_id == "conv-1"
+        assert cached.updated_at == updated_at
+        assert cached.state.focus == ["calendar"]
+        assert cached.state.memory_context[0]["content"] == "Prefers mornings"
+        assert reader.get_stats()["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_other_processes(self):
+        redis = FakeRedis()
+        first = ConversationStateCache(redis_client=redis)
+        second = ConversationStateCache(redis_client=redis)
+        await first.put(1, "conv-1", _state())
+        assert (await second.get(1)).conversation_id == "conv-1"
+
+        # No local copy in the second process outlives the first's write
+        await first.invalidate_user(1)
+
+        assert await second.get(1) is None
+
+    @pytest.mark.asyncio
+    async def test_redis_errors_are_misses(self):
+        redis = AsyncMock()
+        redis.get.side_effect = ConnectionError("down")
+        redis.set.side_effect = ConnectionError("down")
+        cache = ConversationStateCache(
+            max_users=10, local_ttl_seconds=60, redis_client=redis
+        )
+
+        await cache.put(1, "conv-1", _state())
+
+        assert await cache.get(1) is None
+        assert cache.get_stats()["misses"] == 1
+
+
+class TestGetStateCache:
+    """Test when the process-wide cache is enabled"""
+
+    @pytest.fixture(autouse=True)
+    def reset(self):
+        set_state_cache(None)
+        yield
+        set_state_cache(None)
+
+    def test_off_by_default_without_redis(self):
+        with patch(
+            "personal_assistant.memory.state_cache.settings.STATE_CACHE_ENABLED", None
+        ), patch(
+            "personal_assistant.memory.state_cache.settings.STATE_CACHE_REDIS_URL", None
+        ):
+            assert get_state_cache() is None
+
+    def test_explicitly_enabled_in_process_cache(self):
+        with patch(
+            "personal_assistant.memory.state_cache.settings.STATE_CACHE_ENABLED", True
+        ), patch(
+            "personal_assistant.memory.state_cache.settings.STATE_CACHE_REDIS_URL", None
+        ):
+            cache = get_state_cache()
+
+        assert cache is not None
+        assert cache.get_stats()["redis_enabled"] is False
+
+
+class TestConversationServiceCache:
+    """Test that a cached follow-up message skips the database"""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_makes_no_db_reads(self):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        await cache.put(1, "conv-1", _state(), datetime.now(timezone.utc))
+        storage = AsyncMock()
+        service = ConversationService(storage, state_cache=cache)
+
+        with patch(
+            "personal_assistant.core.services.conversation_service.get_conversation_id",
+            AsyncMock(),
+        ) as get_id:
+            conversation_id, state = await service.get_conversation_context(
+                1, "follow-up"
+            )
+
+        assert conversation_id == "conv-1"
+        assert state.user_input == "follow-up"
+        assert len(state.conversation_history) == 2
+        get_id.assert_not_called()
+        storage.get_conversation_timestamp.assert_not_called()
+        storage.load_state.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_db_load_populates_cache(self):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        storage = AsyncMock()
+        storage.get_conversation_timestamp.return_value = datetime.now(timezone.utc)
+        storage.load_state.return_value = _state()
+        service = ConversationService(storage, state_cache=cache)
+
+        with patch(
+            "personal_assistant.core.services.conversation_service.get_conversation_id",
+            AsyncMock(return_value="conv-1"),
+        ):
+            await service.get_conversation_context(1, "first")
+            await service.get_conversation_context(1, "second")
+
+        assert storage.load_state.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_entry_starts_new_conversation(self):
+        cache = ConversationStateCache(max_users=10, local_ttl_seconds=60)
+        stale = datetime.now(timezone.utc) - timedelta(days=1)
+        await cache.put(1, "conv-1", _state(), stale)
+        storage = AsyncMock()
+        storage.get_conversation_timestamp.return_value = stale
+        service = ConversationService(storage, state_cache=cache)
+
+        with patch(
+            "personal_assistant.core.services.conversation_service.create_new_conversation",
+            AsyncMock(return_value="conv-2"),
+        ):
+            conversation_id, state = await service.get_conversation_context(1, "hi")
+
+        assert conversation_id == "conv-2"
+        assert state.conversation_history == []
+        storage.load_state.assert_not_called()
@@ -0,0 +1,197 @@
+"""
+Unit tests for per-turn stage tracing
+
+Tests span recording within a turn (including gathered tasks), the no-op
+path outside a turn or when disabled, the Prometheus histograms, the log
+waterfall and per-task correlation IDs.
+"""
+
+import asyncio
+import logging
+from unittest.mock import patch
+
+import pytest
+
+from personal_assistant.core.services.tool_execution_service import ToolExecutionService
+from personal_assistant.logging import get_correlation_id, set_correlation_id
+from personal_assistant.monitoring import get_metrics_service
+from personal_assistant.monitoring.tracing import (
+    get_current_trace,
+    span,
+    start_turn,
+    traced,
+)
+from personal_assistant.tools.base import Tool, ToolRegistry
+from personal_assistant.types.messages import ToolCall
+from personal_assistant.types.state import AgentState
+
+SETTINGS = "personal_assistant.monitoring.tracing.settings"
+
+
+def _sample(metric: str, **labels) -> float:
+    value = get_metrics_service().registry.get_sample_value(metric, labels)
+    return value or 0.0
+
+
+class TestTurnTracing:
+    """Test span recording within a traced turn"""
+
+    @pytest.mark.asyncio
+    async def test_spans_outside_turn_are_noops(self):
+        with span("llm", model="gemini") as stage:
+            stage.set_status("error")
+
+        assert get_current_trace() is None
+        assert span("tool") is span("llm")
+
+    @pytest.mark.asyncio
+    async def test_spans_recorded_in_start_order(self):
+        with start_turn(user_id=7, correlation_id="req-1") as trace:
+            with span("conversation"):
+                await asyncio.sleep(0.01)
+            with span("llm", model="gemini-test"):
+                await asyncio.sleep(0.02)
+
+        summary = trace.summary()
+        assert [s["stage"] for s in summary] == ["conversation", "llm"]
+        assert summary[1]["model"] == "gemini-test"
+        assert summary[1]["offset_ms"] >= summary[0]["duration_ms"]
+        assert summary[1]["duration_ms"] >= 19
+        assert trace.duration * 1000 >= 30
+        assert trace.correlation_id == "req-1"
+        assert get_current_trace() is None
+
+    @pytest.mark.asyncio
+    async def test_gathered_tasks_share_the_turn(self):
+        async def fetch(stage):
+            with span(stage):
+                await asyncio.sleep(0.02)
+
+        with start_turn(user_id=7) as trace:
+            await asyncio.gather(fetch("ltm"), fetch("rag"))
+
+        ltm, rag = sorted(trace.summary(), key=lambda s: s["stage"])
+        # Both started at the beginning of the turn, not one after the other
+        assert abs(ltm["offset_ms"] - rag["offset_ms"]) < 10
+
+    @pytest.mark.asyncio
+    async def test_exceptions_mark_span_failed(self):
+        @traced("storage.load_state")
+        async def load():
+            raise RuntimeError("db down")
+
+        with start_turn(user_id=7) as trace:
+            with pytest.raises(RuntimeError):
+                await load()
+
+        assert trace.summary()[0]["status"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_disabled_tracing_records_nothing(self):
+        with patch(f"{SETTINGS}.AGENT_TRACING_ENABLED", False):
+            with start_turn(user_id=7):
+                assert get_current_trace() is None
+                assert span("llm") is span("tool")
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_traced_per_tool(self):
+        async def list_events(user_id: int = None):
+            await asyncio.sleep(0.01)
+            return "events"
+
+        registry = ToolRegistry()
+        registry.register(
+            Tool("list_events", list_events, "List events", {"type": "object", "properties": {}})
+        )
+        service = ToolExecutionService(registry)
+        state = AgentState(user_input="hi")
+        before_ok = _sample(
+            "agent_tool_duration_seconds_count", tool="list_events", status="ok"
+        )
+        before_error = _sample(
+            "agent_tool_duration_seconds_count", tool="missing_tool", status="error"
+        )
+
+        with start_turn(user_id=7) as trace:
+            await service.execute_batch(
+                [ToolCall("list_events", {}), ToolCall("missing_tool", {})], state, 7
+            )
+
+        statuses = {s["tool"]: s["status"] for s in trace.summary()}
+        assert statuses == {"list_events": "ok", "missing_tool": "error"}
+        assert (
+            _sample("agent_tool_duration_seconds_count", tool="list_events", status="ok")
+            == before_ok + 1
+        )
+        assert (
+            _sample("agent_tool_duration_seconds_count", tool="missing_tool", status="error")
+            == before_error + 1
+        )
+
+
+class TestTraceExport:
+    """Test the Prometheus histograms and log waterfall"""
+
+    @pytest.mark.asyncio
+    async def test_stage_and_model_histograms(self):
+        before_stage = _sample("agent_stage_duration_seconds_count", stage="llm", status="ok")
+        before_model = _sample(
+            "agent_llm_duration_seconds_count", model="histogram-test", status="ok"
+        )
+        before_turn = _sample("agent_stage_duration_seconds_count", stage="turn", status="ok")
+
+        with start_turn(user_id=7):
+            with span("llm", model="histogram-test"):
+                pass
+
+        assert (
+            _sample("agent_stage_duration_seconds_count", stage="llm", status="ok")
+            == before_stage + 1
+        )
+        assert (
+            _sample("agent_llm_duration_seconds_count", model="histogram-test", status="ok")
+            == before_model + 1
+        )
+        assert (
+            _sample("agent_stage_duration_seconds_count", stage="turn", status="ok")
+            == before_turn + 1
+        )
+
+    @pytest.mark.asyncio
+    async def test_waterfall_logged_with_correlation_id(self, caplog):
+        with patch(f"{SETTINGS}.AGENT_TRACE_LOG_WATERFALL", True), patch(
+            f"{SETTINGS}.AGENT_TRACE_WATERFALL_MIN_MS", 0.0
+        ):
+            with caplog.at_level(logging.INFO, logger="personal_assistant.tracing"):
+                with start_turn(user_id=7, correlation_id="req-42"):
+                    with span("tool", tool="list_events"):
+                        pass
+
+        record = next(r for r in caplog.records if r.name == "personal_assistant.tracing")
+        assert record.correlation_id == "req-42"
+        assert "tool [list_events]" in record.getMessage()
+        assert record.metadata["spans"][0]["tool"] == "list_events"
+
+    @pytest.mark.asyncio
+    async def test_fast_turns_skip_waterfall(self, caplog):
+        with patch(f"{SETTINGS}.AGENT_TRACE_LOG_WATERFALL", True), patch(
+            f"{SETTINGS}.AGENT_TRACE_WATERFALL_MIN_MS", 10_000.0
+        ):
+            with caplog.at_level(logging.INFO, logger="personal_assistant.tracing"):
+                with start_turn(user_id=7):
+                    pass
+
+        assert not [r for r in caplog.records if r.name == "personal_assistant.tracing"]
+
+
+class TestCorrelationContext:
+    """Test that correlation IDs are isolated per task"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_keep_their_ids(self):
+        async def request(correlation_id):
+            set_correlation_id(correlation_id)
+            await asyncio.sleep(0.01)
+            return get_correlation_id()
+
+        assert await asyncio.gather(request("a"), request("b")) == ["a", "b"]
@@ -0,0 +1,100 @@
+"""
+Unit tests for prompt assembly caching.
+
+Tests that static prompt sections, the tool list and the tool schema are
+compiled once per tool registry version, recompiled when a tool is
+registered, and that build stats report time and bytes per section.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from personal_assistant.prompts.enhanced_prompt_builder import EnhancedPromptBuilder
+from personal_assistant.tools.base import Tool, ToolRegistry
+from personal_assistant.types.state import AgentState
+
+PARAMETERS = {"type": "object", "properties": {}}
+
+
+def _tool(name: str) -> Tool:
+    return Tool(name, lambda: None, f"{name} description", PARAMETERS).set_category(
+        "Test"
+    )
+
+
+@pytest.fixture
+def registry():
+    registry = ToolRegistry()
+    registry.register(_tool("list_events"))
+    return registry
+
+
+class TestToolSchemaCache:
+    """Test ToolRegistry schema memoization"""
+
+    def test_schema_reused_until_registration(self, registry):
+        version = registry.version
+        schema = registry.get_schema()
+
+        assert registry.get_schema() is schema
+
+        registry.register(_tool("list_emails"))
+
+        assert registry.version == version + 1
+        assert registry.get_schema() is not schema
+        assert "list_emails" in registry.get_schema()
+
+
+class TestPromptCache:
+    """Test EnhancedPromptBuilder static section caching"""
+
+    def test_static_sections_compiled_once_per_version(self, registry):
+        builder = EnhancedPromptBuilder(registry)
+
+        with patch.object(
+            builder,
+            "_build_core_guidelines",
+            wraps=builder._build_core_guidelines,
+        ) as core_guidelines:
+            first = builder.build(AgentState(user_input="hello"))
+            builder.build(AgentState(user_input="check my calendar"))
+
+        assert core_guidelines.call_count == 1
+        assert builder.get_metrics()["compiles"] == 1
+        assert "CORE AGENT GUIDELINES" in first
+        assert "list_events" in first
+
+    def test_registration_recompiles_tool_list(self, registry):
+        builder = EnhancedPromptBuilder(registry)
+        builder.build(AgentState(user_input="hello"))
+
+        registry.register(_tool("list_emails"))
+        prompt = builder.build(AgentState(user_input="hello"))
+
+        assert "list_emails" in prompt
+        assert builder.get_metrics()["compiles"] == 2
+
+    def test_dynamic_parts_rendered_per_build(self, registry):
+        builder = EnhancedPromptBuilder(registry)
+
+        assert "first request" in builder.build(AgentState(user_input="first request"))
+        assert "second request" in builder.build(AgentState(user_input="second request"))
+
+    def test_build_stats_report_bytes_per_section(self, registry):
+        builder = EnhancedPromptBuilder(registry)
+
+        prompt = builder.build(AgentState(user_input="hello"))
+
+        stats = builder.last_build_stats
+        assert stats["total_bytes"] == len(prompt.encode("utf-8"))
+        assert stats["build_ms"] >= 0
+        assert set(stats["section_bytes"]) == {
+            "guidelines",
+            "tools",
+            "metadata",
+            "memory",
+            "history",
+        }
+        assert sum(stats["section_bytes"].values()) < stats["total_bytes"]
+        assert builder.get_metrics()["builds"] == 1
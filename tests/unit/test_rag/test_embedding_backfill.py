@@ -0,0 +1,120 @@
+"""
+Unit tests for the resumable embedding backfill.
+
+Tests keyset paging through the whole table, resuming from the checkpoint,
+the checkpoint only moving past contiguously written pages, and how embedding
+failures are counted or stop the run.
+"""
+
+import pytest
+
+from personal_assistant.rag.backfill import BackfillCheckpoint, EmbeddingBackfill
+
+
+class InMemoryBackfill(EmbeddingBackfill):
+    """EmbeddingBackfill over an in-memory table instead of the database."""
+
+    def __init__(self, rows, **kwargs):
+        kwargs.setdefault("embed", self._fake_embed)
+        super().__init__(index_documents=False, **kwargs)
+        self.rows = rows
+        self.written = {}
+        self.fetched_after = []
+
+    @staticmethod
+    async def _fake_embed(texts):
+        return [[] if text == "bad" else [float(len(text))] for text in texts]
+
+    async def count_remaining(self, after_id=0):
+        return sum(1 for row in self.rows if row[0] > after_id)
+
+    async def fetch_page(self, after_id):
+        self.fetched_after.append(after_id)
+        return [row for row in self.rows if row[0] > after_id][: self.page_size]
+
+    async def write_page(self, rows, embeddings):
+        for row, embedding in zip(rows, embeddings):
+            self.written[row[0]] = embedding
+
+
+def make_rows(count, content="text"):
+    return [(i, content, {"source": "notion"}, 1) for i in range(1, count + 1)]
+
+
+class TestEmbeddingBackfill:
+    """Test EmbeddingBackfill.run"""
+
+    @pytest.mark.asyncio
+    async def test_pages_through_all_rows(self, tmp_path):
+        checkpoint = BackfillCheckpoint(str(tmp_path / "backfill.json"))
+        backfill = InMemoryBackfill(
+            make_rows(7), page_size=3, workers=2, checkpoint=checkpoint
+        )
+
+        result = await backfill.run()
+
+        assert sorted(backfill.written) == list(range(1, 8))
+        assert backfill.fetched_after == [0, 3, 6]
+        assert (result["processed"], result["successful"], result["failed"]) == (7, 7, 0)
+        assert checkpoint.load()["last_id"] == 7
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_checkpoint(self, tmp_path):
+        checkpoint = BackfillCheckpoint(str(tmp_path / "backfill.json"))
+        checkpoint.save({"last_id": 4, "processed": 4, "successful": 4})
+        backfill = InMemoryBackfill(make_rows(6), page_size=10, checkpoint=checkpoint)
+
+        result = await backfill.run()
+
+        assert sorted(backfill.written) == [5, 6]
+        assert result["resumed_from"] == 4
+        assert result["processed"] == 6
+        assert result["processed_this_run"] == 2
+
+    @pytest.mark.asyncio
+    async def test_restart_ignores_checkpoint(self, tmp_path):
+        checkpoint = BackfillCheckpoint(str(tmp_path / "backfill.json"))
+        checkpoint.save({"last_id": 4})
+        backfill = InMemoryBackfill(make_rows(6), page_size=10, checkpoint=checkpoint)
+
+        await backfill.run(restart=True)
+
+        assert sorted(backfill.written) == list(range(1, 7))
+
+    @pytest.mark.asyncio
+    async def test_failed_rows_counted_and_passed_over(self):
+        rows = make_rows(3) + [(4, "bad", None, 1), (5, None, None, 1)]
+        backfill = InMemoryBackfill(rows, page_size=10)
+
+        result = await backfill.run()
+
+        assert sorted(backfill.written) == [1, 2, 3]
+        assert (result["failed"], result["skipped"]) == (1, 1)
+        assert result["last_id"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_page_stops_before_checkpoint(self, tmp_path):
+        checkpoint = BackfillCheckpoint(str(tmp_path / "backfill.json"))
+        rows = make_rows(2) + [(3, "bad", None, 1), (4, "bad", None, 1)]
+        backfill = InMemoryBackfill(rows, page_size=2, workers=1, checkpoint=checkpoint)
+
+        result = await backfill.run()
+
+        assert "No embeddings returned" in result["error"]
+        assert checkpoint.load()["last_id"] == 2
+
+
+class TestCheckpointOrdering:
+    """Test that the checkpoint only covers contiguously written pages"""
+
+    def test_out_of_order_pages_wait_for_earlier_ones(self, tmp_path):
+        checkpoint = BackfillCheckpoint(str(tmp_path / "backfill.json"))
+        backfill = InMemoryBackfill([], checkpoint=checkpoint)
+
+        backfill._complete_page(1, 20)
+        assert backfill.last_id == 0
+        assert checkpoint.load() == {}
+
+        backfill._complete_page(0, 10)
+        assert backfill.last_id == 20
+        assert checkpoint.load()["last_id"] == 20
@@ -0,0 +1,125 @@
+"""
+Unit tests for batched embedding generation.
+
+Tests deduplication within a batch, chunking to the API batch size, the
+bound on concurrent batch requests, per-text retry after a failed batch and
+skipping cached texts.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from personal_assistant.rag.embeddings.cache import EmbeddingCache
+from personal_assistant.rag.embeddings.gemini_embeddings import GeminiEmbeddings
+
+SETTINGS = "personal_assistant.rag.embeddings.gemini_embeddings.settings"
+
+
+class FakeEmbeddingClient:
+    """Blocking embed_batch that records requests and can fail on demand."""
+
+    def __init__(self, delay: float = 0.0, fail_on=None):
+        self.delay = delay
+        self.fail_on = fail_on
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def embed_batch(self, texts):
+        with self._lock:
+            self.requests.append(list(texts))
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            if self.fail_on and self.fail_on in texts:
+                raise RuntimeError("400 invalid content")
+            return [[float(len(text))] for text in texts]
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+def make_embeddings(client: FakeEmbeddingClient) -> GeminiEmbeddings:
+    embeddings = GeminiEmbeddings(api_key="test", cache=EmbeddingCache(max_size=100))
+    embeddings._llm_client = client
+    return embeddings
+
+
+@pytest.fixture(autouse=True)
+def fast_retries():
+    with patch(f"{SETTINGS}.RAG_EMBEDDING_RETRY_BACKOFF_SECONDS", 0), patch(
+        f"{SETTINGS}.RAG_EMBEDDING_MAX_RETRIES", 2
+    ):
+        yield
+
+
+class TestEmbedBatch:
+    """Test GeminiEmbeddings.embed_batch"""
+
+    @pytest.mark.asyncio
+    async def test_duplicates_embedded_once_in_input_order(self):
+        client = FakeEmbeddingClient()
+        embeddings = make_embeddings(client)
+
+        result = await embeddings.embed_batch(["a", "bb", "a ", "", "bb"])
+
+        assert result == [[1.0], [2.0], [1.0], [], [2.0]]
+        assert client.requests == [["a", "bb"]]
+
+    @pytest.mark.asyncio
+    async def test_chunks_to_batch_size(self):
+        client = FakeEmbeddingClient()
+        embeddings = make_embeddings(client)
+
+        with patch(f"{SETTINGS}.RAG_EMBEDDING_BATCH_SIZE", 2):
+            result = await embeddings.embed_batch(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert [len(request) for request in client.requests] == [2, 2, 1]
+        assert result == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_batches_bounded(self):
+        client = FakeEmbeddingClient(delay=0.05)
+        embeddings = make_embeddings(client)
+
+        with patch(f"{SETTINGS}.RAG_EMBEDDING_BATCH_SIZE", 1), patch(
+            f"{SETTINGS}.RAG_EMBEDDING_MAX_CONCURRENT_BATCHES", 2
+        ):
+            await embeddings.embed_batch([f"text {i}" for i in range(6)])
+
+        assert len(client.requests) == 6
+        assert client.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_retried_per_text(self):
+        client = FakeEmbeddingClient(fail_on="bad")
+        embeddings = make_embeddings(client)
+
+        result = await embeddings.embed_batch(["ok", "bad", "fine"])
+
+        assert result == [[2.0], [], [4.0]]
+        # Two batch attempts, then each text on its own (bad twice)
+        assert client.requests[:2] == [["ok", "bad", "fine"]] * 2
+        assert sorted(map(tuple, client.requests[2:])) == [
+            ("bad",),
+            ("bad",),
+            ("fine",),
+            ("ok",),
+        ]
+        assert embeddings.get_cache_stats()["api_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_texts_not_sent(self):
+        client = FakeEmbeddingClient()
+        embeddings = make_embeddings(client)
+        await embeddings.embed_batch(["a", "bb"])
+
+        result = await embeddings.embed_batch(["bb", "ccc"])
+
+        assert result == [[2.0], [3.0]]
+        assert client.requests[-1] == ["ccc"]
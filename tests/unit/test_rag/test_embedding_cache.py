@@ -0,0 +1,128 @@
+"""
+Unit tests for the content-addressed embedding cache.
+
+Tests stable SHA-256 keys over model and normalized text, compact float32
+values, the bounded in-process tier, sharing through the Redis tier and
+GeminiEmbeddings only calling the API for unseen texts.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from personal_assistant.rag.embeddings.cache import (
+    EmbeddingCache,
+    embedding_cache_key,
+    pack_embedding,
+    unpack_embedding,
+)
+from personal_assistant.rag.embeddings.gemini_embeddings import GeminiEmbeddings
+
+MODEL = "gemini-embedding-001"
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by EmbeddingCache (no expiry)."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+
+class TestEmbeddingCacheKey:
+    """Test content addressing"""
+
+    def test_key_is_stable_sha256(self):
+        key = embedding_cache_key(MODEL, "hello world")
+
+        assert len(key) == 64
+        # Not salted per process, unlike hash()
+        assert key == embedding_cache_key(MODEL, "hello world")
+
+    def test_normalized_text_shares_key(self):
+        assert embedding_cache_key(MODEL, "  hello \n world ") == embedding_cache_key(
+            MODEL, "hello world"
+        )
+
+    def test_model_is_part_of_key(self):
+        assert embedding_cache_key(MODEL, "hello") != embedding_cache_key(
+            "text-embedding-004", "hello"
+        )
+
+    def test_values_packed_as_float32(self):
+        payload = pack_embedding([0.5, -1.25, 3.0])
+
+        assert len(payload) == 12
+        assert unpack_embedding(payload) == [0.5, -1.25, 3.0]
+
+
+class TestEmbeddingCache:
+    """Test the in-process and Redis tiers"""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_and_stats(self):
+        cache = EmbeddingCache(max_size=10)
+
+        assert await cache.get_embedding(MODEL, "hello") is None
+        await cache.put_embedding(MODEL, "hello", [0.25, 0.5])
+
+        assert await cache.get_embedding(MODEL, "hello") == [0.25, 0.5]
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"]) == (1, 1)
+        assert stats["cache_bytes"] == 8
+
+    @pytest.mark.asyncio
+    async def test_in_process_tier_is_bounded(self):
+        cache = EmbeddingCache(max_size=2)
+        for text in ["a", "b", "c"]:
+            await cache.put_embedding(MODEL, text, [1.0])
+
+        assert cache.get_stats()["cache_size"] == 2
+        assert await cache.get_embedding(MODEL, "a") is None
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_shared_between_processes(self):
+        redis = FakeRedis()
+        api_worker = EmbeddingCache(redis_client=redis)
+        celery_worker = EmbeddingCache(redis_client=redis)
+
+        await api_worker.put_embedding(MODEL, "shared text", [0.125])
+
+        assert await celery_worker.get_embedding(MODEL, "shared text") == [0.125]
+        assert celery_worker.get_stats()["redis_hits"] == 1
+        # Promoted into the local tier
+        assert celery_worker.get_stats()["cache_size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_is_a_miss(self):
+        redis = MagicMock()
+        redis.get.side_effect = ConnectionError("redis down")
+        cache = EmbeddingCache(redis_client=redis)
+
+        assert await cache.get_embedding(MODEL, "hello") is None
+
+
+class TestGeminiEmbeddingsCache:
+    """Test GeminiEmbeddings against the shared cache"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_text_embedded_once(self):
+        redis = FakeRedis()
+        embeddings = GeminiEmbeddings(api_key="test", cache=EmbeddingCache(redis_client=redis))
+        llm = MagicMock()
+        llm.embed_batch.side_effect = lambda texts: [[0.5, 0.25] for _ in texts]
+        embeddings._llm_client = llm
+
+        first = await embeddings.embed_text("Quarterly review notes")
+        # A second instance (another worker) with the same shared tier
+        other = GeminiEmbeddings(api_key="test", cache=EmbeddingCache(redis_client=redis))
+        other._llm_client = llm
+        second = await other.embed_text("Quarterly  review notes ")
+
+        assert first == second == [0.5, 0.25]
+        assert llm.embed_batch.call_count == 1
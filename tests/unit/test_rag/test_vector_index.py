@@ -0,0 +1,204 @@
+"""
+Unit tests for the RAG vector index backends.
+
+Covers top-k search, user scoping, incremental updates, on-disk persistence
+and concurrent writers in several processes for the in-process NumPy index,
+and the per-user recall of the pgvector index's SQL.
+"""
+
+import asyncio
+import multiprocessing
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from personal_assistant.rag.vector_index import NumpyVectorIndex, PgVectorIndex
+
+
+def _unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def _add_documents(index_dir, doc_ids):
+    index = NumpyVectorIndex(index_dir=index_dir, compact_threshold=5)
+    for doc_id in doc_ids:
+        asyncio.run(index.add(1, doc_id, _unit(1, doc_id)))
+
+
+class TestNumpyVectorIndex:
+    """Test the in-process NumPy vector index"""
+
+    @pytest.fixture
+    def index(self, tmp_path):
+        return NumpyVectorIndex(index_dir=str(tmp_path), compact_threshold=3)
+
+    @pytest.mark.asyncio
+    async def test_not_ready_until_bootstrapped(self, index):
+        assert not await index.is_ready(1)
+        await index.bulk_load(1, [])
+        assert await index.is_ready(1)
+
+    @pytest.mark.asyncio
+    async def test_search_returns_top_k_in_order(self, index):
+        await index.bulk_load(
+            1,
+            [
+                (10, _unit(1, 0, 0)),
+                (11, _unit(0, 1, 0)),
+                (12, _unit(1, 1, 0)),
+                (13, _unit(0, 0, 1)),
+            ],
+        )
+
+        hits = await index.search(1, [1, 0.1, 0], top_k=2)
+
+        assert [doc_id for doc_id, _ in hits] == [10, 12]
+        assert hits[0][1] > hits[1][1]
+        assert hits[0][1] == pytest.approx(0.995, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_search_is_scoped_by_user(self, index):
+        await index.bulk_load(1, [(10, _unit(1, 0))])
+        await index.bulk_load(2, [(20, _unit(1, 0))])
+
+        assert [doc_id for doc_id, _ in await index.search(1, [1, 0])] == [10]
+        assert [doc_id for doc_id, _ in await index.search(2, [1, 0])] == [20]
+        assert await index.search(3, [1, 0]) == []
+
+    @pytest.mark.asyncio
+    async def test_add_and_remove_update_results(self, index):
+        await index.bulk_load(1, [(10, _unit(0, 1))])
+
+        await index.add(1, 11, [1, 0])
+        assert (await index.search(1, [1, 0], top_k=1))[0][0] == 11
+
+        await index.remove(1, 11)
+        assert [doc_id for doc_id, _ in await index.search(1, [1, 0])] == [10]
+
+    @pytest.mark.asyncio
+    async def test_add_ignored_for_unbootstrapped_user(self, index):
+        await index.add(5, 50, [1, 0])
+        assert not await index.is_ready(5)
+
+    @pytest.mark.asyncio
+    async def test_dimension_mismatch_is_rejected(self, index):
+        await index.bulk_load(1, [(10, _unit(1, 0))])
+        await index.add(1, 11, [1, 0, 0])
+
+        assert await index.search(1, [1, 0, 0]) == []
+        assert [doc_id for doc_id, _ in await index.search(1, [1, 0])] == [10]
+
+    @pytest.mark.asyncio
+    async def test_persistence_replays_log_and_compacts(self, tmp_path, index):
+        await index.bulk_load(1, [(10, _unit(1, 0))])
+        await index.add(1, 11, [0, 1])
+        await index.remove(1, 10)
+
+        reopened = NumpyVectorIndex(index_dir=str(tmp_path))
+        assert await reopened.is_ready(1)
+        assert [doc_id for doc_id, _ in await reopened.search(1, [1, 1])] == [11]
+
+        # Third log record triggers compaction into a fresh snapshot
+        await index.add(1, 12, [1, 1])
+        assert (tmp_path / "user_1.wal").stat().st_size == 0
+
+        reopened = NumpyVectorIndex(index_dir=str(tmp_path))
+        hits = await reopened.search(1, [1, 1])
+        assert [doc_id for doc_id, _ in hits] == [12, 11]
+
+    @pytest.mark.asyncio
+    async def test_picks_up_updates_from_other_process(self, tmp_path, index):
+        await index.bulk_load(1, [(10, _unit(1, 0))])
+        other = NumpyVectorIndex(index_dir=str(tmp_path))
+        assert [doc_id for doc_id, _ in await other.search(1, [1, 0])] == [10]
+
+        await index.add(1, 11, [0, 1])
+
+        assert (await other.search(1, [0, 1], top_k=1))[0][0] == 11
+
+    @pytest.mark.asyncio
+    async def test_concurrent_processes_do_not_lose_updates(self, tmp_path, index):
+        await index.bulk_load(1, [(0, _unit(1, 0))])
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(
+                target=_add_documents,
+                args=(str(tmp_path), range(start, start + 100)),
+            )
+            for start in (1, 1001, 2001)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(60)
+            assert worker.exitcode == 0
+
+        reopened = NumpyVectorIndex(index_dir=str(tmp_path))
+        hits = await reopened.search(1, [1, 0], top_k=1000)
+        assert len(hits) == 301
+
+
+class FakePgSession:
+    """
+    Async session answering PgVectorIndex's SQL. The HNSW scan returns
+    ``ann_rows``; once index scans are disabled the exact scan returns
+    ``exact_rows``.
+    """
+
+    def __init__(self, extversion, ann_rows, exact_rows=None):
+        self.extversion = extversion
+        self.ann_rows = ann_rows
+        self.exact_rows = exact_rows
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        result = MagicMock()
+        if "extversion" in sql:
+            result.scalar.return_value = self.extversion
+        elif any("enable_indexscan = off" in s for s in self.statements):
+            result.all.return_value = self.exact_rows
+        else:
+            result.all.return_value = self.ann_rows
+        return result
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class TestPgVectorIndex:
+    """Test the SQL issued by the pgvector index"""
+
+    @pytest.mark.asyncio
+    async def test_minority_user_gets_top_k(self):
+        # The HNSW candidates mostly belong to other users: only one passes
+        session = FakePgSession(
+            "0.8.0",
+            ann_rows=[(11, 0.9)],
+            exact_rows=[(11, 0.9), (12, 0.8), (13, 0.7)],
+        )
+        index = PgVectorIndex(session_factory=lambda: session, dimension=2)
+
+        results = await index.search(7, [1.0, 0.0], top_k=3)
+
+        assert results == [(11, 0.9), (12, 0.8), (13, 0.7)]
+        assert "SET LOCAL hnsw.iterative_scan = relaxed_order" in session.statements
+        assert index.get_stats()["exact_fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_results_skip_exact_scan(self):
+        # pgvector < 0.8 has no iterative scans; relaxed order is re-sorted
+        session = FakePgSession("0.7.4", ann_rows=[(12, 0.8), (11, 0.9)])
+        index = PgVectorIndex(session_factory=lambda: session, dimension=2)
+
+        results = await index.search(7, [1.0, 0.0], top_k=2)
+
+        assert results == [(11, 0.9), (12, 0.8)]
+        assert not any("SET LOCAL" in sql for sql in session.statements)
+        assert index.get_stats()["exact_fallbacks"] == 0
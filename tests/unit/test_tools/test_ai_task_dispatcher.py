@@ -0,0 +1,141 @@
+"""
+Unit tests for the due AI task dispatcher.
+
+Tests bounded concurrent execution, that a slow task does not delay the
+others, that overlapping dispatcher runs execute each task once, recovery
+of expired leases and lease-fenced status updates.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock
+
+import pytest
+
+from personal_assistant.tools.ai_scheduler.core.dispatcher import DueTaskDispatcher
+from tests.mocks.database_mocks import MockAITask, MockAITaskStore
+
+
+class FakeExecutor:
+    """Stands in for TaskExecutor; records runs and overlapping executions."""
+
+    def __init__(self, latency: float = 0.01, slow_task_ids=(), fail_task_ids=()):
+        self.latency = latency
+        self.slow_task_ids = set(slow_task_ids)
+        self.fail_task_ids = set(fail_task_ids)
+        self.runs = []
+        self.finished = []
+        self.active = 0
+        self.max_active = 0
+
+    async def execute_task(self, task):
+        self.runs.append(task.id)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(0.3 if task.id in self.slow_task_ids else self.latency)
+            if task.id in self.fail_task_ids:
+                raise RuntimeError("agent failed")
+            return {"success": True, "ai_response": f"done {task.id}"}
+        finally:
+            self.active -= 1
+            self.finished.append(task.id)
+
+
+def make_dispatcher(store, executor, max_concurrency=4):
+    return DueTaskDispatcher(
+        task_manager=store,
+        task_executor=executor,
+        notification_service=AsyncMock(),
+        max_concurrency=max_concurrency,
+    )
+
+
+class TestDueTaskDispatcher:
+    """Test DueTaskDispatcher.dispatch"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        store = MockAITaskStore([MockAITask(i) for i in range(1, 7)])
+        executor = FakeExecutor()
+
+        summary = await make_dispatcher(store, executor, max_concurrency=2).dispatch("w1")
+
+        assert summary["tasks_processed"] == 6
+        assert executor.max_active == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_task_does_not_delay_others(self):
+        store = MockAITaskStore([MockAITask(i) for i in range(1, 5)])
+        executor = FakeExecutor(slow_task_ids={1})
+
+        await make_dispatcher(store, executor).dispatch("w1")
+
+        assert executor.finished[-1] == 1
+        assert executor.finished[:3] == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_overlapping_dispatchers_run_each_task_once(self):
+        store = MockAITaskStore([MockAITask(i) for i in range(1, 11)])
+        executor = FakeExecutor()
+
+        first, second = await asyncio.gather(
+            make_dispatcher(store, executor).dispatch("w1", limit=6),
+            make_dispatcher(store, executor).dispatch("w2", limit=6),
+        )
+
+        assert sorted(executor.runs) == list(range(1, 11))
+        assert first["tasks_claimed"] + second["tasks_claimed"] == 10
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_recovered(self):
+        expired = MockAITask(1, status="processing")
+        expired.locked_by = "dead-worker"
+        expired.locked_until = datetime.utcnow() - timedelta(seconds=1)
+        held = MockAITask(2, status="processing")
+        held.locked_by = "live-worker"
+        held.locked_until = datetime.utcnow() + timedelta(minutes=5)
+        store = MockAITaskStore([expired, held])
+        executor = FakeExecutor()
+
+        await make_dispatcher(store, executor).dispatch("w1")
+
+        assert executor.runs == [1]
+        assert expired.status == "completed" and expired.locked_by is None
+        assert held.locked_by == "live-worker"
+
+    @pytest.mark.asyncio
+    async def test_recurring_task_rescheduled(self):
+        task = MockAITask(1, schedule_type="daily", notify=True)
+        store = MockAITaskStore([task])
+        dispatcher = make_dispatcher(store, FakeExecutor())
+
+        await dispatcher.dispatch("w1")
+
+        assert task.status == "active"
+        assert task.next_run_at > datetime.utcnow()
+        dispatcher.notification_service.send_task_completion_notification.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_execution_error_marks_failed(self):
+        store = MockAITaskStore([MockAITask(1), MockAITask(2)])
+
+        summary = await make_dispatcher(store, FakeExecutor(fail_task_ids={2})).dispatch("w1")
+
+        assert (summary["tasks_processed"], summary["tasks_failed"]) == (1, 1)
+        assert store.tasks[2].status == "failed"
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_does_not_overwrite(self):
+        task = MockAITask(1, notify=True)
+        store = MockAITaskStore([task])
+        dispatcher = make_dispatcher(store, FakeExecutor())
+        claimed = await store.claim_due_tasks("w1")
+        # The lease expired and another dispatcher reclaimed the task
+        task.locked_by = "w2"
+
+        result = await dispatcher.run_task(claimed[0], "w1")
+
+        assert result["success"] is False
+        assert task.status == "processing"
+        dispatcher.notification_service.send_task_completion_notification.assert_not_awaited()
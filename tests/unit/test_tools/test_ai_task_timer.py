@@ -0,0 +1,190 @@
+"""
+Unit tests for the AI task due-time index and timer.
+
+Tests scheduling into the sorted set, that a due entry is handed to only one
+of several processes, the timer firing at the due time rather than on the
+next poll, early wake-up for newly scheduled tasks, restoring entries after a
+failed dispatch, reconciliation from the database and sending enough Celery
+dispatcher runs to claim every due task.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from personal_assistant.tools.ai_scheduler.core.timer import (
+    AITaskTimer,
+    AITaskTimerIndex,
+    dispatch_via_celery,
+)
+
+
+class FakeRedis:
+    """The subset of redis.asyncio sorted set commands used by AITaskTimerIndex."""
+
+    def __init__(self):
+        self.zsets = {}
+
+    async def zadd(self, key, mapping):
+        zset = self.zsets.setdefault(key, {})
+        added = sum(1 for member in mapping if member not in zset)
+        zset.update(mapping)
+        return added
+
+    async def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+    def _sorted(self, key):
+        return sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+
+    async def zrange(self, key, start, end, withscores=False):
+        return self._sorted(key)[start : end + 1]
+
+    async def zrangebyscore(self, key, low, high, start=0, num=None, withscores=False):
+        entries = [entry for entry in self._sorted(key) if entry[1] <= high]
+        return entries[start : start + num if num is not None else None]
+
+
+class FakeTaskManager:
+    """Stands in for AITaskManager.get_upcoming_tasks."""
+
+    def __init__(self, upcoming=()):
+        self.upcoming = list(upcoming)
+
+    async def get_upcoming_tasks(self, before, limit=10000):
+        return [(task_id, when) for task_id, when in self.upcoming if when <= before]
+
+
+class RecordingDispatch:
+    """Dispatch callback that records fired task ids and their fire times."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = []
+
+    async def __call__(self, task_ids):
+        if self.fail:
+            raise RuntimeError("broker down")
+        self.calls.append((time.time(), sorted(task_ids)))
+
+
+def in_seconds(seconds):
+    return datetime.utcnow() + timedelta(seconds=seconds)
+
+
+def make_timer(index, dispatch, upcoming=(), max_sleep=1.0):
+    return AITaskTimer(
+        index,
+        dispatch=dispatch,
+        task_manager=FakeTaskManager(upcoming),
+        max_sleep=max_sleep,
+        reconcile_interval=3600,
+    )
+
+
+class TestAITaskTimerIndex:
+    """Test AITaskTimerIndex"""
+
+    @pytest.mark.asyncio
+    async def test_schedule_and_unschedule(self):
+        index = AITaskTimerIndex(FakeRedis())
+
+        await index.schedule(1, in_seconds(60))
+        await index.schedule(2, in_seconds(10))
+        await index.unschedule(1)
+
+        next_due = await index.next_due_at()
+        assert next_due == pytest.approx(time.time() + 10, abs=1)
+        assert await index.pop_due(time.time() + 120) == [(2, next_due)]
+        assert await index.next_due_at() is None
+
+    @pytest.mark.asyncio
+    async def test_reschedule_moves_task(self):
+        index = AITaskTimerIndex(FakeRedis())
+
+        await index.schedule(1, in_seconds(-5))
+        await index.schedule(1, in_seconds(60))
+
+        assert await index.pop_due(time.time()) == []
+
+    @pytest.mark.asyncio
+    async def test_due_entry_popped_by_one_process(self):
+        redis = FakeRedis()
+        first, second = AITaskTimerIndex(redis), AITaskTimerIndex(redis)
+        await first.schedule_many([(1, in_seconds(-1)), (2, in_seconds(-1))])
+
+        popped = await asyncio.gather(first.pop_due(time.time()), second.pop_due(time.time()))
+
+        assert sorted(task_id for entries in popped for task_id, _ in entries) == [1, 2]
+
+
+class TestAITaskTimer:
+    """Test AITaskTimer"""
+
+    @pytest.mark.asyncio
+    async def test_fires_at_due_time(self):
+        index = AITaskTimerIndex(FakeRedis())
+        dispatch = RecordingDispatch()
+        timer = make_timer(index, dispatch, max_sleep=5.0)
+        await index.schedule(7, in_seconds(0.3))
+        due_at = await index.next_due_at()
+
+        timer.start()
+        await asyncio.sleep(0.6)
+        await timer.stop()
+
+        assert [ids for _, ids in dispatch.calls] == [[7]]
+        assert dispatch.calls[0][0] - due_at < 0.2
+
+    @pytest.mark.asyncio
+    async def test_newly_scheduled_task_wakes_timer(self):
+        index = AITaskTimerIndex(FakeRedis())
+        dispatch = RecordingDispatch()
+        timer = make_timer(index, dispatch, max_sleep=10.0)
+
+        timer.start()
+        await asyncio.sleep(0.05)
+        await index.schedule(3, in_seconds(0.1))
+        await asyncio.sleep(0.4)
+        await timer.stop()
+
+        assert [ids for _, ids in dispatch.calls] == [[3]]
+
+    @pytest.mark.asyncio
+    async def test_failed_dispatch_restores_entries(self):
+        index = AITaskTimerIndex(FakeRedis())
+        timer = make_timer(index, RecordingDispatch(fail=True))
+        await index.schedule(4, in_seconds(-1))
+
+        with pytest.raises(RuntimeError):
+            await timer.fire_due()
+
+        assert [task_id for task_id, _ in await index.pop_due(time.time())] == [4]
+
+    @pytest.mark.asyncio
+    async def test_reconcile_adds_upcoming_tasks(self):
+        index = AITaskTimerIndex(FakeRedis())
+        dispatch = RecordingDispatch()
+        timer = make_timer(
+            index, dispatch, upcoming=[(1, in_seconds(-1)), (2, in_seconds(3 * 86400))]
+        )
+
+        assert await timer.reconcile() == 1
+        assert await timer.fire_due() == 1
+        assert dispatch.calls[0][1] == [1]
+        assert timer.get_metrics()["tasks_fired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_celery_dispatch_covers_every_due_task(self):
+        app = MagicMock()
+
+        with patch("personal_assistant.workers.celery_app.app", app), patch(
+            "personal_assistant.tools.ai_scheduler.core.timer.settings"
+        ) as mock_settings:
+            mock_settings.AI_TASK_DISPATCH_BATCH_SIZE = 50
+            await dispatch_via_celery(list(range(120)))
+
+        assert app.send_task.call_count == 3
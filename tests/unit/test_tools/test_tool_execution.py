@@ -0,0 +1,145 @@
+"""
+Unit tests for off-loop tool execution.
+
+Tests that blocking tools run on per-category thread pools with timeouts,
+that one saturated category does not delay another, and that the loop
+stall detector reports a blocked event loop.
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from personal_assistant.tools.base import Tool
+from personal_assistant.tools.execution import (
+    LoopStallDetector,
+    ToolTimeoutError,
+    run_blocking,
+    shutdown_tool_executors,
+)
+
+PARAMETERS = {"type": "object", "properties": {}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_executors():
+    shutdown_tool_executors()
+    yield
+    shutdown_tool_executors()
+
+
+class TestBlockingTool:
+    """Test Tool.blocking handling in Tool.execute"""
+
+    def test_sync_function_defaults_to_blocking(self):
+        tool = Tool("sync_tool", lambda: None, "Sync tool", PARAMETERS)
+        assert tool.blocking is True
+
+    def test_async_function_defaults_to_non_blocking(self):
+        tool = Tool("async_tool", AsyncMock(), "Async tool", PARAMETERS)
+        assert tool.blocking is False
+
+    def test_coroutine_cannot_be_blocking(self):
+        with pytest.raises(ValueError, match="cannot be blocking"):
+            Tool("async_tool", AsyncMock(), "Async tool", PARAMETERS, blocking=True)
+
+    @pytest.mark.asyncio
+    async def test_blocking_tool_runs_on_category_pool(self):
+        tool = Tool(
+            "sync_tool", lambda: threading.current_thread().name, "Sync tool", PARAMETERS
+        ).set_category("Notes")
+
+        thread_name = await tool.execute()
+
+        assert thread_name.startswith("tool-notes")
+
+    @pytest.mark.asyncio
+    async def test_non_blocking_sync_tool_runs_inline(self):
+        tool = Tool(
+            "cheap_tool",
+            lambda: threading.current_thread().name,
+            "Cheap tool",
+            PARAMETERS,
+            blocking=False,
+        )
+
+        assert await tool.execute() == threading.current_thread().name
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_error_response(self):
+        tool = Tool(
+            "slow_tool", lambda: time.sleep(0.5), "Slow tool", PARAMETERS, timeout=0.05
+        )
+
+        result = await tool.execute()
+
+        assert result["error"] is True
+        assert "timed out" in str(result)
+
+
+class TestRunBlocking:
+    """Test run_blocking and the per-category pools"""
+
+    @pytest.mark.asyncio
+    async def test_returns_value_and_passes_arguments(self):
+        result = await run_blocking("Internet", lambda a, b=0: a + b, 2, b=3)
+        assert result == 5
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises(self):
+        with pytest.raises(ToolTimeoutError):
+            await run_blocking("YouTube", time.sleep, 0.5, timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_saturated_category_does_not_delay_others(self):
+        release = threading.Event()
+
+        with patch(
+            "personal_assistant.tools.execution.settings.TOOL_EXECUTOR_MAX_WORKERS", 2
+        ):
+            notion_calls = [
+                asyncio.create_task(run_blocking("Notes", release.wait, 5, timeout=5))
+                for _ in range(4)
+            ]
+            await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            result = await run_blocking("YouTube", lambda: "ok")
+            elapsed = time.perf_counter() - start
+
+            release.set()
+            await asyncio.gather(*notion_calls)
+
+        assert result == "ok"
+        assert elapsed < 0.5
+
+
+class TestLoopStallDetector:
+    """Test the event loop stall detector"""
+
+    @pytest.mark.asyncio
+    async def test_detects_blocked_loop(self):
+        detector = LoopStallDetector(threshold=0.05, interval=0.01)
+        detector.start()
+        await asyncio.sleep(0.02)
+
+        time.sleep(0.15)  # Block the loop
+        await asyncio.sleep(0.03)
+        await detector.stop()
+
+        metrics = detector.get_metrics()
+        assert metrics["stall_count"] >= 1
+        assert metrics["max_lag_ms"] >= 50
+
+    @pytest.mark.asyncio
+    async def test_quiet_loop_reports_no_stalls(self):
+        detector = LoopStallDetector(threshold=0.2, interval=0.01)
+        detector.start()
+        await asyncio.sleep(0.05)
+        await detector.stop()
+
+        assert detector.stall_count == 0
+        assert not detector.running
@@ -0,0 +1,272 @@
+"""
+Unit tests for tool result caching.
+
+Tests that ToolRegistry.run_tool serves repeated read-only calls from the
+cache per user and normalized arguments, honours per-tool TTLs, lets
+mutating tools invalidate cached reads, never caches returned error values,
+and bounds the in-process LRU.
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+from personal_assistant.tools.base import Tool, ToolRegistry
+from personal_assistant.tools.result_cache import (
+    MISS,
+    MemoryToolResultBackend,
+    RedisToolResultBackend,
+    ToolResultCache,
+    is_error_result,
+    set_tool_result_cache,
+)
+from personal_assistant.tools.calendar.calendar_error_handler import (
+    CalendarErrorHandler,
+)
+from personal_assistant.tools.emails.email_error_handler import EmailErrorHandler
+
+PARAMETERS = {"type": "object", "properties": {}}
+
+
+class FakeRedis:
+    """The subset of redis.asyncio used by RedisToolResultBackend (no expiry)."""
+
+    def __init__(self):
+        self.hashes = {}
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+
+def counting_tool(result="ok"):
+    """Async tool function that records its calls in ``.calls``."""
+    calls = []
+
+    async def tool(**kwargs):
+        calls.append(kwargs)
+        return f"{result} #{len(calls)}"
+
+    tool.calls = calls
+    return tool
+
+
+@pytest.fixture
+def cache():
+    cache = ToolResultCache()
+    set_tool_result_cache(cache)
+    yield cache
+    set_tool_result_cache(None)
+
+
+@pytest.fixture
+def registry():
+    return ToolRegistry()
+
+
+def _register(registry, name, func, **kwargs):
+    tool = Tool(name, func, f"{name} tool", PARAMETERS, **kwargs)
+    registry.register(tool)
+    return tool
+
+
+class TestToolResultCache:
+    """Test caching in ToolRegistry.run_tool"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_call_served_from_cache(self, cache, registry):
+        get_todos = counting_tool()
+        _register(registry, "get_todos", get_todos, cache_ttl=30)
+
+        first = await registry.run_tool("get_todos", status="open", limit=5, user_id=1)
+        # Same arguments in a different order
+        second = await registry.run_tool("get_todos", limit=5, status="open", user_id=1)
+
+        assert first == second == "ok #1"
+        assert len(get_todos.calls) == 1
+        assert cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_keyed_per_user_and_arguments(self, cache, registry):
+        get_todos = counting_tool()
+        _register(registry, "get_todos", get_todos, cache_ttl=30)
+
+        await registry.run_tool("get_todos", status="open", user_id=1)
+        await registry.run_tool("get_todos", status="open", user_id=2)
+        await registry.run_tool("get_todos", status="done", user_id=1)
+
+        assert len(get_todos.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_uncached_tool_always_runs(self, cache, registry):
+        create_todo = counting_tool()
+        _register(registry, "create_todo", create_todo)
+
+        await registry.run_tool("create_todo", title="a", user_id=1)
+        await registry.run_tool("create_todo", title="a", user_id=1)
+
+        assert len(create_todo.calls) == 2
+        assert cache.get_stats()["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_entry_expires_after_ttl(self, cache, registry):
+        web_search = counting_tool()
+        _register(registry, "web_search", web_search, cache_ttl=0.05)
+
+        await registry.run_tool("web_search", query="weather", user_id=1)
+        time.sleep(0.06)
+        await registry.run_tool("web_search", query="weather", user_id=1)
+
+        assert len(web_search.calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_mutating_tool_invalidates_reads_for_its_user(self, cache, registry):
+        get_sent_emails = counting_tool()
+        _register(registry, "get_sent_emails", get_sent_emails, cache_ttl=60)
+        _register(registry, "send_email", counting_tool(), invalidates=["get_sent_emails"])
+
+        await registry.run_tool("get_sent_emails", user_id=1)
+        await registry.run_tool("get_sent_emails", user_id=2)
+        await registry.run_tool("send_email", to_recipients="a@example.com", user_id=1)
+        await registry.run_tool("get_sent_emails", user_id=1)
+        await registry.run_tool("get_sent_emails", user_id=2)
+
+        # User 1 re-fetches; user 2's entry is untouched
+        assert len(get_sent_emails.calls) == 3
+        assert cache.get_stats()["invalidations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_results_not_cached(self, cache, registry):
+        calls = []
+
+        async def failing(**kwargs):
+            calls.append(kwargs)
+            raise RuntimeError("provider down")
+
+        _register(registry, "search_videos", failing, cache_ttl=600)
+
+        first = await registry.run_tool("search_videos", query="python", user_id=1)
+        await registry.run_tool("search_videos", query="python", user_id=1)
+
+        assert first["error"] is True
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "error_result",
+        [
+            [
+                CalendarErrorHandler.handle_calendar_error(
+                    RuntimeError("Graph API unavailable"), "view_calendar_events", {}
+                )
+            ],
+            EmailErrorHandler.handle_email_error_str(
+                Exception("Unauthorized: Invalid or expired access token"),
+                "get_emails",
+                {},
+            ),
+            "Error listing reminders: connection refused",
+            str({"error": True, "error_type": "network"}),
+            {"success": False, "error": "db down", "message": "Failed"},
+        ],
+        ids=["calendar_list", "email_string", "reminder_string", "str_dict", "todo_dict"],
+    )
+    async def test_returned_error_values_not_cached(self, cache, registry, error_result):
+        calls = []
+
+        async def read(**kwargs):
+            calls.append(kwargs)
+            return error_result
+
+        _register(registry, "read", read, cache_ttl=60)
+
+        await registry.run_tool("read", user_id=1)
+        await registry.run_tool("read", user_id=1)
+
+        assert len(calls) == 2
+        assert cache.get_stats()["stores"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_if_rejects_tool_specific_errors(self, cache, registry):
+        search_deals = counting_tool("No stores reachable")
+        _register(
+            registry,
+            "search_deals",
+            search_deals,
+            cache_ttl=900,
+            cache_if=lambda result: not result.startswith("No stores reachable"),
+        )
+
+        await registry.run_tool("search_deals", query="milk", user_id=1)
+        await registry.run_tool("search_deals", query="milk", user_id=1)
+
+        assert len(search_deals.calls) == 2
+
+    def test_successful_results_are_cacheable(self):
+        assert not is_error_result("📧 3 unread emails")
+        assert not is_error_result([{"subject": "Standup", "start": "09:00"}])
+        assert not is_error_result({"success": True, "todos": []})
+        assert not is_error_result(None)
+
+    @pytest.mark.asyncio
+    async def test_disabled_cache_bypassed(self, cache, registry):
+        get_todos = counting_tool()
+        _register(registry, "get_todos", get_todos, cache_ttl=30)
+
+        with patch(
+            "personal_assistant.tools.result_cache.settings.TOOL_RESULT_CACHE_ENABLED",
+            False,
+        ):
+            await registry.run_tool("get_todos", user_id=1)
+            await registry.run_tool("get_todos", user_id=1)
+
+        assert len(get_todos.calls) == 2
+
+
+class TestBackends:
+    """Test the memory and Redis backends"""
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_is_bounded_lru(self):
+        backend = MemoryToolResultBackend(max_entries=2)
+        await backend.set("get_todos:1", "a", "A", ttl=60)
+        await backend.set("get_todos:1", "b", "B", ttl=60)
+        await backend.get("get_todos:1", "a")  # Touch a
+        await backend.set("get_todos:1", "c", "C", ttl=60)
+
+        assert backend.size() == 2
+        assert await backend.get("get_todos:1", "b") is MISS
+        assert await backend.get("get_todos:1", "a") == "A"
+
+    @pytest.mark.asyncio
+    async def test_memory_backend_returns_copies(self):
+        backend = MemoryToolResultBackend()
+        await backend.set("get_todos:1", "a", {"todos": ["x"]}, ttl=60)
+
+        (await backend.get("get_todos:1", "a"))["todos"].append("y")
+
+        assert await backend.get("get_todos:1", "a") == {"todos": ["x"]}
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_shared_and_invalidated(self, registry):
+        redis = FakeRedis()
+        first = ToolResultCache(RedisToolResultBackend(redis))
+        second = ToolResultCache(RedisToolResultBackend(redis))
+        tool = Tool("get_todos", counting_tool(), "get_todos tool", PARAMETERS, cache_ttl=30)
+
+        await first.put(tool, {"user_id": 1}, {"todos": []})
+
+        assert await second.get(tool, {"user_id": 1}) == {"todos": []}
+
+        await second.invalidate(["get_todos"], 1)
+
+        assert await first.get(tool, {"user_id": 1}) is MISS
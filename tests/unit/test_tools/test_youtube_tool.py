@@ -197,6 +197,26 @@ class TestYouTubeTool:
             assert "50" in result
             assert "10" in result
 
+    @pytest.mark.asyncio
+    async def test_requests_execute_with_their_own_http(self):
+        """Test that each API request runs on a fresh Http object."""
+        with patch('personal_assistant.tools.youtube.youtube_tool.check_quota_limit') as mock_quota, \
+             patch('personal_assistant.tools.youtube.youtube_tool.settings') as mock_settings, \
+             patch.object(self.youtube_tool, '_youtube') as mock_youtube:
+            mock_quota.return_value = True
+            mock_settings.YOUTUBE_API_KEY = "test_key"
+            execute = mock_youtube.videos.return_value.list.return_value.execute
+            execute.return_value = {"items": []}
+
+            await self.youtube_tool.get_video_info(self.test_video_id)
+            await self.youtube_tool.get_video_info(self.test_video_id)
+
+            assert execute.call_count == 2
+            first_http = execute.call_args_list[0].kwargs["http"]
+            second_http = execute.call_args_list[1].kwargs["http"]
+            assert first_http is not None
+            assert first_http is not second_http
+
     @pytest.mark.asyncio
     async def test_get_video_info_video_not_found(self):
         """Test get video info when video is not found."""
@@ -0,0 +1,102 @@
+"""
+Unit tests for the shared vectorized similarity kernels.
+"""
+
+import numpy as np
+import pytest
+
+from personal_assistant.utils.similarity import (
+    EmbeddingMatrix,
+    cosine_similarity,
+    jaccard_matrix,
+    quantize_int8,
+    top_k_indices,
+)
+
+
+class TestCosineKernels:
+    """Test cosine similarity and top-k selection"""
+
+    @pytest.fixture
+    def vectors(self):
+        return np.random.default_rng(42).standard_normal((500, 32)).astype(np.float32)
+
+    def test_cosine_similarity_pair(self):
+        assert cosine_similarity([1, 0], [1, 0]) == pytest.approx(1.0)
+        assert cosine_similarity([1, 0], [0, 1]) == pytest.approx(0.0)
+        assert cosine_similarity([1, 0], [0, 0]) == 0.0
+        assert cosine_similarity([], [1]) == 0.0
+
+    def test_top_k_indices_ordering(self):
+        scores = np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32)
+        assert top_k_indices(scores, 2).tolist() == [1, 3]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 0]
+        assert top_k_indices(scores, 0).tolist() == []
+
+    def test_top_k_matches_pairwise_scan(self, vectors):
+        matrix = EmbeddingMatrix(vectors, ids=[f"doc-{i}" for i in range(len(vectors))])
+        query = vectors[7] + 0.01
+
+        expected = sorted(
+            ((f"doc-{i}", cosine_similarity(query, v)) for i, v in enumerate(vectors)),
+            key=lambda item: item[1],
+            reverse=True,
+        )[:5]
+        result = matrix.top_k(query, k=5)
+
+        assert [doc_id for doc_id, _ in result] == [doc_id for doc_id, _ in expected]
+        for (_, score), (_, expected_score) in zip(result, expected):
+            assert score == pytest.approx(expected_score, abs=1e-5)
+
+    def test_batch_top_k(self, vectors):
+        matrix = EmbeddingMatrix(vectors)
+        results = matrix.batch_top_k(vectors[:3], k=1)
+        assert [hits[0][0] for hits in results] == [0, 1, 2]
+
+    def test_int8_quantization(self, vectors):
+        quantized, scales = quantize_int8(vectors)
+        restored = quantized.astype(np.float32) * scales[:, None]
+        assert quantized.dtype == np.int8
+        assert np.abs(restored - vectors).max() <= scales.max()
+
+        exact = EmbeddingMatrix(vectors)
+        compact = EmbeddingMatrix(vectors, quantize=True)
+        assert compact.nbytes < exact.nbytes / 3
+        assert compact.top_k(vectors[3], k=1)[0][0] == 3
+        np.testing.assert_allclose(
+            compact.scores([vectors[3]]), exact.scores([vectors[3]]), atol=0.02
+        )
+
+    def test_empty_matrix(self):
+        assert EmbeddingMatrix([]).top_k([1.0, 0.0]) == []
+
+    def test_dimension_mismatch(self, vectors):
+        with pytest.raises(ValueError):
+            EmbeddingMatrix(vectors).top_k([1.0, 0.0])
+
+
+class TestJaccardMatrix:
+    """Test vectorized set-overlap scoring"""
+
+    def test_matches_python_sets(self):
+        sets_a = [{"a", "b"}, {"b", "c", "d"}, set()]
+        sets_b = [{"b"}, {"c", "d", "e"}, set()]
+
+        result = jaccard_matrix(sets_a, sets_b)
+
+        for i, a in enumerate(sets_a):
+            for j, b in enumerate(sets_b):
+                expected = len(a & b) / max(len(a | b), 1)
+                assert result[i, j] == pytest.approx(expected)
+
+    def test_self_comparison(self):
+        result = jaccard_matrix([["x", "y"], ["y", "z"]])
+        assert result.shape == (2, 2)
+        assert result[0, 0] == pytest.approx(1.0)
+        assert result[0, 1] == pytest.approx(1 / 3)
+
+    def test_threshold_boundary_matches_python(self):
+        # 3/5 must not exceed a 0.6 threshold due to float32 rounding
+        a = {"a", "b", "c", "d"}
+        b = {"a", "b", "c", "e"}
+        assert not jaccard_matrix([a], [b])[0, 0] > 0.6
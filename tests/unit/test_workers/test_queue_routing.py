@@ -23,6 +23,9 @@ class TestQueueRouting:
         assert routes['personal_assistant.workers.tasks.ai_tasks.*']['queue'] == 'ai_tasks'
         assert routes['personal_assistant.workers.tasks.ai_tasks.*']['priority'] == 10
 
+        # Long-running RAG maintenance must not occupy ai_tasks workers
+        assert routes['personal_assistant.workers.tasks.rag_tasks.*']['queue'] == 'rag_tasks'
+
 
 
 
@@ -32,7 +35,7 @@ class TestQueueRouting:
         queues = app.conf.task_queues
         queue_names = [q.name for q in queues]
 
-        expected_queues = ['ai_tasks']
+        expected_queues = ['ai_tasks', 'rag_tasks']
         for queue in expected_queues:
             assert queue in queue_names
 
@@ -142,7 +145,7 @@ class TestQueueRoutingRegression:
     def test_worker_listens_to_correct_queues(self):
         """Test that worker configuration includes all required queues."""
         # This test verifies the Docker configuration would include the correct queues
-        expected_queues = ['ai_tasks']
+        expected_queues = ['ai_tasks', 'rag_tasks']
         
         # The worker command should include all these queues
         # This is verified by checking that all queues are declared in Celery config
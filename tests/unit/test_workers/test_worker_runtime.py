@@ -0,0 +1,177 @@
+"""
+Unit tests for the persistent Celery worker async runtime.
+
+Tests that every task runs on the same long-lived loop, that loop-bound
+resources survive between tasks, exception propagation through the
+async_task decorator, submissions from several threads and shutdown,
+which flushes detached background saves before cancelling the rest.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from personal_assistant.core.services.background_service import BackgroundService
+from personal_assistant.types.state import AgentState
+from personal_assistant.workers.runtime import (
+    WorkerAsyncRuntime,
+    async_task,
+    get_worker_runtime,
+    set_worker_runtime,
+)
+
+
+@pytest.fixture
+def runtime():
+    runtime = WorkerAsyncRuntime()
+    set_worker_runtime(runtime)
+    yield runtime
+    runtime.shutdown()
+    set_worker_runtime(None)
+
+
+class TestWorkerAsyncRuntime:
+    """Test WorkerAsyncRuntime"""
+
+    def test_tasks_share_one_loop(self, runtime):
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        loops = {runtime.run(current_loop()) for _ in range(5)}
+
+        assert loops == {runtime.loop}
+        assert runtime.tasks_run == 5
+
+    def test_loop_bound_resources_reused(self, runtime):
+        created = []
+        clients = {}
+
+        async def get_client():
+            loop = asyncio.get_running_loop()
+            if loop not in clients:
+                created.append(loop)
+                clients[loop] = asyncio.Lock()
+            async with clients[loop]:
+                return clients[loop]
+
+        first = runtime.run(get_client())
+        second = runtime.run(get_client())
+
+        assert first is second
+        assert len(created) == 1
+
+    def test_background_work_progresses_between_tasks(self, runtime):
+        ticks = []
+
+        async def start_ticker():
+            async def ticker():
+                while True:
+                    ticks.append(1)
+                    await asyncio.sleep(0.01)
+
+            asyncio.get_running_loop().create_task(ticker())
+
+        runtime.run(start_ticker())
+        runtime.run(asyncio.sleep(0.1))
+
+        assert len(ticks) > 3
+
+    def test_concurrent_submissions_from_threads(self, runtime):
+        async def work(i):
+            await asyncio.sleep(0.05)
+            return i
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: runtime.run(work(i)), range(8)))
+
+        assert results == list(range(8))
+
+    def test_timeout_cancels_coroutine(self, runtime):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(FutureTimeoutError):
+            runtime.run(slow(), timeout=0.05)
+
+        assert cancelled.wait(1)
+
+    def test_shutdown_cancels_pending_tasks(self, runtime):
+        cancelled = []
+
+        async def start_forever():
+            async def forever():
+                try:
+                    await asyncio.sleep(3600)
+                except asyncio.CancelledError:
+                    cancelled.append(True)
+                    raise
+
+            asyncio.get_running_loop().create_task(forever())
+
+        runtime.run(start_forever())
+        runtime.shutdown()
+
+        assert cancelled == [True]
+        assert not runtime.running
+        assert runtime.loop.is_closed()
+
+    def test_shutdown_flushes_detached_background_saves(self, runtime):
+        saved = []
+
+        async def save_state(conversation_id, state, user_id):
+            await asyncio.sleep(0.05)
+            saved.append(conversation_id)
+
+        storage_manager = MagicMock()
+        storage_manager.save_state = AsyncMock(side_effect=save_state)
+        storage_manager.log_agent_interaction = AsyncMock(return_value=True)
+        service = BackgroundService(storage_manager)
+
+        # Submitted from a task, the save runs detached on the runtime loop
+        runtime.run(service.submit(1, "hi", "r", AgentState(user_input="hi"), "a", 0.0))
+        runtime.shutdown()
+
+        assert saved == ["a"]
+
+
+class TestAsyncTaskDecorator:
+    """Test the async_task decorator"""
+
+    def test_runs_coroutine_on_worker_runtime(self, runtime):
+        @async_task
+        async def task_body(self, value):
+            return value, asyncio.get_running_loop()
+
+        value, loop = task_body(None, 42)
+
+        assert value == 42
+        assert loop is runtime.loop
+        assert task_body.__name__ == "task_body"
+
+    def test_exceptions_propagate(self, runtime):
+        @async_task
+        async def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            failing()
+
+    def test_runtime_started_lazily(self):
+        set_worker_runtime(None)
+        try:
+            runtime = get_worker_runtime()
+            assert runtime.running
+            assert get_worker_runtime() is runtime
+        finally:
+            runtime.shutdown()
+            set_worker_runtime(None)